@@ -4,9 +4,11 @@ TruthLens FastAPI App
 FastAPI wrapper for the enhanced TruthLens fact-checking pipeline.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
+import json
 import logging
 import sys
 import os
@@ -20,15 +22,34 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+from src.utils.serving import AdmissionController, AdmissionRejected, BoundedExecutor
+from src.utils.prefork import memory_report, prefork_enabled, prepare_for_fork
+from src.utils.tracing import metrics_snapshot, trace_request
+from src.utils.warmup import WarmupManager
+
 # Import TruthLens components with error handling
 TRUTHLENS_AVAILABLE = False
 news_handler = None
+async_news_client = None
 cross_reference_scorer = None
 pipeline = None
 
+# Blocking pipeline stages run here, off the event loop
+inference_executor = BoundedExecutor.from_env(prefix="TRUTHLENS_INFERENCE", name="inference")
+# /verify is I/O bound, so it only needs a cap on concurrent requests
+verify_admission = AdmissionController(
+    max_concurrency=int(os.environ.get("TRUTHLENS_VERIFY_CONCURRENCY", 64)),
+    max_queue=int(os.environ.get("TRUTHLENS_VERIFY_MAX_QUEUE", 256)),
+    queue_timeout=float(os.environ.get("TRUTHLENS_VERIFY_QUEUE_TIMEOUT", 30)),
+    name="verify"
+)
+# Models load and warm in the background; /health/ready reports when they are done
+warmup = WarmupManager()
+
 try:
     from src.enhanced_truthlens_pipeline import EnhancedTruthLensPipeline
     from src.news.enhanced_news_handler import EnhancedNewsHandler
+    from src.news.async_news_client import AsyncNewsClient
     from src.evidence_retrieval.semantic_cross_reference_scorer import SemanticCrossReferenceScorer
     TRUTHLENS_AVAILABLE = True
     logger.info("TruthLens components imported successfully")
@@ -46,13 +67,25 @@ async def lifespan(app: FastAPI):
     """Lifespan event handler for FastAPI."""
     # Startup
     logger.info("Starting TruthLens FastAPI app...")
-    await initialize_handlers()
-    logger.info("TruthLens FastAPI app started successfully")
+    if not warmup.started:
+        initialize_handlers()
+        warmup.start()
+        logger.info("TruthLens FastAPI app started; models warming up in the background")
+    else:
+        logger.info("TruthLens FastAPI app started with models preloaded before fork")
     
     yield
     
     # Shutdown
     logger.info("Shutting down TruthLens FastAPI app...")
+    verify_admission.close()
+    if async_news_client:
+        await async_news_client.close()
+    inference_executor.shutdown(wait=False)
+    # Write out buffered similarity pairs rather than relying on __del__
+    for scorer in (cross_reference_scorer, getattr(news_handler, 'cross_reference_scorer', None)):
+        if scorer:
+            scorer.close()
 
 # Initialize FastAPI app with lifespan
 app = FastAPI(
@@ -62,10 +95,24 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    """Turn shed requests into 429/503 responses with a Retry-After hint."""
+    logger.warning(f"Request to {request.url.path} rejected: {exc}")
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 # Pydantic Models
 class ClaimInput(BaseModel):
     claim: str = Field(..., description="The claim to verify", min_length=10, max_length=500)
 
+class BatchClaimInput(BaseModel):
+    claims: List[str] = Field(..., description="Claims to verify", min_length=1, max_length=100)
+    max_articles: int = Field(default=15, description="Maximum articles per claim", ge=1, le=50)
+
 class ArticleDetail(BaseModel):
     title: str
     url: str
@@ -86,36 +133,55 @@ class VerificationResponse(BaseModel):
     total_articles: int
     source_breakdown: Dict[str, int]
 
-async def initialize_handlers():
-    """Initialize news handlers and pipeline."""
-    global news_handler, cross_reference_scorer, pipeline
+def initialize_handlers():
+    """Register news handlers and pipeline with the warm-up manager."""
+    if not TRUTHLENS_AVAILABLE:
+        logger.error("TruthLens components not available")
+        return
     
-    try:
-        if TRUTHLENS_AVAILABLE:
-            # Initialize enhanced news handler
-            news_handler = EnhancedNewsHandler(
-                news_api_key=NEWS_API_KEY,
-                guardian_api_key=GUARDIAN_API_KEY
-            )
-            logger.info("Enhanced News Handler initialized")
-            
-            # Initialize cross-reference scorer
-            cross_reference_scorer = SemanticCrossReferenceScorer()
-            logger.info("Cross-reference scorer initialized")
-            
-            # Initialize pipeline
-            pipeline = EnhancedTruthLensPipeline(
-                news_api_key=NEWS_API_KEY,
-                guardian_api_key=GUARDIAN_API_KEY,
-                google_api_key=GOOGLE_API_KEY
-            )
-            logger.info("Enhanced TruthLens Pipeline initialized")
-            
-        else:
-            logger.error("TruthLens components not available")
-            
-    except Exception as e:
-        logger.error(f"Failed to initialize handlers: {e}")
+    def set_news_handler(handler):
+        global news_handler, async_news_client
+        news_handler = handler
+        async_news_client = AsyncNewsClient(handler)
+        logger.info("Enhanced News Handler initialized")
+    
+    def set_cross_reference_scorer(scorer):
+        global cross_reference_scorer
+        cross_reference_scorer = scorer
+        logger.info("Cross-reference scorer initialized")
+    
+    def set_pipeline(loaded):
+        global pipeline
+        pipeline = loaded
+        logger.info("Enhanced TruthLens Pipeline initialized")
+    
+    warmup.add(
+        "news_handler",
+        lambda: EnhancedNewsHandler(news_api_key=NEWS_API_KEY, guardian_api_key=GUARDIAN_API_KEY),
+        on_loaded=set_news_handler
+    )
+    warmup.add(
+        "cross_reference_scorer",
+        SemanticCrossReferenceScorer,
+        warm=lambda scorer: scorer.warm_up(),
+        on_loaded=set_cross_reference_scorer
+    )
+    warmup.add(
+        "pipeline",
+        lambda: EnhancedTruthLensPipeline(
+            news_api_key=NEWS_API_KEY,
+            guardian_api_key=GUARDIAN_API_KEY,
+            google_api_key=GOOGLE_API_KEY
+        ),
+        warm=lambda loaded: loaded.warm_up(),
+        on_loaded=set_pipeline
+    )
+
+if prefork_enabled():
+    # Load in the master (gunicorn --preload) so forked workers share the weights
+    initialize_handlers()
+    warmup.run()
+    prepare_for_fork(pipeline, cross_reference_scorer)
 
 @app.get("/")
 async def root():
@@ -127,8 +193,14 @@ async def root():
         "components_available": TRUTHLENS_AVAILABLE,
         "endpoints": {
             "POST /verify": "Verify a claim",
+            "POST /verify/batch": "Verify many claims with shared retrieval and batched inference",
+            "POST /verify/stream": "Verify a claim, streaming stage events as SSE or NDJSON",
             "GET /health": "Health check",
-            "GET /sources": "List available news sources"
+            "GET /health/live": "Liveness probe",
+            "GET /health/ready": "Readiness probe; 503 until models are loaded and warm",
+            "GET /health/memory": "Shared vs private memory of the answering worker",
+            "GET /sources": "List available news sources",
+            "GET /metrics": "Per-stage latency percentiles and recent request traces"
         }
     }
 
@@ -137,12 +209,44 @@ async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
+        "ready": warmup.is_ready(),
         "timestamp": datetime.now().isoformat(),
         "components": {
             "news_handler": news_handler is not None,
             "cross_reference_scorer": cross_reference_scorer is not None,
             "pipeline": pipeline is not None,
             "truthlens_available": TRUTHLENS_AVAILABLE
+        },
+        "serving": {
+            "verify": verify_admission.stats(),
+            "inference": inference_executor.stats()
+        }
+    }
+
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness probe; answers as soon as the server accepts connections."""
+    return warmup.liveness()
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness probe; 503 until every required model is loaded and warmed."""
+    readiness = warmup.readiness()
+    return JSONResponse(status_code=200 if readiness["ready"] else 503, content=readiness)
+
+@app.get("/health/memory")
+async def memory_check():
+    """Shared vs private memory of the worker answering this request."""
+    return {"prefork": prefork_enabled(), **memory_report()}
+
+@app.get("/metrics")
+async def metrics():
+    """Rolling p50/p95/p99 per pipeline span, recent span trees and serving counters."""
+    return {
+        **metrics_snapshot(),
+        "serving": {
+            "verify": verify_admission.stats(),
+            "inference": inference_executor.stats()
         }
     }
 
@@ -171,13 +275,13 @@ async def list_sources():
 
 async def search_newsapi(claim: str, max_results: int = 10) -> List[Dict[str, Any]]:
     """Search News API for articles related to the claim."""
-    if not news_handler:
+    if not async_news_client:
         logger.warning("News handler not available")
         return []
     
     try:
-        # Use the enhanced news handler to get News API results
-        articles = news_handler._get_news_api_results(claim, max_results, days_back=30)
+        # Same results as news_handler._get_news_api_results, without blocking the loop
+        articles = await async_news_client.search_newsapi(claim, max_results, days_back=30)
         
         if articles:
             logger.info(f"News API returned {len(articles)} articles")
@@ -203,13 +307,13 @@ async def search_newsapi(claim: str, max_results: int = 10) -> List[Dict[str, An
 
 async def search_guardian(claim: str, max_results: int = 10) -> List[Dict[str, Any]]:
     """Search Guardian API as fallback if News API fails."""
-    if not news_handler:
+    if not async_news_client:
         logger.warning("News handler not available")
         return []
     
     try:
-        # Use the enhanced news handler to get Guardian results
-        articles = news_handler._get_guardian_results(claim, max_results, days_back=30)
+        # Same results as news_handler._get_guardian_results, without blocking the loop
+        articles = await async_news_client.search_guardian(claim, max_results, days_back=30)
         
         if articles:
             logger.info(f"Guardian API returned {len(articles)} articles")
@@ -337,6 +441,11 @@ async def verify_claim(claim_input: ClaimInput):
     Returns:
         VerificationResponse with structured verification results
     """
+    async with verify_admission:
+        return await _verify_claim(claim_input)
+
+async def _verify_claim(claim_input: ClaimInput) -> VerificationResponse:
+    """Run the /verify stages once the request has been admitted."""
     start_time = datetime.now()
     
     try:
@@ -436,12 +545,20 @@ async def verify_claim(claim_input: ClaimInput):
             detail=f"Claim verification failed: {str(e)}"
         )
 
+def _analyze_claim_traced(claim: str, profile: bool):
+    """Run the pipeline inside a request trace, sampling stacks when asked."""
+    with trace_request("verify_advanced", profile=profile) as trace:
+        result = pipeline.analyze_claim(claim, max_articles=15)
+    return result, trace
+
 @app.post("/verify-advanced")
-async def verify_claim_advanced(claim_input: ClaimInput):
+async def verify_claim_advanced(claim_input: ClaimInput, profile: bool = False):
     """
     Advanced claim verification using the full TruthLens pipeline.
     
     This endpoint uses the complete enhanced pipeline for more accurate results.
+    Pass ``profile=true`` to sample the request's stacks and return its
+    span tree and profile.
     """
     if not pipeline:
         raise HTTPException(
@@ -455,12 +572,12 @@ async def verify_claim_advanced(claim_input: ClaimInput):
         
         logger.info(f"Advanced verification of claim: {claim}")
         
-        # Use the full pipeline
-        result = pipeline.analyze_claim(claim, max_articles=15)
+        # Use the full pipeline; model inference runs on the bounded executor
+        result, trace = await inference_executor.run(_analyze_claim_traced, claim, profile)
         
         processing_time = (datetime.now() - start_time).total_seconds()
         
-        return {
+        response = {
             "claim": claim,
             "verdict": result.verdict,
             "confidence": result.confidence,
@@ -469,9 +586,15 @@ async def verify_claim_advanced(claim_input: ClaimInput):
             "stance_distribution": dict(result.stance_distribution),
             "fact_check_result": result.fact_check_result,
             "processing_time": processing_time,
+            "stage_timings": trace.stage_timings(),
             "timestamp": datetime.now().isoformat()
         }
+        if profile:
+            response["trace"] = trace.to_dict()
+        return response
         
+    except AdmissionRejected:
+        raise
     except Exception as e:
         logger.error(f"Advanced verification failed: {e}")
         raise HTTPException(
@@ -479,6 +602,112 @@ async def verify_claim_advanced(claim_input: ClaimInput):
             detail=f"Advanced verification failed: {str(e)}"
         )
 
+def _advanced_result_to_dict(result) -> Dict[str, Any]:
+    """Response body for one pipeline result."""
+    return {
+        "claim": result.claim,
+        "verdict": result.verdict,
+        "confidence": result.confidence,
+        "evidence_summary": result.evidence_summary,
+        "news_articles": len(result.news_articles),
+        "stance_distribution": dict(result.stance_distribution),
+        "fact_check_result": result.fact_check_result,
+        "duplicate_of": result.search_summary.get("duplicate_of")
+    }
+
+@app.post("/verify/batch")
+async def verify_claims_batch(batch_input: BatchClaimInput):
+    """
+    Verify many claims in one request using the full TruthLens pipeline.
+    
+    Duplicate claims are analyzed once, retrieval is shared between related
+    claims and stance detection is batched across all of them.
+    """
+    if not pipeline:
+        raise HTTPException(
+            status_code=503,
+            detail="Batch verification not available - pipeline not initialized"
+        )
+    
+    invalid = [i for i, claim in enumerate(batch_input.claims) if not 10 <= len(claim) <= 500]
+    if invalid:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Claims must be 10-500 characters long (invalid indices: {invalid})"
+        )
+    
+    try:
+        start_time = datetime.now()
+        logger.info(f"Batch verification of {len(batch_input.claims)} claims")
+        
+        results = await inference_executor.run(
+            pipeline.analyze_claims, batch_input.claims, max_articles=batch_input.max_articles
+        )
+        
+        processing_time = (datetime.now() - start_time).total_seconds()
+        
+        return {
+            "results": [_advanced_result_to_dict(result) for result in results],
+            "total_claims": len(results),
+            "distinct_claims": sum(1 for r in results if r.search_summary.get("duplicate_of") is None),
+            "processing_time": processing_time,
+            "timestamp": datetime.now().isoformat()
+        }
+        
+    except AdmissionRejected:
+        raise
+    except Exception as e:
+        logger.error(f"Batch verification failed: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Batch verification failed: {str(e)}"
+        )
+
+def _format_stream_event(event: Dict[str, Any], stream_format: str) -> str:
+    """Encode one pipeline event as an SSE message or an NDJSON line."""
+    payload = json.dumps(event, default=str)
+    if stream_format == "ndjson":
+        return payload + "\n"
+    return f"event: {event.get('event', 'message')}\ndata: {payload}\n\n"
+
+@app.post("/verify/stream")
+async def verify_claim_stream(claim_input: ClaimInput,
+                              format: str = "sse",
+                              stop_on_fact_check: Optional[float] = None):
+    """
+    Verify a claim, streaming an event as each pipeline stage completes.
+    
+    Events: started, fact_check, articles, stance (one per article),
+    provisional_verdict, verdict, or error. Use ``format=ndjson`` for
+    newline-delimited JSON instead of Server-Sent Events. Pass
+    ``stop_on_fact_check`` (0-1) to finish as soon as a fact check at least
+    that confident is found; disconnecting also stops the analysis.
+    """
+    if not pipeline:
+        raise HTTPException(
+            status_code=503,
+            detail="Streaming verification not available - pipeline not initialized"
+        )
+    if format not in ("sse", "ndjson"):
+        raise HTTPException(status_code=422, detail="format must be 'sse' or 'ndjson'")
+    
+    logger.info(f"Streaming verification of claim: {claim_input.claim}")
+    events = await inference_executor.stream(
+        pipeline.stream_analysis, claim_input.claim,
+        max_articles=15, stop_on_fact_check=stop_on_fact_check
+    )
+    
+    async def body():
+        try:
+            async for event in events:
+                yield _format_stream_event(event, format)
+        finally:
+            await events.aclose()
+    
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/event-stream"
+    return StreamingResponse(body(), media_type=media_type,
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher Benchmark
+Compares the compiled KeywordMatcher with the per-keyword scanning loops it
+replaced, on synthetic long articles built from dataset/groundtruth.csv.
+
+Usage:
+    python benchmarks/bench_keyword_matcher.py [--sizes 5000 50000 200000] [--repeat 5]
+"""
+
+import argparse
+import csv
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.keyword_matcher import KeywordMatcher
+
+HIGHLIGHT_KEYWORDS = [
+    "confirm", "verified", "true", "accurate", "correct", "proven",
+    "evidence shows", "study finds", "research indicates", "according to",
+    "official", "confirmed", "validated", "authentic", "genuine",
+    "false", "fake", "hoax", "debunked", "disproven", "incorrect",
+    "misleading", "untrue", "fabricated", "denied", "rejected",
+    "no evidence", "not true", "false claim", "misinformation"
+]
+
+CONTRADICTION_KEYWORDS = [
+    'false', 'debunked', 'misleading', 'inaccurate', 'wrong', 'fake', 'hoax',
+    'myth', 'disproven', 'refuted', 'denied', 'rejected', 'contradicted',
+    'fact check', 'misinformation', 'disinformation', 'not true', 'untrue',
+    'no evidence', 'no link', 'no connection', 'does not cause', 'does not lead to',
+    'never happened', 'never occurred', 'baseless', 'unfounded'
+]
+
+CLAIM = "Government officials confirmed the new vaccine study finds no link to autism in children"
+
+
+def load_sentences() -> List[str]:
+    """Load benchmark sentences from the ground-truth dataset."""
+    path = project_root / "dataset" / "groundtruth.csv"
+    with open(path, newline='', encoding='utf-8') as f:
+        return [row["Text"] for row in csv.DictReader(f) if row.get("Text")]
+
+
+def build_article(sentences: List[str], size: int, seed: int = 13) -> str:
+    """Build an article of roughly ``size`` characters with sprinkled keywords."""
+    rng = random.Random(seed)
+    parts: List[str] = []
+    length = 0
+    while length < size:
+        sentence = rng.choice(sentences)
+        if rng.random() < 0.1:
+            sentence = f"{sentence} {rng.choice(HIGHLIGHT_KEYWORDS + CONTRADICTION_KEYWORDS)}."
+        parts.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(parts)
+
+
+def legacy_highlight_scan(text: str, keywords: List[str], claim_terms: List[str]) -> int:
+    """Per-keyword word-boundary scan as done by the original CitationHighlighter."""
+    hits = 0
+    for keyword in dict.fromkeys(keywords + claim_terms):
+        for _ in re.finditer(rf'\b{re.escape(keyword)}\b', text, re.IGNORECASE):
+            hits += 1
+    return hits
+
+
+def legacy_contradiction_scan(text: str) -> str:
+    """First-keyword-in-list substring check as done by EnhancedStanceClassifier."""
+    for keyword in CONTRADICTION_KEYWORDS:
+        if keyword in text:
+            return keyword
+    return ""
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    """Return the best wall-clock time in milliseconds over ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compiled keyword matcher")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 50000, 200000],
+                        help="Article sizes in characters")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement")
+    args = parser.parse_args()
+
+    sentences = load_sentences()
+    claim_terms = sorted({w for w in re.findall(r'\b\w+\b', CLAIM.lower()) if len(w) > 2})
+
+    # Built once, as the callers do
+    highlight_matcher = KeywordMatcher(HIGHLIGHT_KEYWORDS + claim_terms)
+    contradiction_matcher = KeywordMatcher(CONTRADICTION_KEYWORDS, word_boundary=False,
+                                           case_sensitive=True)
+
+    print(f"{'chars':>8} | {'case':<22} | {'loops ms':>9} | {'matcher ms':>10} | {'speedup':>7}")
+    print("-" * 68)
+
+    for size in args.sizes:
+        article = build_article(sentences, size)
+        lowered = article.lower()
+
+        # Sanity check: both approaches agree
+        assert legacy_highlight_scan(article, HIGHLIGHT_KEYWORDS, claim_terms) == \
+            len(highlight_matcher.find_all(article))
+        hit = contradiction_matcher.first_by_priority(lowered)
+        assert legacy_contradiction_scan(lowered) == (hit.keyword if hit else "")
+
+        cases = [
+            ("highlight spans",
+             lambda: legacy_highlight_scan(article, HIGHLIGHT_KEYWORDS, claim_terms),
+             lambda: highlight_matcher.find_all(article)),
+            ("contradiction keyword",
+             lambda: legacy_contradiction_scan(lowered),
+             lambda: contradiction_matcher.first_by_priority(lowered)),
+        ]
+        for name, legacy, compiled in cases:
+            legacy_ms = best_of(legacy, args.repeat)
+            compiled_ms = best_of(compiled, args.repeat)
+            print(f"{size:>8} | {name:<22} | {legacy_ms:>9.2f} | {compiled_ms:>10.2f} | "
+                  f"{legacy_ms / max(compiled_ms, 1e-9):>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+End-to-End Pipeline Benchmark
+Runs the pipeline stages over the sentences in dataset/groundtruth.csv fully
+offline and tracks throughput, latency percentiles, memory and model-load
+time per stage across runs.
+
+External APIs (NewsAPI, Guardian, Currents, Google Fact Check, Wikipedia)
+are served by offline_fixtures.OfflineHTTP from the committed fixture file,
+with deterministic synthetic responses for requests it does not cover. The
+committed file holds every request the enhanced stage makes for the first
+100 sentences, frozen from the synthetic responder; ``--record`` replaces it
+with real API responses.
+Hugging Face models load from the local cache only.
+
+Memory is the current RSS sampled while each stage runs, not the process's
+lifetime high-water mark: ``load_rss_mb`` is the growth while the stage's
+components load, ``peak_rss_delta_mb`` the highest RSS during the stage
+above where it started.
+
+Stages:
+    claim_processing   ClaimProcessor.process_claims
+    retrieval          HybridEvidenceRetriever.retrieve_evidence
+    verification       VerificationPipeline.run on fixture evidence
+    enhanced           EnhancedTruthLensPipeline.analyze_claim
+
+Each run is appended to benchmarks/results/e2e_history.jsonl and compared
+with the previous run of the same configuration.
+
+Usage:
+    python benchmarks/e2e_benchmark.py --limit 100
+    python benchmarks/e2e_benchmark.py --stages claim_processing verification --heuristic-models
+    python benchmarks/e2e_benchmark.py --record --limit 50     # capture real API fixtures
+    python benchmarks/e2e_benchmark.py --freeze --limit 50     # pin synthesized responses as fixtures
+    python benchmarks/e2e_benchmark.py --fail-on-regression 0.15
+"""
+
+import argparse
+import csv
+import json
+import logging
+import math
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from offline_fixtures import OfflineHTTP
+
+DEFAULT_FIXTURES = project_root / "benchmarks" / "fixtures" / "api_responses.json.gz"
+DEFAULT_HISTORY = project_root / "benchmarks" / "results" / "e2e_history.jsonl"
+STAGES = ["claim_processing", "retrieval", "verification", "enhanced"]
+# RSS changes smaller than this are allocator noise, not regressions
+RSS_NOISE_MB = 5.0
+
+
+def load_sentences() -> List[str]:
+    """Load benchmark sentences from the ground-truth dataset."""
+    path = project_root / "dataset" / "groundtruth.csv"
+    with open(path, newline='', encoding='utf-8') as f:
+        return [row["Text"] for row in csv.DictReader(f) if row.get("Text")]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def current_rss_mb() -> Optional[float]:
+    """Current resident set size, or None where it cannot be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+class RSSSampler:
+    """Samples the current RSS on a background thread and keeps the highest value."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.start_mb = current_rss_mb()
+        self.peak_mb = self.start_mb
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def sample(self) -> Optional[float]:
+        rss = current_rss_mb()
+        if rss is not None and (self.peak_mb is None or rss > self.peak_mb):
+            self.peak_mb = rss
+        return rss
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def __enter__(self) -> "RSSSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+        return False
+
+
+def _mb(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 1)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def build_stage(name: str, http: OfflineHTTP) -> Callable[[str, int], Any]:
+    """Construct a stage's components and return a per-sentence callable."""
+    if name == "claim_processing":
+        from src.claim_processing import ClaimProcessor
+        processor = ClaimProcessor()
+        return lambda sentence, i: processor.process_claims(sentence)
+
+    if name == "retrieval":
+        from src.evidence_retrieval.hybrid_retriever import HybridEvidenceRetriever
+        retriever = HybridEvidenceRetriever()
+        return lambda sentence, i: retriever.retrieve_evidence(sentence, f"claim_{i}")
+
+    if name == "verification":
+        from src.verification.pipeline import VerificationPipeline
+        pipeline = VerificationPipeline()
+
+        def verify(sentence: str, i: int):
+            evidence = [
+                {"id": f"{i}_{j}", "title": a["title"], "snippet": a["description"], "url": a["url"],
+                 "domain": a["domain"], "published_at": a["published_at"], "full_text": a["content"]}
+                for j, a in enumerate(http.responder.articles(sentence))
+            ]
+            return pipeline.run(sentence, evidence)
+        return verify
+
+    if name == "enhanced":
+        from src.enhanced_truthlens_pipeline import EnhancedTruthLensPipeline
+        pipeline = EnhancedTruthLensPipeline(news_api_key="offline", guardian_api_key="offline",
+                                             google_api_key="offline")
+        return lambda sentence, i: pipeline.analyze_claim(sentence, max_articles=10)
+
+    raise ValueError(f"Unknown stage: {name}")
+
+
+def run_stage(name: str, sentences: List[str], http: OfflineHTTP) -> Dict[str, Any]:
+    """Load a stage, then time it over every sentence while sampling its RSS."""
+    with RSSSampler() as rss:
+        start = time.perf_counter()
+        try:
+            run_one = build_stage(name, http)
+        except Exception as e:
+            logging.getLogger(__name__).debug(traceback.format_exc())
+            return {"status": "unavailable", "error": f"{type(e).__name__}: {e}"}
+        load_seconds = time.perf_counter() - start
+        rss_loaded = rss.sample()
+
+        latencies: List[float] = []
+        errors = 0
+        start = time.perf_counter()
+        for i, sentence in enumerate(sentences):
+            call_start = time.perf_counter()
+            try:
+                run_one(sentence, i)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - call_start)
+        elapsed = time.perf_counter() - start
+
+    measured = rss.start_mb is not None and rss_loaded is not None
+    return {
+        "status": "ok",
+        "items": len(sentences),
+        "errors": errors,
+        "load_seconds": round(load_seconds, 3),
+        "load_rss_mb": _mb(rss_loaded - rss.start_mb) if measured else None,
+        "peak_rss_mb": _mb(rss.peak_mb),
+        "peak_rss_delta_mb": _mb(rss.peak_mb - rss.start_mb) if measured else None,
+        "throughput_per_sec": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def previous_run(history: Path, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Most recent stored run with the same configuration."""
+    if not history.exists():
+        return None
+    match = None
+    with open(history, encoding='utf-8') as f:
+        for line in f:
+            try:
+                run = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if run.get("config") == config:
+                match = run
+    return match
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Print per-stage changes against the baseline and return regressions."""
+    regressions = []
+    print(f"\nCompared with run {baseline['run_id']} ({baseline.get('git_commit') or 'unknown commit'}):")
+    for stage, result in current["stages"].items():
+        before = baseline["stages"].get(stage, {})
+        if result.get("status") != "ok" or before.get("status") != "ok":
+            continue
+        # Higher is worse for latency, memory growth and load time; lower is worse for throughput.
+        # Memory is compared as the stage's own growth, which earlier stages do not inflate
+        for metric, higher_is_worse in (("p50_ms", True), ("p95_ms", True), ("throughput_per_sec", False),
+                                        ("load_rss_mb", True), ("peak_rss_delta_mb", True),
+                                        ("load_seconds", True)):
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = change > threshold if higher_is_worse else change < -threshold
+            if metric.endswith("_mb") and abs(new - old) < RSS_NOISE_MB:
+                worse = False
+            flag = "  REGRESSION" if worse else ""
+            print(f"  {stage:<17} {metric:<19} {old:>10.2f} -> {new:>10.2f} ({change:+.1%}){flag}")
+            if worse:
+                regressions.append(f"{stage}.{metric}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark of the TruthLens pipeline")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES, help="Stages to run")
+    parser.add_argument("--limit", type=int, default=None, help="Use only the first N sentences")
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES, help="Recorded API fixture file")
+    parser.add_argument("--strict-fixtures", action="store_true",
+                        help="Fail requests without a recording instead of synthesizing a response")
+    parser.add_argument("--record", action="store_true",
+                        help="Call the real APIs and save their responses to --fixtures")
+    parser.add_argument("--freeze", action="store_true",
+                        help="Add the synthesized responses this run serves to --fixtures")
+    parser.add_argument("--heuristic-models", action="store_true",
+                        help="Use the offline heuristic NLI/claim models instead of transformers")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="Run history file (JSON lines)")
+    parser.add_argument("--no-save", action="store_true", help="Do not append this run to the history")
+    parser.add_argument("--fail-on-regression", type=float, default=None, metavar="FRACTION",
+                        help="Exit 1 when a metric is worse than the previous run by more than FRACTION")
+    args = parser.parse_args()
+
+    if args.record and args.freeze:
+        parser.error("--record and --freeze are mutually exclusive")
+    if not args.record:
+        # Models come from the local cache; nothing may reach the network
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+    if args.heuristic_models:
+        os.environ["TRUTHLENS_FORCE_OFFLINE"] = "1"
+        os.environ["TRUTHLENS_DISABLE_ML"] = "1"
+    logging.basicConfig(level=logging.WARNING)
+
+    sentences = load_sentences()
+    if args.limit:
+        sentences = sentences[:args.limit]
+
+    config = {"stages": args.stages, "sentences": len(sentences),
+              "heuristic_models": args.heuristic_models, "fixtures": args.fixtures.name}
+    run = {
+        "run_id": datetime.now().strftime("%Y%m%dT%H%M%S"),
+        "timestamp": datetime.now().isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        "stages": {},
+    }
+
+    print(f"Offline benchmark: {len(sentences)} sentences, stages: {', '.join(args.stages)}")
+    print(f"{'stage':<17} | {'load s':>7} | {'items/s':>8} | {'p50 ms':>9} | {'p95 ms':>9} | "
+          f"{'p99 ms':>9} | {'+RSS MB':>8} | {'errors':>6}")
+    print("-" * 92)
+
+    mode = "record" if args.record else "freeze" if args.freeze else "replay"
+    with OfflineHTTP(args.fixtures, load_sentences(), mode=mode, strict=args.strict_fixtures) as http:
+        for stage in args.stages:
+            result = run_stage(stage, sentences, http)
+            run["stages"][stage] = result
+            if result["status"] != "ok":
+                print(f"{stage:<17} | unavailable: {result['error']}")
+                continue
+            rss_growth = result['peak_rss_delta_mb']
+            rss_growth = f"{rss_growth:>8.1f}" if rss_growth is not None else f"{'n/a':>8}"
+            print(f"{stage:<17} | {result['load_seconds']:>7.2f} | {result['throughput_per_sec']:>8.2f} | "
+                  f"{result['p50_ms']:>9.2f} | {result['p95_ms']:>9.2f} | {result['p99_ms']:>9.2f} | "
+                  f"{rss_growth} | {result['errors']:>6}")
+        run["http"] = http.stats()
+
+    try:
+        from src.utils.tracing import metrics_snapshot
+        run["spans"] = metrics_snapshot()["spans"]
+    except ImportError:
+        run["spans"] = {}
+    print(f"\nHTTP: {run['http']}")
+
+    regressions: List[str] = []
+    baseline = previous_run(args.history, config)
+    if baseline:
+        regressions = compare(run, baseline, args.fail_on_regression or 0.10)
+
+    if not args.no_save and mode == "replay":
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.history, "a", encoding='utf-8') as f:
+            f.write(json.dumps(run) + "\n")
+        print(f"Saved run {run['run_id']} to {args.history}")
+
+    if args.fail_on_regression is not None and regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
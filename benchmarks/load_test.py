@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Serving Load Test
+Drives /verify or /predict with concurrent clients and reports latency
+percentiles, throughput and how many requests admission control shed.
+
+Claims are taken from dataset/groundtruth.csv. Either point the harness at a
+running server or let it start one in-process with uvicorn.
+
+Usage:
+    python benchmarks/load_test.py --url http://localhost:8000 --endpoint /verify
+    python benchmarks/load_test.py --app webapp.truthlens_fastapi:app --endpoint /predict \\
+        --concurrency 1 8 32 --requests 200
+"""
+
+import argparse
+import asyncio
+import csv
+import importlib
+import math
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import aiohttp
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "webapp"))
+
+
+def load_claims() -> List[str]:
+    """Load claims from the ground-truth dataset."""
+    path = project_root / "dataset" / "groundtruth.csv"
+    with open(path, newline='', encoding='utf-8') as f:
+        return [row["Text"] for row in csv.DictReader(f) if len(row.get("Text") or "") >= 10]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def build_payload(endpoint: str, claim: str) -> Dict[str, str]:
+    """Request body for the endpoint under test."""
+    if endpoint.startswith("/predict"):
+        return {"text": claim}
+    return {"claim": claim[:500]}
+
+
+async def run_level(url: str, endpoint: str, claims: List[str], concurrency: int,
+                    total_requests: int, timeout: float) -> Tuple[List[float], Counter, float]:
+    """Send ``total_requests`` requests with ``concurrency`` clients in flight."""
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    next_index = 0
+
+    async def client(session: aiohttp.ClientSession):
+        nonlocal next_index
+        while next_index < total_requests:
+            claim = claims[next_index % len(claims)]
+            next_index += 1
+            start = time.perf_counter()
+            try:
+                async with session.post(url + endpoint, json=build_payload(endpoint, claim)) as response:
+                    await response.read()
+                    statuses[response.status] += 1
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                statuses[type(e).__name__] += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector,
+                                     timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return latencies, statuses, elapsed
+
+
+def start_in_process_server(app_path: str) -> Tuple[str, threading.Thread]:
+    """Start ``module:attr`` with uvicorn on a free port in a background thread."""
+    import uvicorn
+
+    module_name, attr = app_path.split(":")
+    app = getattr(importlib.import_module(module_name), attr)
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}", thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the TruthLens serving endpoints")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Base URL of a running server")
+    target.add_argument("--app", help="ASGI app to start in-process, e.g. webapp.truthlens_fastapi:app")
+    parser.add_argument("--endpoint", default="/verify", help="Endpoint to POST to")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32],
+                        help="Concurrent clients per level")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per level")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    args = parser.parse_args()
+
+    url = args.url.rstrip("/") if args.url else start_in_process_server(args.app)[0]
+    claims = load_claims()
+
+    print(f"Target: {url}{args.endpoint}  ({len(claims)} claims, {args.requests} requests per level)")
+    print(f"{'clients':>7} | {'ok':>5} | {'429':>5} | {'503':>5} | {'other':>5} | "
+          f"{'req/s':>7} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8}")
+    print("-" * 84)
+
+    for concurrency in args.concurrency:
+        latencies, statuses, elapsed = asyncio.run(
+            run_level(url, args.endpoint, claims, concurrency, args.requests, args.timeout)
+        )
+        ok = statuses.get(200, 0)
+        other = sum(statuses.values()) - ok - statuses.get(429, 0) - statuses.get(503, 0)
+        print(f"{concurrency:>7} | {ok:>5} | {statuses.get(429, 0):>5} | {statuses.get(503, 0):>5} | "
+              f"{other:>5} | {ok / elapsed if elapsed else 0:>7.1f} | "
+              f"{percentile(latencies, 50) * 1000:>8.1f} | {percentile(latencies, 95) * 1000:>8.1f} | "
+              f"{percentile(latencies, 99) * 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+"""
+Retrieval and Ranking Micro-Benchmarks
+Measures ops/sec and memory of the retrieval and ranking primitives on
+synthetic corpora of growing size, built from dataset/groundtruth.csv.
+
+Cases:
+    bm25.search               BM25Retriever.search
+    bm25.add                  BM25Retriever.add_documents (batches of --add-batch)
+    dense.search              DenseRetriever.search
+    dense.add                 DenseRetriever.add_documents (batches of --add-batch)
+    vector.search             VectorEvidenceRetriever.search_evidence
+    vector.add                VectorEvidenceRetriever.add_evidence (batches of --add-batch)
+    rrf.fuse                  evidence_selection.rrf_fuse over three rankings
+    calibration.aggregate     confidence_calibrator.aggregate_scores over one claim's evidence
+    evidence.select           EvidenceSelector.select_top_evidence
+    cross_reference.score     SemanticCrossReferenceScorer.calculate_cross_reference_scores
+    semantic_search.cluster   EnhancedSemanticSearch._cluster_articles
+    claims.analyze            EnhancedClaimAnalyzer claim type, search phrases and stance flags of one claim
+    claims.analyze_cold       claims.analyze with the per-claim memo cleared before every call
+
+By default embeddings come from a feature-hashing encoder with the
+SentenceTransformer ``encode`` signature, and cross-encoder scores from
+token overlap, so the numbers measure the data structures rather than model
+inference. ``--real-models`` uses the classes' own models instead.
+
+Memory is reported three ways: the tracemalloc peak while building the
+case's index (Python and NumPy allocations), the RSS growth over the build
+(includes FAISS and other native allocations) and the tracemalloc peak of a
+single operation.
+
+Quadratic cases (cross_reference.score, semantic_search.cluster) and the
+per-call index build in evidence.select are capped at a smaller corpus size;
+larger sizes are reported as skipped unless ``--no-caps`` is given. Even at
+the cap, one cross_reference.score call takes minutes.
+
+Usage:
+    python benchmarks/micro_benchmarks.py
+    python benchmarks/micro_benchmarks.py --sizes 1000 10000 100000 1000000 --cases bm25.search dense.search
+    python benchmarks/micro_benchmarks.py --real-models --sizes 1000 10000 --json benchmarks/results/micro.json
+"""
+
+import argparse
+import atexit
+import csv
+import gc
+import importlib
+import json
+import logging
+import math
+import os
+import random
+import re
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+SOURCES = ["Reuters", "Associated Press", "BBC News", "The New York Times", "NPR",
+           "The Washington Post", "Bloomberg", "Al Jazeera English"]
+DOMAINS = ["reuters.com", "apnews.com", "bbc.co.uk", "nytimes.com", "npr.org",
+           "washingtonpost.com", "bloomberg.com", "aljazeera.com"]
+TOKEN_RE = re.compile(r"\w+")
+
+
+def load_sentences() -> List[str]:
+    """Load benchmark sentences from the ground-truth dataset."""
+    path = project_root / "dataset" / "groundtruth.csv"
+    with open(path, newline='', encoding='utf-8') as f:
+        return [row["Text"] for row in csv.DictReader(f) if row.get("Text")]
+
+
+def build_corpus(sentences: List[str], size: int, seed: int = 13) -> List[Dict[str, Any]]:
+    """Deterministic synthetic news documents of two to five sentences each."""
+    rng = random.Random(seed)
+    docs = []
+    for i in range(size):
+        source = rng.randrange(len(SOURCES))
+        body = " ".join(rng.choice(sentences) for _ in range(rng.randint(2, 5)))
+        docs.append({
+            "id": f"doc_{i}",
+            "title": rng.choice(sentences)[:120],
+            "content": body,
+            "url": f"https://www.{DOMAINS[source]}/news/{i}",
+            "source": SOURCES[source],
+            "domain": DOMAINS[source],
+            "published_at": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00Z",
+            "score": rng.random(),
+        })
+    return docs
+
+
+class HashingEncoder:
+    """Stand-in for ``SentenceTransformer.encode``: L2-normalized feature-hashed bags of words."""
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+        self._buckets: Dict[str, int] = {}
+
+    def encode(self, texts, normalize_embeddings: bool = True, **kwargs) -> np.ndarray:
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in TOKEN_RE.findall((text or "").lower()):
+                bucket = self._buckets.get(token)
+                if bucket is None:
+                    bucket = self._buckets[token] = zlib.crc32(token.encode("utf-8")) % self.dimension
+                vectors[row, bucket] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms > 0, norms, 1.0)
+        return vectors[0] if single else vectors
+
+
+class OverlapCrossEncoder:
+    """Stand-in for ``CrossEncoder.predict``: Jaccard overlap of each pair."""
+
+    def predict(self, pairs, **kwargs) -> np.ndarray:
+        scores = []
+        for query, text in pairs:
+            a, b = set(query.lower().split()), set(text.lower().split())
+            scores.append(len(a & b) / max(1, len(a | b)))
+        return np.array(scores, dtype=np.float32)
+
+
+@contextmanager
+def patched(target: Any, attribute: str, value: Any) -> Iterator[None]:
+    """Temporarily replace an attribute (a module global, a method)."""
+    original = getattr(target, attribute)
+    setattr(target, attribute, value)
+    try:
+        yield
+    finally:
+        setattr(target, attribute, original)
+
+
+@dataclass
+class Case:
+    """One benchmarked operation.
+
+    ``module`` is imported before the build is timed. ``build(docs, queries,
+    options)`` constructs the structure under test (timed and
+    memory-measured) and returns the operation to repeat.
+    """
+    name: str
+    module: str
+    build: Callable[[List[Dict[str, Any]], List[str], argparse.Namespace], Callable[[], Any]]
+    max_size: Optional[int] = None
+
+
+def _workdir() -> Path:
+    """Temporary directory for index and cache files, removed at exit."""
+    path = tempfile.mkdtemp(prefix="truthlens_bench_")
+    atexit.register(shutil.rmtree, path, True)
+    return Path(path)
+
+
+def _cycle(queries: Sequence[str]) -> Callable[[], str]:
+    state = {"i": 0}
+
+    def next_query() -> str:
+        query = queries[state["i"] % len(queries)]
+        state["i"] += 1
+        return query
+    return next_query
+
+
+def _evidence_documents(docs):
+    from src.evidence_retrieval.enhanced_retriever import EvidenceDocument
+    return [EvidenceDocument(id=d["id"], title=d["title"], content=d["content"], url=d["url"],
+                             source=d["source"], domain=d["domain"], published_at=d["published_at"])
+            for d in docs]
+
+
+def build_bm25_search(docs, queries, options):
+    from src.evidence_retrieval.enhanced_retriever import BM25Retriever
+    retriever = BM25Retriever(_evidence_documents(docs))
+    next_query = _cycle(queries)
+    return lambda: retriever.search(next_query(), top_k=options.top_k)
+
+
+def build_bm25_add(docs, queries, options):
+    from src.evidence_retrieval.enhanced_retriever import BM25Retriever
+    retriever = BM25Retriever(_evidence_documents(docs))
+    sentences = load_sentences()
+    state = {"batch": 0}
+
+    def add_batch():
+        batch = build_corpus(sentences, options.add_batch, seed=1000 + state["batch"])
+        retriever.add_documents(_evidence_documents(
+            [dict(d, id=f"add_{state['batch']}_{i}") for i, d in enumerate(batch)]))
+        state["batch"] += 1
+    return add_batch
+
+
+def _dense_retriever(docs, options):
+    from src.evidence_retrieval import enhanced_retriever
+    from src.evidence_retrieval.enhanced_retriever import DenseRetriever
+    if not enhanced_retriever.FAISS_AVAILABLE:
+        raise ImportError("faiss is not installed")
+    documents = _evidence_documents(docs)
+    if options.real_models:
+        retriever = DenseRetriever(documents=documents, use_gpu=False)
+    else:
+        with patched(DenseRetriever, "_initialize", lambda self: None):
+            retriever = DenseRetriever(use_gpu=False)
+        retriever.model = HashingEncoder()
+        retriever.documents = documents
+        retriever._build_index()
+    if retriever.index is None:
+        raise RuntimeError("dense index was not built")
+    return retriever
+
+
+def build_dense_search(docs, queries, options):
+    retriever = _dense_retriever(docs, options)
+    next_query = _cycle(queries)
+    return lambda: retriever.search(next_query(), top_k=options.top_k)
+
+
+def build_dense_add(docs, queries, options):
+    retriever = _dense_retriever(docs, options)
+    sentences = load_sentences()
+    state = {"batch": 0}
+
+    def add_batch():
+        batch = build_corpus(sentences, options.add_batch, seed=1000 + state["batch"])
+        retriever.add_documents(_evidence_documents(
+            [dict(d, id=f"add_{state['batch']}_{i}") for i, d in enumerate(batch)]))
+        state["batch"] += 1
+    return add_batch
+
+
+def _vector_retriever(docs, options):
+    from src.evidence_retrieval import vector_search
+    from src.evidence_retrieval.vector_search import VectorEvidenceRetriever
+
+    workdir = _workdir()
+    paths = {"index_path": workdir / "index.bin", "embeddings_path": workdir / "embeddings.pkl"}
+    if options.real_models:
+        retriever = VectorEvidenceRetriever(**paths)
+    else:
+        with patched(VectorEvidenceRetriever, "_initialize_model", lambda self: None):
+            retriever = VectorEvidenceRetriever(**paths)
+        retriever.model = HashingEncoder(retriever.dimension)
+
+    # The starting index is filled directly; add_evidence is measured on top of it
+    evidence = [_evidence(vector_search, d) for d in docs]
+    embeddings = retriever.model.encode([retriever._evidence_text(e) for e in evidence])
+    retriever.evidence_list = evidence
+    retriever.embeddings = embeddings
+    retriever.index.add(np.asarray(embeddings, dtype="float32"))
+    return retriever
+
+
+def _evidence(vector_search, d: Dict[str, Any], claim_id: str = "bench"):
+    return vector_search.Evidence(id=d["id"], claim_id=claim_id, source_type=vector_search.SourceType.NEWS_ARTICLE,
+                                  url=d["url"], domain=d["domain"], title=d["title"],
+                                  snippet=d["content"][:200], full_text=d["content"])
+
+
+def build_vector_search(docs, queries, options):
+    retriever = _vector_retriever(docs, options)
+    next_query = _cycle(queries)
+    return lambda: retriever.search_evidence(next_query(), top_k=options.top_k)
+
+
+def build_vector_add(docs, queries, options):
+    from src.evidence_retrieval import vector_search
+    retriever = _vector_retriever(docs, options)
+    sentences = load_sentences()
+    state = {"batch": 0}
+
+    def add_batch():
+        batch = build_corpus(sentences, options.add_batch, seed=1000 + state["batch"])
+        items = [_evidence(vector_search, dict(d, id=f"add_{state['batch']}_{i}", url=f"{d['url']}?b={state['batch']}"))
+                 for i, d in enumerate(batch)]
+        state["batch"] += 1
+        if not retriever.add_evidence(items):
+            raise RuntimeError("add_evidence failed")
+    return add_batch
+
+
+def build_rrf_fuse(docs, queries, options):
+    from src.verification.evidence_selection import rrf_fuse
+    ids = [d["id"] for d in docs]
+    rng = random.Random(7)
+    rankings = {}
+    for method in ("dense", "bm25", "keyword"):
+        ranking = list(ids)
+        rng.shuffle(ranking)
+        rankings[method] = ranking
+    return lambda: rrf_fuse(rankings, k=60)
+
+
+def build_calibration(docs, queries, options):
+    from src.verification.confidence_calibrator import aggregate_scores
+    rng = random.Random(5)
+    results = []
+    for d in docs:
+        logits = [rng.uniform(-3, 3) for _ in range(3)]
+        exps = [math.exp(z) for z in logits]
+        results.append({"evidence_id": d["id"], "logits": logits, "probs": [e / sum(exps) for e in exps],
+                        "scores": {"cross": rng.random()}, "domain": d["domain"],
+                        "age_days": rng.uniform(0, 1000), "published_at": d["published_at"]})
+    return lambda: aggregate_scores(results)
+
+
+def build_evidence_select(docs, queries, options):
+    from src.evidence_retrieval.rerank_service import RerankService
+    from src.verification.evidence_selection import EvidenceItem, EvidenceSelector
+    items = [EvidenceItem(id=d["id"], title=d["title"], snippet=d["content"][:300], url=d["url"],
+                          domain=d["domain"], published_at=d["published_at"], full_text=d["content"])
+             for d in docs]
+    next_query = _cycle(queries)
+    if options.real_models:
+        selector = EvidenceSelector()
+        return lambda: selector.select_top_evidence(next_query(), items)
+
+    selector = EvidenceSelector.__new__(EvidenceSelector)
+    selector._offline = False
+    selector.model = HashingEncoder()
+    # Score cache off so every query pays for its cross-encoder pairs
+    selector.reranker = RerankService(cache_size=0, loader=lambda *args: OverlapCrossEncoder())
+    return lambda: selector.select_top_evidence(next_query(), items)
+
+
+def build_cross_reference(docs, queries, options):
+    from src.evidence_retrieval.semantic_cross_reference_scorer import SemanticCrossReferenceScorer
+    articles = [SimpleNamespace(title=d["title"], content=d["content"], url=d["url"], source_name=d["source"])
+                for d in docs]
+    cache_path = _workdir() / "cross_reference.db"
+    if options.real_models:
+        scorer = SemanticCrossReferenceScorer(cache_db_path=str(cache_path))
+    else:
+        with patched(SemanticCrossReferenceScorer, "_initialize_sentence_transformer", lambda self: None):
+            scorer = SemanticCrossReferenceScorer(cache_db_path=str(cache_path))
+        scorer.sentence_transformer = HashingEncoder()
+    # Every call must compute its pairs rather than hit the result cache
+    scorer.cache = None
+    next_query = _cycle(queries)
+    return lambda: scorer.calculate_cross_reference_scores(articles, next_query())
+
+
+def build_cluster(docs, queries, options):
+    from src.evidence_retrieval import enhanced_semantic_search
+    from src.evidence_retrieval.enhanced_semantic_search import EnhancedSemanticSearch
+    from src.utils.document_analysis import document_analysis_scope
+    if options.real_models:
+        search = EnhancedSemanticSearch()
+    else:
+        with patched(enhanced_semantic_search, "SEMANTIC_AVAILABLE", False):
+            search = EnhancedSemanticSearch()
+
+    def cluster():
+        # _cluster_articles annotates its input, so each call gets fresh dicts
+        articles = [{"title": d["title"], "description": d["content"][:200], "content": d["content"],
+                     "url": d["url"], "semantic_score": d["score"]} for d in docs]
+        with document_analysis_scope():
+            return search._cluster_articles(articles)
+    return cluster
+
+
+def _claim_analysis(cold: bool):
+    def build(docs, queries, options):
+        from src import claim_analyzer
+        analyzer = claim_analyzer.EnhancedClaimAnalyzer.__new__(claim_analyzer.EnhancedClaimAnalyzer)
+        # Titles recur across the corpus, as claims do in production traffic
+        next_claim = _cycle([d["title"] for d in docs])
+        clear = getattr(claim_analyzer, "_claim_profile", None)
+
+        def analyze():
+            if cold and clear is not None:
+                clear.cache_clear()
+            claim = next_claim()
+            return (analyzer.classify_claim_type(claim), analyzer.extract_search_phrases(claim),
+                    analyzer._is_causal_claim(claim), analyzer._is_scientific_consensus_claim(claim))
+        return analyze
+    return build
+
+
+CASES = [
+    Case("bm25.search", "src.evidence_retrieval.enhanced_retriever", build_bm25_search),
+    Case("bm25.add", "src.evidence_retrieval.enhanced_retriever", build_bm25_add),
+    Case("dense.search", "src.evidence_retrieval.enhanced_retriever", build_dense_search),
+    Case("dense.add", "src.evidence_retrieval.enhanced_retriever", build_dense_add),
+    Case("vector.search", "src.evidence_retrieval.vector_search", build_vector_search),
+    Case("vector.add", "src.evidence_retrieval.vector_search", build_vector_add),
+    Case("rrf.fuse", "src.verification.evidence_selection", build_rrf_fuse),
+    Case("calibration.aggregate", "src.verification.confidence_calibrator", build_calibration),
+    Case("evidence.select", "src.verification.evidence_selection", build_evidence_select, max_size=100000),
+    Case("cross_reference.score", "src.evidence_retrieval.semantic_cross_reference_scorer", build_cross_reference,
+         max_size=1000),
+    Case("semantic_search.cluster", "src.evidence_retrieval.enhanced_semantic_search", build_cluster,
+         max_size=2000),
+    Case("claims.analyze", "src.claim_analyzer", _claim_analysis(cold=False)),
+    Case("claims.analyze_cold", "src.claim_analyzer", _claim_analysis(cold=True)),
+]
+
+
+def current_rss_mb() -> float:
+    """Current resident set size, falling back to the peak without /proc."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(op: Callable[[], Any], min_time: float, max_iters: int) -> Dict[str, float]:
+    """
+    Time ``op`` after one warm-up call that also records its memory peak.
+
+    Repeats for at least ``min_time`` seconds and three calls, except that an
+    operation slower than ``min_time`` is timed once.
+    """
+    tracemalloc.start()
+    op()
+    _, op_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies: List[float] = []
+    start = time.perf_counter()
+    while True:
+        call_start = time.perf_counter()
+        op()
+        latencies.append(time.perf_counter() - call_start)
+        elapsed = time.perf_counter() - start
+        if len(latencies) >= max_iters or elapsed >= min_time and (len(latencies) >= 3 or latencies[0] >= min_time):
+            break
+    latencies.sort()
+    return {
+        "iterations": len(latencies),
+        "ops_per_sec": round(len(latencies) / elapsed, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+        "op_peak_kb": round(op_peak / 1024, 1),
+    }
+
+
+def run_case(case: Case, docs: List[Dict[str, Any]], queries: List[str],
+             options: argparse.Namespace) -> Dict[str, Any]:
+    """Build one case at one corpus size, then time and memory-profile its operation."""
+    if case.max_size and len(docs) > case.max_size and not options.no_caps:
+        return {"status": "skipped", "error": f"above cap of {case.max_size:,} (use --no-caps)"}
+
+    try:
+        importlib.import_module(case.module)
+    except Exception as e:
+        return {"status": "unavailable", "error": f"{type(e).__name__}: {e}"}
+
+    gc.collect()
+    rss_before = current_rss_mb()
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        op = case.build(docs, queries, options)
+    except Exception as e:
+        tracemalloc.stop()
+        logging.getLogger(__name__).debug("build failed", exc_info=True)
+        return {"status": "unavailable", "error": f"{type(e).__name__}: {e}"}
+    build_seconds = time.perf_counter() - start
+    _, build_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    build_rss = current_rss_mb() - rss_before
+
+    try:
+        timing = measure(op, options.min_time, options.max_iters)
+    except Exception as e:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return {"status": "error", "error": f"{type(e).__name__}: {e}"}
+
+    result = {"status": "ok", "size": len(docs), "build_seconds": round(build_seconds, 3),
+              "build_peak_mb": round(build_peak / (1024 * 1024), 1), "build_rss_mb": round(build_rss, 1)}
+    result.update(timing)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of retrieval and ranking primitives")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Corpus sizes")
+    parser.add_argument("--cases", nargs="+", choices=[c.name for c in CASES], default=[c.name for c in CASES],
+                        help="Cases to run")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds to repeat each operation")
+    parser.add_argument("--max-iters", type=int, default=1000, help="Upper bound on timed repetitions")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per search")
+    parser.add_argument("--add-batch", type=int, default=100, help="Documents per add_evidence call")
+    parser.add_argument("--real-models", action="store_true",
+                        help="Use the classes' own embedding and cross-encoder models")
+    parser.add_argument("--no-caps", action="store_true", help="Run quadratic cases at every size")
+    parser.add_argument("--json", type=Path, default=None, help="Also write results to this file")
+    args = parser.parse_args()
+
+    # Relative config paths (config/calibration.yaml) resolve as they do in the apps
+    os.chdir(project_root)
+    if not args.real_models:
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+    logging.basicConfig(level=logging.ERROR)
+    # Case builds log every index they construct
+    logging.getLogger("src").setLevel(logging.ERROR)
+
+    sentences = load_sentences()
+    queries = random.Random(29).sample(sentences, min(50, len(sentences)))
+    corpus = build_corpus(sentences, max(args.sizes))
+    cases = [c for c in CASES if c.name in args.cases]
+
+    print(f"Micro-benchmarks ({'real models' if args.real_models else 'hashing encoder'}), "
+          f"sizes: {', '.join(f'{s:,}' for s in args.sizes)}")
+    print(f"{'case':<24} | {'size':>9} | {'build s':>8} | {'ops/s':>10} | {'mean ms':>9} | "
+          f"{'build MB':>8} | {'RSS +MB':>8} | {'op KB':>9}")
+    print("-" * 104)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for case in cases:
+        results[case.name] = {}
+        for size in args.sizes:
+            result = run_case(case, corpus[:size], queries, args)
+            results[case.name][str(size)] = result
+            if result["status"] != "ok":
+                print(f"{case.name:<24} | {size:>9,} | {result['status']}: {result['error']}")
+                if result["status"] == "unavailable":
+                    break
+                continue
+            print(f"{case.name:<24} | {size:>9,} | {result['build_seconds']:>8.2f} | "
+                  f"{result['ops_per_sec']:>10.1f} | {result['mean_ms']:>9.3f} | "
+                  f"{result['build_peak_mb']:>8.1f} | {result['build_rss_mb']:>8.1f} | {result['op_peak_kb']:>9.1f}")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w", encoding='utf-8') as f:
+            json.dump({"timestamp": datetime.now().isoformat(), "real_models": args.real_models,
+                       "sizes": args.sizes, "results": results}, f, indent=2)
+        print(f"\nSaved results to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Offline HTTP Fixtures
+Serves NewsAPI, Guardian, Currents, Google Fact Check and Wikipedia responses
+from a fixture file so benchmarks run without network access.
+
+Every ``requests`` call goes through ``HTTPAdapter.send``, which is patched
+while an ``OfflineHTTP`` context is active:
+
+- ``replay`` (default): recorded responses are served by request key;
+  requests without a recording get a deterministic synthetic response built
+  from dataset sentences, shaped like the real API's JSON.
+- ``record``: requests go to the network and responses are saved, so a
+  fixture file can be captured once with real API keys and replayed later.
+- ``freeze``: like ``replay``, but synthesized responses are added to the
+  fixture file, pinning them so later changes to the synthesizer do not
+  change what the benchmark replays.
+
+Fixture files ending in ``.gz`` are read and written gzip-compressed.
+
+Request keys drop API keys and date-window parameters, so recordings stay
+valid on later days.
+
+Usage:
+    with OfflineHTTP("benchmarks/fixtures/api_responses.json.gz", sentences) as http:
+        pipeline.analyze_claim("...")
+    http.stats()        # {"replayed": ..., "synthesized": ..., "recorded": ...}
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import random
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Parameters that identify the caller or the current date rather than the query
+VOLATILE_PARAMS = {"apikey", "api-key", "key", "api_key", "token", "from", "to", "from-date",
+                   "to-date", "start_date", "end_date"}
+# Parameters that carry the search text, per API
+QUERY_PARAMS = ("q", "query", "keywords", "srsearch")
+
+SOURCES = ["Reuters", "Associated Press", "BBC News", "The New York Times", "NPR",
+           "The Washington Post", "Bloomberg", "Al Jazeera English"]
+DOMAINS = ["reuters.com", "apnews.com", "bbc.co.uk", "nytimes.com", "npr.org",
+           "washingtonpost.com", "bloomberg.com", "aljazeera.com"]
+RATINGS = ["False", "Mostly False", "Half True", "Mostly True", "True", "Misleading"]
+
+
+def request_key(method: str, url: str, body: Optional[bytes] = None) -> str:
+    """Stable fixture key for a request."""
+    parts = urlsplit(url)
+    params = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                    if k.lower() not in VOLATILE_PARAMS)
+    key = f"{method.upper()} {parts.netloc}{parts.path}"
+    if params:
+        key += "?" + "&".join(f"{k}={v}" for k, v in params)
+    if body:
+        key += " #" + hashlib.sha1(body).hexdigest()[:12]
+    return key
+
+
+def _query_text(url: str) -> str:
+    params = dict(parse_qsl(urlsplit(url).query))
+    for name in QUERY_PARAMS:
+        if params.get(name):
+            return params[name]
+    return urlsplit(url).path.rsplit("/", 1)[-1]
+
+
+class SyntheticResponder:
+    """Builds API-shaped JSON for a query from dataset sentences."""
+
+    def __init__(self, sentences: List[str], articles_per_query: int = 10, fact_check_rate: float = 0.3):
+        self.sentences = sentences or ["No content available."]
+        self.articles_per_query = articles_per_query
+        self.fact_check_rate = fact_check_rate
+
+    def _rng(self, query: str) -> random.Random:
+        return random.Random(int(hashlib.sha1(query.encode("utf-8")).hexdigest()[:12], 16))
+
+    def articles(self, query: str, count: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Deterministic articles for a query; the first ones restate it."""
+        rng = self._rng(query)
+        count = count or self.articles_per_query
+        articles = []
+        for i in range(count):
+            source = rng.randrange(len(SOURCES))
+            body = [rng.choice(self.sentences) for _ in range(rng.randint(3, 8))]
+            if i < count // 2:
+                body.insert(rng.randint(0, len(body)), query)
+            slug = hashlib.sha1(f"{query}|{i}".encode("utf-8")).hexdigest()[:10]
+            articles.append({
+                "title": query if i == 0 else rng.choice(self.sentences),
+                "description": " ".join(body[:2]),
+                "content": " ".join(body),
+                "url": f"https://www.{DOMAINS[source]}/news/{slug}",
+                "source": SOURCES[source],
+                "domain": DOMAINS[source],
+                "published_at": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00Z",
+            })
+        return articles
+
+    def respond(self, method: str, url: str) -> Dict[str, Any]:
+        """Status code and body for a request without a recording."""
+        parts = urlsplit(url)
+        host, path = parts.netloc, parts.path
+        query = _query_text(url)
+
+        if host.endswith("newsapi.org"):
+            items = self.articles(query)
+            return self._json({"status": "ok", "totalResults": len(items), "articles": [
+                {"source": {"id": None, "name": a["source"]}, "author": None, "title": a["title"],
+                 "description": a["description"], "url": a["url"], "publishedAt": a["published_at"],
+                 "content": a["content"]} for a in items]})
+
+        if host.endswith("guardianapis.com"):
+            items = self.articles(query)
+            return self._json({"response": {"status": "ok", "total": len(items), "results": [
+                {"id": a["url"].rsplit("/", 1)[-1], "webTitle": a["title"], "webUrl": a["url"],
+                 "webPublicationDate": a["published_at"], "sectionName": "World news",
+                 "fields": {"headline": a["title"], "bodyText": a["content"]}, "tags": []}
+                for a in items]}})
+
+        if host.endswith("currentsapi.services"):
+            items = self.articles(query)
+            return self._json({"status": "ok", "news": [
+                {"title": a["title"], "description": a["description"], "url": a["url"],
+                 "author": a["source"], "published": a["published_at"].replace("T", " ").rstrip("Z"),
+                 "language": "en", "category": ["general"]} for a in items]})
+
+        if host.endswith("factchecktools.googleapis.com"):
+            rng = self._rng(query)
+            claims = []
+            if rng.random() < self.fact_check_rate:
+                claims.append({"text": query, "claimant": "Social media", "claimReview": [{
+                    "publisher": {"name": "PolitiFact", "site": "politifact.com"},
+                    "url": f"https://www.politifact.com/factchecks/{rng.randrange(10 ** 6)}/",
+                    "title": query, "textualRating": rng.choice(RATINGS),
+                    "reviewDate": "2024-03-01T00:00:00Z", "languageCode": "en"}]})
+            return self._json({"claims": claims} if claims else {})
+
+        if host.endswith("wikipedia.org") and path.endswith("api.php"):
+            params = dict(parse_qsl(parts.query))
+            if params.get("list") == "search":
+                rng = self._rng(query)
+                return self._json({"query": {"search": [
+                    {"pageid": rng.randrange(10 ** 7), "title": rng.choice(self.sentences)[:60],
+                     "snippet": rng.choice(self.sentences)} for _ in range(5)]}})
+            page_id = params.get("pageids", "0")
+            rng = self._rng(page_id)
+            return self._json({"query": {"pages": {page_id: {
+                "pageid": int(page_id) if page_id.isdigit() else 0, "title": rng.choice(self.sentences)[:60],
+                "extract": " ".join(rng.choice(self.sentences) for _ in range(6))}}}})
+
+        if host.endswith("wikipedia.org"):
+            rng = self._rng(path)
+            return self._json({"title": path.rsplit("/", 1)[-1].replace("_", " "),
+                               "extract": " ".join(rng.choice(self.sentences) for _ in range(4)),
+                               "content_urls": {"desktop": {"page": f"https://en.wikipedia.org/wiki/{path.rsplit('/', 1)[-1]}"}}})
+
+        # Fact-check and news HTML pages: an empty page parses to no results
+        return {"status": 200, "content_type": "text/html; charset=utf-8",
+                "body": "<html><head><title>Search</title></head><body></body></html>"}
+
+    @staticmethod
+    def _json(payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {"status": 200, "content_type": "application/json", "body": json.dumps(payload)}
+
+
+class OfflineHTTP:
+    """Context manager that routes every ``requests`` call through fixtures."""
+
+    def __init__(self, fixtures_path: Optional[Path], sentences: List[str], mode: str = "replay",
+                 strict: bool = False):
+        """
+        Initialize the fixture layer.
+
+        Args:
+            fixtures_path: JSON fixture file; None to only synthesize
+            sentences: Sentences used to synthesize missing responses
+            mode: "replay", "record" or "freeze"
+            strict: In replay mode, fail requests without a recording instead of synthesizing
+        """
+        if mode not in ("replay", "record", "freeze"):
+            raise ValueError("mode must be 'replay', 'record' or 'freeze'")
+        self.fixtures_path = Path(fixtures_path) if fixtures_path else None
+        self.mode = mode
+        self.strict = strict
+        self.responder = SyntheticResponder(sentences)
+        self.fixtures: Dict[str, Dict[str, Any]] = {}
+        if self.fixtures_path and self.fixtures_path.exists():
+            with self._open(self.fixtures_path, "rt") as f:
+                self.fixtures = json.load(f)
+
+        self._lock = threading.Lock()
+        self._counts = {"replayed": 0, "synthesized": 0, "recorded": 0, "missing": 0}
+        self._original_send = None
+
+    def __enter__(self) -> "OfflineHTTP":
+        self._original_send = HTTPAdapter.send
+        layer = self
+
+        def send(adapter, request, **kwargs):
+            return layer._send(adapter, request, **kwargs)
+
+        HTTPAdapter.send = send
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        HTTPAdapter.send = self._original_send
+        if self.mode in ("record", "freeze") and self.fixtures_path:
+            self.save()
+        return False
+
+    def _send(self, adapter, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        body = request.body.encode("utf-8") if isinstance(request.body, str) else request.body
+        key = request_key(request.method, request.url, body)
+
+        if self.mode == "record":
+            response = self._original_send(adapter, request, **kwargs)
+            with self._lock:
+                self.fixtures[key] = {"status": response.status_code,
+                                      "content_type": response.headers.get("Content-Type", ""),
+                                      "body": response.text}
+                self._counts["recorded"] += 1
+            return response
+
+        with self._lock:
+            recorded = self.fixtures.get(key)
+        if recorded is not None:
+            self._count("replayed")
+            return self._build_response(request, recorded)
+        if self.strict:
+            self._count("missing")
+            raise requests.ConnectionError(f"No recorded fixture for {key}", request=request)
+        synthesized = self.responder.respond(request.method, request.url)
+        with self._lock:
+            self._counts["synthesized"] += 1
+            if self.mode == "freeze":
+                self.fixtures[key] = synthesized
+        return self._build_response(request, synthesized)
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    @staticmethod
+    def _build_response(request: requests.PreparedRequest, fixture: Dict[str, Any]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = fixture["status"]
+        response.reason = "OK" if fixture["status"] < 400 else "Error"
+        response._content = fixture["body"].encode("utf-8")
+        response.headers = CaseInsensitiveDict({"Content-Type": fixture.get("content_type", "")})
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    @staticmethod
+    def _open(path: Path, mode: str):
+        if path.suffix == ".gz":
+            # mtime=0 keeps the compressed bytes identical for identical fixtures
+            raw = gzip.GzipFile(path, mode.replace("t", "b"), mtime=0)
+            return io.TextIOWrapper(raw, encoding="utf-8")
+        return open(path, mode, encoding="utf-8")
+
+    def save(self):
+        """Write recorded fixtures to the fixture file."""
+        self.fixtures_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._open(self.fixtures_path, "wt") as f:
+            json.dump(self.fixtures, f, indent=1, sort_keys=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Requests served per source."""
+        with self._lock:
+            return dict(self._counts, fixtures=len(self.fixtures))
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable, List, Sequence, Tuple
 import os
@@ -249,7 +250,9 @@ def _tiny_bootstrap_dataset() -> List[FineTuneExample]:
 	]
 
 
+@lru_cache(maxsize=1)
 def _ensure_finetuned_model():
+	"""Load (or bootstrap) the claim model once per process."""
 	try:
 		from transformers import AutoModelForSequenceClassification, AutoTokenizer  # type: ignore
 	except Exception:
@@ -273,6 +276,11 @@ def _ensure_finetuned_model():
 	)
 
 
+def warm_up() -> None:
+	"""Load the claim model and run one dummy forward pass."""
+	is_claim("The unemployment rate fell to 3.5 percent last year.")
+
+
 def is_claim(sentence: str, threshold: float = 0.4) -> Tuple[bool, float]:
 	"""Predict whether a sentence is a factual claim.
 
@@ -0,0 +1,47 @@
+"""
+Gunicorn configuration for multi-worker TruthLens deployments.
+
+Models are loaded and warmed once in the master (``preload_app``) and shared
+copy-on-write by the forked uvicorn workers; see src/utils/prefork.py.
+
+Usage:
+    gunicorn app:app -c gunicorn.conf.py
+    TRUTHLENS_WORKERS=4 gunicorn webapp.truthlens_fastapi:app -c gunicorn.conf.py
+"""
+
+import os
+import sys
+
+# Must be set before the app module is imported by the master
+os.environ.setdefault("TRUTHLENS_PREFORK", "1")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils.prefork import after_fork, memory_report, worker_memory_reports
+
+bind = os.environ.get("TRUTHLENS_BIND", f"0.0.0.0:{os.environ.get('PORT', 8000)}")
+workers = int(os.environ.get("TRUTHLENS_WORKERS", 2))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.environ["TRUTHLENS_PREFORK"] == "1"
+# Model loading in the master can take minutes
+timeout = int(os.environ.get("TRUTHLENS_WORKER_TIMEOUT", 300))
+
+
+def post_fork(server, worker):
+    after_fork()
+
+
+def post_worker_init(worker):
+    report = memory_report()
+    worker.log.info(f"Worker {report['pid']} memory: {report.get('shared_mb', 0):.0f} MB shared, "
+                    f"{report.get('private_mb', 0):.0f} MB private")
+
+
+def when_ready(server):
+    report = memory_report()
+    server.log.info(f"Master memory after preload: {report.get('rss_mb', 0):.0f} MB RSS")
+
+
+def worker_exit(server, worker):
+    for report in worker_memory_reports(server.pid):
+        server.log.info(f"Worker {report['pid']} memory: {report.get('shared_mb', 0):.0f} MB shared, "
+                        f"{report.get('private_mb', 0):.0f} MB private, {report.get('pss_mb', 0):.0f} MB PSS")
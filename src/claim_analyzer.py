@@ -7,11 +7,13 @@ Uses News API with semantic search, improved stance detection, and better verdic
 import re
 import time
 import hashlib
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from dataclasses import dataclass
 import logging
 from datetime import datetime, timedelta
 from collections import defaultdict
+from functools import lru_cache
+from itertools import chain
 
 # Import required components
 try:
@@ -33,8 +35,156 @@ except ImportError:
     logging.warning("Sentence transformers not available, falling back to keyword search")
     SEMANTIC_SEARCH_AVAILABLE = False
 
+from src.utils.document_analysis import analyze_text
+
 logger = logging.getLogger(__name__)
 
+# Distinct claims whose analysis is memoized
+CLAIM_CACHE_SIZE = 4096
+MAX_SEARCH_PHRASES = 5
+
+# Claim types in precedence order, matched against the lowercased claim
+CLAIM_TYPE_PATTERNS = (
+    ("causal", re.compile(r'\b(?:causes?|caused|leads?\s+to|led\s+to|results?\s+in|trigger(?:s|ed)?|'
+                          r'creates?|produces?|generates?|induces?)\b')),
+    ("prediction", re.compile(r'\b(?:will|going\s+to|gonna|would|could|might|may|shall|expected|forecast)\b')),
+    ("opinion", re.compile(r'\b(?:believe|think|feel|opinion|view|seem|appear|look\s+like|sound\s+like)\b')),
+    ("factual", re.compile(r'\b(?:is|are|was|were|has|have|contains?|consists?\s+of|comprises?|amounts?\s+to)\b')),
+)
+
+# Subject/object patterns per claim type; other types fall back to n-grams
+PHRASE_PATTERNS = {
+    "causal": (
+        re.compile(r'(\w+(?:\s+\w+){0,3})\s+(?:causes?|caused|leads?\s+to|led\s+to|results?\s+in)\s+(\w+(?:\s+\w+){0,3})', re.IGNORECASE),
+        re.compile(r'(\w+(?:\s+\w+){0,3})\s+(?:trigger(?:s|ed)?|creates?|produces?|generates?)\s+(\w+(?:\s+\w+){0,3})', re.IGNORECASE),
+    ),
+    "factual": (
+        re.compile(r'(\w+(?:\s+\w+){0,3})\s+(?:is|are|was|were|has|have)\s+(\w+(?:\s+\w+){0,3})', re.IGNORECASE),
+        re.compile(r'(\w+(?:\s+\w+){0,3})\s+(?:contains?|consists?\s+of|comprises?)\s+(\w+(?:\s+\w+){0,3})', re.IGNORECASE),
+    ),
+    "prediction": (
+        re.compile(r'(\w+(?:\s+\w+){0,3})\s+(?:will|going\s+to|gonna|would|could)\s+(\w+(?:\s+\w+){0,3})', re.IGNORECASE),
+        re.compile(r'(\w+(?:\s+\w+){0,3})\s+(?:expected|forecast|predicted)\s+(\w+(?:\s+\w+){0,3})', re.IGNORECASE),
+    ),
+}
+
+ENTITY_PATTERNS = (
+    # Proper nouns (capitalized words)
+    re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b'),
+    # Numbers and measurements
+    re.compile(r'\b\d+(?:\.\d+)?(?:\s*(?:percent|%|million|billion|thousand))?\b', re.IGNORECASE),
+    # Specific terms (diseases, technologies, etc.)
+    re.compile(r'\b(?:covid|coronavirus|vaccine|5g|ai|artificial\s+intelligence|climate\s+change|global\s+warming)\b',
+               re.IGNORECASE),
+)
+
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
+    'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had',
+    'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can',
+    'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they',
+    'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his', 'its', 'our', 'their',
+    'very', 'really', 'quite', 'just', 'only', 'even', 'still', 'also', 'too', 'as',
+    'so', 'than', 'more', 'most', 'less', 'least', 'much', 'many', 'few', 'several'
+})
+
+CAUSAL_WORDS = ('causes', 'caused', 'leads to', 'led to', 'results in', 'resulted in')
+
+# Topics with strong scientific consensus
+CONSENSUS_TOPICS = (
+    'vaccine autism', 'vaccines cause autism', 'vaccine autism link',
+    'earth flat', 'earth is flat', 'flat earth',
+    'climate change hoax', 'global warming hoax', 'climate change fake',
+    '5g coronavirus', '5g covid', '5g causes coronavirus',
+    'moon landing fake', 'moon landing hoax'
+)
+
+# Related keywords for common effects
+RELATED_KEYWORDS = {
+    'destruction': ('damage', 'devastation', 'loss', 'destruction', 'wreckage', 'ruin'),
+    'deaths': ('death', 'casualty', 'fatality', 'killed', 'died', 'victim'),
+    'floods': ('flooding', 'water', 'inundation', 'submerged', 'overflow'),
+    'autism': ('autism', 'autistic', 'developmental disorder'),
+    'jobs': ('employment', 'work', 'career', 'job loss', 'unemployment'),
+    'weather': ('storm', 'rain', 'wind', 'temperature', 'climate'),
+}
+
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_CAUSAL_WORDS_RE = re.compile('|'.join(re.escape(word) for word in CAUSAL_WORDS))
+_CONSENSUS_TOPICS_RE = re.compile('|'.join(re.escape(topic) for topic in CONSENSUS_TOPICS))
+
+
+@dataclass(frozen=True)
+class ClaimProfile:
+    """Text-only analysis of a claim, shared by every lookup of the same claim."""
+    claim_type: str
+    phrases: Tuple[str, ...]
+    is_causal: bool
+    is_consensus: bool
+
+
+def _normalize_claim(claim: str) -> str:
+    return ' '.join(claim.split())
+
+
+def _pattern_phrases(claim: str, patterns) -> Iterator[str]:
+    for pattern in patterns:
+        for match in pattern.finditer(claim):
+            subject = match.group(1).strip()
+            obj = match.group(2).strip()
+            yield subject
+            yield obj
+            yield f"{subject} {obj}"
+
+
+def _ngram_phrases(words: List[str]) -> Iterator[str]:
+    # 2-4 word combinations, shortest first
+    for n in range(2, min(5, len(words) + 1)):
+        for i in range(len(words) - n + 1):
+            yield ' '.join(words[i:i + n])
+
+
+def _key_entities(claim: str) -> Iterator[str]:
+    for pattern in ENTITY_PATTERNS:
+        yield from pattern.findall(claim)
+
+
+@lru_cache(maxsize=CLAIM_CACHE_SIZE)
+def _claim_profile(claim: str) -> ClaimProfile:
+    """
+    Analyze a whitespace-normalized claim.
+
+    Search phrases are generated lazily and deduplicated in one pass, so
+    extraction stops at the first MAX_SEARCH_PHRASES distinct phrases.
+    """
+    claim_lower = claim.lower()
+    claim_type = next((name for name, pattern in CLAIM_TYPE_PATTERNS if pattern.search(claim_lower)), "general")
+
+    patterns = PHRASE_PATTERNS.get(claim_type)
+    if patterns:
+        candidates = _pattern_phrases(claim, patterns)
+    else:
+        words = [word for word in _NON_WORD_RE.sub(' ', claim).split()
+                 if len(word) > 2 and word.lower() not in STOP_WORDS]
+        candidates = _ngram_phrases(words)
+    # The original claim is a phrase too if it's not too long
+    whole = (claim,) if len(claim.split()) <= 8 else ()
+
+    phrases = []
+    seen = set()
+    for phrase in chain(candidates, _key_entities(claim), whole):
+        phrase_lower = phrase.lower().strip()
+        if phrase_lower not in seen and len(phrase_lower) > 3:
+            seen.add(phrase_lower)
+            phrases.append(phrase)
+            if len(phrases) == MAX_SEARCH_PHRASES:
+                break
+
+    return ClaimProfile(claim_type=claim_type, phrases=tuple(phrases),
+                        is_causal=_CAUSAL_WORDS_RE.search(claim_lower) is not None,
+                        is_consensus=_CONSENSUS_TOPICS_RE.search(claim_lower) is not None)
+
+
 @dataclass
 class ConfidenceBadge:
     """Confidence badge with color coding."""
@@ -139,206 +289,14 @@ class EnhancedClaimAnalyzer:
     
     def classify_claim_type(self, claim: str) -> str:
         """Classify the type of claim for better search strategies."""
-        claim_lower = claim.lower()
-        
-        # Causal claims
-        causal_patterns = [
-            r'\bcauses?\b', r'\bcaused\b', r'\bleads?\s+to\b', r'\bled\s+to\b',
-            r'\bresults?\s+in\b', r'\btrigger(s|ed)?\b', r'\bcreates?\b',
-            r'\bproduces?\b', r'\bgenerates?\b', r'\binduces?\b'
-        ]
-        
-        # Factual claims
-        factual_patterns = [
-            r'\bis\b', r'\bare\b', r'\bwas\b', r'\bwere\b', r'\bhas\b', r'\bhave\b',
-            r'\bcontains?\b', r'\bconsists?\s+of\b', r'\bcomprises?\b', r'\bamounts?\s+to\b'
-        ]
-        
-        # Prediction claims
-        prediction_patterns = [
-            r'\bwill\b', r'\bgoing\s+to\b', r'\bgonna\b', r'\bwould\b', r'\bcould\b',
-            r'\bmight\b', r'\bmay\b', r'\bshall\b', r'\bexpected\b', r'\bforecast\b'
-        ]
-        
-        # Opinion indicators
-        opinion_patterns = [
-            r'\bbelieve\b', r'\bthink\b', r'\bfeel\b', r'\bopinion\b', r'\bview\b',
-            r'\bseem\b', r'\bappear\b', r'\blook\s+like\b', r'\bsound\s+like\b'
-        ]
-        
-        # Count matches
-        causal_count = sum(1 for pattern in causal_patterns if re.search(pattern, claim_lower))
-        factual_count = sum(1 for pattern in factual_patterns if re.search(pattern, claim_lower))
-        prediction_count = sum(1 for pattern in prediction_patterns if re.search(pattern, claim_lower))
-        opinion_count = sum(1 for pattern in opinion_patterns if re.search(pattern, claim_lower))
-        
-        # Determine claim type
-        if causal_count > 0:
-            return "causal"
-        elif prediction_count > 0:
-            return "prediction"
-        elif opinion_count > 0:
-            return "opinion"
-        elif factual_count > 0:
-            return "factual"
-        else:
-            return "general"
+        return _claim_profile(_normalize_claim(claim)).claim_type
     
     def extract_search_phrases(self, claim: str) -> List[str]:
         """
         Extract meaningful phrases from a claim for News API search.
         Uses advanced NLP techniques and News API best practices.
         """
-        claim_type = self.classify_claim_type(claim)
-        
-        # Clean the claim
-        claim_clean = re.sub(r'[^\w\s]', ' ', claim)
-        words = claim_clean.split()
-        
-        # Remove common stop words
-        stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
-            'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had',
-            'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can',
-            'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they',
-            'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his', 'her', 'its', 'our', 'their',
-            'very', 'really', 'quite', 'just', 'only', 'even', 'still', 'also', 'too', 'as',
-            'so', 'than', 'more', 'most', 'less', 'least', 'much', 'many', 'few', 'several'
-        }
-        
-        # Filter out stop words and short words
-        meaningful_words = [word for word in words if word.lower() not in stop_words and len(word) > 2]
-        
-        # Create phrases based on claim type
-        phrases = []
-        
-        if claim_type == "causal":
-            # For causal claims, focus on the cause and effect
-            phrases = self._extract_causal_phrases(claim, meaningful_words)
-        elif claim_type == "factual":
-            # For factual claims, focus on the main entities and facts
-            phrases = self._extract_factual_phrases(claim, meaningful_words)
-        elif claim_type == "prediction":
-            # For predictions, focus on the subject and predicted outcome
-            phrases = self._extract_prediction_phrases(claim, meaningful_words)
-        else:
-            # General approach: create n-grams and key phrases
-            phrases = self._extract_general_phrases(claim, meaningful_words)
-        
-        # Add the original claim as a phrase if it's not too long
-        if len(claim.split()) <= 8:
-            phrases.append(claim)
-        
-        # Remove duplicates and limit to top phrases
-        unique_phrases = []
-        seen = set()
-        for phrase in phrases:
-            phrase_lower = phrase.lower().strip()
-            if phrase_lower not in seen and len(phrase_lower) > 3:
-                seen.add(phrase_lower)
-                unique_phrases.append(phrase)
-        
-        return unique_phrases[:5]  # Limit to top 5 phrases
-    
-    def _extract_causal_phrases(self, claim: str, words: List[str]) -> List[str]:
-        """Extract phrases for causal claims."""
-        phrases = []
-        
-        # Look for cause-effect patterns
-        causal_patterns = [
-            r'(\w+(?:\s+\w+){0,3})\s+(?:causes?|caused|leads?\s+to|led\s+to|results?\s+in)\s+(\w+(?:\s+\w+){0,3})',
-            r'(\w+(?:\s+\w+){0,3})\s+(?:trigger(s|ed)?|creates?|produces?|generates?)\s+(\w+(?:\s+\w+){0,3})',
-        ]
-        
-        for pattern in causal_patterns:
-            matches = re.finditer(pattern, claim, re.IGNORECASE)
-            for match in matches:
-                cause = match.group(1).strip()
-                effect = match.group(2).strip()
-                phrases.extend([cause, effect, f"{cause} {effect}"])
-        
-        # Add key entities
-        phrases.extend(self._extract_key_entities(claim, words))
-        
-        return phrases
-    
-    def _extract_factual_phrases(self, claim: str, words: List[str]) -> List[str]:
-        """Extract phrases for factual claims."""
-        phrases = []
-        
-        # Look for factual patterns
-        factual_patterns = [
-            r'(\w+(?:\s+\w+){0,3})\s+(?:is|are|was|were|has|have)\s+(\w+(?:\s+\w+){0,3})',
-            r'(\w+(?:\s+\w+){0,3})\s+(?:contains?|consists?\s+of|comprises?)\s+(\w+(?:\s+\w+){0,3})',
-        ]
-        
-        for pattern in factual_patterns:
-            matches = re.finditer(pattern, claim, re.IGNORECASE)
-            for match in matches:
-                subject = match.group(1).strip()
-                predicate = match.group(2).strip()
-                phrases.extend([subject, predicate, f"{subject} {predicate}"])
-        
-        # Add key entities
-        phrases.extend(self._extract_key_entities(claim, words))
-        
-        return phrases
-    
-    def _extract_prediction_phrases(self, claim: str, words: List[str]) -> List[str]:
-        """Extract phrases for prediction claims."""
-        phrases = []
-        
-        # Look for prediction patterns
-        prediction_patterns = [
-            r'(\w+(?:\s+\w+){0,3})\s+(?:will|going\s+to|gonna|would|could)\s+(\w+(?:\s+\w+){0,3})',
-            r'(\w+(?:\s+\w+){0,3})\s+(?:expected|forecast|predicted)\s+(\w+(?:\s+\w+){0,3})',
-        ]
-        
-        for pattern in prediction_patterns:
-            matches = re.finditer(pattern, claim, re.IGNORECASE)
-            for match in matches:
-                subject = match.group(1).strip()
-                prediction = match.group(2).strip()
-                phrases.extend([subject, prediction, f"{subject} {prediction}"])
-        
-        # Add key entities
-        phrases.extend(self._extract_key_entities(claim, words))
-        
-        return phrases
-    
-    def _extract_general_phrases(self, claim: str, words: List[str]) -> List[str]:
-        """Extract general phrases using n-grams and key entities."""
-        phrases = []
-        
-        # Create n-grams (2-4 word combinations)
-        for n in range(2, min(5, len(words) + 1)):
-            for i in range(len(words) - n + 1):
-                phrase = ' '.join(words[i:i+n])
-                if len(phrase) > 3:
-                    phrases.append(phrase)
-        
-        # Add key entities
-        phrases.extend(self._extract_key_entities(claim, words))
-        
-        return phrases
-    
-    def _extract_key_entities(self, claim: str, words: List[str]) -> List[str]:
-        """Extract key entities from the claim."""
-        entities = []
-        
-        # Look for proper nouns (capitalized words)
-        proper_nouns = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', claim)
-        entities.extend(proper_nouns)
-        
-        # Look for numbers and measurements
-        numbers = re.findall(r'\b\d+(?:\.\d+)?(?:\s*(?:percent|%|million|billion|thousand))?\b', claim, re.IGNORECASE)
-        entities.extend(numbers)
-        
-        # Look for specific terms (diseases, technologies, etc.)
-        specific_terms = re.findall(r'\b(?:covid|coronavirus|vaccine|5g|ai|artificial\s+intelligence|climate\s+change|global\s+warming)\b', claim, re.IGNORECASE)
-        entities.extend(specific_terms)
-        
-        return entities
+        return list(_claim_profile(_normalize_claim(claim)).phrases)
     
     def search_news_with_semantic_ranking(self, claim: str, phrases: List[str], max_articles: int = 20) -> List[Dict[str, Any]]:
         """
@@ -554,8 +512,7 @@ class EnhancedClaimAnalyzer:
     
     def _is_causal_claim(self, claim: str) -> bool:
         """Check if claim is causal."""
-        causal_words = ['causes', 'caused', 'leads to', 'led to', 'results in', 'resulted in']
-        return any(word in claim.lower() for word in causal_words)
+        return _claim_profile(_normalize_claim(claim)).is_causal
     
     def _analyze_causal_stance(self, claim: str, article_text: str) -> Tuple[str, float, List[str]]:
         """
@@ -587,13 +544,8 @@ class EnhancedClaimAnalyzer:
     
     def _extract_cause_effect(self, claim: str) -> Optional[Tuple[str, str]]:
         """Extract cause and effect from a causal claim."""
-        patterns = [
-            r'(\w+(?:\s+\w+){0,3})\s+(?:causes?|caused|leads?\s+to|led\s+to|results?\s+in)\s+(\w+(?:\s+\w+){0,3})',
-            r'(\w+(?:\s+\w+){0,3})\s+(?:trigger(s|ed)?|creates?|produces?|generates?)\s+(\w+(?:\s+\w+){0,3})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, claim, re.IGNORECASE)
+        for pattern in PHRASE_PATTERNS["causal"]:
+            match = pattern.search(claim)
             if match:
                 return match.group(1).strip(), match.group(2).strip()
         
@@ -623,20 +575,9 @@ class EnhancedClaimAnalyzer:
     def _get_related_keywords(self, concept: str) -> List[str]:
         """Get related keywords for a concept."""
         concept_lower = concept.lower()
-        
-        # Define related keywords for common effects
-        related_keywords = {
-            'destruction': ['damage', 'devastation', 'loss', 'destruction', 'wreckage', 'ruin'],
-            'deaths': ['death', 'casualty', 'fatality', 'killed', 'died', 'victim'],
-            'floods': ['flooding', 'water', 'inundation', 'submerged', 'overflow'],
-            'autism': ['autism', 'autistic', 'developmental disorder'],
-            'jobs': ['employment', 'work', 'career', 'job loss', 'unemployment'],
-            'weather': ['storm', 'rain', 'wind', 'temperature', 'climate'],
-        }
-        
-        for key, keywords in related_keywords.items():
+        for key, keywords in RELATED_KEYWORDS.items():
             if key in concept_lower:
-                return keywords
+                return list(keywords)
         
         return []
     
@@ -671,12 +612,11 @@ class EnhancedClaimAnalyzer:
     
     def _extract_evidence_sentences(self, text: str, keyword: str) -> List[str]:
         """Extract sentences containing the keyword as evidence."""
-        sentences = re.split(r'[.!?]+', text)
         evidence_sentences = []
         
-        for sentence in sentences:
-            if keyword in sentence.lower() and len(sentence.strip()) > 10:
-                evidence_sentences.append(sentence.strip())
+        for sentence in analyze_text(text).sentences:
+            if keyword in sentence.lower and len(sentence.text) > 10:
+                evidence_sentences.append(sentence.text)
         
         return evidence_sentences[:2]  # Limit to top 2 evidence sentences
     
@@ -765,18 +705,7 @@ class EnhancedClaimAnalyzer:
     
     def _is_scientific_consensus_claim(self, claim: str) -> bool:
         """Check if claim is about a topic with strong scientific consensus."""
-        claim_lower = claim.lower()
-        
-        # Scientific consensus topics
-        consensus_topics = [
-            'vaccine autism', 'vaccines cause autism', 'vaccine autism link',
-            'earth flat', 'earth is flat', 'flat earth',
-            'climate change hoax', 'global warming hoax', 'climate change fake',
-            '5g coronavirus', '5g covid', '5g causes coronavirus',
-            'moon landing fake', 'moon landing hoax'
-        ]
-        
-        return any(topic in claim_lower for topic in consensus_topics)
+        return _claim_profile(_normalize_claim(claim)).is_consensus
     
     def _handle_scientific_consensus_claim(self, claim: str, support_percentage: float, 
                                          contradict_percentage: float, 
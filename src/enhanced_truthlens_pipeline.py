@@ -4,12 +4,25 @@ Enhanced TruthLens Pipeline
 Comprehensive integration of all improvements for better fact-checking accuracy.
 """
 
+import contextvars
+import copy
 import logging
+import os
+import threading
 import time
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+import heapq
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Callable, Collection, Iterator, Optional, Set, Tuple
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 
+from src.evidence_retrieval.rerank_service import overlap_scores
+from src.utils.tracing import span, trace_request, traced
+from src.verification.calibration_config import config_version
+from src.verification.claim_review_index import factcheck_refresh_job
+
 # Import enhanced components
 try:
     from src.verification.enhanced_stance_classifier import EnhancedStanceClassifier, EnhancedStanceResult
@@ -17,6 +30,7 @@ try:
     from src.verification.enhanced_factcheck_api import EnhancedFactCheckAPI, EnhancedFactCheckResult
     from src.evidence_retrieval.enhanced_semantic_search import EnhancedSemanticSearch, EnhancedSearchResult
     from src.news.news_handler import NewsHandler
+    from src.utils.document_analysis import document_analysis_scope, group_near_duplicates
     COMPONENTS_AVAILABLE = True
 except ImportError as e:
     logging.warning(f"Some enhanced components not available: {e}")
@@ -24,6 +38,49 @@ except ImportError as e:
 
 logger = logging.getLogger(__name__)
 
+# Aggregator overrides that make a fact check decisive regardless of news evidence
+FACT_CHECK_OVERRIDES = {"refuted", "supported", "scientific_consensus_refuted"}
+
+# Lookups that failed and fell back to an empty result inside _tracking_failures
+_failed_lookups: "contextvars.ContextVar[Optional[Set[str]]]" = contextvars.ContextVar(
+    "truthlens_failed_lookups", default=None)
+
+
+def _lookup_failed(stage: str):
+    """Record that a lookup hid an error behind an empty result."""
+    failed = _failed_lookups.get()
+    if failed is not None:
+        failed.add(stage)
+
+
+def _tracking_failures(fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, Set[str]]:
+    """Call fn, returning its result and the lookups that failed inside it."""
+    failed: Set[str] = set()
+    token = _failed_lookups.set(failed)
+    try:
+        return fn(*args, **kwargs), failed
+    finally:
+        _failed_lookups.reset(token)
+
+
+PHRASE_STOP_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'})
+
+
+@lru_cache(maxsize=4096)
+def _search_phrases(claim: str) -> Tuple[str, ...]:
+    """
+    The five longest 2-4 word phrases of a claim's meaningful words.
+
+    Simple phrase extraction - in production you'd use more sophisticated NLP.
+    Phrases are streamed into a bounded heap instead of being collected and
+    sorted; ties keep their generation order, as a stable sort would.
+    """
+    words = [word.lower() for word in claim.split() if word.lower() not in PHRASE_STOP_WORDS and len(word) > 2]
+    phrases = (' '.join(words[i:j]) for i in range(len(words)) for j in range(i + 2, min(i + 5, len(words) + 1)))
+    # Longer phrases are usually more specific
+    return tuple(heapq.nlargest(5, (phrase for phrase in phrases if len(phrase) > 5), key=len))
+
+
 @dataclass
 class EnhancedAnalysisResult:
     """Result of enhanced TruthLens analysis."""
@@ -41,6 +98,73 @@ class EnhancedAnalysisResult:
     analysis_timestamp: str
     evidence_summary: str
     rule_based_overrides: List[str]
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    cascade: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class CascadeConfig:
+    """
+    Early-exit gates tried in order before news retrieval and NLI.
+    
+    analyze_claim, analyze_claims and stream_analysis all pass through them.
+    A gate set to None is skipped. Verdicts built without any news or
+    fact-check evidence are cached for ``fallback_cache_ttl`` only (None to
+    not cache them), since an empty lookup may be an outage the lookup hid;
+    verdicts from a lookup that failed are not cached at all.
+    """
+    verdict_cache_size: Optional[int] = 1024
+    verdict_cache_ttl: float = 3600.0
+    fallback_cache_ttl: Optional[float] = 60.0
+    fact_check_min_confidence: Optional[float] = 0.85
+    rule_min_confidence: Optional[float] = 0.85
+
+
+class VerdictCache:
+    """
+    LRU cache of analysis results with a time-to-live, keyed by normalized claim and config version.
+    
+    Results are deep-copied in and out, so callers never share the cached
+    evidence lists and cannot change a cached verdict. ``put`` can shorten
+    the time-to-live of a single entry.
+    """
+    
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # Values are (monotonic expiry time, result)
+        self._entries: "OrderedDict[Tuple[str, int, str], Tuple[float, EnhancedAnalysisResult]]" = OrderedDict()
+    
+    @staticmethod
+    def key(claim: str, max_articles: int) -> Tuple[str, int, str]:
+        return (" ".join(claim.lower().split()), max_articles, config_version())
+    
+    def get(self, claim: str, max_articles: int) -> Optional[EnhancedAnalysisResult]:
+        key = self.key(claim, max_articles)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() > entry[0]:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(entry[1])
+    
+    def put(self, claim: str, max_articles: int, result: EnhancedAnalysisResult, ttl: Optional[float] = None):
+        key = self.key(claim, max_articles)
+        result = copy.deepcopy(result)
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
 
 class EnhancedTruthLensPipeline:
     """
@@ -56,7 +180,8 @@ class EnhancedTruthLensPipeline:
     7. Scientific consensus handling
     """
     
-    def __init__(self, news_api_key: str, guardian_api_key: str, google_api_key: str, currents_api_key: str = None):
+    def __init__(self, news_api_key: str, guardian_api_key: str, google_api_key: str, currents_api_key: str = None,
+                 cascade: Optional[CascadeConfig] = None):
         """
         Initialize the enhanced TruthLens pipeline.
         
@@ -65,12 +190,25 @@ class EnhancedTruthLensPipeline:
             guardian_api_key: Guardian API key
             google_api_key: Google Fact Check API key
             currents_api_key: Currents API key (optional)
+            cascade: Early-exit gates for analyze_claim (defaults to CascadeConfig())
         """
         self.news_api_key = news_api_key
         self.guardian_api_key = guardian_api_key
         self.google_api_key = google_api_key
         self.currents_api_key = currents_api_key
         
+        self.cascade = cascade or CascadeConfig()
+        self.verdict_cache = (VerdictCache(self.cascade.verdict_cache_size, self.cascade.verdict_cache_ttl)
+                              if self.cascade.verdict_cache_size else None)
+        # Moving average of full-path analysis time, the baseline for time saved by early exits
+        self._full_path_seconds: Optional[float] = None
+        
+        # Concurrent news lookups of analyze_claims
+        self.retrieval_workers = int(os.environ.get("TRUTHLENS_BATCH_RETRIEVAL_WORKERS", 4))
+        self._retrieval_lock = threading.Lock()
+        self._retrieval_pool: Optional[ThreadPoolExecutor] = None
+        self._retrieval_pid: Optional[int] = None
+        
         # Initialize components
         self.news_handler = None
         self.stance_classifier = None
@@ -103,6 +241,13 @@ class EnhancedTruthLensPipeline:
             if self.google_api_key:
                 self.fact_check_api = EnhancedFactCheckAPI(self.google_api_key)
                 logger.info("Enhanced fact-check API initialized")
+                claim_index = self.fact_check_api.claim_index
+                if claim_index is not None:
+                    # Scheduled here, started by the first lookup in each (forked) process;
+                    # only the process holding the refresh lock file runs the job
+                    claim_index.start_refresh(
+                        [factcheck_refresh_job(self.fact_check_api, claim_index)],
+                        interval=float(os.environ.get("TRUTHLENS_CLAIM_INDEX_REFRESH_SECONDS", 3600)))
             
             # Initialize enhanced semantic search
             self.semantic_search = EnhancedSemanticSearch()
@@ -112,10 +257,23 @@ class EnhancedTruthLensPipeline:
             logger.error(f"Error initializing components: {e}")
             raise
     
+    def warm_up(self):
+        """Run a dummy forward pass through every loaded model."""
+        if self.stance_classifier:
+            self.stance_classifier.warm_up()
+        if self.semantic_search:
+            self.semantic_search.warm_up()
+    
     def analyze_claim(self, claim: str, max_articles: int = 20) -> EnhancedAnalysisResult:
         """
         Analyze a claim using the enhanced TruthLens pipeline.
         
+        Before news retrieval and NLI the claim goes through the early-exit
+        cascade configured by ``self.cascade``: a cached verdict, a confident
+        decisive fact-check match, or a claim-level rule override ends the
+        request. ``result.cascade`` records the gates passed, the exit stage
+        and the estimated time saved against the average full analysis.
+        
         Args:
             claim: The claim to analyze
             max_articles: Maximum number of articles to analyze
@@ -123,12 +281,33 @@ class EnhancedTruthLensPipeline:
         Returns:
             EnhancedAnalysisResult with comprehensive analysis
         """
+        # Evidence texts are segmented and tokenized once for all stages
+        with document_analysis_scope(), trace_request("analyze_claim") as trace:
+            result = self._analyze_claim(claim, max_articles)
+        result.stage_timings = trace.stage_timings()
+        return result
+    
+    def _analyze_claim(self, claim: str, max_articles: int) -> EnhancedAnalysisResult:
+        """Run the cascade and pipeline stages inside the request's document-analysis scope."""
         start_time = time.time()
         logger.info(f"Starting enhanced analysis of claim: {claim}")
+        path: List[str] = []
         
         try:
+            # Gate 1: a verdict computed recently under the same configuration
+            cached = self._cached_verdict(claim, max_articles, path, start_time)
+            if cached is not None:
+                return cached
+            
+            # Gates 2 and 3: a confident fact check or a claim-level rule
+            fact_check_result, failed = _tracking_failures(self._check_fact_check_sources, claim)
+            decided = self._decisive_verdict(claim, max_articles, path, fact_check_result, start_time, failed)
+            if decided is not None:
+                return decided
+            
             # Step 1: Search for news articles
-            news_articles = self._search_news_articles(claim, max_articles)
+            news_articles, news_failed = _tracking_failures(self._search_news_articles, claim, max_articles)
+            failed |= news_failed
             logger.info(f"Found {len(news_articles)} news articles")
             
             # Step 2: Apply enhanced semantic search and ranking
@@ -141,66 +320,485 @@ class EnhancedTruthLensPipeline:
                 ranked_articles = news_articles
                 search_summary = {"message": "Semantic search not available"}
             
-            # Step 3: Check fact-checking sources
-            fact_check_result = self._check_fact_check_sources(claim)
-            
-            # Step 4: Perform enhanced stance detection
+            # Step 3: Perform enhanced stance detection
             stance_results = self._detect_stances(claim, ranked_articles)
             logger.info(f"Completed stance detection for {len(stance_results)} articles")
             
-            # Step 5: Aggregate verdict using enhanced logic
-            verdict_result = self._aggregate_verdict(claim, stance_results, fact_check_result, len(ranked_articles))
+            # Steps 4-6: Aggregate verdict, summarize evidence, collect overrides
+            result = self._build_result(claim, ranked_articles, search_summary,
+                                        fact_check_result, stance_results, start_time)
+            path.append("full")
+            
+            logger.info(f"Enhanced analysis completed in {result.processing_time:.2f}s")
+            logger.info(f"Final verdict: {result.verdict} (confidence: {result.confidence:.1%})")
+            
+            return self._finish_cascade(result, max_articles, path, None, failed)
+            
+        except Exception as e:
+            logger.error(f"Error in enhanced analysis: {e}")
+            result = self._error_result(claim, e, start_time)
+            result.cascade = {"path": path, "exit": None, "time_saved": None}
+            return result
+    
+    def _cached_verdict(self, claim: str, max_articles: int, path: List[str],
+                        start_time: float) -> Optional[EnhancedAnalysisResult]:
+        """Gate 1: a verdict computed recently under the same configuration, if any."""
+        if self.verdict_cache is None:
+            return None
+        with span("cascade.verdict_cache"):
+            cached = self.verdict_cache.get(claim, max_articles)
+        path.append("verdict_cache:" + ("hit" if cached else "miss"))
+        if cached is None:
+            return None
+        result = replace(cached, claim=claim, processing_time=time.time() - start_time)
+        return self._finish_cascade(result, max_articles, path, "verdict_cache")
+    
+    def _decisive_verdict(self, claim: str, max_articles: int, path: List[str],
+                          fact_check_result: Optional[EnhancedFactCheckResult], start_time: float,
+                          failed: Collection[str] = ()) -> Optional[EnhancedAnalysisResult]:
+        """Gates 2 and 3: the result when a confident fact check or a claim-level rule decides the verdict."""
+        # Gate 2: a confident fact check decides the verdict on its own
+        gate = self.cascade.fact_check_min_confidence
+        if fact_check_result is not None and gate is not None and fact_check_result.confidence >= gate:
+            verdict_result = self._aggregate_verdict(claim, [], fact_check_result, 0)
+            if verdict_result.fact_check_override in FACT_CHECK_OVERRIDES:
+                path.append("fact_check:hit")
+                return self._early_exit(claim, max_articles, path, "fact_check",
+                                        fact_check_result, verdict_result, start_time, failed)
+        path.append("fact_check:" + ("pass" if fact_check_result else "miss"))
+        
+        # Gate 3: claim-level rules (scientific consensus) that news evidence cannot overturn
+        gate = self.cascade.rule_min_confidence
+        if gate is not None and self.verdict_aggregator:
+            with span("cascade.rules"):
+                verdict_result = self.verdict_aggregator.rule_verdict(
+                    claim, self._fact_check_dict(fact_check_result))
+            if verdict_result is not None and verdict_result.confidence >= gate:
+                path.append("rules:hit")
+                return self._early_exit(claim, max_articles, path, "rules",
+                                        fact_check_result, verdict_result, start_time, failed)
+            path.append("rules:miss")
+        return None
+    
+    def _early_exit(self, claim: str, max_articles: int, path: List[str], stage: str,
+                    fact_check_result: Optional[EnhancedFactCheckResult], verdict_result: VerdictResult,
+                    start_time: float, failed: Collection[str] = ()) -> EnhancedAnalysisResult:
+        """Result of a request that ended at a cascade gate, without news or NLI."""
+        result = self._build_result(claim, [], {"early_exit": stage}, fact_check_result, [], start_time,
+                                    verdict_result=verdict_result)
+        logger.info(f"Early exit at {stage}: {result.verdict} (confidence: {result.confidence:.1%})")
+        return self._finish_cascade(result, max_articles, path, stage, failed)
+    
+    def _finish_cascade(self, result: EnhancedAnalysisResult, max_articles: int, path: List[str],
+                        exit_stage: Optional[str], failed: Collection[str] = (),
+                        update_baseline: bool = True) -> EnhancedAnalysisResult:
+        """Record the cascade path and time saved, update the full-path baseline and cache the verdict."""
+        time_saved = None
+        if exit_stage is None:
+            if update_baseline:
+                elapsed = result.processing_time
+                self._full_path_seconds = (elapsed if self._full_path_seconds is None
+                                           else 0.8 * self._full_path_seconds + 0.2 * elapsed)
+        elif self._full_path_seconds is not None:
+            time_saved = max(0.0, self._full_path_seconds - result.processing_time)
+        result.cascade = {"path": path, "exit": exit_stage, "time_saved": time_saved}
+        
+        ttl = self._cache_ttl(result, exit_stage, failed)
+        if self.verdict_cache is not None and ttl:
+            self.verdict_cache.put(result.claim, max_articles, result, ttl=ttl)
+        return result
+    
+    def _cache_ttl(self, result: EnhancedAnalysisResult, exit_stage: Optional[str],
+                   failed: Collection[str]) -> Optional[float]:
+        """Seconds a verdict may stay cached, or None when it must not be cached."""
+        if result.verdict == "Error" or exit_stage == "verdict_cache" or failed:
+            return None
+        if exit_stage is None and not result.news_articles and result.fact_check_result is None:
+            # Neither lookup returned evidence, which may be an outage the lookup hid
+            return self.cascade.fallback_cache_ttl
+        return self.cascade.verdict_cache_ttl
+    
+    def stream_analysis(self, claim: str, max_articles: int = 20,
+                        stop_on_fact_check: Optional[float] = None,
+                        provisional_every: int = 3) -> Iterator[Dict[str, Any]]:
+        """
+        Analyze a claim, yielding an event as each stage completes.
+        
+        The stream passes through the same early-exit cascade as
+        analyze_claim and fills the same verdict cache. The fact-check
+        lookup runs first so a confident hit reaches the client before news
+        search starts. Events, in order:
+        
+        - ``started``
+        - ``fact_check``: best fact-check result, or ``found: False``
+          (skipped on a verdict cache hit)
+        - ``articles``: number of ranked articles about to be classified
+        - ``stance``: one per article as soon as it is classified
+        - ``provisional_verdict``: after the fact check and every
+          ``provisional_every`` stances
+        - ``verdict``: the final result; ``early_exit`` names the cascade
+          gate (or ``fact_check`` for ``stop_on_fact_check``) that ended
+          the stream before news search
+        - ``error``: analysis failed; no further events follow
+        
+        Closing the generator stops the analysis before the next stage.
+        
+        Args:
+            claim: The claim to analyze
+            max_articles: Maximum number of articles to analyze
+            stop_on_fact_check: Finish right after a fact-check hit with at least this confidence
+            provisional_every: Stances between provisional verdicts
             
-            # Step 6: Generate evidence summary
-            evidence_summary = self._generate_evidence_summary(stance_results, fact_check_result)
+        Yields:
+            JSON-serializable event dictionaries with an ``event`` key
+        """
+        with document_analysis_scope():
+            yield from self._stream_analysis(claim, max_articles, stop_on_fact_check, provisional_every)
+    
+    def _stream_analysis(self, claim: str, max_articles: int, stop_on_fact_check: Optional[float],
+                         provisional_every: int) -> Iterator[Dict[str, Any]]:
+        """Yield stage events inside the request's document-analysis scope."""
+        start_time = time.time()
+        yield {"event": "started", "claim": claim}
+        path: List[str] = []
+        
+        try:
+            # Gate 1: a verdict computed recently under the same configuration
+            cached = self._cached_verdict(claim, max_articles, path, start_time)
+            if cached is not None:
+                yield self._verdict_event(cached, early_exit="verdict_cache")
+                return
             
-            # Step 7: Extract rule-based overrides
-            rule_based_overrides = self._extract_rule_based_overrides(stance_results)
+            # Step 1: Fact-check lookup first; it is the cheapest confident signal
+            fact_check_result, failed = _tracking_failures(self._check_fact_check_sources, claim)
+            yield {
+                "event": "fact_check",
+                "found": fact_check_result is not None,
+                "result": fact_check_result.to_dict() if fact_check_result else None,
+                "elapsed": time.time() - start_time
+            }
             
-            processing_time = time.time() - start_time
+            if fact_check_result and stop_on_fact_check is not None \
+                    and fact_check_result.confidence >= stop_on_fact_check:
+                # Caller-chosen threshold, not a cascade gate: the verdict is not cached
+                result = self._build_result(claim, [], {"early_exit": "fact_check"},
+                                            fact_check_result, [], start_time)
+                yield self._verdict_event(result, early_exit="fact_check")
+                return
             
-            result = EnhancedAnalysisResult(
-                claim=claim,
-                verdict=verdict_result.verdict,
-                confidence=verdict_result.confidence,
-                reasoning=verdict_result.reasoning,
-                stance_distribution=verdict_result.stance_distribution,
-                stance_percentages=verdict_result.stance_percentages,
-                fact_check_result=fact_check_result.to_dict() if fact_check_result else None,
-                news_articles=ranked_articles,
-                stance_results=[self._stance_result_to_dict(sr) for sr in stance_results],
-                search_summary=search_summary,
-                processing_time=processing_time,
-                analysis_timestamp=datetime.now().isoformat(),
-                evidence_summary=evidence_summary,
-                rule_based_overrides=rule_based_overrides
-            )
+            # Gates 2 and 3: a confident fact check or a claim-level rule
+            decided = self._decisive_verdict(claim, max_articles, path, fact_check_result, start_time, failed)
+            if decided is not None:
+                yield self._verdict_event(decided, early_exit=decided.cascade["exit"])
+                return
+            if fact_check_result:
+                yield self._provisional_event(claim, [], fact_check_result, 0, start_time)
             
-            logger.info(f"Enhanced analysis completed in {processing_time:.2f}s")
-            logger.info(f"Final verdict: {result.verdict} (confidence: {result.confidence:.1%})")
+            # Step 2: News search and semantic ranking
+            news_articles, news_failed = _tracking_failures(self._search_news_articles, claim, max_articles)
+            failed |= news_failed
+            ranked_articles, search_summary = self._rank_articles(claim, news_articles, max_articles)
+            yield {"event": "articles", "count": len(ranked_articles), "elapsed": time.time() - start_time}
             
-            return result
+            # Step 3: Stance per article, streamed as soon as it is classified
+            stance_results = []
+            for index, article in enumerate(ranked_articles):
+                stance_result = self._detect_stances(claim, [article])[0] if self.stance_classifier else None
+                if stance_result is None:
+                    break
+                stance_results.append(stance_result)
+                yield {
+                    "event": "stance",
+                    "index": index,
+                    "title": article.get('title', ''),
+                    "url": article.get('url', ''),
+                    "source_name": article.get('source_name', 'Unknown'),
+                    **self._stance_result_to_dict(stance_result),
+                    "elapsed": time.time() - start_time
+                }
+                if provisional_every > 0 and len(stance_results) % provisional_every == 0 \
+                        and len(stance_results) < len(ranked_articles):
+                    yield self._provisional_event(claim, stance_results, fact_check_result,
+                                                  len(ranked_articles), start_time)
+            
+            # Step 4: Final verdict
+            result = self._build_result(claim, ranked_articles, search_summary,
+                                        fact_check_result, stance_results, start_time)
+            if len(stance_results) == len(ranked_articles):
+                path.append("full")
+                result = self._finish_cascade(result, max_articles, path, None, failed)
+            yield self._verdict_event(result)
             
         except Exception as e:
-            logger.error(f"Error in enhanced analysis: {e}")
-            # Return error result
-            return EnhancedAnalysisResult(
-                claim=claim,
-                verdict="Error",
-                confidence=0.0,
-                reasoning=f"Analysis failed: {str(e)}",
-                stance_distribution={},
-                stance_percentages={},
-                fact_check_result=None,
-                news_articles=[],
-                stance_results=[],
-                search_summary={"error": str(e)},
-                processing_time=time.time() - start_time,
-                analysis_timestamp=datetime.now().isoformat(),
-                evidence_summary="Analysis failed due to error",
-                rule_based_overrides=[]
-            )
+            logger.error(f"Error in streaming analysis: {e}")
+            yield {"event": "error", "message": str(e), "elapsed": time.time() - start_time}
+    
+    def _provisional_event(self, claim: str, stance_results: List[EnhancedStanceResult],
+                           fact_check_result: Optional[EnhancedFactCheckResult],
+                           total_articles: int, start_time: float) -> Dict[str, Any]:
+        """Verdict over the evidence seen so far."""
+        verdict_result = self._aggregate_verdict(claim, stance_results, fact_check_result, total_articles)
+        return {
+            "event": "provisional_verdict",
+            "verdict": verdict_result.verdict,
+            "confidence": verdict_result.confidence,
+            "articles_classified": len(stance_results),
+            "articles_total": total_articles,
+            "elapsed": time.time() - start_time
+        }
+    
+    def _verdict_event(self, result: EnhancedAnalysisResult, early_exit: Optional[str] = None) -> Dict[str, Any]:
+        """Final event carrying the analysis result."""
+        return {
+            "event": "verdict",
+            "claim": result.claim,
+            "verdict": result.verdict,
+            "confidence": result.confidence,
+            "reasoning": result.reasoning,
+            "stance_distribution": dict(result.stance_distribution),
+            "stance_percentages": dict(result.stance_percentages),
+            "fact_check_result": result.fact_check_result,
+            "evidence_summary": result.evidence_summary,
+            "rule_based_overrides": result.rule_based_overrides,
+            "news_articles": len(result.news_articles),
+            "early_exit": early_exit,
+            "elapsed": result.processing_time
+        }
+    
+    def analyze_claims(self, claims: List[str], max_articles: int = 20,
+                       duplicate_threshold: float = 0.9, nli_batch_size: int = 16) -> List[EnhancedAnalysisResult]:
+        """
+        Analyze many claims, sharing retrieval and batching the NLI model.
+        
+        Identical and near-identical claims are analyzed once, and each
+        distinct claim goes through the same early-exit cascade as
+        analyze_claim: cached verdicts are reused, and claims a confident
+        fact check or rule settles skip news retrieval and NLI. The distinct
+        claims' fact checks go out as one provider batch, the remaining
+        claims' news lookups run concurrently on a bounded pool, and claims
+        whose search phrases overlap also rank each other's articles. Stance
+        detection runs once over the union of (claim, article) pairs.
+        
+        Args:
+            claims: Claims to analyze
+            max_articles: Maximum number of articles to analyze per claim
+            duplicate_threshold: Word Jaccard similarity at which claims are merged
+            nli_batch_size: Pairs per NLI forward pass
+            
+        Returns:
+            One EnhancedAnalysisResult per input claim, in input order
+        """
+        with document_analysis_scope(), trace_request("analyze_claims", claims=len(claims)):
+            return self._analyze_claims(claims, max_articles, duplicate_threshold, nli_batch_size)
+    
+    def _analyze_claims(self, claims: List[str], max_articles: int,
+                        duplicate_threshold: float, nli_batch_size: int) -> List[EnhancedAnalysisResult]:
+        """Run the batched pipeline inside the request's document-analysis scope."""
+        start_time = time.time()
+        representatives = group_near_duplicates(claims, duplicate_threshold)
+        unique_indices = sorted(set(representatives))
+        logger.info(f"Batch analysis of {len(claims)} claims ({len(unique_indices)} distinct)")
+        
+        results: Dict[int, EnhancedAnalysisResult] = {}
+        errors: Dict[int, Exception] = {}
+        paths: Dict[int, List[str]] = {index: [] for index in unique_indices}
+        failed: Dict[int, Set[str]] = {index: set() for index in unique_indices}
+        
+        # Gate 1: verdicts computed recently under the same configuration
+        for index in unique_indices:
+            cached = self._cached_verdict(claims[index], max_articles, paths[index], start_time)
+            if cached is not None:
+                results[index] = cached
+        
+        # Gates 2 and 3 on one batched fact-check lookup
+        pending = [index for index in unique_indices if index not in results]
+        batch, fact_check_failed = _tracking_failures(self._check_fact_check_sources_batch,
+                                                      [claims[index] for index in pending])
+        fact_checks = dict(zip(pending, batch))
+        for index in pending:
+            failed[index] |= fact_check_failed
+            try:
+                decided = self._decisive_verdict(claims[index], max_articles, paths[index], fact_checks[index],
+                                                 start_time, failed[index])
+            except Exception as e:
+                logger.error(f"Error in cascade for batch claim {index}: {e}")
+                errors[index] = e
+                continue
+            if decided is not None:
+                results[index] = decided
+        
+        # Step 1: Concurrent news lookups for the claims no gate settled
+        pending = [index for index in pending if index not in results and index not in errors]
+        fetched: Dict[int, List[Dict[str, Any]]] = {}
+        pool = self._retrieval_executor()
+        news_lookups = {index: pool.submit(contextvars.copy_context().run, _tracking_failures,
+                                           self._search_news_articles, claims[index], max_articles)
+                        for index in pending}
+        for index, lookup in news_lookups.items():
+            try:
+                fetched[index], news_failed = lookup.result()
+                failed[index] |= news_failed
+            except Exception as e:
+                logger.error(f"Error retrieving evidence for batch claim {index}: {e}")
+                errors[index] = e
+        
+        # Step 2: Pool articles across claims with overlapping search phrases
+        ranked: Dict[int, Tuple[List[Dict[str, Any]], Dict[str, Any]]] = {}
+        for index, articles in self._pool_shared_articles(claims, fetched).items():
+            try:
+                ranked[index] = self._rank_articles(claims[index], articles, max_articles)
+            except Exception as e:
+                logger.error(f"Error ranking articles for batch claim {index}: {e}")
+                errors[index] = e
+        
+        # Step 3: Stance detection over the union of (claim, article) pairs
+        pairs = [(claims[index], article) for index in ranked for article in ranked[index][0]]
+        stance_results = self._detect_stances_batch(pairs, nli_batch_size)
+        
+        # Steps 4-6: Per-claim verdicts
+        offset = 0
+        for index, (articles, search_summary) in ranked.items():
+            claim_stances = stance_results[offset:offset + len(articles)]
+            offset += len(articles)
+            try:
+                result = self._build_result(claims[index], articles, search_summary,
+                                            fact_checks.get(index), claim_stances, start_time)
+            except Exception as e:
+                logger.error(f"Error aggregating verdict for batch claim {index}: {e}")
+                errors[index] = e
+                continue
+            paths[index].append("full")
+            # Batch timings cover the whole batch, so they do not feed the single-claim baseline
+            results[index] = self._finish_cascade(result, max_articles, paths[index], None, failed[index],
+                                                  update_baseline=False)
+        
+        batch_results = []
+        for index, claim in enumerate(claims):
+            representative = representatives[index]
+            if representative in errors or representative not in results:
+                error = errors.get(representative, RuntimeError("claim was not analyzed"))
+                batch_results.append(self._error_result(claim, error, start_time))
+                continue
+            
+            result = results[representative]
+            if representative != index:
+                summary = dict(result.search_summary)
+                summary["duplicate_of"] = representative
+                result = replace(result, claim=claim, search_summary=summary)
+            batch_results.append(result)
+        
+        logger.info(f"Batch analysis completed in {time.time() - start_time:.2f}s "
+                    f"({len(pairs)} stance pairs)")
+        return batch_results
+    
+    def _pool_shared_articles(self, claims: List[str],
+                              fetched: Dict[int, List[Dict[str, Any]]]) -> Dict[int, List[Dict[str, Any]]]:
+        """Give each claim the articles fetched for claims sharing one of its search phrases."""
+        claims_by_phrase: Dict[str, List[int]] = {}
+        for index in fetched:
+            for phrase in self._extract_search_phrases(claims[index]):
+                claims_by_phrase.setdefault(phrase, []).append(index)
+        
+        pooled: Dict[int, List[Dict[str, Any]]] = {}
+        for index, articles in fetched.items():
+            related = {other for phrase in self._extract_search_phrases(claims[index])
+                       for other in claims_by_phrase.get(phrase, ()) if other != index}
+            if not related:
+                pooled[index] = articles
+                continue
+            
+            seen_urls = {article.get('url') for article in articles}
+            combined = list(articles)
+            for other in sorted(related):
+                for article in fetched[other]:
+                    url = article.get('url')
+                    if url not in seen_urls:
+                        seen_urls.add(url)
+                        combined.append(article)
+            pooled[index] = combined
+        
+        return pooled
+    
+    def _rank_articles(self, claim: str, news_articles: List[Dict[str, Any]],
+                       max_articles: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Apply semantic search and ranking, returning the ranked articles and a summary."""
+        if self.semantic_search and news_articles:
+            search_results = self.semantic_search.search_and_rank_articles(claim, news_articles, max_articles)
+            return ([result.article for result in search_results],
+                    self.semantic_search.get_search_summary(search_results))
+        # Pooled articles arrive in fetch order; rank by word overlap before truncating
+        texts = [' '.join(filter(None, (article.get('title'), article.get('description'), article.get('content'))))
+                 for article in news_articles]
+        order = sorted(range(len(news_articles)), key=overlap_scores(claim, texts).__getitem__, reverse=True)
+        return ([news_articles[i] for i in order[:max_articles]],
+                {"message": "Semantic search not available", "ranking": "word_overlap"})
+    
+    def _retrieval_executor(self) -> ThreadPoolExecutor:
+        """Pool for the concurrent news lookups of a batch, recreated in a forked worker."""
+        with self._retrieval_lock:
+            if self._retrieval_pool is None or self._retrieval_pid != os.getpid():
+                self._retrieval_pool = ThreadPoolExecutor(max_workers=max(1, self.retrieval_workers),
+                                                          thread_name_prefix="truthlens-retrieval")
+                self._retrieval_pid = os.getpid()
+            return self._retrieval_pool
     
+    @traced("pipeline.aggregate")
+    def _build_result(self,
+                      claim: str,
+                      ranked_articles: List[Dict[str, Any]],
+                      search_summary: Dict[str, Any],
+                      fact_check_result: Optional[EnhancedFactCheckResult],
+                      stance_results: List[EnhancedStanceResult],
+                      start_time: float,
+                      verdict_result: Optional[VerdictResult] = None) -> EnhancedAnalysisResult:
+        """Aggregate the verdict, unless already decided, and assemble the analysis result."""
+        # Aggregate verdict using enhanced logic
+        if verdict_result is None:
+            verdict_result = self._aggregate_verdict(claim, stance_results, fact_check_result, len(ranked_articles))
+        
+        # Generate evidence summary
+        evidence_summary = self._generate_evidence_summary(stance_results, fact_check_result)
+        
+        # Extract rule-based overrides
+        rule_based_overrides = self._extract_rule_based_overrides(stance_results)
+        
+        return EnhancedAnalysisResult(
+            claim=claim,
+            verdict=verdict_result.verdict,
+            confidence=verdict_result.confidence,
+            reasoning=verdict_result.reasoning,
+            stance_distribution=verdict_result.stance_distribution,
+            stance_percentages=verdict_result.stance_percentages,
+            fact_check_result=fact_check_result.to_dict() if fact_check_result else None,
+            news_articles=ranked_articles,
+            stance_results=[self._stance_result_to_dict(sr) for sr in stance_results],
+            search_summary=search_summary,
+            processing_time=time.time() - start_time,
+            analysis_timestamp=datetime.now().isoformat(),
+            evidence_summary=evidence_summary,
+            rule_based_overrides=rule_based_overrides
+        )
+    
+    def _error_result(self, claim: str, error: Exception, start_time: float) -> EnhancedAnalysisResult:
+        """Result returned when analysis of a claim fails."""
+        return EnhancedAnalysisResult(
+            claim=claim,
+            verdict="Error",
+            confidence=0.0,
+            reasoning=f"Analysis failed: {str(error)}",
+            stance_distribution={},
+            stance_percentages={},
+            fact_check_result=None,
+            news_articles=[],
+            stance_results=[],
+            search_summary={"error": str(error)},
+            processing_time=time.time() - start_time,
+            analysis_timestamp=datetime.now().isoformat(),
+            evidence_summary="Analysis failed due to error",
+            rule_based_overrides=[]
+        )
+    
+    @traced("pipeline.search_news")
     def _search_news_articles(self, claim: str, max_articles: int) -> List[Dict[str, Any]]:
         """Search for news articles using News API and Guardian API."""
         if not self.news_handler:
@@ -241,28 +839,14 @@ class EnhancedTruthLensPipeline:
             
         except Exception as e:
             logger.error(f"Error in enhanced news search: {e}")
+            _lookup_failed("news")
             return []
     
     def _extract_search_phrases(self, claim: str) -> List[str]:
         """Extract meaningful search phrases from a claim."""
-        # Simple phrase extraction - in production you'd use more sophisticated NLP
-        words = claim.split()
-        
-        # Remove common stop words
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'}
-        meaningful_words = [word.lower() for word in words if word.lower() not in stop_words and len(word) > 2]
-        
-        # Create phrases of 2-4 words
-        phrases = []
-        for i in range(len(meaningful_words)):
-            for j in range(i+2, min(i+5, len(meaningful_words)+1)):
-                phrase = ' '.join(meaningful_words[i:j])
-                if len(phrase) > 5:  # Minimum phrase length
-                    phrases.append(phrase)
-        
-        # Return top phrases by length (longer phrases are usually more specific)
-        return sorted(phrases, key=len, reverse=True)[:5]
+        return list(_search_phrases(claim))
     
+    @traced("pipeline.fact_check")
     def _check_fact_check_sources(self, claim: str) -> Optional[EnhancedFactCheckResult]:
         """Check multiple fact-checking sources."""
         if not self.fact_check_api:
@@ -276,8 +860,23 @@ class EnhancedTruthLensPipeline:
             return result
         except Exception as e:
             logger.error(f"Error checking fact-check sources: {e}")
+            _lookup_failed("fact_check")
             return None
     
+    @traced("pipeline.fact_check_batch")
+    def _check_fact_check_sources_batch(self, claims: List[str]) -> List[Optional[EnhancedFactCheckResult]]:
+        """Best fact check for each claim, with the provider searches of all claims in one batch."""
+        if not self.fact_check_api or not claims:
+            return [None] * len(claims)
+        
+        try:
+            return self.fact_check_api.get_best_fact_checks(claims, deadline=self.fact_check_api.deadline_seconds)
+        except Exception as e:
+            logger.error(f"Error checking fact-check sources for batch: {e}")
+            _lookup_failed("fact_check")
+            return [None] * len(claims)
+    
+    @traced("pipeline.stance_detection")
     def _detect_stances(self, claim: str, articles: List[Dict[str, Any]]) -> List[EnhancedStanceResult]:
         """Perform enhanced stance detection on articles."""
         if not self.stance_classifier:
@@ -301,6 +900,23 @@ class EnhancedTruthLensPipeline:
         
         return stance_results
     
+    @traced("pipeline.stance_detection_batch")
+    def _detect_stances_batch(self, pairs: List[Tuple[str, Dict[str, Any]]],
+                              batch_size: int) -> List[EnhancedStanceResult]:
+        """Perform stance detection on (claim, article) pairs with batched NLI."""
+        if not self.stance_classifier:
+            logger.warning("Stance classifier not available")
+            return []
+        
+        try:
+            return self.stance_classifier.classify_stances(pairs, batch_size=batch_size)
+        except Exception as e:
+            logger.warning(f"Batched stance detection failed, classifying pairs one by one: {e}")
+            results = []
+            for claim, article in pairs:
+                results.extend(self._detect_stances(claim, [article]))
+            return results
+    
     def _aggregate_verdict(self, 
                           claim: str, 
                           stance_results: List[EnhancedStanceResult],
@@ -330,20 +946,21 @@ class EnhancedTruthLensPipeline:
                 'rule_based_override': sr.rule_based_override
             })
         
-        # Convert fact-check result to dict if available
-        fact_check_dict = None
-        if fact_check_result:
-            fact_check_dict = {
-                'verdict': fact_check_result.verdict,
-                'confidence': fact_check_result.confidence,
-                'explanation': fact_check_result.explanation,
-                'source': fact_check_result.best_source['name']
-            }
-        
         return self.verdict_aggregator.aggregate_verdict(
-            claim, stance_dicts, fact_check_dict, total_articles
+            claim, stance_dicts, self._fact_check_dict(fact_check_result), total_articles
         )
     
+    def _fact_check_dict(self, fact_check_result: Optional[EnhancedFactCheckResult]) -> Optional[Dict[str, Any]]:
+        """Fact-check result in the form the verdict aggregator expects."""
+        if not fact_check_result:
+            return None
+        return {
+            'verdict': fact_check_result.verdict,
+            'confidence': fact_check_result.confidence,
+            'explanation': fact_check_result.explanation,
+            'source': fact_check_result.best_source['name']
+        }
+    
     def _generate_evidence_summary(self, 
                                  stance_results: List[EnhancedStanceResult],
                                  fact_check_result: Optional[EnhancedFactCheckResult]) -> str:
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Inverted BM25 Index for TruthLens
+Incrementally updatable BM25 index with top-k pruning and on-disk persistence.
+
+Postings are kept per term as compact int32 arrays of ascending document
+numbers and term frequencies, so adding a document only appends to the
+postings of its own terms. Deleted documents are tombstoned and dropped
+from the postings when they exceed ``compact_ratio`` of the index.
+
+Queries are scored term-at-a-time in MaxScore order. Terms are processed by
+decreasing score upper bound. Once the bounds of the remaining terms cannot
+lift a document outside the current candidates past the k-th best score,
+the remaining postings are only probed (binary search) for surviving
+candidates instead of being scanned. Query cost therefore follows the
+postings of the query terms, not the corpus size.
+
+Scores use the BM25 weighting of rank_bm25's BM25Okapi (k1=1.5, b=0.75)
+with the non-negative Lucene IDF, log(1 + (N - df + 0.5) / (df + 0.5)), so
+every term contributes a positive, boundable amount. As in Lucene, document
+frequencies include tombstoned documents until the next compaction.
+"""
+
+import json
+import logging
+import math
+import os
+import sys
+import threading
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+
+class _Buffer:
+    """Append-only NumPy array with amortized doubling growth."""
+
+    __slots__ = ("data", "size")
+
+    def __init__(self, dtype, capacity: int = 4, data: Optional[np.ndarray] = None):
+        if data is not None:
+            self.data = np.array(data, dtype=dtype)
+            self.size = len(self.data)
+        else:
+            self.data = np.empty(capacity, dtype=dtype)
+            self.size = 0
+
+    def append(self, value):
+        if self.size == len(self.data):
+            grown = np.empty(max(4, 2 * len(self.data)), dtype=self.data.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[self.size] = value
+        self.size += 1
+
+    def view(self) -> np.ndarray:
+        return self.data[:self.size]
+
+
+class _Postings:
+    """
+    Postings list of one term plus the statistics behind its score bound.
+
+    Appends go to compact ``array('i')`` buffers; queries read NumPy copies
+    that are refreshed only after the list has grown.
+    """
+
+    __slots__ = ("docs", "tfs", "max_tf", "min_length", "_arrays")
+
+    def __init__(self, docs: Optional[np.ndarray] = None, tfs: Optional[np.ndarray] = None,
+                 max_tf: int = 0, min_length: int = sys.maxsize):
+        self.docs = _int_array(docs)
+        self.tfs = _int_array(tfs)
+        self.max_tf = max_tf
+        self.min_length = min_length
+        self._arrays: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def append(self, doc: int, tf: int, length: int):
+        self.docs.append(doc)
+        self.tfs.append(tf)
+        if tf > self.max_tf:
+            self.max_tf = tf
+        if length < self.min_length:
+            self.min_length = length
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        cached = self._arrays
+        if cached is None or len(cached[0]) != len(self.docs):
+            cached = self._arrays = (np.frombuffer(self.docs, dtype=np.int32).copy(),
+                                     np.frombuffer(self.tfs, dtype=np.int32).copy())
+        return cached
+
+
+def _int_array(values: Optional[np.ndarray]) -> array:
+    buffer = array("i")
+    if values is not None and len(values):
+        buffer.frombytes(np.ascontiguousarray(values, dtype=np.int32).tobytes())
+    return buffer
+
+
+class InvertedBM25Index:
+    """
+    Inverted BM25 index over string document IDs.
+
+    Thread-safe; callers pass already tokenized text. Each document may
+    carry an integer fingerprint of its content so a caller can tell which
+    documents changed since the index was saved.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, compact_ratio: float = 0.25):
+        """
+        Initialize an empty index.
+
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization
+            compact_ratio: Fraction of deleted documents that triggers compaction
+        """
+        self.k1 = k1
+        self.b = b
+        self.compact_ratio = compact_ratio
+
+        self._lock = threading.RLock()
+        self._postings: Dict[str, _Postings] = {}
+        self._doc_ids: List[Optional[str]] = []
+        self._doc_numbers: Dict[str, int] = {}
+        self._lengths = _Buffer(np.int32, 1024)
+        self._live = _Buffer(np.bool_, 1024)
+        self._fingerprints = _Buffer(np.int64, 1024)
+        self._total_length = 0
+        self._deleted = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._doc_numbers)
+
+    def __contains__(self, doc_id: str) -> bool:
+        with self._lock:
+            return doc_id in self._doc_numbers
+
+    def doc_ids(self) -> List[str]:
+        """IDs of every live document."""
+        with self._lock:
+            return list(self._doc_numbers)
+
+    def fingerprint(self, doc_id: str) -> Optional[int]:
+        """Content fingerprint stored with a document, or None if it is not indexed."""
+        with self._lock:
+            number = self._doc_numbers.get(doc_id)
+            return None if number is None else int(self._fingerprints.data[number])
+
+    def add(self, doc_id: str, tokens: Sequence[str], fingerprint: int = 0):
+        """
+        Index a document, replacing any earlier version with the same ID.
+
+        Args:
+            doc_id: Document ID
+            tokens: Document tokens
+            fingerprint: Content fingerprint returned by ``fingerprint``
+        """
+        with self._lock:
+            if doc_id in self._doc_numbers:
+                self._remove(doc_id)
+
+            number = len(self._doc_ids)
+            length = len(tokens)
+            self._doc_ids.append(doc_id)
+            self._doc_numbers[doc_id] = number
+            self._lengths.append(length)
+            self._live.append(True)
+            self._fingerprints.append(fingerprint)
+            self._total_length += length
+
+            for term, tf in Counter(tokens).items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = _Postings()
+                postings.append(number, tf, length)
+
+    def remove(self, doc_id: str) -> bool:
+        """
+        Delete a document.
+
+        Returns:
+            True if the document was indexed
+        """
+        with self._lock:
+            if doc_id not in self._doc_numbers:
+                return False
+            self._remove(doc_id)
+            if self._deleted > self.compact_ratio * len(self._doc_ids):
+                self.compact()
+            return True
+
+    def _remove(self, doc_id: str):
+        number = self._doc_numbers.pop(doc_id)
+        self._doc_ids[number] = None
+        self._live.data[number] = False
+        self._total_length -= int(self._lengths.data[number])
+        self._deleted += 1
+
+    def compact(self):
+        """Drop deleted documents from the postings and renumber the rest."""
+        with self._lock:
+            if not self._deleted:
+                return
+            live = self._live.view()
+            new_numbers = np.cumsum(live, dtype=np.int64) - 1
+            lengths = self._lengths.view()[live]
+
+            postings: Dict[str, _Postings] = {}
+            for term, old in self._postings.items():
+                docs, tfs = old.arrays()
+                keep = live[docs]
+                if not keep.any():
+                    continue
+                docs, tfs = new_numbers[docs[keep]], tfs[keep]
+                postings[term] = _Postings(docs, tfs, max_tf=int(tfs.max()), min_length=int(lengths[docs].min()))
+
+            self._postings = postings
+            self._doc_ids = [doc_id for doc_id in self._doc_ids if doc_id is not None]
+            self._doc_numbers = {doc_id: number for number, doc_id in enumerate(self._doc_ids)}
+            self._fingerprints = _Buffer(np.int64, data=self._fingerprints.view()[live])
+            self._lengths = _Buffer(np.int32, data=lengths)
+            self._live = _Buffer(np.bool_, data=np.ones(len(self._doc_ids), dtype=np.bool_))
+            logger.debug(f"Compacted BM25 index: removed {self._deleted} deleted documents")
+            self._deleted = 0
+
+    def search(self, query_tokens: Sequence[str], top_k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Top-k documents for a tokenized query.
+
+        Repeated query tokens count once per occurrence, as in BM25Okapi.
+
+        Returns:
+            (doc_id, score) pairs by descending score; only documents
+            containing at least one query term
+        """
+        with self._lock:
+            if not self._doc_numbers or top_k <= 0:
+                return []
+            query = Counter(token for token in query_tokens if token in self._postings)
+            if not query:
+                return []
+
+            k1, b = self.k1, self.b
+            n_docs = len(self._doc_ids)
+            avgdl = self._total_length / len(self._doc_numbers) or 1.0
+            norm_base, norm_scale = k1 * (1 - b), k1 * b / avgdl
+            lengths = self._lengths.view()
+            live = self._live.view()
+
+            terms = []
+            for term, count in query.items():
+                postings = self._postings[term]
+                df = len(postings)
+                weight = count * math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                bound = weight * postings.max_tf * (k1 + 1) / (
+                    postings.max_tf + norm_base + norm_scale * postings.min_length)
+                terms.append((bound, weight, postings))
+            terms.sort(key=lambda t: t[0], reverse=True)
+
+            remaining = sum(t[0] for t in terms)
+            cand_docs = np.empty(0, dtype=np.int32)
+            cand_scores = np.empty(0, dtype=np.float64)
+            pruning = False
+
+            for bound, weight, postings in terms:
+                threshold = self._kth_score(cand_scores, top_k)
+                # A document outside the candidates can reach at most `remaining`
+                pruning = pruning or remaining < threshold
+                docs, tfs = postings.arrays()
+
+                if pruning:
+                    # Candidates that cannot catch up are dropped before probing
+                    alive = cand_scores + remaining >= threshold
+                    cand_docs, cand_scores = cand_docs[alive], cand_scores[alive]
+                    positions = np.minimum(np.searchsorted(docs, cand_docs), len(docs) - 1)
+                    hit = docs[positions] == cand_docs
+                    tf = tfs[positions[hit]]
+                    dl = lengths[cand_docs[hit]]
+                    cand_scores[hit] += weight * tf * (k1 + 1) / (tf + norm_base + norm_scale * dl)
+                else:
+                    keep = live[docs]
+                    docs, tfs = docs[keep], tfs[keep]
+                    scores = weight * tfs * (k1 + 1) / (tfs + norm_base + norm_scale * lengths[docs])
+                    merged_docs, inverse = np.unique(np.concatenate([cand_docs, docs]), return_inverse=True)
+                    cand_scores = np.bincount(inverse, weights=np.concatenate([cand_scores, scores]),
+                                              minlength=len(merged_docs))
+                    cand_docs = merged_docs.astype(np.int32)
+                remaining -= bound
+
+            if len(cand_docs) > top_k:
+                best = np.argpartition(-cand_scores, top_k - 1)[:top_k]
+                cand_docs, cand_scores = cand_docs[best], cand_scores[best]
+            order = np.lexsort((cand_docs, -cand_scores))
+            return [(self._doc_ids[cand_docs[i]], float(cand_scores[i])) for i in order if cand_scores[i] > 0]
+
+    @staticmethod
+    def _kth_score(scores: np.ndarray, k: int) -> float:
+        if len(scores) < k:
+            return 0.0
+        return float(np.partition(scores, len(scores) - k)[len(scores) - k])
+
+    def save(self, path: Union[str, Path]):
+        """Write the index to ``path`` atomically."""
+        path = Path(path)
+        with self._lock:
+            self.compact()
+            terms = list(self._postings)
+            sizes = np.array([len(self._postings[t]) for t in terms], dtype=np.int64)
+            offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+            empty = np.empty(0, dtype=np.int32)
+            meta = {
+                "version": FORMAT_VERSION,
+                "k1": self.k1,
+                "b": self.b,
+                "compact_ratio": self.compact_ratio,
+                "terms": terms,
+                "doc_ids": self._doc_ids,
+            }
+            arrays = {
+                "meta": np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8),
+                "offsets": offsets,
+                "docs": np.concatenate([self._postings[t].arrays()[0] for t in terms] or [empty]),
+                "tfs": np.concatenate([self._postings[t].arrays()[1] for t in terms] or [empty]),
+                "max_tf": np.array([self._postings[t].max_tf for t in terms], dtype=np.int32),
+                "min_length": np.array([self._postings[t].min_length for t in terms], dtype=np.int64),
+                "lengths": self._lengths.view(),
+                "fingerprints": self._fingerprints.view(),
+            }
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+        logger.info(f"Saved BM25 index with {len(meta['doc_ids'])} documents to {path}")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "InvertedBM25Index":
+        """
+        Read an index written by ``save``.
+
+        Raises:
+            ValueError: If the file is not a supported index
+        """
+        with np.load(str(path), allow_pickle=False) as data:
+            meta = json.loads(bytes(data["meta"]).decode("utf-8"))
+            if meta.get("version") != FORMAT_VERSION:
+                raise ValueError(f"Unsupported BM25 index version: {meta.get('version')}")
+            offsets, docs, tfs = data["offsets"], data["docs"], data["tfs"]
+            max_tf, min_length = data["max_tf"], data["min_length"]
+            lengths, fingerprints = data["lengths"], data["fingerprints"]
+
+        index = cls(k1=meta["k1"], b=meta["b"], compact_ratio=meta["compact_ratio"])
+        for i, term in enumerate(meta["terms"]):
+            start, end = offsets[i], offsets[i + 1]
+            index._postings[term] = _Postings(docs[start:end], tfs[start:end], max_tf=int(max_tf[i]),
+                                              min_length=int(min_length[i]))
+
+        index._doc_ids = meta["doc_ids"]
+        index._doc_numbers = {doc_id: number for number, doc_id in enumerate(index._doc_ids)}
+        index._lengths = _Buffer(np.int32, data=lengths)
+        index._live = _Buffer(np.bool_, data=np.ones(len(index._doc_ids), dtype=np.bool_))
+        index._fingerprints = _Buffer(np.int64, data=fingerprints)
+        index._total_length = int(lengths.sum())
+        return index
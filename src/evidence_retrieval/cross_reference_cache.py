@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Cross-Reference Cache for TruthLens
+Thread-safe SQLite cache used by the SemanticCrossReferenceScorer.
+
+A single connection is shared by every thread (guarded by a lock) and pair
+similarity writes are buffered in memory and flushed in batched transactions
+instead of committing after every insert: when the buffer fills, and from a
+background timer so a quiet period never strands the last batch. The connection belongs to the
+process that opened it: pre-fork setup releases it in the master and each
+forked worker opens its own on first use.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from ..utils.prefork import register_connection_owner
+from ..utils.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER on older builds is 999
+_MAX_SQL_VARIABLES = 900
+
+
+def article_key(article_id: str) -> int:
+    """
+    Convert an article ID into a signed 64-bit integer key.
+
+    Article IDs produced by the scorer are 16 hex characters (64 bits of an
+    MD5 digest) and are decoded directly; any other string is hashed.
+
+    Args:
+        article_id: Article identifier
+
+    Returns:
+        Signed 64-bit integer suitable for an SQLite INTEGER column
+    """
+    try:
+        if len(article_id) == 16:
+            value = int(article_id, 16)
+        else:
+            raise ValueError
+    except ValueError:
+        digest = hashlib.blake2b(article_id.encode('utf-8'), digest_size=8).digest()
+        value = int.from_bytes(digest, 'big')
+
+    if value >= 1 << 63:
+        value -= 1 << 64
+    return value
+
+
+def canonical_pair(article1_id: str, article2_id: str) -> Tuple[str, str]:
+    """
+    Order an article pair so (a, b) and (b, a) share one cache entry.
+
+    Similarity is symmetric, so every pair is stored and looked up with the
+    lexicographically smaller ID first.
+
+    Args:
+        article1_id: First article ID
+        article2_id: Second article ID
+
+    Returns:
+        The pair in canonical order
+    """
+    if article2_id < article1_id:
+        return article2_id, article1_id
+    return article1_id, article2_id
+
+
+class CrossReferenceCache:
+    """
+    Thread-safe cache for article pair similarities and cross-reference results.
+
+    Features:
+    - One shared connection (check_same_thread=False) guarded by a lock
+    - WAL journal so readers are not blocked by the batched writer
+    - Pair similarities keyed by two 64-bit article-ID hashes in canonical order
+    - Buffered writes flushed in batched transactions, by size and by a timer
+    - Bulk prefetch of every cached pair for an article set in one query
+    - Connection reopened per process, so it never crosses fork()
+    """
+
+    def __init__(self,
+                 db_path: str = "cross_reference_cache.db",
+                 similarity_ttl_hours: int = 24,
+                 result_ttl_hours: int = 1,
+                 flush_batch_size: int = 256,
+                 flush_interval_seconds: float = 2.0):
+        """
+        Initialize the cross-reference cache.
+
+        Args:
+            db_path: Path to SQLite cache database
+            similarity_ttl_hours: Maximum age of cached pair similarities
+            result_ttl_hours: Maximum age of cached cross-reference results
+            flush_batch_size: Number of buffered writes that triggers a flush
+            flush_interval_seconds: Maximum time buffered writes wait before a flush
+        """
+        self.db_path = db_path
+        self.similarity_ttl = similarity_ttl_hours * 3600
+        self.result_ttl = result_ttl_hours * 3600
+        self.flush_batch_size = flush_batch_size
+        self.flush_interval = flush_interval_seconds
+
+        self._lock = threading.RLock()
+        self._pending_pairs: Dict[Tuple[int, int], Tuple[float, float]] = {}
+        self._last_flush = time.time()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._closed = False
+        self._flusher: Optional[threading.Thread] = None
+        self._flusher_pid: Optional[int] = None
+        self._flusher_stop = threading.Event()
+
+        if self.conn is not None:
+            logger.info("Cross-reference cache initialized")
+        register_connection_owner(self)
+
+    @property
+    def conn(self) -> Optional[sqlite3.Connection]:
+        """This process's connection, opened on first use; None if closed or unavailable."""
+        if self._closed:
+            return None
+        if self._conn is None or self._conn_pid != os.getpid():
+            with self._lock:
+                if self._conn is not None and self._conn_pid != os.getpid():
+                    # Inherited across fork: never use or close the parent's
+                    # connection, and leave its buffered writes to the parent
+                    self._conn = None
+                    self._pending_pairs.clear()
+                if self._conn is None:
+                    self._open()
+        return self._conn
+
+    def _open(self):
+        try:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn_pid = os.getpid()
+            self._create_tables()
+        except Exception as e:
+            logger.warning(f"Could not initialize cache: {e}")
+            self._conn = None
+            self._closed = True
+
+    @property
+    def available(self) -> bool:
+        """Whether the backing database could be opened."""
+        return self.conn is not None
+
+    def _create_tables(self):
+        """Create cache tables if they don't exist."""
+        with self._lock:
+            cursor = self.conn.cursor()
+            try:
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+            except sqlite3.DatabaseError as e:
+                logger.debug(f"Could not enable WAL mode: {e}")
+
+            # Pair similarities keyed by two 64-bit article hashes
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS pair_similarity (
+                    article1_key INTEGER NOT NULL,
+                    article2_key INTEGER NOT NULL,
+                    similarity_score REAL NOT NULL,
+                    timestamp REAL NOT NULL,
+                    PRIMARY KEY (article1_key, article2_key)
+                ) WITHOUT ROWID
+            """)
+
+            # Cache for cross-reference results
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS cross_reference_cache (
+                    query_hash TEXT PRIMARY KEY,
+                    results_json TEXT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            self.conn.commit()
+
+    def get_similarity(self, article1_id: str, article2_id: str) -> Optional[float]:
+        """
+        Get a cached similarity for an article pair.
+
+        Args:
+            article1_id: First article ID
+            article2_id: Second article ID
+
+        Returns:
+            Cached similarity score or None
+        """
+        article1_id, article2_id = canonical_pair(article1_id, article2_id)
+        key = (article_key(article1_id), article_key(article2_id))
+
+        with self._lock:
+            pending = self._pending_pairs.get(key)
+            if pending is not None:
+                return pending[0]
+            if not self.conn:
+                return None
+
+            try:
+                cursor = self.conn.execute("""
+                    SELECT similarity_score FROM pair_similarity
+                    WHERE article1_key = ? AND article2_key = ? AND timestamp > ?
+                """, (key[0], key[1], time.time() - self.similarity_ttl))
+                row = cursor.fetchone()
+            except Exception as e:
+                logger.warning(f"Similarity cache retrieval failed: {e}")
+                return None
+
+        return float(row[0]) if row else None
+
+    def put_similarity(self, article1_id: str, article2_id: str, similarity: float):
+        """
+        Buffer a pair similarity for the next batched write.
+
+        Args:
+            article1_id: First article ID
+            article2_id: Second article ID
+            similarity: Similarity score
+        """
+        article1_id, article2_id = canonical_pair(article1_id, article2_id)
+        key = (article_key(article1_id), article_key(article2_id))
+
+        with self._lock:
+            self._pending_pairs[key] = (float(similarity), time.time())
+            if (len(self._pending_pairs) >= self.flush_batch_size or
+                    time.time() - self._last_flush >= self.flush_interval):
+                self._flush_locked()
+            else:
+                self._ensure_flusher()
+
+    def _ensure_flusher(self):
+        """Start this process's flush timer; the caller must hold the lock."""
+        # A forked worker inherits the buffer's owner but not the thread
+        if self.flush_interval <= 0 or self._closed:
+            return
+        if self._flusher is not None and self._flusher_pid == os.getpid() and self._flusher.is_alive():
+            return
+        self._flusher_stop = threading.Event()
+        self._flusher_pid = os.getpid()
+        self._flusher = threading.Thread(target=self._flush_periodically, args=(self._flusher_stop,),
+                                         name="truthlens-xref-flush", daemon=True)
+        self._flusher.start()
+
+    def _flush_periodically(self, stop: threading.Event):
+        while not stop.wait(self.flush_interval):
+            with self._lock:
+                if self._pending_pairs and time.time() - self._last_flush >= self.flush_interval:
+                    self._flush_locked()
+
+    def _stop_flusher(self):
+        """Stop this process's flush timer; the caller must hold the lock."""
+        self._flusher_stop.set()
+        if self._flusher_pid == os.getpid():
+            self._flusher = None
+            self._flusher_pid = None
+
+    @traced("cache.cross_reference.prefetch")
+    def prefetch_similarities(self, article_ids: Iterable[str]) -> Dict[Tuple[str, str], float]:
+        """
+        Load every cached pair similarity among a set of articles.
+
+        Args:
+            article_ids: Article IDs in the set
+
+        Returns:
+            Mapping of canonically ordered (article1_id, article2_id) pairs to similarity score
+        """
+        id_by_key: Dict[int, str] = {}
+        for article_id in article_ids:
+            id_by_key[article_key(article_id)] = article_id
+
+        results: Dict[Tuple[str, str], float] = {}
+        if not id_by_key:
+            return results
+
+        keys = list(id_by_key)
+        cutoff = time.time() - self.similarity_ttl
+
+        with self._lock:
+            if self.conn:
+                # One query for typical sets; chunked only when the set exceeds
+                # SQLite's bound-variable limit
+                chunk_size = max(1, (_MAX_SQL_VARIABLES - 1) // 2)
+                try:
+                    for start in range(0, len(keys), chunk_size):
+                        left = keys[start:start + chunk_size]
+                        for right_start in range(0, len(keys), chunk_size):
+                            right = keys[right_start:right_start + chunk_size]
+                            cursor = self.conn.execute(f"""
+                                SELECT article1_key, article2_key, similarity_score
+                                FROM pair_similarity
+                                WHERE article1_key IN ({','.join('?' * len(left))})
+                                  AND article2_key IN ({','.join('?' * len(right))})
+                                  AND timestamp > ?
+                            """, (*left, *right, cutoff))
+                            for key1, key2, score in cursor.fetchall():
+                                pair = canonical_pair(id_by_key[key1], id_by_key[key2])
+                                results[pair] = float(score)
+                except Exception as e:
+                    logger.warning(f"Similarity prefetch failed: {e}")
+
+            for (key1, key2), (score, _) in self._pending_pairs.items():
+                if key1 in id_by_key and key2 in id_by_key:
+                    results[canonical_pair(id_by_key[key1], id_by_key[key2])] = score
+
+        return results
+
+    @traced("cache.cross_reference.get")
+    def get_result(self, cache_key: str) -> Optional[List[Dict[str, Any]]]:
+        """Get cached cross-reference results as a list of dictionaries."""
+        if not self.conn:
+            return None
+
+        with self._lock:
+            try:
+                cursor = self.conn.execute("""
+                    SELECT results_json FROM cross_reference_cache
+                    WHERE query_hash = ? AND timestamp > datetime('now', ?)
+                """, (cache_key, f"-{int(self.result_ttl)} seconds"))
+                row = cursor.fetchone()
+            except Exception as e:
+                logger.warning(f"Cache retrieval failed: {e}")
+                return None
+
+        return json.loads(row[0]) if row else None
+
+    @traced("cache.cross_reference.put")
+    def put_result(self, cache_key: str, results: List[Dict[str, Any]]):
+        """Store cross-reference results together with any buffered pair writes."""
+        if not self.conn:
+            return
+
+        with self._lock:
+            try:
+                self.conn.execute("""
+                    INSERT OR REPLACE INTO cross_reference_cache (query_hash, results_json, timestamp)
+                    VALUES (?, ?, datetime('now'))
+                """, (cache_key, json.dumps(results)))
+                self._flush_locked(commit=False)
+                self.conn.commit()
+            except Exception as e:
+                logger.warning(f"Cache storage failed: {e}")
+
+    def flush(self):
+        """Write buffered pair similarities in one transaction."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self, commit: bool = True):
+        """Flush buffered writes; the caller must hold the lock."""
+        self._last_flush = time.time()
+        if not self._pending_pairs or not self.conn:
+            return
+
+        rows = [(k1, k2, score, ts) for (k1, k2), (score, ts) in self._pending_pairs.items()]
+        try:
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO pair_similarity
+                (article1_key, article2_key, similarity_score, timestamp)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+            if commit:
+                self.conn.commit()
+            self._pending_pairs.clear()
+        except Exception as e:
+            logger.warning(f"Similarity cache storage failed: {e}")
+
+    def cleanup(self, max_age_hours: int = 24):
+        """Remove cache entries older than the given age."""
+        if not self.conn:
+            return
+
+        with self._lock:
+            try:
+                self._flush_locked(commit=False)
+                self.conn.execute("DELETE FROM pair_similarity WHERE timestamp < ?",
+                                  (time.time() - max_age_hours * 3600,))
+                self.conn.execute("DELETE FROM cross_reference_cache WHERE timestamp < datetime('now', ?)",
+                                  (f"-{int(max_age_hours)} hours",))
+                self.conn.commit()
+            except Exception as e:
+                logger.warning(f"Cache cleanup failed: {e}")
+
+    def release_connections(self):
+        """Flush and close this process's connection; the next use reopens it."""
+        with self._lock:
+            self._stop_flusher()
+            if self._conn is None or self._conn_pid != os.getpid():
+                return
+            self._flush_locked()
+            self._conn.close()
+            self._conn = None
+            self._conn_pid = None
+
+    def close(self):
+        """Flush pending writes and close the connection."""
+        with self._lock:
+            self.release_connections()
+            self._closed = True
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Embedding Cache for TruthLens
+Caches document embeddings by document ID and content hash, so re-indexing
+a corpus only encodes documents that are new or whose text changed.
+
+Usage:
+    cache = EmbeddingCache("sentence-transformers/all-MiniLM-L6-v2")
+    keys = [(doc.id, content_hash(text)) for doc, text in ...]
+    vectors = cache.encode(model, keys, texts)     # encodes cache misses only
+    cache.save("data/processed/dense_embeddings.npz")
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str]
+
+
+def content_hash(text: str) -> str:
+    """Hash of the text a document is embedded from."""
+    return hashlib.md5(text.encode('utf-8')).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Thread-safe LRU cache of embedding vectors keyed by (document ID, content hash).
+
+    A cache belongs to one embedding model; vectors from different models are
+    not comparable, so the model name is stored with a saved cache and checked
+    on load.
+    """
+
+    def __init__(self, model_name: str, max_entries: Optional[int] = 100_000):
+        """
+        Initialize the cache.
+
+        Args:
+            model_name: Embedding model the vectors come from
+            max_entries: Least recently used entries beyond this are evicted; None for no limit
+        """
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._vectors: "OrderedDict[CacheKey, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._vectors)
+
+    def get(self, key: CacheKey) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._vectors.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._vectors.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, key: CacheKey, vector: np.ndarray):
+        with self._lock:
+            self._vectors[key] = np.array(vector, dtype=np.float32)
+            self._vectors.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self._vectors) > self.max_entries:
+                    self._vectors.popitem(last=False)
+
+    def encode(self, encoder: Any, keys: Sequence[CacheKey], texts: Sequence[str],
+               **encode_kwargs: Any) -> np.ndarray:
+        """
+        Embeddings for ``texts``, encoding only the ones missing from the cache.
+
+        Args:
+            encoder: Object with a SentenceTransformer-style ``encode(texts, **kwargs)``
+            keys: Cache key per text
+            texts: Texts to embed, aligned with keys
+            encode_kwargs: Passed to ``encoder.encode``
+
+        Returns:
+            float32 matrix with one row per text
+        """
+        vectors: List[Optional[np.ndarray]] = [self.get(key) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            encoded = np.asarray(encoder.encode([texts[i] for i in missing], **encode_kwargs), dtype=np.float32)
+            for i, row in zip(missing, encoded):
+                self.put(keys[i], row)
+                vectors[i] = row
+        if not vectors:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.vstack(vectors).astype(np.float32, copy=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._vectors),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def save(self, path: Union[str, Path]):
+        """Write the cache to ``path`` atomically."""
+        path = Path(path)
+        with self._lock:
+            keys = list(self._vectors)
+            matrix = np.vstack(list(self._vectors.values())) if keys else np.empty((0, 0), dtype=np.float32)
+        meta = {"model_name": self.model_name, "keys": keys}
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8), vectors=matrix)
+        os.replace(tmp_path, path)
+        logger.info(f"Saved {len(keys)} cached embeddings to {path}")
+
+    @classmethod
+    def load(cls, path: Union[str, Path], model_name: str,
+             max_entries: Optional[int] = 100_000) -> "EmbeddingCache":
+        """
+        Read a cache written by ``save``.
+
+        Raises:
+            ValueError: If the cache was built with a different model
+        """
+        with np.load(str(path), allow_pickle=False) as data:
+            meta = json.loads(bytes(data["meta"]).decode("utf-8"))
+            vectors = data["vectors"]
+        if meta.get("model_name") != model_name:
+            raise ValueError(f"Embedding cache {path} was built with {meta.get('model_name')}, not {model_name}")
+
+        cache = cls(model_name, max_entries=max_entries)
+        for key, vector in zip(meta["keys"], vectors):
+            cache.put((key[0], key[1]), vector)
+        return cache
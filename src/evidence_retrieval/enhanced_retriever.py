@@ -13,19 +13,17 @@ from typing import List, Dict, Optional, Tuple, Any, Union
 from dataclasses import dataclass, field
 from datetime import datetime
 import re
+import zlib
 
 import numpy as np
-from sentence_transformers import SentenceTransformer, CrossEncoder
+from sentence_transformers import SentenceTransformer
 import torch
 
-# Optional dependencies
-try:
-    from rank_bm25 import BM25Okapi
-    BM25_AVAILABLE = True
-except ImportError:
-    BM25_AVAILABLE = False
-    BM25Okapi = None
+from .bm25_index import InvertedBM25Index
+from .embedding_cache import EmbeddingCache, content_hash
+from .rerank_service import RerankerUnavailable, get_reranker
 
+# Optional dependencies
 try:
     from elasticsearch import Elasticsearch
     ELASTICSEARCH_AVAILABLE = True
@@ -66,31 +64,79 @@ class RetrievalResult:
 
 
 class BM25Retriever:
-    """BM25-based keyword retrieval"""
+    """BM25-based keyword retrieval over an incremental inverted index"""
     
-    def __init__(self, documents: List[EvidenceDocument] = None):
+    def __init__(self, documents: List[EvidenceDocument] = None, index_path: Optional[str] = None):
+        """
+        Args:
+            documents: Documents to index
+            index_path: File the index is loaded from and saved to; only new
+                or changed documents are re-tokenized when it exists
+        """
         self.documents = documents or []
-        self.bm25 = None
-        self.tokenized_docs = []
+        self.index_path = Path(index_path) if index_path else None
+        self.index = InvertedBM25Index()
+        self._documents_by_id: Dict[str, EvidenceDocument] = {}
         self._build_index()
     
     def _build_index(self):
-        """Build BM25 index from documents"""
-        if not self.documents:
-            return
+        """Load the persisted index and bring it in line with the documents"""
+        if self.index_path and self.index_path.exists():
+            try:
+                self.index = InvertedBM25Index.load(self.index_path)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Could not load BM25 index from {self.index_path}, rebuilding: {e}")
+                self.index = InvertedBM25Index()
         
-        # Tokenize documents
-        self.tokenized_docs = []
-        for doc in self.documents:
-            tokens = self._tokenize(f"{doc.title} {doc.content}")
-            self.tokenized_docs.append(tokens)
+        self._documents_by_id = {}
+        changed = self._index_documents(self.documents)
         
-        # Build BM25 index
-        if BM25_AVAILABLE and self.tokenized_docs:
-            self.bm25 = BM25Okapi(self.tokenized_docs)
-            logger.info(f"Built BM25 index with {len(self.documents)} documents")
-        else:
-            logger.warning("BM25 not available, using fallback")
+        # Documents saved with the index that are no longer in the corpus
+        for doc_id in self.index.doc_ids():
+            if doc_id not in self._documents_by_id:
+                self.index.remove(doc_id)
+                changed += 1
+        
+        if changed and self.index_path:
+            self.save()
+        if self.documents:
+            logger.info(f"BM25 index ready with {len(self.index)} documents ({changed} indexed)")
+    
+    def _index_documents(self, documents: List[EvidenceDocument]) -> int:
+        """Index documents that are new or whose content changed; returns how many"""
+        changed = 0
+        for doc in documents:
+            text = f"{doc.title} {doc.content}"
+            fingerprint = zlib.crc32(text.encode('utf-8'))
+            self._documents_by_id[doc.id] = doc
+            if self.index.fingerprint(doc.id) != fingerprint:
+                self.index.add(doc.id, self._tokenize(text), fingerprint)
+                changed += 1
+        return changed
+    
+    def add_documents(self, documents: List[EvidenceDocument]):
+        """Index new documents and replace re-added IDs, without touching the rest of the corpus"""
+        positions = {doc.id: i for i, doc in enumerate(self.documents)}
+        for doc in documents:
+            if doc.id in positions:
+                self.documents[positions[doc.id]] = doc
+            else:
+                positions[doc.id] = len(self.documents)
+                self.documents.append(doc)
+        self._index_documents(documents)
+    
+    def remove_documents(self, doc_ids: List[str]):
+        """Remove documents from the corpus and the index"""
+        removed = set(doc_ids)
+        for doc_id in removed:
+            self.index.remove(doc_id)
+            self._documents_by_id.pop(doc_id, None)
+        self.documents = [doc for doc in self.documents if doc.id not in removed]
+    
+    def save(self):
+        """Persist the index to index_path"""
+        if self.index_path:
+            self.index.save(self.index_path)
     
     def _tokenize(self, text: str) -> List[str]:
         """Simple tokenization"""
@@ -100,29 +146,16 @@ class BM25Retriever:
     
     def search(self, query: str, top_k: int = 10) -> List[RetrievalResult]:
         """Search using BM25"""
-        if not self.bm25 or not self.documents:
-            return []
-        
-        query_tokens = self._tokenize(query)
-        scores = self.bm25.get_scores(query_tokens)
-        
-        # Create results
-        results = []
-        for i, score in enumerate(scores):
-            if score > 0:
-                results.append(RetrievalResult(
-                    document=self.documents[i],
-                    score=float(score),
-                    method="BM25",
-                    rank=0  # Will be set later
-                ))
-        
-        # Sort by score and assign ranks
-        results.sort(key=lambda x: x.score, reverse=True)
-        for i, result in enumerate(results[:top_k]):
-            result.rank = i + 1
-        
-        return results[:top_k]
+        hits = self.index.search(self._tokenize(query), top_k)
+        return [
+            RetrievalResult(
+                document=self._documents_by_id[doc_id],
+                score=score,
+                method="BM25",
+                rank=i + 1
+            )
+            for i, (doc_id, score) in enumerate(hits)
+        ]
 
 
 class ElasticsearchRetriever:
@@ -259,14 +292,30 @@ class DenseRetriever:
         self,
         model_name: str = "sentence-transformers/msmarco-MiniLM-L-6-v2",
         documents: List[EvidenceDocument] = None,
-        use_gpu: bool = True
+        use_gpu: bool = True,
+        embedding_cache: Optional[EmbeddingCache] = None
     ):
+        """
+        Args:
+            model_name: Sentence transformer model
+            documents: Documents to index
+            use_gpu: Encode on GPU when available
+            embedding_cache: Cache of document embeddings for this model; a
+                private one is created when omitted
+        """
+        if embedding_cache is not None and embedding_cache.model_name != model_name:
+            raise ValueError(f"Embedding cache is for {embedding_cache.model_name}, not {model_name}")
         self.model_name = model_name
         self.documents = documents or []
         self.use_gpu = use_gpu and torch.cuda.is_available()
+        self.embedding_cache = embedding_cache or EmbeddingCache(model_name)
         self.model = None
         self.embeddings = None
         self.index = None
+        # Content hash of every indexed document, by ID
+        self._content_hashes: Dict[str, str] = {}
+        # Rows of self.embeddings live in a larger buffer so appends are amortized
+        self._embedding_buffer: Optional[np.ndarray] = None
         self._initialize()
     
     def _initialize(self):
@@ -282,30 +331,95 @@ class DenseRetriever:
         except Exception as e:
             logger.error(f"Failed to initialize dense retriever: {e}")
     
+    @staticmethod
+    def _document_text(doc: EvidenceDocument) -> str:
+        return f"{doc.title} {doc.content}"
+    
+    def _encode_documents(self, documents: List[EvidenceDocument]) -> np.ndarray:
+        """L2-normalized embeddings; only documents missing from the cache are encoded"""
+        texts = [self._document_text(doc) for doc in documents]
+        keys = [(doc.id, content_hash(text)) for doc, text in zip(documents, texts)]
+        embeddings = self.embedding_cache.encode(self.model, keys, texts, show_progress_bar=len(texts) > 1000)
+        embeddings = np.ascontiguousarray(embeddings, dtype='float32')
+        faiss.normalize_L2(embeddings)
+        return embeddings
+    
+    def _set_embeddings(self, embeddings: np.ndarray):
+        self._embedding_buffer = embeddings
+        self.embeddings = embeddings
+    
+    def _append_embeddings(self, embeddings: np.ndarray):
+        rows = 0 if self.embeddings is None else len(self.embeddings)
+        needed = rows + len(embeddings)
+        if self._embedding_buffer is None or len(self._embedding_buffer) < needed:
+            grown = np.empty((max(needed, 2 * rows), embeddings.shape[1]), dtype='float32')
+            if rows:
+                grown[:rows] = self.embeddings
+            self._embedding_buffer = grown
+        self._embedding_buffer[rows:needed] = embeddings
+        self.embeddings = self._embedding_buffer[:needed]
+    
     def _build_index(self):
         """Build FAISS index for documents"""
         if not FAISS_AVAILABLE or not self.documents:
             return
         
         try:
-            # Create document texts
-            texts = [f"{doc.title} {doc.content}" for doc in self.documents]
-            
-            # Compute embeddings
-            self.embeddings = self.model.encode(texts, show_progress_bar=True)
+            # Cached embeddings are reused; only new or edited documents are encoded
+            embeddings = self._encode_documents(self.documents)
             
-            # Build FAISS index
-            dimension = self.embeddings.shape[1]
-            self.index = faiss.IndexFlatIP(dimension)  # Inner product for cosine similarity
-            
-            # Normalize embeddings for cosine similarity
-            faiss.normalize_L2(self.embeddings)
-            self.index.add(self.embeddings.astype('float32'))
+            # Build FAISS index (inner product of normalized vectors is cosine similarity)
+            self.index = faiss.IndexFlatIP(embeddings.shape[1])
+            self.index.add(embeddings)
+            self._set_embeddings(embeddings)
+            self._content_hashes = {doc.id: content_hash(self._document_text(doc)) for doc in self.documents}
             
             logger.info(f"Built FAISS index with {len(self.documents)} documents")
         except Exception as e:
             logger.error(f"Failed to build FAISS index: {e}")
     
+    def add_documents(self, documents: List[EvidenceDocument]):
+        """
+        Append documents to the index, encoding only the new ones.
+        
+        Documents already indexed with the same content are skipped. A
+        document whose content changed replaces its old version, which
+        rebuilds the index from cached embeddings.
+        """
+        new_docs: List[EvidenceDocument] = []
+        new_hashes: Dict[str, str] = {}
+        replaced = set()
+        for doc in documents:
+            digest = content_hash(self._document_text(doc))
+            known = new_hashes.get(doc.id, self._content_hashes.get(doc.id))
+            if known == digest:
+                continue
+            if known is not None:
+                replaced.add(doc.id)
+            new_docs.append(doc)
+            new_hashes[doc.id] = digest
+        
+        if not new_docs:
+            return
+        
+        if replaced or self.index is None:
+            kept = [doc for doc in self.documents if doc.id not in replaced]
+            latest = {doc.id: doc for doc in new_docs}
+            self.documents = kept + list(latest.values())
+            if self.model is not None:
+                self._build_index()
+            return
+        
+        try:
+            embeddings = self._encode_documents(new_docs)
+            self.index.add(embeddings)
+            self._append_embeddings(embeddings)
+            self.documents.extend(new_docs)
+            self._content_hashes.update(new_hashes)
+            logger.info(f"Appended {len(new_docs)} documents to FAISS index ({self.index.ntotal} total)")
+        except Exception as e:
+            logger.error(f"Failed to append to FAISS index: {e}")
+    
     def search(self, query: str, top_k: int = 10) -> List[RetrievalResult]:
         """Search using dense retrieval"""
         if not self.index or not self.documents:
@@ -340,49 +454,41 @@ class DenseRetriever:
 
 
 class CrossEncoderReranker:
-    """Cross-encoder for reranking results"""
+    """Cross-encoder for reranking results, backed by the shared rerank service"""
     
     def __init__(self, model_name: str = "cross-encoder/msmarco-MiniLM-L-6-v2"):
         self.model_name = model_name
-        self.model = None
+        self.service = get_reranker(model_name)
         self._initialize()
     
     def _initialize(self):
-        """Initialize cross-encoder"""
+        """Load the cross-encoder into the resident service"""
         try:
-            self.model = CrossEncoder(self.model_name)
+            self.service.load()
             logger.info(f"Loaded cross-encoder: {self.model_name}")
-        except Exception as e:
+        except RerankerUnavailable as e:
             logger.error(f"Failed to load cross-encoder: {e}")
     
     def rerank(self, query: str, results: List[RetrievalResult], top_k: int = 10) -> List[RetrievalResult]:
         """Rerank results using cross-encoder"""
-        if not self.model or not results:
+        if not results:
             return results
         
         try:
-            # Prepare pairs for cross-encoder
-            pairs = []
-            for result in results:
-                text = f"{result.document.title} {result.document.content}"
-                pairs.append([query, text])
-            
-            # Get scores
-            scores = self.model.predict(pairs)
+            texts = [f"{result.document.title} {result.document.content}" for result in results]
+            ranked = self.service.rerank(query, texts, top_k=top_k, fallback=False)
             
-            # Update results with cross-encoder scores
-            for result, score in zip(results, scores):
-                result.score = float(score)
+            reranked = []
+            for rank, (index, score) in enumerate(ranked, 1):
+                result = results[index]
+                result.score = score
                 result.method = "CrossEncoder"
+                result.rank = rank
+                reranked.append(result)
             
-            # Sort by new scores
-            results.sort(key=lambda x: x.score, reverse=True)
-            
-            # Update ranks
-            for i, result in enumerate(results[:top_k]):
-                result.rank = i + 1
-            
-            return results[:top_k]
+            return reranked
+        except RerankerUnavailable:
+            return results
         except Exception as e:
             logger.error(f"Cross-encoder reranking failed: {e}")
             return results
@@ -403,10 +509,20 @@ class EnhancedEvidenceRetriever:
         elasticsearch_config: Dict = None,
         dense_model: str = "sentence-transformers/msmarco-MiniLM-L-6-v2",
         cross_encoder_model: str = "cross-encoder/msmarco-MiniLM-L-6-v2",
-        use_gpu: bool = True
+        use_gpu: bool = True,
+        embedding_cache_path: Optional[str] = None,
+        bm25_index_path: Optional[str] = None
     ):
+        self.embedding_cache_path = Path(embedding_cache_path) if embedding_cache_path else None
+        embedding_cache = None
+        if self.embedding_cache_path and self.embedding_cache_path.exists():
+            try:
+                embedding_cache = EmbeddingCache.load(self.embedding_cache_path, dense_model)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring embedding cache {self.embedding_cache_path}: {e}")
+        
         # Initialize retrievers
-        self.bm25_retriever = BM25Retriever(bm25_documents) if BM25_AVAILABLE else None
+        self.bm25_retriever = BM25Retriever(list(bm25_documents or []), index_path=bm25_index_path)
         
         if elasticsearch_config:
             self.elasticsearch_retriever = ElasticsearchRetriever(**elasticsearch_config)
@@ -415,8 +531,9 @@ class EnhancedEvidenceRetriever:
         
         self.dense_retriever = DenseRetriever(
             model_name=dense_model,
-            documents=bm25_documents,
-            use_gpu=use_gpu
+            documents=list(bm25_documents or []),
+            use_gpu=use_gpu,
+            embedding_cache=embedding_cache
         )
         
         self.cross_encoder = CrossEncoderReranker(cross_encoder_model)
@@ -484,17 +601,22 @@ class EnhancedEvidenceRetriever:
     def add_documents(self, documents: List[EvidenceDocument]):
         """Add documents to all retrievers"""
         if self.bm25_retriever:
-            self.bm25_retriever.documents.extend(documents)
-            self.bm25_retriever._build_index()
+            self.bm25_retriever.add_documents(documents)
         
         if self.dense_retriever:
-            self.dense_retriever.documents.extend(documents)
-            self.dense_retriever._build_index()
+            self.dense_retriever.add_documents(documents)
         
         if self.elasticsearch_retriever:
             self.elasticsearch_retriever.index_documents(documents)
         
         logger.info(f"Added {len(documents)} documents to retrievers")
+    
+    def save(self):
+        """Persist the BM25 index and the dense embedding cache, where paths were given"""
+        if self.bm25_retriever:
+            self.bm25_retriever.save()
+        if self.dense_retriever and self.embedding_cache_path:
+            self.dense_retriever.embedding_cache.save(self.embedding_cache_path)
 
 
 def create_sample_documents() -> List[EvidenceDocument]:
@@ -11,6 +11,9 @@ import hashlib
 import re
 from collections import defaultdict
 
+from ..utils.document_analysis import document_analysis_scope, jaccard_similarity
+from ..utils.tracing import traced
+
 try:
     from sentence_transformers import SentenceTransformer
     from sklearn.metrics.pairwise import cosine_similarity
@@ -68,6 +71,12 @@ class EnhancedSemanticSearch:
         self.max_cluster_size = 5  # Maximum articles per cluster
         self.min_cluster_similarity = 0.8  # Minimum similarity for clustering
     
+    def warm_up(self):
+        """Run one dummy embedding pass so the first request skips lazy initialization."""
+        if self.semantic_model:
+            self.semantic_model.encode(["the sky is blue", "The sky appears blue during the day."])
+    
+    @traced("semantic_search.rank")
     def search_and_rank_articles(self, 
                                 claim: str, 
                                 articles: List[Dict[str, Any]], 
@@ -86,21 +95,23 @@ class EnhancedSemanticSearch:
         if not articles:
             return []
         
-        # Step 1: Preprocess articles
-        processed_articles = self._preprocess_articles(articles)
-        
-        # Step 2: Calculate semantic similarity if model available
-        if self.semantic_model and processed_articles:
-            processed_articles = self._add_semantic_scores(claim, processed_articles)
-        
-        # Step 3: Deduplicate articles
-        unique_articles = self._deduplicate_articles(processed_articles)
-        
-        # Step 4: Cluster similar articles
-        clustered_articles = self._cluster_articles(unique_articles)
-        
-        # Step 5: Rank by relevance
-        ranked_articles = self._rank_by_relevance(clustered_articles)
+        # Article texts are tokenized once and shared by every pairwise comparison
+        with document_analysis_scope():
+            # Step 1: Preprocess articles
+            processed_articles = self._preprocess_articles(articles)
+            
+            # Step 2: Calculate semantic similarity if model available
+            if self.semantic_model and processed_articles:
+                processed_articles = self._add_semantic_scores(claim, processed_articles)
+            
+            # Step 3: Deduplicate articles
+            unique_articles = self._deduplicate_articles(processed_articles)
+            
+            # Step 4: Cluster similar articles
+            clustered_articles = self._cluster_articles(unique_articles)
+            
+            # Step 5: Rank by relevance
+            ranked_articles = self._rank_by_relevance(clustered_articles)
         
         return ranked_articles[:max_results]
     
@@ -295,19 +306,8 @@ class EnhancedSemanticSearch:
     
     def _calculate_text_similarity(self, text1: str, text2: str) -> float:
         """Calculate simple text similarity using word overlap."""
-        if not text1 or not text2:
-            return 0.0
-        
-        words1 = set(text1.split())
-        words2 = set(text2.split())
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
-        
-        return len(intersection) / len(union) if union else 0.0
+        # Token sets are built once per text for the whole request
+        return jaccard_similarity(text1, text2)
     
     def _rank_by_relevance(self, articles: List[Dict[str, Any]]) -> List[EnhancedSearchResult]:
         """Rank articles by relevance to the claim."""
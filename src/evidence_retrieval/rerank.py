@@ -9,38 +9,32 @@ from __future__ import annotations
 
 from typing import List, Tuple
 
-import torch
-from transformers import AutoModelForSequenceClassification, AutoTokenizer
-
 # Schemas
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 from schemas.evidence import TextChunk  # type: ignore
+from .rerank_service import get_reranker
 
 MODEL_NAME = "BAAI/bge-reranker-v2-m3"
 
 
 class Reranker:
-	"""Scores (claim, chunk_text) pairs and sorts by relevance."""
+	"""Scores (claim, chunk_text) pairs and sorts by relevance.
+
+	Backed by the resident rerank service, so the model is loaded once per
+	process and pairs are batched and cached across callers.
+	"""
 
 	def __init__(self, model_name: str = MODEL_NAME, device: str | None = None):
-		self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
-		self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-		self.model = AutoModelForSequenceClassification.from_pretrained(model_name).to(self.device)
-		self.model.eval()
+		self.model_name = model_name
+		self.service = get_reranker(model_name, device=device)
+		# Fail fast like a direct model load would
+		self.service.load()
 
-	@torch.no_grad()
 	def score_pairs(self, claim: str, chunks: List[TextChunk], batch_size: int = 8) -> List[float]:
-		scores: List[float] = []
-		for i in range(0, len(chunks), batch_size):
-			batch = chunks[i : i + batch_size]
-			pairs = [[claim, c.text] for c in batch]
-			inputs = self.tokenizer(pairs, padding=True, truncation=True, max_length=512, return_tensors="pt").to(self.device)
-			logits = self.model(**inputs).logits.view(-1)
-			batch_scores = logits.detach().cpu().tolist()
-			scores.extend(batch_scores)
-		return scores
+		# batch_size is kept for compatibility; the service batches across callers
+		return self.service.score(claim, [c.text for c in chunks], fallback=False)
 
 	def rerank(self, claim: str, chunks: List[TextChunk], top_k: int | None = None) -> List[Tuple[TextChunk, float]]:
 		scores = self.score_pairs(claim, chunks)
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Resident Reranking Service for TruthLens
+One process-wide cross-encoder service per model, shared by evidence
+selection, the enhanced retriever and the Phase 3 reranker.
+
+- The model is loaded once and stays resident; a failed load is retried
+  after a back-off instead of on every call.
+- (claim, passage) pairs from concurrent callers are micro-batched by a
+  worker thread: a batch closes when it reaches ``max_batch_size`` pairs or
+  ``max_wait_ms`` after its first request arrived.
+- Scores are cached by model and hashes of the claim and the passage.
+- Optionally a cheap first-pass model (e.g. MiniLM) scores every candidate
+  and only the best ``first_pass_top_n`` reach the heavyweight model.
+
+Usage:
+    service = get_reranker("cross-encoder/roberta-large-ms-marco")
+    service.rerank(claim, passages, top_k=5)     # [(passage index, score), ...]
+
+Environment:
+    TRUTHLENS_RERANK_FIRST_PASS        first-pass model name (off when unset)
+    TRUTHLENS_RERANK_FIRST_PASS_TOP_N  candidates kept by the first pass (default 30)
+    TRUTHLENS_RERANK_BATCH_SIZE        pairs per model call (default 32)
+    TRUTHLENS_RERANK_MAX_WAIT_MS       batching window (default 2)
+    TRUTHLENS_RERANK_CACHE_SIZE        cached pair scores (default 50000)
+"""
+
+import hashlib
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "cross-encoder/roberta-large-ms-marco"
+DEFAULT_FIRST_PASS_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+LOAD_RETRY_SECONDS = 60.0
+
+Pair = Tuple[str, str]
+
+
+class RerankerUnavailable(Exception):
+    """Raised when the reranking model cannot be loaded."""
+
+
+def _load_cross_encoder(model_name: str, device: Optional[str] = None) -> Any:
+    """Default loader: a sentence-transformers CrossEncoder."""
+    if os.environ.get("TRUTHLENS_FORCE_OFFLINE", "0") == "1":
+        raise RerankerUnavailable("TRUTHLENS_FORCE_OFFLINE=1")
+    from sentence_transformers import CrossEncoder
+    return CrossEncoder(model_name, device=device)
+
+
+def overlap_scores(claim: str, passages: Sequence[str]) -> List[float]:
+    """Token Jaccard overlap; the offline stand-in for cross-encoder scores."""
+    claim_set = set((claim or "").lower().split())
+    scores = []
+    for passage in passages:
+        tokens = set((passage or "").lower().split())
+        inter = len(claim_set & tokens)
+        denom = max(1, len(claim_set) + len(tokens) - inter)
+        scores.append(float(inter / denom))
+    return scores
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b((text or "").encode("utf-8"), digest_size=16).digest()
+
+
+class _ScoreCache:
+    """Thread-safe LRU of pair scores keyed by (model, claim hash, passage hash)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._scores: "OrderedDict[Tuple[str, bytes, bytes], float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> Optional[float]:
+        with self._lock:
+            score = self._scores.get(key)
+            if score is None:
+                self.misses += 1
+                return None
+            self._scores.move_to_end(key)
+            self.hits += 1
+            return score
+
+    def put(self, key, score: float):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._scores[key] = score
+            self._scores.move_to_end(key)
+            while len(self._scores) > self.max_entries:
+                self._scores.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._scores)
+
+
+class _Request:
+    __slots__ = ("pairs", "future")
+
+    def __init__(self, pairs: List[Pair]):
+        self.pairs = pairs
+        self.future: Future = Future()
+
+
+class _ModelWorker:
+    """One resident model plus the thread that micro-batches its requests."""
+
+    def __init__(self, model_name: str, loader: Callable[..., Any], device: Optional[str],
+                 max_batch_size: int, max_wait: float):
+        self.model_name = model_name
+        self.loader = loader
+        self.device = device
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self.model: Any = None
+        self.load_seconds: Optional[float] = None
+        self.load_error: Optional[str] = None
+        self._retry_at = 0.0
+        self._load_lock = threading.Lock()
+
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._thread_lock = threading.Lock()
+        self.batches = 0
+        self.batched_pairs = 0
+
+    def load(self) -> Any:
+        """Load the model once; failures are retried after LOAD_RETRY_SECONDS."""
+        if self.model is not None:
+            return self.model
+        with self._load_lock:
+            if self.model is not None:
+                return self.model
+            if self.load_error and time.monotonic() < self._retry_at:
+                raise RerankerUnavailable(self.load_error)
+            start = time.perf_counter()
+            try:
+                self.model = self.loader(self.model_name, self.device)
+            except Exception as e:
+                self.load_error = f"{type(e).__name__}: {e}"
+                self._retry_at = time.monotonic() + LOAD_RETRY_SECONDS
+                logger.warning(f"Reranker '{self.model_name}' unavailable: {self.load_error}")
+                raise RerankerUnavailable(self.load_error) from e
+            self.load_seconds = time.perf_counter() - start
+            self.load_error = None
+            logger.info(f"Loaded reranker '{self.model_name}' in {self.load_seconds:.2f}s")
+            return self.model
+
+    def predict(self, pairs: List[Pair]) -> List[float]:
+        """Score pairs directly in the calling thread."""
+        model = self.load()
+        with span("rerank.predict", model=self.model_name, pairs=len(pairs)):
+            scores = model.predict(pairs, batch_size=self.max_batch_size)
+        return [float(s) for s in scores]
+
+    def submit(self, pairs: List[Pair]) -> List[float]:
+        """Score pairs in the next micro-batch and wait for the result."""
+        if self.model is None:
+            # Load (or fail) in the caller so an unavailable model is not queued
+            self.load()
+        self._ensure_thread()
+        request = _Request(pairs)
+        self._queue.put(request)
+        return request.future.result()
+
+    def _ensure_thread(self):
+        # A worker forked from a pre-loaded master inherits the model but not the thread
+        with self._thread_lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._queue = queue.Queue()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name=f"truthlens-rerank-{self.model_name}",
+                                            daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        requests_queue = self._queue
+        while True:
+            first = requests_queue.get()
+            if first is None:
+                return
+            batch = [first]
+            size = len(first.pairs)
+            deadline = time.monotonic() + self.max_wait
+            closing = False
+            while size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = requests_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    closing = True
+                    break
+                batch.append(request)
+                size += len(request.pairs)
+            self._process(batch)
+            if closing:
+                return
+
+    def _process(self, batch: List[_Request]):
+        # Identical pairs from different callers are scored once
+        unique: Dict[Pair, int] = {}
+        for request in batch:
+            for pair in request.pairs:
+                unique.setdefault(pair, len(unique))
+        try:
+            scores = self.predict(list(unique))
+        except BaseException as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+        self.batches += 1
+        self.batched_pairs += len(unique)
+        for request in batch:
+            request.future.set_result([scores[unique[pair]] for pair in request.pairs])
+
+    def close(self):
+        with self._thread_lock:
+            if self._thread is not None and self._thread.is_alive():
+                self._queue.put(None)
+                self._thread.join(timeout=5)
+            self._thread = None
+
+
+class RerankService:
+    """
+    Resident cross-encoder reranker with micro-batching, a score cache and an
+    optional cheap first pass.
+
+    When the model cannot be loaded, scores fall back to token overlap unless
+    the caller asks for ``fallback=False``, in which case RerankerUnavailable
+    is raised.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, first_pass_model: Optional[str] = None,
+                 first_pass_top_n: int = 30, max_batch_size: int = 32, max_wait_ms: float = 2.0,
+                 cache_size: int = 50_000, device: Optional[str] = None,
+                 loader: Optional[Callable[..., Any]] = None):
+        """
+        Initialize the service; models load on first use or in ``warm_up``.
+
+        Args:
+            model_name: Heavyweight cross-encoder
+            first_pass_model: Cheap cross-encoder that pre-filters candidates; None to disable
+            first_pass_top_n: Candidates the first pass hands to the heavyweight model
+            max_batch_size: Most pairs per model call
+            max_wait_ms: How long a batch waits for more callers after its first request
+            cache_size: Pair scores kept in the LRU cache; 0 disables caching
+            device: Torch device for the models
+            loader: ``loader(model_name, device)`` returning an object with ``predict(pairs)``
+        """
+        loader = loader or _load_cross_encoder
+        max_wait = max_wait_ms / 1000
+        self.model_name = model_name
+        self.first_pass_top_n = first_pass_top_n
+        self.cache = _ScoreCache(cache_size)
+        self._worker = _ModelWorker(model_name, loader, device, max_batch_size, max_wait)
+        self._first_pass = (_ModelWorker(first_pass_model, loader, device, max_batch_size, max_wait)
+                            if first_pass_model and first_pass_model != model_name else None)
+
+    @property
+    def available(self) -> bool:
+        """Whether the heavyweight model is loaded or may still load."""
+        try:
+            self._worker.load()
+            return True
+        except RerankerUnavailable:
+            return False
+
+    def load(self):
+        """Load every configured model now; raises RerankerUnavailable on failure."""
+        self._worker.load()
+        if self._first_pass is not None:
+            self._first_pass.load()
+
+    def warm_up(self):
+        """Load the models and run one dummy pair through each."""
+        pair = [("The sky is blue.", "The sky appears blue during the day.")]
+        self._worker.predict(pair)
+        if self._first_pass is not None:
+            self._first_pass.predict(pair)
+
+    def _score(self, worker: _ModelWorker, claim: str, passages: Sequence[str]) -> List[float]:
+        claim_key = _digest(claim)
+        keys = [(worker.model_name, claim_key, _digest(passage)) for passage in passages]
+        scores: List[Optional[float]] = [self.cache.get(key) for key in keys]
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            fresh = worker.submit([(claim, passages[i]) for i in missing])
+            for i, score in zip(missing, fresh):
+                scores[i] = score
+                self.cache.put(keys[i], score)
+        return scores
+
+    def score(self, claim: str, passages: Sequence[str], fallback: bool = True) -> List[float]:
+        """Heavyweight-model scores for (claim, passage) pairs, in passage order."""
+        if not passages:
+            return []
+        try:
+            return self._score(self._worker, claim, passages)
+        except RerankerUnavailable:
+            if not fallback:
+                raise
+            return overlap_scores(claim, passages)
+
+    def rerank(self, claim: str, passages: Sequence[str], top_k: Optional[int] = None,
+               fallback: bool = True) -> List[Tuple[int, float]]:
+        """
+        Rank passages for a claim.
+
+        With a first-pass model, only its ``first_pass_top_n`` best candidates
+        are scored by the heavyweight model and returned.
+
+        Returns:
+            (passage index, score) pairs by descending score
+        """
+        if not passages:
+            return []
+        candidates = list(range(len(passages)))
+        try:
+            if self._first_pass is not None and len(passages) > self.first_pass_top_n:
+                try:
+                    cheap = self._score(self._first_pass, claim, passages)
+                    candidates = sorted(candidates, key=lambda i: cheap[i], reverse=True)[:self.first_pass_top_n]
+                except RerankerUnavailable:
+                    # Without the first pass every candidate goes to the heavyweight model
+                    pass
+            scores = self._score(self._worker, claim, [passages[i] for i in candidates])
+        except RerankerUnavailable:
+            if not fallback:
+                raise
+            logger.warning(f"Reranker '{self.model_name}' unavailable; using offline overlap heuristic")
+            candidates = list(range(len(passages)))
+            scores = overlap_scores(claim, passages)
+
+        ranked = sorted(zip(candidates, scores), key=lambda item: item[1], reverse=True)
+        return ranked[:top_k] if top_k is not None else ranked
+
+    def stats(self) -> Dict[str, Any]:
+        workers = [self._worker] + ([self._first_pass] if self._first_pass is not None else [])
+        return {
+            "model": self.model_name,
+            "first_pass_model": self._first_pass.model_name if self._first_pass is not None else None,
+            "cache_entries": len(self.cache),
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+            "models": {
+                w.model_name: {"loaded": w.model is not None, "load_seconds": w.load_seconds,
+                               "error": w.load_error, "batches": w.batches, "pairs": w.batched_pairs}
+                for w in workers
+            },
+        }
+
+    def close(self):
+        """Stop the batching threads; models stay loaded."""
+        self._worker.close()
+        if self._first_pass is not None:
+            self._first_pass.close()
+
+
+_services: Dict[str, RerankService] = {}
+_services_lock = threading.Lock()
+
+
+def get_reranker(model_name: str = DEFAULT_MODEL, device: Optional[str] = None) -> RerankService:
+    """
+    Process-wide reranking service for a model, created on first request.
+
+    Batching, caching and the first pass are configured from the
+    ``TRUTHLENS_RERANK_*`` environment variables.
+    """
+    with _services_lock:
+        service = _services.get(model_name)
+        if service is None:
+            service = _services[model_name] = RerankService(
+                model_name=model_name,
+                first_pass_model=os.environ.get("TRUTHLENS_RERANK_FIRST_PASS") or None,
+                first_pass_top_n=int(os.environ.get("TRUTHLENS_RERANK_FIRST_PASS_TOP_N", 30)),
+                max_batch_size=int(os.environ.get("TRUTHLENS_RERANK_BATCH_SIZE", 32)),
+                max_wait_ms=float(os.environ.get("TRUTHLENS_RERANK_MAX_WAIT_MS", 2)),
+                cache_size=int(os.environ.get("TRUTHLENS_RERANK_CACHE_SIZE", 50_000)),
+                device=device,
+            )
+        return service
@@ -12,9 +12,13 @@ from dataclasses import dataclass
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 import hashlib
-import sqlite3
+import threading
 from datetime import datetime, timedelta
 
+from .cross_reference_cache import CrossReferenceCache, canonical_pair
+from ..utils.document_analysis import document_analysis_scope, jaccard_similarity
+from ..utils.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -49,7 +53,8 @@ class SemanticCrossReferenceScorer:
     - Semantic similarity using Sentence-BERT
     - Cross-source credibility boosting
     - Verification badges for multiple sources
-    - SQLite caching for performance
+    - Thread-safe SQLite caching with batched writes
+    - Symmetric pair caching and order-independent result keys
     - Smart source preference handling
     """
     
@@ -62,7 +67,7 @@ class SemanticCrossReferenceScorer:
         """
         self.cache_db_path = cache_db_path
         self.sentence_transformer = None
-        self.cache_conn = None
+        self.cache = None
         
         # Initialize components
         self._initialize_sentence_transformer()
@@ -73,8 +78,22 @@ class SemanticCrossReferenceScorer:
         self.medium_similarity_threshold = 0.6
         self.low_similarity_threshold = 0.4
         
+        # Cache hit-rate counters
+        self._stats_lock = threading.Lock()
+        self.cache_stats = {
+            "result_hits": 0,
+            "result_misses": 0,
+            "pair_hits": 0,
+            "pair_misses": 0
+        }
+        
         logger.info("Semantic Cross-Reference Scorer initialized")
     
+    def warm_up(self):
+        """Run one dummy embedding pass so the first request skips lazy initialization."""
+        if self.sentence_transformer:
+            self.sentence_transformer.encode(["The sky is blue.", "The sky appears blue during the day."])
+    
     def _initialize_sentence_transformer(self):
         """Initialize Sentence-BERT model."""
         try:
@@ -86,44 +105,12 @@ class SemanticCrossReferenceScorer:
             self.sentence_transformer = None
     
     def _initialize_cache(self):
-        """Initialize SQLite cache database."""
-        try:
-            self.cache_conn = sqlite3.connect(self.cache_db_path)
-            self._create_cache_tables()
-            logger.info("Cross-reference cache initialized")
-        except Exception as e:
-            logger.warning(f"Could not initialize cache: {e}")
-            self.cache_conn = None
-    
-    def _create_cache_tables(self):
-        """Create cache tables if they don't exist."""
-        if not self.cache_conn:
-            return
-        
-        cursor = self.cache_conn.cursor()
-        
-        # Cache for similarity calculations
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS similarity_cache (
-                query_hash TEXT PRIMARY KEY,
-                article1_hash TEXT,
-                article2_hash TEXT,
-                similarity_score REAL,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Cache for cross-reference results
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS cross_reference_cache (
-                query_hash TEXT PRIMARY KEY,
-                results_json TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        self.cache_conn.commit()
+        """Initialize the thread-safe cross-reference cache."""
+        self.cache = CrossReferenceCache(self.cache_db_path)
+        if not self.cache.available:
+            self.cache = None
     
+    @traced("cross_reference.score")
     def calculate_cross_reference_scores(self, 
                                        articles: List[Any], 
                                        query: str,
@@ -142,25 +129,33 @@ class SemanticCrossReferenceScorer:
         if not articles:
             return []
         
+        article_ids = [self._get_article_id(article) for article in articles]
+        
         # Check cache first
-        cache_key = self._generate_cache_key(query, articles)
-        cached_result = self._get_cached_result(cache_key)
+        cache_key = self._generate_cache_key(query, articles, prefer_sources)
+        cached_result = self._order_cached_result(self._get_cached_result(cache_key), article_ids)
         if cached_result:
+            self._record_cache_stats(result_hits=1)
             logger.info("Using cached cross-reference results")
             return cached_result
+        self._record_cache_stats(result_misses=1)
         
         logger.info(f"Calculating cross-reference scores for {len(articles)} articles")
         
         # Group articles by source
         source_groups = self._group_articles_by_source(articles)
         
+        # Similarity is symmetric, so only the upper triangle is computed
+        with document_analysis_scope():
+            similarity_lookup = self._calculate_pair_similarities(articles, article_ids)
+        
         # Calculate cross-reference scores
         cross_reference_scores = []
         
         for article in articles:
             try:
                 score = self._calculate_article_cross_reference(
-                    article, articles, source_groups, prefer_sources
+                    article, articles, source_groups, prefer_sources, similarity_lookup
                 )
                 cross_reference_scores.append(score)
             except Exception as e:
@@ -182,11 +177,81 @@ class SemanticCrossReferenceScorer:
         
         return cross_reference_scores
     
+    def _calculate_pair_similarities(self, articles: List[Any],
+                                     article_ids: List[str]) -> Dict[Tuple[str, str], float]:
+        """
+        Calculate similarities for every unordered article pair once.
+        
+        Args:
+            articles: Articles to compare
+            article_ids: Precomputed article IDs, aligned with articles
+            
+        Returns:
+            Similarities keyed by canonically ordered article ID pairs
+        """
+        # Load every cached pair for this article set in one query
+        similarity_lookup = {}
+        if self.cache:
+            similarity_lookup = self.cache.prefetch_similarities(article_ids)
+        
+        hits = 0
+        misses = 0
+        for i in range(len(articles)):
+            for j in range(i + 1, len(articles)):
+                if article_ids[i] == article_ids[j]:
+                    continue
+                pair = canonical_pair(article_ids[i], article_ids[j])
+                if pair in similarity_lookup:
+                    hits += 1
+                    continue
+                misses += 1
+                try:
+                    self._calculate_article_similarity(articles[i], articles[j], similarity_lookup)
+                except Exception as e:
+                    logger.warning(f"Error calculating article similarity: {e}")
+        
+        self._record_cache_stats(pair_hits=hits, pair_misses=misses)
+        return similarity_lookup
+    
+    def _order_cached_result(self, cached_result: Optional[List[CrossReferenceScore]],
+                             article_ids: List[str]) -> Optional[List[CrossReferenceScore]]:
+        """Reorder a cached result to follow the order of the current article list."""
+        if not cached_result:
+            return None
+        
+        by_id = {score.article_id: score for score in cached_result}
+        if any(article_id not in by_id for article_id in article_ids):
+            return None
+        return [by_id[article_id] for article_id in article_ids]
+    
+    def _record_cache_stats(self, **increments: int):
+        """Add to the cache hit-rate counters."""
+        with self._stats_lock:
+            for name, value in increments.items():
+                self.cache_stats[name] += value
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get cache hit counts and hit rates for results and article pairs.
+        
+        Returns:
+            Dictionary of counters plus result_hit_rate and pair_hit_rate
+        """
+        with self._stats_lock:
+            stats = dict(self.cache_stats)
+        
+        result_total = stats["result_hits"] + stats["result_misses"]
+        pair_total = stats["pair_hits"] + stats["pair_misses"]
+        stats["result_hit_rate"] = stats["result_hits"] / result_total if result_total else 0.0
+        stats["pair_hit_rate"] = stats["pair_hits"] / pair_total if pair_total else 0.0
+        return stats
+    
     def _calculate_article_cross_reference(self, 
                                          article: Any, 
                                          all_articles: List[Any],
                                          source_groups: Dict[str, List[Any]],
-                                         prefer_sources: Optional[List[str]] = None) -> CrossReferenceScore:
+                                         prefer_sources: Optional[List[str]] = None,
+                                         similarity_lookup: Optional[Dict[Tuple[str, str], float]] = None) -> CrossReferenceScore:
         """
         Calculate cross-reference score for a single article.
         
@@ -195,6 +260,7 @@ class SemanticCrossReferenceScorer:
             all_articles: All articles from all sources
             source_groups: Articles grouped by source
             prefer_sources: Preferred source order
+            similarity_lookup: Prefetched pair similarities keyed by article IDs
             
         Returns:
             CrossReferenceScore for the article
@@ -212,7 +278,7 @@ class SemanticCrossReferenceScorer:
                 continue
             
             # Calculate similarity
-            similarity = self._calculate_article_similarity(article, other_article)
+            similarity = self._calculate_article_similarity(article, other_article, similarity_lookup)
             
             if similarity > self.low_similarity_threshold:
                 other_source = getattr(other_article, 'source_name', 'Unknown')
@@ -255,20 +321,25 @@ class SemanticCrossReferenceScorer:
             evidence_strength=evidence_strength
         )
     
-    def _calculate_article_similarity(self, article1: Any, article2: Any) -> float:
+    def _calculate_article_similarity(self, article1: Any, article2: Any,
+                                      similarity_lookup: Optional[Dict[Tuple[str, str], float]] = None) -> float:
         """
         Calculate semantic similarity between two articles.
         
         Args:
             article1: First article
             article2: Second article
+            similarity_lookup: Prefetched pair similarities keyed by article IDs
             
         Returns:
             Similarity score (0.0 to 1.0)
         """
-        # Check cache first
-        cache_key = f"{self._get_article_id(article1)}_{self._get_article_id(article2)}"
-        cached_similarity = self._get_cached_similarity(cache_key)
+        # Check cache first; (a, b) and (b, a) share one entry
+        pair = canonical_pair(self._get_article_id(article1), self._get_article_id(article2))
+        if similarity_lookup is not None and pair in similarity_lookup:
+            return similarity_lookup[pair]
+        article1_id, article2_id = pair
+        cached_similarity = self._get_cached_similarity(article1_id, article2_id)
         if cached_similarity is not None:
             return cached_similarity
         
@@ -310,8 +381,12 @@ class SemanticCrossReferenceScorer:
             # Without semantic similarity: title (60%) + content (40%)
             overall_similarity = (title_similarity * 0.6) + (content_similarity * 0.4)
         
+        overall_similarity = float(overall_similarity)
+        
         # Cache the result
-        self._cache_similarity(cache_key, overall_similarity)
+        self._cache_similarity(article1_id, article2_id, overall_similarity)
+        if similarity_lookup is not None:
+            similarity_lookup[pair] = overall_similarity
         
         return overall_similarity
     
@@ -326,24 +401,9 @@ class SemanticCrossReferenceScorer:
         Returns:
             Similarity score (0.0 to 1.0)
         """
-        if not text1 or not text2:
-            return 0.0
-        
-        # Convert to lowercase and split into words
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        # Calculate Jaccard similarity
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
-        
-        if union == 0:
-            return 0.0
-        
-        return intersection / union
+        # Jaccard similarity over lowercase words; each text is tokenized
+        # once per request rather than once per pair
+        return jaccard_similarity(text1, text2)
     
     def _calculate_credibility_boost(self, 
                                    similar_articles: List[Dict[str, Any]], 
@@ -456,101 +516,58 @@ class SemanticCrossReferenceScorer:
         content = f"{title}{url}{source}".encode('utf-8')
         return hashlib.md5(content).hexdigest()[:16]
     
-    def _generate_cache_key(self, query: str, articles: List[Any]) -> str:
-        """Generate cache key for cross-reference results."""
-        # Create hash from query and article IDs
-        article_ids = [self._get_article_id(article) for article in articles]
-        content = f"{query}{''.join(sorted(article_ids))}".encode('utf-8')
-        return hashlib.md5(content).hexdigest()
+    def _generate_cache_key(self, query: str, articles: List[Any],
+                            prefer_sources: Optional[List[str]] = None) -> str:
+        """
+        Generate cache key for cross-reference results.
+        
+        The key depends only on the normalized query, the set of article IDs and
+        the set of preferred sources, so reordered or duplicated article lists
+        map to the same entry.
+        """
+        article_ids = sorted({self._get_article_id(article) for article in articles})
+        preferred = sorted(set(prefer_sources or []))
+        normalized_query = " ".join(query.lower().split())
+        content = "|".join([normalized_query, ",".join(article_ids), ",".join(preferred)])
+        return hashlib.md5(content.encode('utf-8')).hexdigest()
     
     def _get_cached_result(self, cache_key: str) -> Optional[List[CrossReferenceScore]]:
         """Get cached cross-reference result."""
-        if not self.cache_conn:
+        if not self.cache:
             return None
         
-        try:
-            cursor = self.cache_conn.cursor()
-            cursor.execute("""
-                SELECT results_json, timestamp FROM cross_reference_cache 
-                WHERE query_hash = ? AND timestamp > datetime('now', '-1 hour')
-            """, (cache_key,))
-            
-            result = cursor.fetchone()
-            if result:
-                import json
-                return json.loads(result[0])
-            
-        except Exception as e:
-            logger.warning(f"Cache retrieval failed: {e}")
+        cached = self.cache.get_result(cache_key)
+        if cached is None:
+            return None
         
-        return None
+        try:
+            return [CrossReferenceScore(**score) for score in cached]
+        except TypeError as e:
+            logger.warning(f"Discarding malformed cached result: {e}")
+            return None
     
     def _cache_result(self, cache_key: str, results: List[CrossReferenceScore]):
         """Cache cross-reference results."""
-        if not self.cache_conn:
+        if not self.cache:
             return
         
-        try:
-            import json
-            results_json = json.dumps([self._cross_reference_score_to_dict(score) for score in results])
-            
-            cursor = self.cache_conn.cursor()
-            cursor.execute("""
-                INSERT OR REPLACE INTO cross_reference_cache (query_hash, results_json, timestamp)
-                VALUES (?, ?, datetime('now'))
-            """, (cache_key, results_json))
-            
-            self.cache_conn.commit()
-            
-        except Exception as e:
-            logger.warning(f"Cache storage failed: {e}")
+        self.cache.put_result(
+            cache_key, [self._cross_reference_score_to_dict(score) for score in results]
+        )
     
-    def _get_cached_similarity(self, cache_key: str) -> Optional[float]:
+    def _get_cached_similarity(self, article1_id: str, article2_id: str) -> Optional[float]:
         """Get cached similarity score."""
-        if not self.cache_conn:
+        if not self.cache:
             return None
         
-        try:
-            cursor = self.cache_conn.cursor()
-            cursor.execute("""
-                SELECT similarity_score FROM similarity_cache 
-                WHERE query_hash = ? AND timestamp > datetime('now', '-24 hours')
-            """, (cache_key,))
-            
-            result = cursor.fetchone()
-            if result:
-                score = result[0]
-                # Fix bytes vs float issue
-                if isinstance(score, bytes):
-                    score = float(score.decode("utf-8"))
-                elif isinstance(score, (int, float)):
-                    score = float(score)
-                else:
-                    logger.warning(f"Unexpected score type: {type(score)}, value: {score}")
-                    return None
-                return score
-            
-        except Exception as e:
-            logger.warning(f"Similarity cache retrieval failed: {e}")
-        
-        return None
+        return self.cache.get_similarity(article1_id, article2_id)
     
-    def _cache_similarity(self, cache_key: str, similarity: float):
-        """Cache similarity score."""
-        if not self.cache_conn:
+    def _cache_similarity(self, article1_id: str, article2_id: str, similarity: float):
+        """Buffer similarity score for the next batched cache write."""
+        if not self.cache:
             return
         
-        try:
-            cursor = self.cache_conn.cursor()
-            cursor.execute("""
-                INSERT OR REPLACE INTO similarity_cache (query_hash, similarity_score, timestamp)
-                VALUES (?, ?, datetime('now'))
-            """, (cache_key, similarity))
-            
-            self.cache_conn.commit()
-            
-        except Exception as e:
-            logger.warning(f"Similarity cache storage failed: {e}")
+        self.cache.put_similarity(article1_id, article2_id, similarity)
     
     def _cross_reference_score_to_dict(self, score: CrossReferenceScore) -> Dict[str, Any]:
         """Convert CrossReferenceScore to dictionary for JSON serialization."""
@@ -647,31 +664,18 @@ class SemanticCrossReferenceScorer:
     
     def cleanup_cache(self, max_age_hours: int = 24):
         """Clean up old cache entries."""
-        if not self.cache_conn:
+        if not self.cache:
             return
         
-        try:
-            cursor = self.cache_conn.cursor()
-            
-            # Clean similarity cache
-            cursor.execute("""
-                DELETE FROM similarity_cache 
-                WHERE timestamp < datetime('now', '-{} hours')
-            """.format(max_age_hours))
-            
-            # Clean cross-reference cache
-            cursor.execute("""
-                DELETE FROM cross_reference_cache 
-                WHERE timestamp < datetime('now', '-{} hours')
-            """.format(max_age_hours))
-            
-            self.cache_conn.commit()
-            logger.info("Cache cleanup completed")
-            
-        except Exception as e:
-            logger.warning(f"Cache cleanup failed: {e}")
+        self.cache.cleanup(max_age_hours)
+        logger.info("Cache cleanup completed")
+    
+    def close(self):
+        """Flush buffered similarity writes and close the cache."""
+        cache = getattr(self, 'cache', None)
+        if cache:
+            cache.close()
     
     def __del__(self):
         """Cleanup when object is destroyed."""
-        if self.cache_conn:
-            self.cache_conn.close()
+        self.close()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Trusted Content Store for TruthLens
+SQLite storage for TrustedSourcesDatabase content.
+
+Rows are upserted one transaction per batch, so adding content costs the
+same however large the corpus is. Startup reads every column except the full
+text, which is fetched per item on first access. An external-content FTS5
+table over title, snippet and full text is kept in sync by triggers; the
+trusted-content index uses it as the posting lists of the full-text field.
+The connection is opened per process, so a store built before a pre-fork
+server forks its workers is reopened by each worker on first use.
+
+Usage:
+    store = TrustedContentStore("data/trusted_sources/content.db")
+    store.put_many([row, ...])                 # dicts with the TrustedContent fields
+    rows = store.load_metadata()               # everything but full_text
+    store.full_text("who-1")
+    store.full_text_postings("measles")        # {"who-1", ...}
+    store.full_text_postings("vaccine", "vaccines")    # either word
+    store.full_text_postings("vaccine", prefix=True)   # also "vaccines", "vaccinee", ...
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+from ..utils.prefork import register_connection_owner
+
+logger = logging.getLogger(__name__)
+
+METADATA_COLUMNS = ("id", "source_id", "title", "url", "snippet", "published_date", "last_updated",
+                    "tags", "relevance_score", "fact_check_rating", "verdict")
+COLUMNS = METADATA_COLUMNS + ("full_text",)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS content (
+    id TEXT PRIMARY KEY,
+    source_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    snippet TEXT NOT NULL,
+    full_text TEXT NOT NULL,
+    published_date TEXT NOT NULL,
+    last_updated TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    relevance_score REAL NOT NULL DEFAULT 0.0,
+    fact_check_rating TEXT,
+    verdict TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_content_source ON content(source_id);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS content_fts USING fts5(
+    title, snippet, full_text, content='content', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS content_ai AFTER INSERT ON content BEGIN
+    INSERT INTO content_fts(rowid, title, snippet, full_text)
+    VALUES (new.rowid, new.title, new.snippet, new.full_text);
+END;
+CREATE TRIGGER IF NOT EXISTS content_ad AFTER DELETE ON content BEGIN
+    INSERT INTO content_fts(content_fts, rowid, title, snippet, full_text)
+    VALUES ('delete', old.rowid, old.title, old.snippet, old.full_text);
+END;
+CREATE TRIGGER IF NOT EXISTS content_au AFTER UPDATE ON content BEGIN
+    INSERT INTO content_fts(content_fts, rowid, title, snippet, full_text)
+    VALUES ('delete', old.rowid, old.title, old.snippet, old.full_text);
+    INSERT INTO content_fts(rowid, title, snippet, full_text)
+    VALUES (new.rowid, new.title, new.snippet, new.full_text);
+END;
+"""
+
+
+class TrustedContentStore:
+    """
+    Thread-safe SQLite store of trusted content rows.
+
+    Rows are dicts keyed by the TrustedContent field names, with dates as
+    ISO strings and tags as a list.
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Open or create the store.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        with self._lock:
+            self._connection()
+        register_connection_owner(self)
+
+    def _connection(self) -> sqlite3.Connection:
+        """This process's connection; the caller must hold the lock."""
+        if self._conn is None or self._conn_pid != os.getpid():
+            # A connection inherited across fork is dropped without being used or closed
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn_pid = os.getpid()
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            with self._conn:
+                self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM content").fetchone()[0]
+
+    def put_many(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert or replace rows in one transaction.
+
+        Returns:
+            Number of rows written
+        """
+        values = [tuple(json.dumps(row[c]) if c == "tags" else row.get(c) for c in COLUMNS) for row in rows]
+        if not values:
+            return 0
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in COLUMNS[1:])
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO content ({', '.join(COLUMNS)}) VALUES ({placeholders}) "
+                    f"ON CONFLICT(id) DO UPDATE SET {updates}",
+                    values,
+                )
+        return len(values)
+
+    def put(self, row: Dict[str, Any]):
+        self.put_many([row])
+
+    def load_metadata(self) -> List[Dict[str, Any]]:
+        """Every row without its full text."""
+        with self._lock:
+            cursor = self._connection().execute(f"SELECT {', '.join(METADATA_COLUMNS)} FROM content ORDER BY rowid")
+            rows = [dict(zip(METADATA_COLUMNS, values)) for values in cursor]
+        for row in rows:
+            row["tags"] = json.loads(row["tags"])
+        return rows
+
+    def full_text(self, content_id: str) -> Optional[str]:
+        with self._lock:
+            found = self._connection().execute("SELECT full_text FROM content WHERE id = ?", (content_id,)).fetchone()
+        return found[0] if found else None
+
+    def full_text_postings(self, *terms: str, prefix: bool = False) -> Set[str]:
+        """IDs of the content whose full text contains one of ``terms``, or a word starting with one."""
+        if not terms:
+            return set()
+        phrase = "(" + " OR ".join('"' + term.replace('"', '""') + '"' + (' *' if prefix else '')
+                                   for term in terms) + ")"
+        with self._lock:
+            cursor = self._connection().execute(
+                "SELECT content.id FROM content_fts JOIN content ON content.rowid = content_fts.rowid "
+                "WHERE content_fts MATCH ?",
+                (f"full_text : {phrase}",),
+            )
+            return {content_id for content_id, in cursor}
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            found = self._connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return found[0] if found else None
+
+    def set_meta(self, key: str, value: str):
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("INSERT INTO meta (key, value) VALUES (?, ?) "
+                             "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, value))
+
+    def release_connections(self):
+        """Close this process's connection; the next use reopens it."""
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._conn_pid = None
+
+    def close(self):
+        self.release_connections()
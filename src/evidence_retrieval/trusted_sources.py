@@ -4,18 +4,39 @@ Implements integration with trusted sources: PIB, WHO, RBI, major news portals,
 Enhanced with additional fact-checking sources: Snopes, PolitiFact, AltNews, BOOM Live
 """
 
+import heapq
 import json
 import logging
+import re
+import threading
+from collections import Counter, defaultdict
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, FrozenSet, Iterable, Optional, Set, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from enum import Enum
 import requests
 import time
 
+from .trusted_content_store import TrustedContentStore
+
 logger = logging.getLogger(__name__)
 
+_WORD_RE = re.compile(r'\w+')
+
+# Words too common to decide whether content is about a query
+STOPWORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'is', 'it',
+    'its', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'were', 'will', 'with',
+})
+
+# (field, weight) of the relevance score; a field matching every query term scores its full weight
+FIELD_WEIGHTS = (('title', 0.5), ('snippet', 0.3), ('full_text', 0.2))
+FULL_TEXT_WEIGHT = dict(FIELD_WEIGHTS)['full_text']
+FACT_CHECK_BOOST = 0.2
+
+_NOT_LOADED = object()
+
 
 class SourceType(Enum):
     """Types of trusted sources."""
@@ -67,6 +88,171 @@ class TrustedContent:
     verdict: Optional[str] = None  # True, False, Mixed, Unproven
 
 
+FACT_CHECK_TYPES = frozenset([
+    SourceType.FACT_CHECK, SourceType.SNOPES, SourceType.POLITIFACT,
+    SourceType.ALTNEWS, SourceType.BOOM_LIVE, SourceType.SCIENCE_FEEDBACK
+])
+
+
+def _stem(word: str) -> str:
+    """
+    Fold plural and -y endings: vaccines -> vaccine, studies and study -> stud.
+    
+    The stored full texts are not stemmed; ``_surface_forms`` lists the
+    words to look up there for a stem.
+    """
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3]
+    if len(word) > 3 and word[-1] == 'y' and word[-2] not in 'aeiou':
+        return word[:-1]
+    if len(word) > 3 and word[-1] == 's' and word[-2] not in 'siu':
+        return word[:-1]
+    return word
+
+
+def _surface_forms(stem: str) -> Tuple[str, ...]:
+    """
+    The words ``_stem`` folds into ``stem``: stud -> stud, studs, study, studies.
+    
+    A prefix query would also match unrelated longer words, "new" matching
+    "newton" and "stud" matching "student".
+    """
+    return tuple(word for word in (stem, stem + 's', stem + 'y', stem + 'ies') if _stem(word) == stem)
+
+
+def _terms(text: str) -> FrozenSet[str]:
+    """
+    Lowercased, stemmed word set of a text, without stopwords.
+    
+    A query made only of stopwords has no terms and matches nothing.
+    """
+    return frozenset(_stem(word) for word in _WORD_RE.findall(text.lower()) if word not in STOPWORDS)
+
+
+class _LazyTrustedContent(TrustedContent):
+    """TrustedContent whose full text is read from the store on first access."""
+    
+    def __init__(self, store: TrustedContentStore, **fields):
+        self._store = store
+        super().__init__(full_text=_NOT_LOADED, **fields)
+    
+    @property
+    def full_text(self) -> str:
+        if self._full_text is _NOT_LOADED:
+            self._full_text = self._store.full_text(self.id) or ''
+        return self._full_text
+    
+    @full_text.setter
+    def full_text(self, value: str):
+        self._full_text = value
+
+
+class TrustedContentIndex:
+    """
+    Inverted index over the title, snippet and full text of trusted content.
+    
+    Each field is kept as a term set, so relevance is the weighted share of
+    query terms each field contains. Content is bucketed by source ID,
+    which lets a source-type filter become a set intersection.
+    
+    With ``full_text_postings`` the full-text postings live elsewhere (the
+    store's FTS5 table) and only titles and snippets are held in memory.
+    
+    Terms are stemmed, so "vaccine" finds "vaccines". The index is shared by
+    request threads and updated by ingestion; a lock guards every change and
+    search.
+    """
+    
+    def __init__(self, full_text_postings: Optional[Callable[[str], Set[str]]] = None):
+        """
+        Initialize an empty index.
+        
+        Args:
+            full_text_postings: Returns the IDs of content whose full text has a word stemming to a term
+        """
+        self.full_text_postings = full_text_postings
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._fields: Dict[str, Tuple[FrozenSet[str], ...]] = {}
+        self._by_source: Dict[str, Set[str]] = defaultdict(set)
+        self._source_of: Dict[str, str] = {}
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._fields)
+    
+    def add(self, content: TrustedContent):
+        """Index content, replacing an earlier version with the same ID."""
+        fields = tuple(frozenset() if name == 'full_text' and self.full_text_postings else
+                       _terms(getattr(content, name) or '') for name, _ in FIELD_WEIGHTS)
+        with self._lock:
+            self.remove(content.id)
+            self._fields[content.id] = fields
+            for term in frozenset().union(*fields):
+                self._postings[term].add(content.id)
+            self._by_source[content.source_id].add(content.id)
+            self._source_of[content.id] = content.source_id
+    
+    def remove(self, content_id: str):
+        with self._lock:
+            fields = self._fields.pop(content_id, None)
+            if fields is None:
+                return
+            for term in frozenset().union(*fields):
+                postings = self._postings[term]
+                postings.discard(content_id)
+                if not postings:
+                    del self._postings[term]
+            self._by_source[self._source_of.pop(content_id)].discard(content_id)
+    
+    def search(self, query: str, source_ids: Optional[Iterable[str]] = None,
+               boosted_source_ids: FrozenSet[str] = frozenset()) -> List[Tuple[str, float]]:
+        """
+        Score every content item sharing a term with the query.
+        
+        Args:
+            query: Search query
+            source_ids: Only consider content from these sources
+            boosted_source_ids: Sources whose content gets the fact-check boost
+            
+        Returns:
+            (content ID, relevance in [0, 1]) pairs, unordered
+        """
+        query_terms = _terms(query)
+        if not query_terms:
+            return []
+        full_text_hits: Counter = Counter()
+        if self.full_text_postings:
+            # The store has its own lock; the index lock is not held while it is queried
+            for term in query_terms:
+                full_text_hits.update(self.full_text_postings(term))
+        
+        n_terms = len(query_terms)
+        scored = []
+        with self._lock:
+            candidates: Set[str] = set(full_text_hits)
+            for term in query_terms:
+                candidates |= self._postings.get(term, set())
+            if source_ids is not None:
+                allowed: Set[str] = set()
+                for source_id in source_ids:
+                    allowed |= self._by_source.get(source_id, set())
+                candidates &= allowed
+            
+            for content_id in candidates:
+                fields = self._fields.get(content_id)
+                if fields is None:
+                    continue
+                relevance = sum(weight * len(query_terms & terms) / n_terms
+                                for (_, weight), terms in zip(FIELD_WEIGHTS, fields))
+                if self.full_text_postings:
+                    relevance += FULL_TEXT_WEIGHT * full_text_hits[content_id] / n_terms
+                if self._source_of[content_id] in boosted_source_ids:
+                    relevance += FACT_CHECK_BOOST
+                scored.append((content_id, min(relevance, 1.0)))
+        return scored
+
+
 class TrustedSourcesDatabase:
     """
     Database of trusted sources and their content.
@@ -74,6 +260,7 @@ class TrustedSourcesDatabase:
     Enhanced Features:
     - Curated list of trusted sources including fact-checking sites
     - Content caching and freshness tracking
+    - SQLite content storage with lazily loaded full texts (legacy content.json is migrated)
     - Relevance scoring
     - API integration for real-time updates
     - Fact-checking source integration (Snopes, PolitiFact, AltNews, BOOM Live)
@@ -90,15 +277,21 @@ class TrustedSourcesDatabase:
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
         self.sources_file = self.data_dir / "sources.json"
-        self.content_file = self.data_dir / "content.json"
+        self.content_file = self.data_dir / "content.json"  # Legacy format, imported into content_db
+        self.content_db = self.data_dir / "content.db"
         self.cache_file = self.data_dir / "cache.json"
         
         # Initialize sources
         self.sources: Dict[str, TrustedSource] = {}
         self.content: Dict[str, TrustedContent] = {}
         self.cache: Dict[str, Any] = {}
+        self.store = TrustedContentStore(self.content_db)
+        # Index terms are stems; the full texts are searched for the words folding into them
+        self.content_index = TrustedContentIndex(
+            full_text_postings=lambda term: self.store.full_text_postings(*_surface_forms(term)))
         
         self._load_data()
+        self._load_content()
         self._initialize_default_sources()
     
     def _load_data(self):
@@ -123,26 +316,6 @@ class TrustedSourcesDatabase:
                         )
                         self.sources[source.id] = source
             
-            if self.content_file.exists():
-                with open(self.content_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for content_data in data.values():
-                        content = TrustedContent(
-                            id=content_data["id"],
-                            source_id=content_data["source_id"],
-                            title=content_data["title"],
-                            url=content_data["url"],
-                            snippet=content_data["snippet"],
-                            full_text=content_data["full_text"],
-                            published_date=datetime.fromisoformat(content_data["published_date"]),
-                            last_updated=datetime.fromisoformat(content_data["last_updated"]),
-                            tags=content_data["tags"],
-                            relevance_score=content_data.get("relevance_score", 0.0),
-                            fact_check_rating=content_data.get("fact_check_rating"),
-                            verdict=content_data.get("verdict")
-                        )
-                        self.content[content.id] = content
-            
             if self.cache_file.exists():
                 with open(self.cache_file, 'r', encoding='utf-8') as f:
                     self.cache = json.load(f)
@@ -300,6 +473,7 @@ class TrustedSourcesDatabase:
             for source_id, source in self.sources.items():
                 data[source_id] = asdict(source)
                 # Convert datetime to string for JSON serialization
+                data[source_id]["source_type"] = source.source_type.value
                 data[source_id]["last_updated"] = source.last_updated.isoformat()
             
             with open(self.sources_file, 'w', encoding='utf-8') as f:
@@ -327,69 +501,43 @@ class TrustedSourcesDatabase:
     
     def get_fact_check_sources(self) -> List[TrustedSource]:
         """Get all fact-checking sources."""
-        fact_check_types = [
-            SourceType.FACT_CHECK, SourceType.SNOPES, SourceType.POLITIFACT,
-            SourceType.ALTNEWS, SourceType.BOOM_LIVE, SourceType.SCIENCE_FEEDBACK
-        ]
-        return [source for source in self.sources.values() if source.source_type in fact_check_types]
+        return [source for source in self.sources.values() if source.source_type in FACT_CHECK_TYPES]
     
     def search_content(self, query: str, source_types: Optional[List[SourceType]] = None, 
-                      max_results: int = 10) -> List[TrustedContent]:
+                      max_results: int = 10, min_relevance: float = 0.0) -> List[TrustedContent]:
         """
         Search content from trusted sources.
         
+        Relevance is the weighted share of query terms found in the title
+        (0.5), snippet (0.3) and full text (0.2), plus 0.2 for fact-checking
+        sources, capped at 1.0.
+        
         Args:
             query: Search query
             source_types: Filter by source types
             max_results: Maximum number of results
+            min_relevance: Drop content scoring below this
             
         Returns:
-            List of relevant content
+            List of relevant content, by relevance and then recency
         """
-        results = []
-        
-        # Filter content by source types if specified
+        source_ids = None
         if source_types:
-            filtered_content = [
-                content for content in self.content.values()
-                if self.sources.get(content.source_id, {}).source_type in source_types
-            ]
-        else:
-            filtered_content = list(self.content.values())
-        
-        # Simple keyword-based search (can be enhanced with semantic search)
-        query_lower = query.lower()
-        
-        for content in filtered_content:
-            # Check if query appears in title, snippet, or full text
-            if (query_lower in content.title.lower() or 
-                query_lower in content.snippet.lower() or 
-                query_lower in content.full_text.lower()):
-                
-                # Calculate relevance score
-                relevance = 0.0
-                if query_lower in content.title.lower():
-                    relevance += 0.5
-                if query_lower in content.snippet.lower():
-                    relevance += 0.3
-                if query_lower in content.full_text.lower():
-                    relevance += 0.2
-                
-                # Boost score for fact-checking sources
-                source = self.sources.get(content.source_id)
-                if source and source.source_type in [
-                    SourceType.FACT_CHECK, SourceType.SNOPES, SourceType.POLITIFACT,
-                    SourceType.ALTNEWS, SourceType.BOOM_LIVE, SourceType.SCIENCE_FEEDBACK
-                ]:
-                    relevance += 0.2
-                
-                content.relevance_score = min(relevance, 1.0)
-                results.append(content)
+            source_ids = [source.id for source in self.sources.values() if source.source_type in source_types]
+        boosted = frozenset(source.id for source in self.get_fact_check_sources())
         
-        # Sort by relevance score and recency
-        results.sort(key=lambda x: (x.relevance_score, x.published_date), reverse=True)
+        scored = [(content_id, relevance)
+                  for content_id, relevance in self.content_index.search(query, source_ids, boosted)
+                  if relevance >= min_relevance]
+        best = heapq.nlargest(max_results, scored,
+                              key=lambda item: (item[1], self.content[item[0]].published_date))
         
-        return results[:max_results]
+        results = []
+        for content_id, relevance in best:
+            content = self.content[content_id]
+            content.relevance_score = relevance
+            results.append(content)
+        return results
     
     def get_fact_check_results(self, claim: str) -> List[TrustedContent]:
         """
@@ -481,24 +629,59 @@ class TrustedSourcesDatabase:
     
     def add_content(self, content: TrustedContent):
         """Add content from a trusted source."""
-        self.content[content.id] = content
-        self._save_content()
+        self.add_contents([content])
     
-    def _save_content(self):
-        """Save content to file."""
+    def add_contents(self, contents: Iterable[TrustedContent]):
+        """Add many content items in one store transaction."""
+        contents = list(contents)
         try:
-            data = {}
-            for content_id, content in self.content.items():
-                data[content_id] = asdict(content)
-                # Convert datetime to string for JSON serialization
-                data[content_id]["published_date"] = content.published_date.isoformat()
-                data[content_id]["last_updated"] = content.last_updated.isoformat()
-            
-            with open(self.content_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-                
+            self.store.put_many(self._content_row(content) for content in contents)
         except Exception as e:
             logger.error(f"Error saving content: {e}")
+        for content in contents:
+            self.content[content.id] = content
+            self.content_index.add(content)
+    
+    @staticmethod
+    def _content_row(content: TrustedContent) -> Dict[str, Any]:
+        row = asdict(content)
+        # Convert datetime to string for storage
+        row["published_date"] = content.published_date.isoformat()
+        row["last_updated"] = content.last_updated.isoformat()
+        return row
+    
+    def _load_content(self):
+        """Load content metadata from the store; full texts are read on first access."""
+        try:
+            self._migrate_json_content()
+            for row in self.store.load_metadata():
+                row["published_date"] = datetime.fromisoformat(row["published_date"])
+                row["last_updated"] = datetime.fromisoformat(row["last_updated"])
+                content = _LazyTrustedContent(self.store, **row)
+                self.content[content.id] = content
+                self.content_index.add(content)
+        except Exception as e:
+            logger.error(f"Error loading trusted content: {e}")
+    
+    def _migrate_json_content(self):
+        """Import content.json into the store when it is new or has changed since the last import."""
+        if not self.content_file.exists():
+            return
+        stat = self.content_file.stat()
+        signature = f"{stat.st_size}:{stat.st_mtime_ns}"
+        if self.store.get_meta("content_json") == signature:
+            return
+        with open(self.content_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        rows = [{
+            "relevance_score": 0.0,
+            "fact_check_rating": None,
+            "verdict": None,
+            **content_data,
+        } for content_data in data.values()]
+        self.store.put_many(rows)
+        self.store.set_meta("content_json", signature)
+        logger.info(f"Migrated {len(rows)} content items from {self.content_file} to {self.content_db}")
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get statistics about the database."""
@@ -26,6 +26,7 @@ from sklearn.metrics.pairwise import cosine_similarity
 import sys
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 from schemas.evidence import Evidence, SourceType
+from ..utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -154,13 +155,17 @@ class VectorEvidenceRetriever:
         """Generate a hash for content deduplication."""
         return hashlib.md5(content.lower().encode()).hexdigest()
     
+    def _evidence_text(self, evidence: Evidence) -> str:
+        """Text embedded for an evidence item: title plus body."""
+        return f"{evidence.title} {evidence.full_text or evidence.snippet}"
+    
     def _deduplicate_evidence(self, evidence_list: List[Evidence]) -> List[Evidence]:
         """Remove duplicate evidence based on content similarity."""
         if not evidence_list:
             return evidence_list
         
         # Generate embeddings for all evidence
-        texts = [f"{e.title} {e.content}" for e in evidence_list]
+        texts = [self._evidence_text(e) for e in evidence_list]
         embeddings = self.model.encode(texts, show_progress_bar=True)
         
         # Calculate pairwise similarities
@@ -207,6 +212,7 @@ class VectorEvidenceRetriever:
         logger.info(f"Created {len(cluster_list)} clusters from {len(evidence_list)} evidence items")
         return cluster_list
     
+    @traced("faiss.add")
     def add_evidence(self, evidence_list: List[Evidence]) -> bool:
         """
         Add evidence to the index with deduplication and clustering.
@@ -230,7 +236,7 @@ class VectorEvidenceRetriever:
                 return True
             
             # Generate embeddings
-            texts = [f"{e.title} {e.content}" for e in unique_evidence]
+            texts = [self._evidence_text(e) for e in unique_evidence]
             new_embeddings = self.model.encode(texts, show_progress_bar=True)
             
             # Add to existing evidence
@@ -264,6 +270,7 @@ class VectorEvidenceRetriever:
             logger.error(f"Error adding evidence: {e}")
             return False
     
+    @traced("faiss.search")
     def search_evidence(self, query: str, top_k: int = 10, 
                        apply_clustering: bool = True) -> List[VectorSearchResult]:
         """
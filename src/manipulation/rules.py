@@ -11,11 +11,18 @@ Implements pattern matching for common manipulation techniques:
 """
 
 import re
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
 
 
+@lru_cache(maxsize=256)
+def _compile_rule_pattern(pattern: str) -> "re.Pattern":
+    """Compile a rule pattern once; rules sharing a pattern share the compiled form."""
+    return re.compile(pattern, re.IGNORECASE)
+
+
 class ManipulationType(Enum):
     """Types of manipulation techniques."""
     CLICKBAIT = "clickbait"
@@ -54,6 +61,7 @@ class ManipulationRuleDetector:
     
     def __init__(self):
         self.rules = self._initialize_rules()
+        self._suggestions_map = self._initialize_suggestions()
     
     def _initialize_rules(self) -> List[ManipulationRule]:
         """Initialize manipulation detection rules."""
@@ -150,13 +158,14 @@ class ManipulationRuleDetector:
             List of detected manipulation patterns
         """
         results = []
-        text_lower = text.lower()
         
         for rule in self.rules:
-            matches = re.finditer(rule.pattern, text_lower, re.IGNORECASE)
+            # Patterns are compiled once; matching on the original text keeps
+            # offsets aligned with the returned matched_text
+            matches = _compile_rule_pattern(rule.pattern).finditer(text)
             
             for match in matches:
-                matched_text = text[match.start():match.end()]
+                matched_text = match.group()
                 
                 # Generate suggestions based on manipulation type
                 suggestions = self._generate_suggestions(rule.manipulation_type)
@@ -174,7 +183,15 @@ class ManipulationRuleDetector:
     
     def _generate_suggestions(self, manipulation_type: ManipulationType) -> List[str]:
         """Generate suggestions for addressing manipulation techniques."""
-        suggestions_map = {
+        return list(self._suggestions_map.get(manipulation_type, [
+            "Look for evidence-based information",
+            "Check multiple credible sources",
+            "Verify claims with fact-checking organizations"
+        ]))
+    
+    def _initialize_suggestions(self) -> Dict[ManipulationType, List[str]]:
+        """Initialize suggestions for each manipulation type."""
+        return {
             ManipulationType.CLICKBAIT: [
                 "Look for factual headlines instead of sensational language",
                 "Check if the content delivers on the headline's promise",
@@ -216,12 +233,6 @@ class ManipulationRuleDetector:
                 "Seek out fact-checking from reputable organizations"
             ]
         }
-        
-        return suggestions_map.get(manipulation_type, [
-            "Look for evidence-based information",
-            "Check multiple credible sources",
-            "Verify claims with fact-checking organizations"
-        ])
     
     def get_manipulation_summary(self, text: str) -> Dict:
         """
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Async News Client for TruthLens
+Non-blocking News API and Guardian API search for the FastAPI apps.
+
+The synchronous handlers use ``requests`` and would stall the event loop for
+the whole round trip. This client issues the same requests with aiohttp and
+reuses the handlers' parsing, relevance scoring and NewsAPI cache, so results
+are identical to ``EnhancedNewsHandler._get_news_api_results`` and
+``_get_guardian_results``.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from .news_handler import NewsArticle
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncNewsClient:
+    """
+    aiohttp-based client for News API and The Guardian.
+
+    Features:
+    - One pooled aiohttp session shared by all requests
+    - NewsAPI cache and rate-limit state shared with the wrapped EnhancedNewsHandler
+    - SQLite cache access on a single background thread, never on the event loop
+    - Guardian request spacing enforced with asyncio.sleep instead of time.sleep
+    """
+
+    def __init__(self, news_handler, timeout_seconds: float = 10.0, max_connections: int = 32):
+        """
+        Initialize the async news client.
+
+        Args:
+            news_handler: EnhancedNewsHandler providing API keys, cache and parsers
+            timeout_seconds: Total timeout per API request
+            max_connections: Connection pool size
+        """
+        self.handler = news_handler
+        self.timeout = aiohttp.ClientTimeout(total=timeout_seconds)
+        self.max_connections = max_connections
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        # The handler's in-memory SQLite connection is not safe for concurrent
+        # use, so every cache call goes through one thread
+        self._cache_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="truthlens-news-cache")
+        self._guardian_lock: Optional[asyncio.Lock] = None
+        self._guardian_last_request = 0.0
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=self.timeout,
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                headers={'User-Agent': 'TruthLens/1.0 (Fact-Checking System)'}
+            )
+        return self._session
+
+    async def _run_cache(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._cache_executor, fn, *args)
+
+    async def search_newsapi(self, query: str, max_results: int = 10, days_back: int = 30) -> List[NewsArticle]:
+        """
+        Search News API with caching and rate limit handling.
+
+        Args:
+            query: Search query
+            max_results: Maximum number of results to return
+            days_back: Number of days back to search
+
+        Returns:
+            List of NewsArticle objects
+        """
+        try:
+            rate_limited = await self._run_cache(self.handler._is_newsapi_rate_limited)
+            cached_results = await self._run_cache(self.handler._get_cached_newsapi_results, query, days_back)
+            if cached_results:
+                logger.info(f"Using cached NewsAPI results for '{query}'")
+                return cached_results[:max_results]
+            if rate_limited:
+                logger.info("NewsAPI is rate limited and no cached results are available")
+                return []
+
+            news_handler = self.handler.news_handler
+            end_date = datetime.now()
+            start_date = end_date - timedelta(days=days_back)
+            params = {
+                'apiKey': news_handler.api_key,
+                'q': query,
+                'from': start_date.strftime('%Y-%m-%d'),
+                'to': end_date.strftime('%Y-%m-%d'),
+                'sortBy': 'relevancy',
+                'pageSize': min(max_results, 100),
+                'language': 'en'
+            }
+
+            session = await self._get_session()
+            async with session.get(f"{news_handler.base_url}/everything", params=params) as response:
+                if response.status == 429:
+                    logger.warning("NewsAPI rate limit hit, marking as rate limited")
+                    await self._run_cache(self.handler._mark_newsapi_rate_limited)
+                    return []
+                if response.status != 200:
+                    logger.error(f"News API request failed with status {response.status}")
+                    return []
+                data = await response.json()
+
+            articles = [
+                NewsArticle(
+                    title=article.get('title', ''),
+                    description=article.get('description', ''),
+                    content=article.get('content', ''),
+                    url=article.get('url', ''),
+                    source=(article.get('source') or {}).get('name', 'Unknown'),
+                    published_at=article.get('publishedAt', ''),
+                    relevance_score=news_handler._calculate_relevance_score(query, article)
+                )
+                for article in data.get('articles', [])
+            ]
+            articles.sort(key=lambda x: x.relevance_score, reverse=True)
+            articles = articles[:max_results]
+
+            if articles:
+                await self._run_cache(self.handler._cache_newsapi_results, query, days_back, articles)
+            return articles
+
+        except Exception as e:
+            logger.warning(f"News API search failed: {e}")
+            return []
+
+    async def search_guardian(self, query: str, max_results: int = 10, days_back: int = 30) -> List[Dict[str, Any]]:
+        """
+        Search The Guardian API.
+
+        Args:
+            query: Search query
+            max_results: Maximum number of results to return
+            days_back: Number of days back to search
+
+        Returns:
+            List of Guardian articles in the pipeline's dictionary format
+        """
+        guardian_handler = self.handler.guardian_handler
+        try:
+            await self._guardian_rate_limit(guardian_handler.request_delay)
+
+            end_date = datetime.now()
+            start_date = end_date - timedelta(days=days_back)
+            params = {
+                'api-key': guardian_handler.api_key,
+                'q': query,
+                'page-size': min(max_results, 50),
+                'from-date': start_date.strftime('%Y-%m-%d'),
+                'to-date': end_date.strftime('%Y-%m-%d'),
+                'show-fields': 'headline,bodyText,lastModified,sectionName,webUrl,standfirst',
+                'show-tags': 'contributor',
+                'show-blocks': 'all',
+                'order-by': 'relevance'
+            }
+
+            session = await self._get_session()
+            async with session.get(f"{guardian_handler.base_url}/search", params=params) as response:
+                if response.status != 200:
+                    logger.warning(f"Guardian API returned status {response.status}")
+                    return []
+                data = await response.json()
+
+            response_data = data.get('response', {})
+            if response_data.get('status') != 'ok':
+                logger.warning(f"Guardian API error: {response_data.get('message', 'Unknown error')}")
+                return []
+
+            formatted_results = []
+            for result in response_data.get('results', [])[:max_results]:
+                formatted_result = guardian_handler._parse_guardian_result(result)
+                if formatted_result:
+                    formatted_results.append(formatted_result)
+            return formatted_results
+
+        except Exception as e:
+            logger.warning(f"Guardian API search failed: {e}")
+            return []
+
+    async def _guardian_rate_limit(self, request_delay: float):
+        """Space Guardian requests without blocking the event loop."""
+        if self._guardian_lock is None:
+            self._guardian_lock = asyncio.Lock()
+        async with self._guardian_lock:
+            wait = request_delay - (time.monotonic() - self._guardian_last_request)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._guardian_last_request = time.monotonic()
+
+    async def close(self):
+        """Close the HTTP session and the cache thread."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._cache_executor.shutdown(wait=False)
@@ -17,6 +17,7 @@ import json
 from .news_handler import NewsHandler, NewsArticle
 from .guardian_api_handler import GuardianAPIHandler
 from .currents_api_handler import CurrentsAPIHandler
+from ..utils.tracing import traced
 from ..evidence_retrieval.semantic_cross_reference_scorer import SemanticCrossReferenceScorer
 
 logger = logging.getLogger(__name__)
@@ -66,6 +67,7 @@ class EnhancedNewsHandler:
         
         logger.info("Enhanced News Handler initialized with News API, Guardian API, and Currents API")
     
+    @traced("news.get_news_sources")
     def get_news_sources(self, query: str, max_results: int = 15, days_back: int = 30, 
                         prefer_sources: Optional[List[str]] = None) -> List[EnhancedNewsArticle]:
         """
@@ -126,6 +128,7 @@ class EnhancedNewsHandler:
                 logger.error(f"Fallback to News API also failed: {fallback_error}")
                 return []
     
+    @traced("news.newsapi")
     def _get_news_api_results(self, query: str, max_results: int, days_back: int) -> List[NewsArticle]:
         """Get results from News API with caching and rate limit handling."""
         try:
@@ -170,6 +173,7 @@ class EnhancedNewsHandler:
             logger.warning(f"News API search failed: {e}")
             return []
     
+    @traced("news.guardian")
     def _get_guardian_results(self, query: str, max_results: int, days_back: int) -> List[Dict[str, Any]]:
         """Get results from Guardian API."""
         try:
@@ -178,6 +182,7 @@ class EnhancedNewsHandler:
             logger.warning(f"Guardian API search failed: {e}")
             return []
     
+    @traced("news.currents")
     def _get_currents_results(self, query: str, max_results: int, days_back: int) -> List[Dict[str, Any]]:
         """Get results from Currents API."""
         try:
@@ -317,6 +322,7 @@ class EnhancedNewsHandler:
         except Exception as e:
             logger.error(f"Failed to mark NewsAPI as rate limited: {e}")
     
+    @traced("cache.newsapi.get")
     def _get_cached_newsapi_results(self, query: str, days_back: int) -> Optional[List[NewsArticle]]:
         """Get cached NewsAPI results if available."""
         if not self.cache_conn:
@@ -359,6 +365,7 @@ class EnhancedNewsHandler:
         
         return None
     
+    @traced("cache.newsapi.put")
     def _cache_newsapi_results(self, query: str, days_back: int, results: List[NewsArticle]):
         """Cache NewsAPI results."""
         if not self.cache_conn:
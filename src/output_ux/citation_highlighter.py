@@ -1,9 +1,23 @@
 from __future__ import annotations
 
 import re
-from typing import Dict, List, Optional, Tuple
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+from ..utils.keyword_matcher import get_keyword_matcher
+
+
+_TOKEN_RE = re.compile(r'\b\w+\b')
+
+# Span types, in the order used to break relevance ties between overlapping
+# spans when the citation's stance does not decide
+_TYPE_ORDER = {"support": 0, "refute": 1, "neutral": 2}
+
+# Stance probability key used as the confidence of each span type
+_TYPE_STANCE = {"support": "SUPPORTED", "refute": "REFUTED", "neutral": "NOT ENOUGH INFO"}
+
 
 @dataclass
 class HighlightedSpan:
@@ -16,6 +30,13 @@ class HighlightedSpan:
     confidence: float
 
 
+@dataclass
+class PreparedClaim:
+    """Claim terms preprocessed once and reused across citations."""
+    terms: List[str]
+    term_weights: Dict[str, int]  # distinct term -> occurrences in the claim
+
+
 @dataclass
 class CitationHighlight:
     """Represents a citation with highlighted spans."""
@@ -50,54 +71,158 @@ class CitationHighlighter:
             r"\brefute\b", r"\bdisprove\b", r"\bdebunk\b"
         ]
         
+        # Context indicators (plain substring checks)
+        self.positive_indicators = ["confirm", "true", "accurate", "verified", "proven", "evidence"]
+        self.negative_indicators = ["false", "fake", "hoax", "debunked", "disproven", "incorrect"]
+        
         # Compile regex patterns
         self.negation_regex = re.compile("|".join(self.negation_patterns), re.IGNORECASE)
+        
+        # Compiled keyword matchers, built once per keyword set. Support and
+        # refute keywords share one matcher so the citation is scanned once.
+        self.stance_keyword_matcher = get_keyword_matcher(self.support_keywords + self.refute_keywords)
+        self.keyword_types: Dict[str, List[str]] = {}
+        for keyword in self.support_keywords:
+            self.keyword_types.setdefault(keyword.lower(), []).append("support")
+        for keyword in self.refute_keywords:
+            self.keyword_types.setdefault(keyword.lower(), []).append("refute")
+        self.positive_matcher = get_keyword_matcher(self.positive_indicators, word_boundary=False)
+        self.negative_matcher = get_keyword_matcher(self.negative_indicators, word_boundary=False)
     
     def highlight_citation(self, claim: str, citation_text: str, stance: str, 
                           stance_probabilities: Dict[str, float]) -> CitationHighlight:
         """Highlight relevant parts of a citation based on the claim and stance."""
+        return self._highlight_prepared(
+            self.prepare_claim(claim), citation_text, stance, stance_probabilities
+        )
+    
+    def highlight_citations(self, claim: str, citations: List[Dict[str, Any]]) -> List[CitationHighlight]:
+        """
+        Highlight multiple citations for one claim.
+        
+        Claim terms are extracted once and reused for every citation.
+        
+        Args:
+            claim: Claim being verified
+            citations: Dicts with "text" or "snippet", plus optional "stance"
+                and "stance_probabilities"
+            
+        Returns:
+            One CitationHighlight per citation with non-empty text
+        """
+        prepared = self.prepare_claim(claim)
+        highlighted_citations = []
+        
+        for citation in citations:
+            citation_text = citation.get("text", citation.get("snippet", ""))
+            stance = citation.get("stance", "NOT ENOUGH INFO")
+            stance_probs = citation.get("stance_probabilities", {})
+            
+            if citation_text:
+                highlighted_citations.append(
+                    self._highlight_prepared(prepared, citation_text, stance, stance_probs)
+                )
+        
+        return highlighted_citations
+    
+    def prepare_claim(self, claim: str) -> PreparedClaim:
+        """Extract and count claim terms once for reuse across citations."""
+        terms = self._extract_key_terms(claim)
+        term_weights: Dict[str, int] = {}
+        for term in terms:
+            term_weights[term] = term_weights.get(term, 0) + 1
+        return PreparedClaim(terms=terms, term_weights=term_weights)
+    
+    def _highlight_prepared(self, prepared: PreparedClaim, citation_text: str, stance: str,
+                            stance_probabilities: Dict[str, float]) -> CitationHighlight:
+        """
+        Highlight a citation in a single pass over its text.
+        
+        The citation is tokenized once. Claim-term occurrences are counted in
+        per-term prefix sums over the token sequence, so the relevance of any
+        context window is computed in O(number of claim terms) rather than by
+        re-tokenizing the window.
+        """
+        text = citation_text
+        
+        # Tokenize once
+        token_starts: List[int] = []
+        token_ends: List[int] = []
+        token_terms: List[Optional[str]] = []
+        for match in _TOKEN_RE.finditer(text):
+            token_starts.append(match.start())
+            token_ends.append(match.end())
+            lowered = match.group().lower()
+            token_terms.append(lowered if lowered in prepared.term_weights else None)
         
-        # Extract key terms from the claim
-        claim_terms = self._extract_key_terms(claim)
+        # Per-term prefix counts over tokens
+        term_prefix = {
+            term: [0] + list(accumulate(1 if t == term else 0 for t in token_terms))
+            for term in prepared.term_weights
+        }
+        total_terms = max(1, len(prepared.terms))
         
-        # Find relevant spans
-        highlighted_spans = []
+        def relevance(start: int, end: int) -> float:
+            # Tokens lying entirely inside [start, end)
+            first = bisect_left(token_starts, start)
+            last = bisect_right(token_ends, end)
+            if last <= first:
+                return 0.0
+            overlap = sum(weight for term, weight in prepared.term_weights.items()
+                          if term_prefix[term][last] > term_prefix[term][first])
+            return min(1.0, overlap / total_terms)
         
-        # Find supporting evidence spans
-        support_spans = self._find_support_spans(citation_text, claim_terms)
-        for span in support_spans:
-            highlighted_spans.append(HighlightedSpan(
-                start=span[0],
-                end=span[1],
-                text=span[2],
-                relevance_score=span[3],
-                highlight_type="support",
-                confidence=stance_probabilities.get("SUPPORTED", 0.0)
-            ))
+        positive_index = self._indicator_index(self.positive_matcher, text)
+        negative_index = self._indicator_index(self.negative_matcher, text)
         
-        # Find refuting evidence spans
-        refute_spans = self._find_refute_spans(citation_text, claim_terms)
-        for span in refute_spans:
-            highlighted_spans.append(HighlightedSpan(
-                start=span[0],
-                end=span[1],
-                text=span[2],
-                relevance_score=span[3],
-                highlight_type="refute",
-                confidence=stance_probabilities.get("REFUTED", 0.0)
-            ))
+        candidates: List[Tuple[int, int, float, str]] = []
+        text_length = len(text)
         
-        # Find neutral/context spans
-        neutral_spans = self._find_neutral_spans(citation_text, claim_terms)
-        for span in neutral_spans:
-            highlighted_spans.append(HighlightedSpan(
-                start=span[0],
-                end=span[1],
-                text=span[2],
-                relevance_score=span[3],
-                highlight_type="neutral",
-                confidence=stance_probabilities.get("NOT ENOUGH INFO", 0.0)
-            ))
+        # Stance keywords near claim terms
+        for hit in self.stance_keyword_matcher.finditer(text):
+            context_start = max(0, hit.start - 100)
+            context_end = min(text_length, hit.end + 100)
+            score = relevance(context_start, context_end)
+            if score > 0.3:  # Threshold for relevance
+                for highlight_type in self.keyword_types.get(hit.keyword.lower(), []):
+                    candidates.append((hit.start, hit.end, score, highlight_type))
+        
+        # Claim terms, classified by their surrounding context
+        for index, term in enumerate(token_terms):
+            if term is None:
+                continue
+            start, end = token_starts[index], token_ends[index]
+            
+            context_start = max(0, start - 50)
+            context_end = min(text_length, end + 50)
+            is_positive = self._window_has(positive_index, context_start, context_end)
+            is_negative = self._window_has(negative_index, context_start, context_end)
+            if is_positive or is_negative:
+                score = relevance(context_start, context_end)
+                if is_positive:
+                    candidates.append((start, end, score, "support"))
+                if is_negative:
+                    candidates.append((start, end, score, "refute"))
+            
+            context_start = max(0, start - 30)
+            context_end = min(text_length, end + 30)
+            if (not self._window_has(positive_index, context_start, context_end) and
+                    not self._window_has(negative_index, context_start, context_end)):
+                score = relevance(context_start, context_end) * 0.5  # Lower relevance for neutral
+                if score > 0.2:
+                    candidates.append((start, end, score, "neutral"))
+        
+        highlighted_spans = [
+            HighlightedSpan(
+                start=start,
+                end=end,
+                text=text[start:end],
+                relevance_score=score,
+                highlight_type=highlight_type,
+                confidence=stance_probabilities.get(_TYPE_STANCE[highlight_type], 0.0)
+            )
+            for start, end, score, highlight_type in self._merge_spans(candidates, stance)
+        ]
         
         # Sort spans by relevance score
         highlighted_spans.sort(key=lambda x: x.relevance_score, reverse=True)
@@ -122,100 +247,66 @@ class CitationHighlighter:
         key_terms = [word for word in words if word not in stop_words and len(word) > 2]
         return key_terms
     
-    def _find_support_spans(self, text: str, claim_terms: List[str]) -> List[Tuple[int, int, str, float]]:
-        """Find spans that support the claim."""
-        spans = []
-        
-        # Look for support keywords
-        for keyword in self.support_keywords:
-            for match in re.finditer(rf'\b{re.escape(keyword)}\b', text, re.IGNORECASE):
-                # Check if this keyword appears near claim terms
-                context_start = max(0, match.start() - 100)
-                context_end = min(len(text), match.end() + 100)
-                context = text[context_start:context_end]
-                
-                # Calculate relevance based on proximity to claim terms
-                relevance = self._calculate_relevance(context, claim_terms)
-                if relevance > 0.3:  # Threshold for relevance
-                    spans.append((match.start(), match.end(), match.group(), relevance))
-        
-        # Look for claim term matches with positive context
-        for term in claim_terms:
-            for match in re.finditer(rf'\b{re.escape(term)}\b', text, re.IGNORECASE):
-                context_start = max(0, match.start() - 50)
-                context_end = min(len(text), match.end() + 50)
-                context = text[context_start:context_end]
-                
-                # Check if context is positive
-                if self._is_positive_context(context):
-                    relevance = self._calculate_relevance(context, claim_terms)
-                    spans.append((match.start(), match.end(), match.group(), relevance))
+    def _indicator_index(self, matcher, text: str) -> Tuple[List[int], List[int]]:
+        """
+        Index indicator hits for window queries.
         
-        return spans
+        Returns hit starts and the suffix minimum of hit ends, so a window
+        [a, b) contains a whole hit iff the first hit starting at or after a
+        has a suffix-minimum end <= b.
+        """
+        hits = sorted((hit.start, hit.end) for hit in matcher.finditer(text))
+        starts = [start for start, _ in hits]
+        suffix_min_end = [end for _, end in hits]
+        for i in range(len(suffix_min_end) - 2, -1, -1):
+            suffix_min_end[i] = min(suffix_min_end[i], suffix_min_end[i + 1])
+        return starts, suffix_min_end
     
-    def _find_refute_spans(self, text: str, claim_terms: List[str]) -> List[Tuple[int, int, str, float]]:
-        """Find spans that refute the claim."""
-        spans = []
+    def _window_has(self, index: Tuple[List[int], List[int]], start: int, end: int) -> bool:
+        """Whether an indicator hit lies entirely inside [start, end)."""
+        starts, suffix_min_end = index
+        i = bisect_left(starts, start)
+        return i < len(starts) and suffix_min_end[i] <= end
+    
+    def _merge_spans(self, candidates: List[Tuple[int, int, float, str]],
+                     stance: str) -> List[Tuple[int, int, float, str]]:
+        """
+        Merge candidate spans into non-overlapping spans.
         
-        # Look for refute keywords
-        for keyword in self.refute_keywords:
-            for match in re.finditer(rf'\b{re.escape(keyword)}\b', text, re.IGNORECASE):
-                context_start = max(0, match.start() - 100)
-                context_end = min(len(text), match.end() + 100)
-                context = text[context_start:context_end]
-                
-                relevance = self._calculate_relevance(context, claim_terms)
-                if relevance > 0.3:
-                    spans.append((match.start(), match.end(), match.group(), relevance))
+        Overlapping spans of the same type are joined and keep their highest
+        relevance. Where spans of different types still overlap, the more
+        relevant one wins, and ties go to the type matching the stance.
+        """
+        type_order = dict(_TYPE_ORDER)
+        for highlight_type, stance_label in _TYPE_STANCE.items():
+            if stance_label == stance:
+                type_order[highlight_type] = -1
         
-        # Look for claim term matches with negative context
-        for term in claim_terms:
-            for match in re.finditer(rf'\b{re.escape(term)}\b', text, re.IGNORECASE):
-                context_start = max(0, match.start() - 50)
-                context_end = min(len(text), match.end() + 50)
-                context = text[context_start:context_end]
-                
-                # Check if context is negative
-                if self._is_negative_context(context):
-                    relevance = self._calculate_relevance(context, claim_terms)
-                    spans.append((match.start(), match.end(), match.group(), relevance))
+        merged: List[Tuple[int, int, float, str]] = []
+        for highlight_type in _TYPE_ORDER:
+            current = None
+            for start, end, score, _ in sorted(c for c in candidates if c[3] == highlight_type):
+                if current and start < current[1]:
+                    current = (current[0], max(current[1], end), max(current[2], score), highlight_type)
+                else:
+                    if current:
+                        merged.append(current)
+                    current = (start, end, score, highlight_type)
+            if current:
+                merged.append(current)
         
-        return spans
-    
-    def _find_neutral_spans(self, text: str, claim_terms: List[str]) -> List[Tuple[int, int, str, float]]:
-        """Find neutral/contextual spans."""
-        spans = []
+        accepted_starts: List[int] = []
+        accepted: List[Tuple[int, int, float, str]] = []
+        for span in sorted(merged, key=lambda s: (-s[2], type_order[s[3]], s[0])):
+            i = bisect_left(accepted_starts, span[0])
+            if i > 0 and accepted[i - 1][1] > span[0]:
+                continue
+            if i < len(accepted) and accepted[i][0] < span[1]:
+                continue
+            accepted_starts.insert(i, span[0])
+            accepted.insert(i, span)
         
-        # Look for claim terms in neutral context
-        for term in claim_terms:
-            for match in re.finditer(rf'\b{re.escape(term)}\b', text, re.IGNORECASE):
-                context_start = max(0, match.start() - 30)
-                context_end = min(len(text), match.end() + 30)
-                context = text[context_start:context_end]
-                
-                # Check if context is neutral
-                if not self._is_positive_context(context) and not self._is_negative_context(context):
-                    relevance = self._calculate_relevance(context, claim_terms) * 0.5  # Lower relevance for neutral
-                    if relevance > 0.2:
-                        spans.append((match.start(), match.end(), match.group(), relevance))
-        
-        return spans
-    
-    def _is_positive_context(self, context: str) -> bool:
-        """Check if context is positive/supporting."""
-        positive_indicators = ["confirm", "true", "accurate", "verified", "proven", "evidence"]
-        return any(indicator in context.lower() for indicator in positive_indicators)
-    
-    def _is_negative_context(self, context: str) -> bool:
-        """Check if context is negative/refuting."""
-        negative_indicators = ["false", "fake", "hoax", "debunked", "disproven", "incorrect"]
-        return any(indicator in context.lower() for indicator in negative_indicators)
-    
-    def _calculate_relevance(self, context: str, claim_terms: List[str]) -> float:
-        """Calculate relevance score based on term overlap."""
-        context_words = set(re.findall(r'\b\w+\b', context.lower()))
-        overlap = sum(1 for term in claim_terms if term in context_words)
-        return min(1.0, overlap / max(1, len(claim_terms)))
+        return accepted
     
     def format_highlighted_text(self, highlight: CitationHighlight) -> str:
         """Format highlighted text with HTML-like tags for display."""
@@ -246,18 +337,6 @@ class CitationHighlighter:
         return result
 
 
-def highlight_citations(claim: str, citations: List[Dict[str, any]]) -> List[CitationHighlight]:
+def highlight_citations(claim: str, citations: List[Dict[str, Any]]) -> List[CitationHighlight]:
     """Highlight multiple citations for a claim."""
-    highlighter = CitationHighlighter()
-    highlighted_citations = []
-    
-    for citation in citations:
-        citation_text = citation.get("text", citation.get("snippet", ""))
-        stance = citation.get("stance", "NOT ENOUGH INFO")
-        stance_probs = citation.get("stance_probabilities", {})
-        
-        if citation_text:
-            highlight = highlighter.highlight_citation(claim, citation_text, stance, stance_probs)
-            highlighted_citations.append(highlight)
-    
-    return highlighted_citations
+    return CitationHighlighter().highlight_citations(claim, citations)
@@ -0,0 +1,262 @@
+"""
+Document analysis utilities for TruthLens.
+
+Segments and tokenizes evidence text once per request so the verification
+stack does not re-split and re-lowercase the same article in every module.
+
+Usage:
+    with document_analysis_scope():
+        doc = analyze_text(evidence_text)      # computed once
+        doc.sentences, doc.word_set, doc.token_ids
+        analyze_text(evidence_text) is doc     # True inside the scope
+
+Outside a scope ``analyze_text`` still works but nothing is cached.
+"""
+
+import re
+from array import array
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, FrozenSet, Iterator, List, Optional
+
+# Sentence delimiter used throughout the verification stack
+SENTENCE_DELIMITER = re.compile(r'[.!?]+')
+
+
+@dataclass(frozen=True)
+class Sentence:
+    """A sentence with its offsets in the source text."""
+    text: str
+    start: int
+    end: int
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+
+class AnalyzedDocument:
+    """
+    Lazily computed segmentation and tokenization of one text.
+
+    Each view is computed on first access and then reused.
+    """
+
+    def __init__(self, text: str, analyzer: Optional["DocumentAnalyzer"] = None):
+        self.text = text or ""
+        self._analyzer = analyzer
+
+    @cached_property
+    def lower(self) -> str:
+        """Lowercased text."""
+        return self.text.lower()
+
+    @cached_property
+    def sentences(self) -> List[Sentence]:
+        """Non-empty, stripped sentences split on ``[.!?]+`` with source offsets."""
+        sentences = []
+        position = 0
+        for match in SENTENCE_DELIMITER.finditer(self.text):
+            self._append_sentence(sentences, position, match.start())
+            position = match.end()
+        self._append_sentence(sentences, position, len(self.text))
+        return sentences
+
+    def _append_sentence(self, sentences: List[Sentence], start: int, end: int):
+        segment = self.text[start:end]
+        stripped = segment.strip()
+        if stripped:
+            offset = start + (len(segment) - len(segment.lstrip()))
+            sentences.append(Sentence(stripped, offset, offset + len(stripped)))
+
+    @cached_property
+    def sentence_texts(self) -> List[str]:
+        """Sentence strings, as returned by ``text_cleaning.extract_sentences``."""
+        return [sentence.text for sentence in self.sentences]
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        """Lowercase whitespace tokens."""
+        return self.lower.split()
+
+    @cached_property
+    def word_set(self) -> FrozenSet[str]:
+        """Distinct lowercase whitespace tokens."""
+        return frozenset(self.tokens)
+
+    @cached_property
+    def token_ids(self) -> array:
+        """Token IDs from the owning analyzer's vocabulary."""
+        analyzer = self._analyzer or DocumentAnalyzer()
+        return array('l', (analyzer.token_id(token) for token in self.tokens))
+
+    @cached_property
+    def token_id_set(self) -> FrozenSet[int]:
+        """Distinct token IDs."""
+        return frozenset(self.token_ids)
+
+
+class DocumentAnalyzer:
+    """
+    Per-request cache of analyzed documents and a shared token vocabulary.
+
+    Token IDs are only comparable between documents of the same analyzer.
+    """
+
+    def __init__(self):
+        self._documents: Dict[str, AnalyzedDocument] = {}
+        self._vocabulary: Dict[str, int] = {}
+
+    def analyze(self, text: str) -> AnalyzedDocument:
+        """Return the analysis of a text, creating it on first use."""
+        text = text or ""
+        document = self._documents.get(text)
+        if document is None:
+            document = AnalyzedDocument(text, self)
+            self._documents[text] = document
+        return document
+
+    def token_id(self, token: str) -> int:
+        """Return the vocabulary ID of a token, assigning one if new."""
+        token_id = self._vocabulary.get(token)
+        if token_id is None:
+            token_id = len(self._vocabulary)
+            self._vocabulary[token] = token_id
+        return token_id
+
+    def jaccard(self, text1: str, text2: str) -> float:
+        """Jaccard similarity of the lowercase whitespace tokens of two texts."""
+        if not text1 or not text2:
+            return 0.0
+
+        ids1 = self.analyze(text1).token_id_set
+        ids2 = self.analyze(text2).token_id_set
+        if not ids1 or not ids2:
+            return 0.0
+
+        intersection = len(ids1 & ids2)
+        return intersection / (len(ids1) + len(ids2) - intersection)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+
+_current_analyzer: ContextVar[Optional[DocumentAnalyzer]] = ContextVar(
+    "truthlens_document_analyzer", default=None
+)
+
+
+@contextmanager
+def document_analysis_scope() -> Iterator[DocumentAnalyzer]:
+    """
+    Share one DocumentAnalyzer for the duration of a request.
+
+    Nested scopes reuse the outer analyzer, so library entry points can open
+    a scope unconditionally.
+    """
+    analyzer = _current_analyzer.get()
+    if analyzer is not None:
+        yield analyzer
+        return
+
+    analyzer = DocumentAnalyzer()
+    token = _current_analyzer.set(analyzer)
+    try:
+        yield analyzer
+    finally:
+        _current_analyzer.reset(token)
+
+
+def get_document_analyzer() -> DocumentAnalyzer:
+    """Return the active analyzer, or a throwaway one outside any scope."""
+    return _current_analyzer.get() or DocumentAnalyzer()
+
+
+def analyze_text(text: str) -> AnalyzedDocument:
+    """Analyze a text, reusing the active request's cached analysis when available."""
+    analyzer = _current_analyzer.get()
+    if analyzer is None:
+        return AnalyzedDocument(text)
+    return analyzer.analyze(text)
+
+
+def jaccard_similarity(text1: str, text2: str) -> float:
+    """Jaccard similarity of lowercase whitespace tokens, cached per request."""
+    return get_document_analyzer().jaccard(text1, text2)
+
+
+_NORMALIZE_PATTERN = re.compile(r'[^\w\s]+')
+# Negations, with "n't" and "cannot" folded into "not"
+_NEGATION_PATTERN = re.compile(r"\b(?:not|no|never|none|nobody|nothing|neither|nor|nowhere|without|cannot)\b"
+                               r"|n['\u2019]t\b")
+_NEGATION_FORMS = {"cannot": "not", "n't": "not", "n\u2019t": "not"}
+
+
+def normalize_claim(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace for duplicate detection."""
+    return ' '.join(_NORMALIZE_PATTERN.sub(' ', (text or '').lower()).split())
+
+
+def negation_words(text: str) -> FrozenSet[str]:
+    """Negation words of a text; claims that differ in them are not duplicates."""
+    return frozenset(_NEGATION_FORMS.get(word, word) for word in _NEGATION_PATTERN.findall((text or '').lower()))
+
+
+def group_near_duplicates(texts: List[str], threshold: float = 0.9) -> List[int]:
+    """
+    Map each text to the index of the first text it duplicates.
+
+    Texts are identical if they normalize to the same string, and
+    near-identical if their word Jaccard similarity is at least ``threshold``
+    and they use the same negation words, so a claim never shares a verdict
+    with its own negation.
+
+    Args:
+        texts: Texts in input order
+        threshold: Minimum Jaccard similarity for near-duplicates
+
+    Returns:
+        For each text, the index of its representative (itself if unique)
+    """
+    analyzer = DocumentAnalyzer()
+    representatives: List[int] = []
+    by_normalized: Dict[str, int] = {}
+    # Representatives bucketed by word count; Jaccard >= t needs a size ratio >= t
+    by_size: Dict[int, List[int]] = {}
+    word_sets: Dict[int, FrozenSet[int]] = {}
+    negations: Dict[int, FrozenSet[str]] = {}
+
+    for index, text in enumerate(texts):
+        normalized = normalize_claim(text)
+        match = by_normalized.get(normalized)
+
+        if match is None and threshold < 1.0:
+            words = analyzer.analyze(normalized).token_id_set
+            negated = negation_words(text)
+            size = len(words)
+            lowest = int(size * threshold)
+            highest = int(size / threshold) if threshold > 0 else size
+            for other_size in range(lowest, highest + 1):
+                for candidate in by_size.get(other_size, ()):
+                    if negations[candidate] != negated:
+                        continue
+                    other = word_sets[candidate]
+                    union = len(words | other)
+                    if union and len(words & other) / union >= threshold:
+                        match = candidate
+                        break
+                if match is not None:
+                    break
+            if match is None:
+                word_sets[index] = words
+                negations[index] = negated
+                by_size.setdefault(size, []).append(index)
+
+        if match is None:
+            match = index
+            by_normalized[normalized] = index
+        representatives.append(match)
+
+    return representatives
@@ -0,0 +1,230 @@
+"""
+Keyword matching utilities for TruthLens.
+
+Provides a compiled multi-keyword matcher that finds every occurrence of a
+keyword set in a single pass over the text. Keywords are folded into one
+trie-shaped regular expression, so the scan cost no longer grows with the
+number of keywords the way a ``for keyword in keywords`` loop does.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+
+class KeywordHit(NamedTuple):
+    """A keyword occurrence in a text."""
+    keyword: str
+    start: int
+    end: int
+    text: str
+    priority: int
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Build a regex alternation with shared prefixes factored out.
+
+    Longer continuations are tried first, so the longest keyword starting at
+    a position wins unless a boundary check forces backtracking.
+
+    Args:
+        words: Keywords to combine
+
+    Returns:
+        Regex source matching any of the keywords
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            if len(branches) == 1 and len(body) == 1:
+                return body + '?'
+            return ('(?:' + body + ')' if len(branches) == 1 else body) + '?'
+        return body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Compiled matcher for a fixed set of keywords.
+
+    All hits, including overlapping ones, are collected in one scan. Each hit
+    carries the keyword's position in the original list as its priority, so
+    callers that used to stop at the first keyword in list order can keep
+    that behaviour with ``first_by_priority``.
+
+    Case-insensitive matching lowercases the text once and runs a
+    case-sensitive pattern over it, which is several times faster than
+    ``re.IGNORECASE``. Presence checks without word boundaries are answered
+    with ``str.find`` over the folded text, since CPython's substring search
+    outperforms any regex for that question.
+    """
+
+    def __init__(self, keywords: Iterable[str], word_boundary: bool = True,
+                 case_sensitive: bool = False):
+        """
+        Compile the matcher.
+
+        Args:
+            keywords: Keywords in priority order
+            word_boundary: Require ``\\b`` on both sides of a match
+            case_sensitive: Match case exactly instead of ignoring case
+        """
+        self.word_boundary = word_boundary
+        self.case_sensitive = case_sensitive
+
+        self.keywords: List[str] = []
+        self._priority: Dict[str, int] = {}
+        for keyword in keywords:
+            key = self._fold(keyword)
+            if key and key not in self._priority:
+                self._priority[key] = len(self.keywords)
+                self.keywords.append(keyword)
+
+        # Shorter keywords that are prefixes of a longer one start at the same
+        # position; the regex only reports the longest, so record the rest here.
+        folded = sorted(self._priority, key=len)
+        self._prefixes: Dict[str, List[str]] = {
+            key: [other for other in folded if len(other) < len(key) and key.startswith(other)]
+            for key in folded
+        }
+
+        self.pattern: Optional[re.Pattern] = None
+        self._source = ''
+        self._ignorecase_pattern: Optional[re.Pattern] = None
+        if self._priority:
+            body = _trie_pattern(self._priority)
+            if word_boundary:
+                body = r'\b(?=(' + body + r')\b)'
+            else:
+                body = '(?=(' + body + '))'
+            self._source = body
+            self.pattern = re.compile(body)
+
+    def _fold(self, text: str) -> str:
+        return text if self.case_sensitive else text.lower()
+
+    def _scan(self, text: str):
+        """Run the compiled pattern, yielding (start, matched_text, folded_key)."""
+        folded = self._fold(text)
+        if len(folded) == len(text):
+            for match in self.pattern.finditer(folded):
+                start, end = match.span(1)
+                yield start, text[start:end], match.group(1)
+            return
+
+        # Lowercasing changed the length (rare non-ASCII input), so offsets
+        # would not line up; fall back to a case-insensitive pattern
+        if self._ignorecase_pattern is None:
+            self._ignorecase_pattern = re.compile(self._source, re.IGNORECASE)
+        for match in self._ignorecase_pattern.finditer(text):
+            yield match.start(1), match.group(1), self._fold(match.group(1))
+
+    def _is_boundary(self, text: str, index: int) -> bool:
+        """Whether ``\\b`` would match at index."""
+        before = index > 0 and (text[index - 1].isalnum() or text[index - 1] == '_')
+        after = index < len(text) and (text[index].isalnum() or text[index] == '_')
+        return before != after
+
+    def finditer(self, text: str):
+        """
+        Yield every keyword hit in order of start offset.
+
+        Args:
+            text: Text to scan
+
+        Yields:
+            KeywordHit for each occurrence, including overlapping ones
+        """
+        if not self.pattern or not text:
+            return
+
+        for start, matched, key in self._scan(text):
+            priority = self._priority.get(key)
+            if priority is None:
+                continue
+            yield KeywordHit(self.keywords[priority], start, start + len(matched), matched, priority)
+
+            for prefix in self._prefixes[key]:
+                end = start + len(prefix)
+                if self.word_boundary and not self._is_boundary(text, end):
+                    continue
+                yield KeywordHit(self.keywords[self._priority[prefix]], start, end,
+                                 text[start:end], self._priority[prefix])
+
+    def find_all(self, text: str) -> List[KeywordHit]:
+        """Return all keyword hits in the text."""
+        return list(self.finditer(text))
+
+    def search(self, text: str) -> bool:
+        """Return True if any keyword occurs in the text."""
+        if not self.pattern or not text:
+            return False
+        if not self.word_boundary:
+            folded = self._fold(text)
+            return any(key in folded for key in self._priority)
+        return next(self._scan(text), None) is not None
+
+    def first_by_priority(self, text: str) -> Optional[KeywordHit]:
+        """
+        Return the earliest hit of the highest-priority keyword present.
+
+        This matches a ``for keyword in keywords: if keyword in text`` loop.
+        """
+        if not self.pattern or not text:
+            return None
+
+        folded = self._fold(text)
+        if not self.word_boundary and len(folded) == len(text):
+            for key, priority in self._priority.items():
+                start = folded.find(key)
+                if start >= 0:
+                    end = start + len(key)
+                    return KeywordHit(self.keywords[priority], start, end, text[start:end], priority)
+            return None
+
+        best = None
+        for hit in self.finditer(text):
+            if best is None or (hit.priority, hit.start) < (best.priority, best.start):
+                best = hit
+                if best.priority == 0:
+                    break
+        return best
+
+    def matched_keywords(self, text: str) -> Set[str]:
+        """Return the set of keywords present in the text."""
+        return {hit.keyword for hit in self.finditer(text)}
+
+
+@lru_cache(maxsize=512)
+def _cached_matcher(keywords: Tuple[str, ...], word_boundary: bool,
+                    case_sensitive: bool) -> KeywordMatcher:
+    return KeywordMatcher(keywords, word_boundary=word_boundary, case_sensitive=case_sensitive)
+
+
+def get_keyword_matcher(keywords: Iterable[str], word_boundary: bool = True,
+                        case_sensitive: bool = False) -> KeywordMatcher:
+    """
+    Get a compiled matcher, reusing one already built for the same keyword set.
+
+    Args:
+        keywords: Keywords in priority order
+        word_boundary: Require ``\\b`` on both sides of a match
+        case_sensitive: Match case exactly instead of ignoring case
+
+    Returns:
+        Shared KeywordMatcher instance
+    """
+    return _cached_matcher(tuple(keywords), word_boundary, case_sensitive)
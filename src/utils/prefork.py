@@ -0,0 +1,221 @@
+"""
+Pre-fork model sharing for multi-worker TruthLens deployments.
+
+With ``TRUTHLENS_PREFORK=1`` the apps load and warm every model at import
+time, which under ``gunicorn --preload`` happens once in the master process.
+Workers forked afterwards share the weight pages copy-on-write. Two things
+would otherwise make those pages private again:
+
+* autograd bookkeeping and training-mode modules, so models are switched to
+  eval mode with ``requires_grad`` off;
+* the cyclic garbage collector, which writes to the header of every object it
+  visits, so the heap is moved to the permanent generation with
+  ``gc.freeze()`` right before forking.
+
+SQLite connections must not be used across fork() either. Objects holding
+file-backed connections register with ``register_connection_owner``;
+``prepare_for_fork`` closes their connections in the master and each worker
+reopens its own on first use.
+
+``memory_report`` reads ``/proc/<pid>/smaps_rollup`` to show how much of a
+worker's resident memory is shared with its siblings and how much is private.
+
+Usage:
+    # gunicorn.conf.py sets TRUTHLENS_PREFORK=1 and calls these hooks
+    prepare_for_fork(pipeline, cross_reference_scorer)   # in the master, after loading
+    after_fork()                                          # in each worker
+    memory_report()                                       # shared vs private MB
+"""
+
+import gc
+import logging
+import os
+import weakref
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+# smaps_rollup fields reported by memory_report, in kB
+_SMAPS_FIELDS = {
+    "Rss": "rss_mb",
+    "Pss": "pss_mb",
+    "Shared_Clean": "shared_clean_mb",
+    "Shared_Dirty": "shared_dirty_mb",
+    "Private_Clean": "private_clean_mb",
+    "Private_Dirty": "private_dirty_mb",
+    "Swap": "swap_mb",
+}
+
+
+# Objects with a release_connections() method, see register_connection_owner
+_connection_owners: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def register_connection_owner(owner: Any):
+    """
+    Have ``prepare_for_fork`` release ``owner``'s database connections.
+
+    The owner's ``release_connections()`` must close its connections so that
+    they are reopened lazily, by whichever process uses the owner next.
+    """
+    _connection_owners.add(owner)
+
+
+def release_connections() -> int:
+    """Close the connections of every registered owner; returns how many were released."""
+    owners = list(_connection_owners)
+    for owner in owners:
+        try:
+            owner.release_connections()
+        except Exception as e:
+            logger.warning(f"Could not release connections of {type(owner).__name__}: {e}")
+    return len(owners)
+
+
+def prefork_enabled() -> bool:
+    """Whether models should be loaded before the server forks workers."""
+    return os.environ.get("TRUTHLENS_PREFORK", "0") == "1"
+
+
+def _iter_modules(obj: Any, depth: int, seen: Set[int]) -> Iterable[Any]:
+    if obj is None or id(obj) in seen or depth < 0:
+        return
+    seen.add(id(obj))
+
+    if TORCH_AVAILABLE and isinstance(obj, torch.nn.Module):
+        # Submodules are covered by eval()/requires_grad_() on the parent
+        yield obj
+        return
+    if isinstance(obj, (list, tuple, set)):
+        children = list(obj)
+    elif isinstance(obj, dict):
+        children = list(obj.values())
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        children = list(vars(obj).values())
+    else:
+        return
+
+    for child in children:
+        yield from _iter_modules(child, depth - 1, seen)
+
+
+def freeze_models(*roots: Any, max_depth: int = 4) -> int:
+    """
+    Put every torch module reachable from ``roots`` into inference mode.
+
+    Args:
+        roots: Components holding models (pipelines, classifiers, scorers)
+        max_depth: How many attribute levels to follow from each root
+
+    Returns:
+        Number of top-level modules frozen
+    """
+    if not TORCH_AVAILABLE:
+        return 0
+
+    seen: Set[int] = set()
+    frozen = 0
+    for root in roots:
+        for module in _iter_modules(root, max_depth, seen):
+            module.eval()
+            module.requires_grad_(False)
+            frozen += 1
+    return frozen
+
+
+def prepare_for_fork(*roots: Any) -> Dict[str, Any]:
+    """
+    Freeze models and the Python heap and close database connections in the
+    master right before forking.
+
+    Returns:
+        Summary with the number of frozen modules, released connection
+        owners and the master's memory
+    """
+    frozen = freeze_models(*roots)
+    released = release_connections()
+
+    if TORCH_AVAILABLE and torch.cuda.is_available() and torch.cuda.is_initialized():
+        # A CUDA context does not survive fork; workers would fail on first use
+        logger.warning("CUDA was initialized before fork; pre-fork sharing only works for CPU models")
+
+    gc.collect()
+    gc.freeze()
+
+    report = memory_report()
+    logger.info(f"Prepared for fork: {frozen} models frozen, {released} connection owners released, "
+                f"{gc.get_freeze_count()} objects frozen, master RSS {report.get('rss_mb', 0):.0f} MB")
+    return {"frozen_models": frozen, "released_connections": released, "frozen_objects": gc.get_freeze_count(),
+            "memory": report}
+
+
+def after_fork(torch_threads: Optional[int] = None):
+    """
+    Per-worker setup after fork.
+
+    Limits intra-op threads so N workers do not each start one thread per
+    core. Reads ``TRUTHLENS_TORCH_THREADS`` when ``torch_threads`` is None.
+    """
+    if torch_threads is None:
+        torch_threads = int(os.environ.get("TRUTHLENS_TORCH_THREADS", 1))
+    if TORCH_AVAILABLE and torch_threads > 0:
+        torch.set_num_threads(torch_threads)
+
+
+def memory_report(pid: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Shared versus private memory of a process, in MB.
+
+    ``shared_mb`` counts pages also mapped by another process (the weights
+    inherited from the master); ``private_mb`` counts pages only this process
+    maps. ``pss_mb`` splits shared pages evenly between their users, so the
+    PSS of all workers sums to the real footprint.
+
+    Args:
+        pid: Process to inspect, defaults to the current one
+
+    Returns:
+        Memory breakdown, or ``{"available": False}`` without /proc
+    """
+    pid = pid or os.getpid()
+    values: Dict[str, float] = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            lines = f.readlines()
+    except OSError:
+        try:
+            with open(f"/proc/{pid}/smaps") as f:
+                lines = f.readlines()
+        except OSError:
+            return {"pid": pid, "available": False}
+
+    for line in lines:
+        parts = line.split()
+        if len(parts) >= 2 and parts[0].rstrip(":") in _SMAPS_FIELDS:
+            key = _SMAPS_FIELDS[parts[0].rstrip(":")]
+            values[key] = values.get(key, 0.0) + int(parts[1]) / 1024
+
+    report: Dict[str, Any] = {"pid": pid, "available": True}
+    report.update({key: round(values.get(key, 0.0), 1) for key in _SMAPS_FIELDS.values()})
+    report["shared_mb"] = round(report["shared_clean_mb"] + report["shared_dirty_mb"], 1)
+    report["private_mb"] = round(report["private_clean_mb"] + report["private_dirty_mb"], 1)
+    return report
+
+
+def worker_memory_reports(master_pid: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Memory reports for the direct children of ``master_pid`` (the workers)."""
+    master_pid = master_pid or os.getppid()
+    children: List[int] = []
+    try:
+        for task in os.listdir(f"/proc/{master_pid}/task"):
+            with open(f"/proc/{master_pid}/task/{task}/children") as f:
+                children.extend(int(pid) for pid in f.read().split())
+    except OSError:
+        return []
+    return [memory_report(pid) for pid in sorted(children)]
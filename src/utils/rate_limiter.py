@@ -0,0 +1,73 @@
+"""
+Rate limiting for TruthLens API clients.
+
+A RateLimiter hands out request slots at least ``min_interval`` seconds
+apart. Slots are reserved under a lock and waited for outside it, so any
+number of threads can share one limiter and a provider's quota holds however
+the requests are scheduled. A caller with a deadline is refused a slot it
+would have to wait past the deadline for, instead of sleeping into it.
+
+Usage:
+    limiter = RateLimiter(min_interval=1.0, name="snopes")
+
+    if limiter.acquire(deadline=time.monotonic() + 5):
+        session.get(...)
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class RateLimiter:
+    """Thread-safe request spacing for one provider."""
+
+    def __init__(self, min_interval: float, name: str = "default"):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            min_interval: Minimum seconds between the starts of two requests
+            name: Provider name, for stats and logging
+        """
+        self.min_interval = max(0.0, float(min_interval))
+        self.name = name
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._granted = 0
+        self._refused = 0
+
+    def reserve(self, deadline: Optional[float] = None) -> Optional[float]:
+        """
+        Reserve the next free slot.
+
+        Args:
+            deadline: time.monotonic() value the slot must not start after
+
+        Returns:
+            Seconds to wait before the slot starts, or None if it would start
+            after the deadline (nothing is reserved then)
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            if deadline is not None and slot > deadline:
+                self._refused += 1
+                return None
+            self._next_slot = slot + self.min_interval
+            self._granted += 1
+            return slot - now
+
+    def acquire(self, deadline: Optional[float] = None) -> bool:
+        """Block until a slot starts; False if none starts before the deadline."""
+        wait = self.reserve(deadline)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"name": self.name, "min_interval": self.min_interval,
+                    "granted": self._granted, "refused": self._refused}
@@ -0,0 +1,333 @@
+"""
+Serving utilities for TruthLens.
+
+Keeps the FastAPI event loop responsive while the pipeline does synchronous
+work. CPU/GPU stages (torch inference, SQLite cache access, pipeline glue)
+run on a bounded thread pool, and requests are admitted through a queue with
+a fixed depth so overload turns into fast 429/503 responses instead of an
+ever-growing backlog.
+
+Usage:
+    executor = BoundedExecutor(max_workers=2, max_queue=16, name="inference")
+
+    @app.post("/predict")
+    async def predict(request):
+        return await executor.run(process_pipeline, request.text)
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request cannot be admitted.
+
+    ``status_code`` is 429 when the queue is full and 503 when the request
+    waited longer than the queue timeout or the service is shutting down.
+    """
+
+    def __init__(self, message: str, status_code: int = 429, retry_after: int = 1):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class _StreamError:
+    """Carries an exception from a producer thread to the stream consumer."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_STREAM_DONE = object()
+
+
+class _ProducerStream:
+    """
+    Async iterator over the items a producer thread emits.
+
+    The producer is cancelled when the stream ends, is closed, its consumer
+    is cancelled, or the stream is dropped without ever being iterated, so
+    an abandoned stream never keeps holding an executor slot.
+    """
+
+    def __init__(self, queue: "asyncio.Queue", cancelled: threading.Event):
+        self._queue = queue
+        self._cancelled = cancelled
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._cancelled.is_set():
+            raise StopAsyncIteration
+        try:
+            item = await self._queue.get()
+        except BaseException:
+            self._cancelled.set()
+            raise
+        if item is _STREAM_DONE:
+            self._cancelled.set()
+            raise StopAsyncIteration
+        if isinstance(item, _StreamError):
+            self._cancelled.set()
+            raise item.error
+        return item
+
+    async def aclose(self):
+        """Stop the producer before it emits its next item."""
+        self._cancelled.set()
+
+    def __del__(self):
+        self._cancelled.set()
+
+
+class AdmissionController:
+    """
+    Limits concurrent work and the number of requests waiting for a slot.
+
+    At most ``max_concurrency`` requests run at once and at most
+    ``max_queue`` wait behind them. Anything beyond that is rejected
+    immediately with 429; a waiter that does not get a slot within
+    ``queue_timeout`` seconds is rejected with 503.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int,
+                 queue_timeout: Optional[float] = 30.0, name: str = "default"):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.name = name
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._active = 0
+        self._waiting = 0
+        self._closed = False
+        self._stats = {"admitted": 0, "rejected_queue_full": 0,
+                       "rejected_timeout": 0, "rejected_closed": 0}
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so the controller can be built at import time,
+        # before uvicorn starts its loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def acquire(self):
+        """Wait for a slot or raise AdmissionRejected."""
+        if self._closed:
+            self._stats["rejected_closed"] += 1
+            raise AdmissionRejected(f"{self.name}: service is shutting down", status_code=503)
+
+        semaphore = self._get_semaphore()
+        if semaphore.locked() and self._waiting >= self.max_queue:
+            self._stats["rejected_queue_full"] += 1
+            raise AdmissionRejected(
+                f"{self.name}: queue full ({self._waiting} waiting, {self._active} running)",
+                status_code=429
+            )
+
+        self._waiting += 1
+        try:
+            if self.queue_timeout is None:
+                await semaphore.acquire()
+            else:
+                await asyncio.wait_for(semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._stats["rejected_timeout"] += 1
+            raise AdmissionRejected(
+                f"{self.name}: no worker available within {self.queue_timeout:.0f}s",
+                status_code=503,
+                retry_after=max(1, int(self.queue_timeout))
+            )
+        finally:
+            self._waiting -= 1
+
+        self._active += 1
+        self._stats["admitted"] += 1
+
+    def release(self):
+        """Free a slot taken by ``acquire``."""
+        self._active -= 1
+        self._get_semaphore().release()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+    def close(self):
+        """Reject new requests; requests already admitted finish normally."""
+        self._closed = True
+
+    def stats(self) -> Dict[str, Any]:
+        """Current occupancy and admission counters."""
+        return {
+            "name": self.name,
+            "active": self._active,
+            "waiting": self._waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            **self._stats
+        }
+
+
+class BoundedExecutor:
+    """
+    Thread pool for blocking pipeline stages, fronted by admission control.
+
+    Only ``max_workers`` calls are handed to the pool at a time; further
+    callers wait in the admission queue on the event loop, where they can be
+    shed or time out, rather than in the pool's unbounded internal queue.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 16,
+                 queue_timeout: Optional[float] = 30.0, name: str = "inference"):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Threads running blocking work concurrently
+            max_queue: Requests allowed to wait for a thread
+            queue_timeout: Seconds a request may wait before a 503, None to wait forever
+            name: Name used in thread names, logs and stats
+        """
+        self.name = name
+        self.admission = AdmissionController(max_workers, max_queue, queue_timeout, name=name)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"truthlens-{name}")
+        self._timing_lock = threading.Lock()
+        self._completed = 0
+        self._busy_seconds = 0.0
+
+    @classmethod
+    def from_env(cls, prefix: str = "TRUTHLENS", name: str = "inference",
+                 default_workers: int = 2, default_queue: int = 16,
+                 default_timeout: float = 30.0) -> "BoundedExecutor":
+        """
+        Build an executor sized from environment variables.
+
+        Reads ``{prefix}_WORKERS``, ``{prefix}_MAX_QUEUE`` and
+        ``{prefix}_QUEUE_TIMEOUT``.
+        """
+        workers = int(os.environ.get(f"{prefix}_WORKERS", default_workers))
+        max_queue = int(os.environ.get(f"{prefix}_MAX_QUEUE", default_queue))
+        timeout = float(os.environ.get(f"{prefix}_QUEUE_TIMEOUT", default_timeout))
+        return cls(max_workers=workers, max_queue=max_queue,
+                   queue_timeout=timeout if timeout > 0 else None, name=name)
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking callable on the pool without blocking the event loop.
+
+        Raises:
+            AdmissionRejected: If the request is shed by admission control
+        """
+        await self.admission.acquire()
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._pool.submit(functools.partial(self._timed, fn, *args, **kwargs))
+        except BaseException:
+            self.admission.release()
+            raise
+
+        # The slot is freed when the thread finishes, not when the caller
+        # stops waiting, so a disconnected client cannot push the pool past
+        # max_workers
+        future.add_done_callback(lambda _: self._release_from_thread(loop))
+        return await asyncio.wrap_future(future, loop=loop)
+
+    async def stream(self, fn: Callable[..., Iterable[Any]], *args, **kwargs) -> AsyncIterator[Any]:
+        """
+        Run a blocking generator on the pool and expose it as an async iterator.
+
+        Admission happens before this coroutine returns, so a rejection can
+        still become a 429/503 status instead of a broken stream. The
+        generator runs start to finish on one pool thread; once the consumer
+        stops iterating, closes the stream or drops it (even unstarted), the
+        generator is closed before it produces its next item.
+
+        Raises:
+            AdmissionRejected: If the request is shed by admission control
+        """
+        await self.admission.acquire()
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def emit(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                cancelled.set()
+
+        def produce():
+            iterator = None
+            try:
+                iterator = iter(fn(*args, **kwargs))
+                for item in iterator:
+                    if cancelled.is_set():
+                        break
+                    emit(item)
+            except BaseException as e:
+                emit(_StreamError(e))
+            finally:
+                close = getattr(iterator, "close", None)
+                if close:
+                    close()
+                emit(_STREAM_DONE)
+
+        try:
+            future = self._pool.submit(functools.partial(self._timed, produce))
+        except BaseException:
+            self.admission.release()
+            raise
+        future.add_done_callback(lambda _: self._release_from_thread(loop))
+        return _ProducerStream(queue, cancelled)
+
+    def _release_from_thread(self, loop: asyncio.AbstractEventLoop):
+        try:
+            loop.call_soon_threadsafe(self.admission.release)
+        except RuntimeError:
+            # Event loop already closed during shutdown
+            pass
+
+    def _timed(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._timing_lock:
+                self._completed += 1
+                self._busy_seconds += elapsed
+
+    def stats(self) -> Dict[str, Any]:
+        """Admission counters plus completed-call timing."""
+        with self._timing_lock:
+            completed, busy = self._completed, self._busy_seconds
+        stats = self.admission.stats()
+        stats["completed"] = completed
+        stats["avg_run_seconds"] = busy / completed if completed else 0.0
+        return stats
+
+    def shutdown(self, wait: bool = True):
+        """Stop admitting requests and shut the pool down."""
+        self.admission.close()
+        self._pool.shutdown(wait=wait)
+        logger.info(f"{self.name} executor shut down")
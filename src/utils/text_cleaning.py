@@ -9,6 +9,8 @@ import unicodedata
 from typing import Optional, List
 from html import unescape
 
+from .document_analysis import analyze_text
+
 
 def clean_text(text: str, 
                remove_html: bool = True,
@@ -102,9 +104,8 @@ def extract_sentences(text: str) -> List[str]:
     Returns:
         List of sentences
     """
-    # Simple sentence splitting
-    sentences = re.split(r'[.!?]+', text)
-    return [s.strip() for s in sentences if s.strip()]
+    # Simple sentence splitting, shared with the rest of the request
+    return list(analyze_text(text).sentence_texts)
 
 
 def extract_paragraphs(text: str) -> List[str]:
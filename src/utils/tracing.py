@@ -0,0 +1,330 @@
+"""
+Lightweight tracing for TruthLens pipeline stages.
+
+Spans time a block of work and nest through a ContextVar, so a request
+opened with ``trace_request`` collects a span tree of everything it called:
+news providers, fact-check APIs, encoders, NLI, FAISS, SQLite caches and
+calibrators. Every span also feeds a rolling window per span name, exported
+as p50/p95/p99 on the apps' ``/metrics`` endpoint. Outside a request, spans
+only update those windows.
+
+An opt-in sampling profiler samples the request thread's stack and keeps
+the folded stacks of requests slower than a threshold.
+
+Usage:
+    @traced("nli.batch")
+    def classify(...): ...
+
+    with trace_request("analyze_claim") as trace:
+        with span("news.search", provider="guardian"):
+            ...
+    trace.to_dict()                      # span tree with durations
+    trace.stage_timings()                # {"news.search": 812.4, ...} in ms
+    metrics_snapshot()                   # {"nli.batch": {"p50_ms": ..., ...}}
+
+Environment:
+    TRUTHLENS_TRACING=0           disable spans entirely
+    TRUTHLENS_PROFILE=1           profile every trace_request
+    TRUTHLENS_PROFILE_SLOW_MS     keep profiles only for requests at least this slow
+    TRUTHLENS_PROFILE_INTERVAL_MS sampling interval (default 5)
+"""
+
+import asyncio
+import functools
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACING_ENABLED = os.environ.get("TRUTHLENS_TRACING", "1") != "0"
+
+
+@dataclass
+class Span:
+    """One timed block of work and the spans opened inside it."""
+    name: str
+    start: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    children: List["Span"] = field(default_factory=list)
+    duration: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.duration if self.duration is not None else time.perf_counter() - self.start
+        return end * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        node: Dict[str, Any] = {"name": self.name, "duration_ms": round(self.duration_ms, 3)}
+        if self.attributes:
+            node["attributes"] = self.attributes
+        if self.error:
+            node["error"] = self.error
+        if self.children:
+            node["children"] = [child.to_dict() for child in self.children]
+        return node
+
+
+@dataclass
+class Trace:
+    """Span tree of one request, plus its profile when sampling was on."""
+    root: Span
+    profile: Optional[Dict[str, Any]] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return self.root.duration_ms
+
+    def stage_timings(self) -> Dict[str, float]:
+        """Total milliseconds per span name across the tree, root excluded."""
+        totals: Dict[str, float] = {}
+        stack = list(self.root.children)
+        while stack:
+            node = stack.pop()
+            totals[node.name] = totals.get(node.name, 0.0) + node.duration_ms
+            stack.extend(node.children)
+        return {name: round(ms, 3) for name, ms in totals.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        trace = {"name": self.root.name, "duration_ms": round(self.duration_ms, 3),
+                 "spans": self.root.to_dict()}
+        if self.profile:
+            trace["profile"] = self.profile
+        return trace
+
+
+class SpanMetrics:
+    """Rolling duration window and totals per span name."""
+
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self._lock = threading.Lock()
+        self._durations: Dict[str, Deque[float]] = {}
+        self._counts: Counter = Counter()
+        self._errors: Counter = Counter()
+
+    def record(self, name: str, duration_ms: float, error: bool = False):
+        with self._lock:
+            durations = self._durations.get(name)
+            if durations is None:
+                durations = self._durations[name] = deque(maxlen=self.window)
+            durations.append(duration_ms)
+            self._counts[name] += 1
+            if error:
+                self._errors[name] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Count, error count and p50/p95/p99/max over the window, per span name."""
+        with self._lock:
+            windows = {name: sorted(values) for name, values in self._durations.items()}
+            counts, errors = dict(self._counts), dict(self._errors)
+
+        return {
+            name: {
+                "count": counts[name],
+                "errors": errors.get(name, 0),
+                "window": len(values),
+                "p50_ms": round(_percentile(values, 50), 3),
+                "p95_ms": round(_percentile(values, 95), 3),
+                "p99_ms": round(_percentile(values, 99), 3),
+                "max_ms": round(values[-1], 3),
+            }
+            for name, values in sorted(windows.items())
+        }
+
+    def reset(self):
+        with self._lock:
+            self._durations.clear()
+            self._counts.clear()
+            self._errors.clear()
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class SamplingProfiler:
+    """
+    Samples one thread's Python stack at a fixed interval.
+
+    Stacks are kept in folded form ("outer;inner;leaf" -> samples), which
+    flame-graph tools read directly.
+    """
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = 0.005, max_depth: int = 64):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        self._thread = threading.Thread(target=self._run, name="truthlens-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+
+    def report(self, top: int = 20) -> Dict[str, Any]:
+        """Sample count, hottest leaf functions and the folded stacks."""
+        leaves: Counter = Counter()
+        for stack, count in self.samples.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return {
+            "interval_ms": self.interval * 1000,
+            "samples": sum(self.samples.values()),
+            "top_functions": [{"function": name, "samples": count} for name, count in leaves.most_common(top)],
+            "folded_stacks": dict(self.samples.most_common(top * 5)),
+        }
+
+
+metrics = SpanMetrics()
+_current_span: ContextVar[Optional[Span]] = ContextVar("truthlens_current_span", default=None)
+_recent_traces: Deque[Dict[str, Any]] = deque(maxlen=int(os.environ.get("TRUTHLENS_TRACE_HISTORY", 50)))
+_recent_lock = threading.Lock()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """
+    Time a block and attach it to the enclosing span, if any.
+
+    Yields the span so callers can add attributes found while the block
+    runs. With tracing disabled the span is still timed but neither nested
+    nor recorded.
+    """
+    current = Span(name=name, start=time.perf_counter(), attributes=attributes)
+    if not TRACING_ENABLED:
+        try:
+            yield current
+        finally:
+            current.duration = time.perf_counter() - current.start
+        return
+
+    parent = _current_span.get()
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        current.duration = time.perf_counter() - current.start
+        _current_span.reset(token)
+        if parent is not None:
+            parent.children.append(current)
+        metrics.record(name, current.duration * 1000, error=current.error is not None)
+
+
+def traced(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """Decorator that runs a function (sync or async) inside a span."""
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def trace_request(name: str, profile: Optional[bool] = None, **attributes: Any) -> Iterator[Trace]:
+    """
+    Collect the span tree of one request.
+
+    Nested calls (e.g. a batch running single-claim analyses) open a plain
+    span inside the outer trace instead of starting a new one.
+
+    Args:
+        name: Root span name
+        profile: Sample the calling thread's stack; defaults to ``TRUTHLENS_PROFILE``
+        attributes: Attributes recorded on the root span
+    """
+    nested = _current_span.get() is not None
+    if profile is None:
+        profile = os.environ.get("TRUTHLENS_PROFILE", "0") == "1"
+
+    trace: Optional[Trace] = None
+    try:
+        with span(name, **attributes) as root:
+            trace = Trace(root=root)
+
+            profiler = None
+            if profile and not nested:
+                interval = float(os.environ.get("TRUTHLENS_PROFILE_INTERVAL_MS", 5)) / 1000
+                profiler = SamplingProfiler(interval=interval).start()
+
+            try:
+                yield trace
+            finally:
+                if profiler is not None:
+                    profiler.stop()
+                    slow_ms = float(os.environ.get("TRUTHLENS_PROFILE_SLOW_MS", 0))
+                    if trace.duration_ms >= slow_ms:
+                        trace.profile = profiler.report()
+    finally:
+        # Failed requests are kept too; their root span carries the error
+        if trace is not None and not nested:
+            with _recent_lock:
+                _recent_traces.append(trace.to_dict())
+
+
+def traced_request(name: str) -> Callable[[Callable], Callable]:
+    """Decorator that runs a synchronous entry point inside ``trace_request``."""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with trace_request(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def metrics_snapshot() -> Dict[str, Any]:
+    """Per-span percentiles plus the most recent request traces."""
+    with _recent_lock:
+        recent = list(_recent_traces)
+    return {
+        "tracing_enabled": TRACING_ENABLED,
+        "spans": metrics.snapshot(),
+        "recent_traces": recent,
+    }
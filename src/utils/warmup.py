@@ -0,0 +1,189 @@
+"""
+Model warm-up utilities for TruthLens.
+
+Loads every model a service needs and runs a dummy forward pass through each
+before the service reports ready, so the first real request does not pay for
+weight loading, CUDA context creation or lazy initialization.
+
+Usage:
+    warmup = WarmupManager()
+    warmup.add("stance_classifier", EnhancedStanceClassifier, warm=lambda c: c.warm_up())
+    warmup.start()                      # background thread; liveness stays up
+
+    warmup.is_ready()                   # True once every required component is ready
+    warmup.readiness()                  # per-component state and timings
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+LOADING = "loading"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+
+@dataclass
+class ComponentStatus:
+    """Load state and timings of one component."""
+    name: str
+    required: bool = True
+    state: str = PENDING
+    load_seconds: Optional[float] = None
+    warmup_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class _Component:
+    status: ComponentStatus
+    load: Callable[[], Any]
+    warm: Optional[Callable[[Any], Any]]
+    on_loaded: Optional[Callable[[Any], None]]
+
+
+class WarmupManager:
+    """
+    Loads and warms service components in registration order.
+
+    A failed optional component does not block readiness; a failed required
+    component does. Dummy forward passes can be skipped with
+    ``TRUTHLENS_WARMUP=0``; components are still loaded.
+    """
+
+    def __init__(self, run_forward_passes: Optional[bool] = None):
+        """
+        Initialize the warm-up manager.
+
+        Args:
+            run_forward_passes: Run each component's warm callable; defaults to
+                the ``TRUTHLENS_WARMUP`` environment variable (on unless "0")
+        """
+        if run_forward_passes is None:
+            run_forward_passes = os.environ.get("TRUTHLENS_WARMUP", "1") != "0"
+        self.run_forward_passes = run_forward_passes
+
+        self._components: List[_Component] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._process_started = time.time()
+
+    def add(self, name: str, load: Callable[[], Any], warm: Optional[Callable[[Any], Any]] = None,
+            on_loaded: Optional[Callable[[Any], None]] = None, required: bool = True):
+        """
+        Register a component.
+
+        Args:
+            name: Component name reported by readiness
+            load: Builds the component (loads weights)
+            warm: Runs a dummy forward pass on the loaded component
+            on_loaded: Receives the component once loaded, e.g. to set a module global
+            required: Whether readiness waits for this component
+        """
+        status = ComponentStatus(name=name, required=required)
+        self._components.append(_Component(status, load, warm, on_loaded))
+
+    def run(self):
+        """Load and warm every component in the calling thread."""
+        with self._lock:
+            self._started_at = time.time()
+
+        for component in self._components:
+            self._run_component(component)
+
+        with self._lock:
+            self._finished_at = time.time()
+        logger.info(f"Warm-up finished in {self._finished_at - self._started_at:.2f}s "
+                    f"(ready={self.is_ready()})")
+
+    def start(self) -> threading.Thread:
+        """Run warm-up in a background thread so liveness answers meanwhile."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="truthlens-warmup", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    @property
+    def started(self) -> bool:
+        """Whether warm-up has started, in this process or before it was forked."""
+        with self._lock:
+            return self._started_at is not None
+
+    def _run_component(self, component: _Component):
+        status = component.status
+        self._set(status, state=LOADING)
+        start = time.perf_counter()
+        try:
+            instance = component.load()
+            self._set(status, load_seconds=time.perf_counter() - start)
+
+            if component.warm and self.run_forward_passes:
+                self._set(status, state=WARMING)
+                start = time.perf_counter()
+                component.warm(instance)
+                self._set(status, warmup_seconds=time.perf_counter() - start)
+
+            if component.on_loaded:
+                component.on_loaded(instance)
+            self._set(status, state=READY)
+            logger.info(f"Component '{status.name}' ready (load {status.load_seconds:.2f}s"
+                        f"{f', warm-up {status.warmup_seconds:.2f}s' if status.warmup_seconds is not None else ''})")
+        except Exception as e:
+            self._set(status, state=FAILED, error=str(e))
+            log = logger.error if status.required else logger.warning
+            log(f"Component '{status.name}' failed to load: {e}")
+
+    def _set(self, status: ComponentStatus, **fields):
+        with self._lock:
+            for key, value in fields.items():
+                setattr(status, key, value)
+
+    def is_ready(self) -> bool:
+        """Whether every required component is ready."""
+        with self._lock:
+            # With nothing registered (e.g. mock mode) readiness follows the run itself
+            if not self._components:
+                return self._finished_at is not None
+            return all(c.status.state == READY for c in self._components if c.status.required)
+
+    def liveness(self) -> Dict[str, Any]:
+        """Process liveness; true whenever the event loop can answer."""
+        return {
+            "status": "alive",
+            "uptime_seconds": time.time() - self._process_started,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def readiness(self) -> Dict[str, Any]:
+        """Readiness with per-component load state and warm-up timings."""
+        with self._lock:
+            components = {c.status.name: asdict(c.status) for c in self._components}
+            started, finished = self._started_at, self._finished_at
+        ready = self.is_ready()
+
+        if finished is not None:
+            warmup_seconds = finished - started
+        elif started is not None:
+            warmup_seconds = time.time() - started
+        else:
+            warmup_seconds = None
+
+        return {
+            "status": "ready" if ready else ("warming" if finished is None else "degraded"),
+            "ready": ready,
+            "warmup_complete": finished is not None,
+            "warmup_seconds": warmup_seconds,
+            "forward_passes": self.run_forward_passes,
+            "components": components,
+            "timestamp": datetime.now().isoformat()
+        }
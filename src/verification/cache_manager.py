@@ -12,10 +12,27 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
+import re
 import time
 
+from ..utils.document_analysis import analyze_text
+
 logger = logging.getLogger(__name__)
 
+# Sentence-level stance patterns used when highlighting cached evidence
+NEGATION_PATTERNS = [
+    re.compile(r'\b(not true|false|fake|hoax|debunked|disproven|refuted|denied|incorrect|wrong)\b'),
+    re.compile(r'\b(no evidence|no proof|unfounded|baseless|misleading|misinformation)\b'),
+    re.compile(r'\b(does not|did not|do not|cannot|could not|would not|should not)\b')
+]
+
+SUPPORT_PATTERNS = [
+    re.compile(r'\b(confirmed|verified|true|accurate|correct|proven|established)\b'),
+    re.compile(r'\b(evidence shows|studies confirm|research indicates)\b')
+]
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
 
 @dataclass
 class CachedStanceResult:
@@ -204,41 +221,28 @@ class CacheManager:
         Returns:
             List of highlighted sentences with relevance information
         """
-        import re
-        
-        # Split into sentences
-        sentences = re.split(r'[.!?]+', evidence_text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        # Sentences are segmented and lowercased once per request
+        sentences = analyze_text(evidence_text).sentences
         
         # Extract claim keywords
-        claim_keywords = set(re.findall(r'\b\w+\b', claim.lower()))
+        claim_keywords = set(WORD_PATTERN.findall(claim.lower()))
         claim_keywords = {kw for kw in claim_keywords if len(kw) > 3}  # Filter short words
         
         highlighted_sentences = []
         
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
+        for sentence_info in sentences:
+            sentence = sentence_info.text
+            sentence_lower = sentence_info.lower
             
             # Calculate relevance score
             keyword_matches = sum(1 for kw in claim_keywords if kw in sentence_lower)
             relevance_score = keyword_matches / len(claim_keywords) if claim_keywords else 0
             
             # Check for negation patterns
-            negation_patterns = [
-                r'\b(not true|false|fake|hoax|debunked|disproven|refuted|denied|incorrect|wrong)\b',
-                r'\b(no evidence|no proof|unfounded|baseless|misleading|misinformation)\b',
-                r'\b(does not|did not|do not|cannot|could not|would not|should not)\b'
-            ]
-            
-            has_negation = any(re.search(pattern, sentence_lower) for pattern in negation_patterns)
+            has_negation = any(pattern.search(sentence_lower) for pattern in NEGATION_PATTERNS)
             
             # Check for support patterns
-            support_patterns = [
-                r'\b(confirmed|verified|true|accurate|correct|proven|established)\b',
-                r'\b(evidence shows|studies confirm|research indicates)\b'
-            ]
-            
-            has_support = any(re.search(pattern, sentence_lower) for pattern in support_patterns)
+            has_support = any(pattern.search(sentence_lower) for pattern in SUPPORT_PATTERNS)
             
             # Determine sentence type
             if has_negation:
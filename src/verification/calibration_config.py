@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Calibration Configuration for TruthLens
+Typed, parsed-once views of config/calibration.yaml, config/domain_priors.yaml
+and the UX verdict mapping, shared by every module in the verification path.
+
+Each file is parsed on first use and re-parsed only when its mtime or size
+changes; the file is stat'ed at most once per ``TRUTHLENS_CONFIG_CHECK_INTERVAL``
+seconds (default 1). Every parsed config carries a ``version`` derived from
+the file contents, and ``config_version()`` combines them so cached results
+can be keyed on, or invalidated by, the calibration they were computed with.
+
+Usage:
+    calib = get_calibration()
+    calib.temperature, calib.version
+    get_domain_priors().priors      # {"who.int": 1.0, ..., "default": 0.6}
+    get_domain_priors().index.trust("www.who.int")
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+import yaml
+
+from .domain_trust import DomainTrustIndex
+
+logger = logging.getLogger(__name__)
+
+CALIBRATION_PATH = "config/calibration.yaml"
+DOMAIN_PRIORS_PATH = "config/domain_priors.yaml"
+UX_MAPPING_PATH = "phase4_verification/config/ux_mapping.yaml"
+CHECK_INTERVAL_SECONDS = float(os.environ.get("TRUTHLENS_CONFIG_CHECK_INTERVAL", 1.0))
+
+DEFAULT_VERSION = "default"
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class CalibrationConfig:
+    """Settings from calibration.yaml. ``None`` means the caller's own default applies."""
+    temperature: float = 1.2
+    discrepancy_delta: float = 0.20
+    discrepancy_jsd: float = 0.20
+    cosine_floor: Optional[float] = None
+    topk_dense: int = 100
+    topk_rrf: int = 30
+    topk_cross_encoder: int = 20
+    final_k: Optional[int] = None
+    recency_tau_days: float = 365.0
+    nei_max_prob_keep: float = 0.45
+    version: str = DEFAULT_VERSION
+
+    @classmethod
+    def from_mapping(cls, data: Dict[str, Any], version: str = DEFAULT_VERSION) -> "CalibrationConfig":
+        values: Dict[str, Any] = {"version": version}
+        for f in fields(cls):
+            if f.name == "version" or data.get(f.name) is None:
+                continue
+            kind = int if f.name in ("topk_dense", "topk_rrf", "topk_cross_encoder", "final_k") else float
+            values[f.name] = kind(data[f.name])
+        return cls(**values)
+
+
+@dataclass(frozen=True)
+class DomainPriors:
+    """Domain trust priors from domain_priors.yaml; ``default`` applies to unknown domains."""
+    priors: Dict[str, float] = field(default_factory=dict)
+    version: str = DEFAULT_VERSION
+    index: DomainTrustIndex = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Compiled once per file version and shared by every calibrator
+        object.__setattr__(self, "index", DomainTrustIndex(self.priors))
+
+    @property
+    def default(self) -> float:
+        return self.index.default
+
+    @classmethod
+    def from_mapping(cls, data: Dict[str, Any], version: str = DEFAULT_VERSION) -> "DomainPriors":
+        return cls(priors={str(k): float(v) for k, v in data.items()}, version=version)
+
+
+DEFAULT_LABELS = {
+    "likely_true": "Likely True 🟢",
+    "unclear": "Unclear 🟡",
+    "likely_false": "Likely False 🔴",
+}
+
+
+@dataclass(frozen=True)
+class UXMapping:
+    """Verdict thresholds and labels from the UX mapping file."""
+    true_min: float = 0.7
+    unclear_min: float = 0.4
+    labels: Dict[str, str] = field(default_factory=lambda: dict(DEFAULT_LABELS))
+    use_supported_probability: bool = True
+    discrepancy_delta: float = 0.2
+    discrepancy_jsd: float = 0.2
+    version: str = DEFAULT_VERSION
+
+    @classmethod
+    def from_mapping(cls, data: Dict[str, Any], version: str = DEFAULT_VERSION) -> "UXMapping":
+        thresholds = data.get("thresholds") or {}
+        return cls(
+            true_min=float(thresholds.get("true_min", 0.7)),
+            unclear_min=float(thresholds.get("unclear_min", 0.4)),
+            labels={**DEFAULT_LABELS, **(data.get("labels") or {})},
+            use_supported_probability=bool(data.get("use_supported_probability", True)),
+            discrepancy_delta=float(data.get("discrepancy_delta", 0.2)),
+            discrepancy_jsd=float(data.get("discrepancy_jsd", 0.2)),
+            version=version,
+        )
+
+
+class ConfigFile(Generic[T]):
+    """
+    A YAML file parsed into a typed config and re-parsed when it changes on disk.
+
+    A missing file yields the parser's defaults; a file that fails to parse
+    keeps the last good config.
+    """
+
+    def __init__(self, path: str, parse: Callable[[Dict[str, Any], str], T],
+                 check_interval: float = CHECK_INTERVAL_SECONDS):
+        self.path = path
+        self.parse = parse
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._value: Optional[T] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._next_check = 0.0
+        self.loads = 0
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def get(self) -> T:
+        now = time.monotonic()
+        value = self._value
+        if value is not None and now < self._next_check:
+            return value
+        with self._lock:
+            self._next_check = now + self.check_interval
+            signature = self._stat()
+            if self._value is not None and signature == self._signature:
+                return self._value
+            self._value = self._load(signature)
+            self._signature = signature
+            return self._value
+
+    def _load(self, signature: Optional[Tuple[int, int]]) -> T:
+        self.loads += 1
+        if signature is None:
+            if self._signature is not None:
+                logger.warning(f"Config {self.path} disappeared; using defaults")
+            return self.parse({}, DEFAULT_VERSION)
+        try:
+            with open(self.path, "rb") as f:
+                raw = f.read()
+            data = yaml.safe_load(raw.decode("utf-8")) or {}
+            if not isinstance(data, dict):
+                raise ValueError(f"expected a mapping, got {type(data).__name__}")
+            value = self.parse(data, hashlib.sha1(raw).hexdigest()[:12])
+        except Exception as e:
+            if self._value is not None:
+                logger.error(f"Failed to reload config {self.path}; keeping previous version. Error: {e}")
+                return self._value
+            logger.error(f"Failed to load config {self.path}; using defaults. Error: {e}")
+            return self.parse({}, DEFAULT_VERSION)
+        if self._signature is not None:
+            logger.info(f"Reloaded config {self.path} (version {value.version})")
+        return value
+
+
+_files: Dict[Tuple[str, str], ConfigFile] = {}
+_files_lock = threading.Lock()
+
+
+def _watched(kind: str, path: str, parse: Callable[[Dict[str, Any], str], Any]) -> ConfigFile:
+    key = (kind, os.path.abspath(path))
+    config_file = _files.get(key)
+    if config_file is None:
+        with _files_lock:
+            config_file = _files.get(key)
+            if config_file is None:
+                config_file = _files[key] = ConfigFile(path, parse)
+    return config_file
+
+
+def get_calibration(path: str = CALIBRATION_PATH) -> CalibrationConfig:
+    """Current calibration settings."""
+    return _watched("calibration", path, CalibrationConfig.from_mapping).get()
+
+
+def get_domain_priors(path: str = DOMAIN_PRIORS_PATH) -> DomainPriors:
+    """Current domain trust priors."""
+    return _watched("domain_priors", path, DomainPriors.from_mapping).get()
+
+
+def get_ux_mapping(path: str = UX_MAPPING_PATH) -> UXMapping:
+    """Current verdict thresholds and labels."""
+    return _watched("ux_mapping", path, UXMapping.from_mapping).get()
+
+
+def config_version() -> str:
+    """Combined version of every config loaded so far; changes when any of them changes."""
+    with _files_lock:
+        watched = sorted(_files.items())
+    if not watched:
+        return DEFAULT_VERSION
+    digest = hashlib.sha1()
+    for (kind, path), config_file in watched:
+        digest.update(f"{kind}:{path}:{config_file.get().version};".encode("utf-8"))
+    return digest.hexdigest()[:12]
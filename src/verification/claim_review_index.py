@@ -0,0 +1,558 @@
+#!/usr/bin/env python3
+"""
+Local ClaimReview Index for TruthLens
+Fact-check reviews seen by any provider, kept in process and searched before
+going to the network.
+
+Reviews from the Google Fact Check API, the EnhancedFactCheckAPI parsers and
+the TrustedSourcesDatabase are stored as ClaimReview records and indexed
+twice: in an InvertedBM25Index over the claim text and, when an encoder is
+configured, as normalized embeddings. A lookup takes the BM25 and nearest
+embedding candidates and scores each as a blend of token overlap and cosine
+similarity. Only a hit scoring at least ``min_score`` whose claim has the
+same negation and reversal words as the query is served locally, so
+"X does not cause Y" never picks up the review of "X causes Y".
+
+Most traffic repeats a small set of viral claims, so refresh jobs re-query
+the most looked-up claims on a background thread and ingest whatever the
+providers return. The thread is started lazily in each process, but only the
+process holding an exclusive lock on the refresh lock file runs the jobs, so a
+pre-fork server with N workers does not spend N times the provider quota. The
+other workers reload the index from ``path`` whenever the refreshing worker
+has saved it, and one of them takes over the lock when that worker exits.
+
+Usage:
+    index = get_claim_review_index()
+    index.add([ClaimReview.from_google_claim(c) for c in claims])
+    hit = index.lookup("5G towers spread the coronavirus")   # (ClaimReview, score) or None
+
+    index.start_refresh([factcheck_refresh_job(api, index)], interval=3600)
+
+Environment:
+    TRUTHLENS_CLAIM_INDEX_PATH             JSON file the shared index is loaded from and saved to
+    TRUTHLENS_CLAIM_INDEX_MODEL            sentence-transformers model for the embedding index
+                                           (lexical matching only when unset)
+    TRUTHLENS_CLAIM_INDEX_REFRESH_SECONDS  refresh interval used by the pipeline (default 3600)
+    TRUTHLENS_CLAIM_INDEX_REFRESH_LOCK     lock file electing the refreshing process (default next
+                                           to TRUTHLENS_CLAIM_INDEX_PATH, else in the temp dir)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, every process refreshes
+    fcntl = None
+
+from ..evidence_retrieval.bm25_index import InvertedBM25Index
+from ..evidence_retrieval.embedding_cache import EmbeddingCache, content_hash
+from ..utils.document_analysis import negation_words
+from ..utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+MAX_TRACKED_QUERIES = 10_000
+_TOKEN_RE = re.compile(r'[^\w\s]')
+# Words that reverse what a claim asserts
+REVERSAL_WORDS = frozenset({'false', 'fake', 'hoax', 'myth', 'untrue', 'debunked'})
+
+_FALSE_RATING_WORDS = ('false', 'incorrect', 'inaccurate', 'refuted', 'debunked', 'pants on fire')
+_NEGATED_TRUE_RE = re.compile(r"\b(?:not|isn't|wasn't|un)\s*(?:true|correct|accurate|supported)")
+
+RefreshJob = Callable[[], Iterable["ClaimReview"]]
+
+
+def _tokenize(text: str) -> List[str]:
+    """Same tokenization as the BM25 retriever."""
+    return [word for word in _TOKEN_RE.sub(' ', text.lower()).split() if len(word) > 2]
+
+
+def _polarity(text: str) -> FrozenSet[str]:
+    """Negation and reversal words of a claim; a review only answers claims with the same ones."""
+    return negation_words(text) | REVERSAL_WORDS.intersection(_tokenize(text))
+
+
+def normalize_rating(rating: str) -> str:
+    """
+    Map a publisher's textual rating to SUPPORTED, REFUTED, MIXED or NOT ENOUGH INFO.
+
+    Negated and false ratings are matched before true ones, since "Not true",
+    "Untrue" and "Mostly false" all contain a true word.
+    """
+    rating_lower = rating.lower()
+    if _NEGATED_TRUE_RE.search(rating_lower) or any(word in rating_lower for word in _FALSE_RATING_WORDS):
+        return "REFUTED"
+    if any(word in rating_lower for word in ['mixed', 'mixture', 'half', 'partially']):
+        return "MIXED"
+    if any(word in rating_lower for word in ['true', 'correct', 'accurate', 'supported']):
+        return "SUPPORTED"
+    return "NOT ENOUGH INFO"
+
+
+@dataclass
+class ClaimReview:
+    """One published review of a claim, independent of the provider it came from."""
+    claim_text: str
+    rating: str
+    verdict: str
+    publisher: str
+    url: str
+    review_date: str
+    provider: str
+    confidence: float = 0.5
+    explanation: str = ""
+
+    @property
+    def id(self) -> str:
+        """The review URL, or a hash of claim and publisher for reviews without one."""
+        if self.url:
+            return self.url
+        return hashlib.md5(f"{self.claim_text}\x00{self.publisher}".encode('utf-8')).hexdigest()
+
+    @classmethod
+    def from_google_claim(cls, claim: Dict[str, Any]) -> Optional["ClaimReview"]:
+        """Review from a Google Fact Check Tools ``claims:search`` item; None without a claimReview."""
+        reviews = claim.get('claimReview') or []
+        if not reviews:
+            return None
+        review = reviews[0]
+        rating = review.get('textualRating', '') or ''
+        return cls(
+            claim_text=claim.get('text', '') or '',
+            rating=rating,
+            verdict=normalize_rating(rating),
+            publisher=(review.get('publisher') or {}).get('name', 'Unknown'),
+            url=review.get('url', '') or '',
+            review_date=review.get('reviewDate', '') or '',
+            provider='Google Fact Check',
+        )
+
+    @classmethod
+    def from_fact_check_result(cls, result: Any) -> "ClaimReview":
+        """Review from an EnhancedFactCheckResult."""
+        source = result.best_source or {}
+        return cls(
+            claim_text=result.claim_text,
+            rating=result.rating,
+            verdict=result.verdict,
+            publisher=source.get('publisher') or source.get('name', 'Unknown'),
+            url=result.url,
+            review_date=result.review_date,
+            provider=source.get('name', 'Unknown'),
+            confidence=result.confidence,
+            explanation=result.explanation,
+        )
+
+    @classmethod
+    def from_trusted_content(cls, content: Any, source: Any = None) -> Optional["ClaimReview"]:
+        """Review from TrustedContent that carries a fact-check rating or verdict; None otherwise."""
+        rating = content.fact_check_rating or content.verdict
+        if not rating:
+            return None
+        published = content.published_date
+        return cls(
+            claim_text=content.title,
+            rating=rating,
+            verdict=normalize_rating(rating),
+            publisher=source.name if source is not None else content.source_id,
+            url=content.url,
+            review_date=published.strftime('%Y-%m-%d') if hasattr(published, 'strftime') else str(published),
+            provider=source.name if source is not None else 'Trusted Sources',
+            confidence=source.reliability_score if source is not None else 0.5,
+            explanation=content.snippet,
+        )
+
+
+class ClaimReviewIndex:
+    """
+    Thread-safe hybrid lexical/embedding index of ClaimReviews.
+
+    Reviews are keyed by ``ClaimReview.id``; adding a review with a known ID
+    replaces it. Reviews without a rating (scraper placeholders) are ignored.
+    """
+
+    def __init__(self, encoder: Any = None, model_name: Optional[str] = None, min_score: float = 0.8,
+                 lexical_weight: float = 0.4, candidates: int = 20, path: Optional[Union[str, Path]] = None):
+        """
+        Initialize an empty index.
+
+        Args:
+            encoder: Object with a SentenceTransformer-style ``encode``; None for lexical matching only
+            model_name: Name of the encoder's model, stored with saved embeddings
+            min_score: Match score a local hit needs
+            lexical_weight: Weight of token overlap against cosine similarity when an encoder is set
+            candidates: Candidates taken from each of the BM25 and embedding indexes
+            path: JSON file used by ``save`` and ``load``; embeddings go next to it as .npz
+        """
+        self.encoder = encoder
+        self.model_name = model_name or getattr(encoder, 'model_name', None) or type(encoder).__name__
+        self.min_score = min_score
+        self.lexical_weight = lexical_weight if encoder is not None else 1.0
+        self.candidates = candidates
+        self.path = Path(path) if path else None
+        self.embedding_cache = EmbeddingCache(self.model_name, max_entries=None) if encoder is not None else None
+
+        self._lock = threading.RLock()
+        self._reviews: Dict[str, ClaimReview] = {}
+        self._tokens: Dict[str, FrozenSet[str]] = {}
+        self._bm25 = InvertedBM25Index()
+        self._rows: Dict[str, int] = {}
+        self._row_ids: List[str] = []
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+
+        self._queries: Counter = Counter()
+        self.hits = 0
+        self.misses = 0
+
+        self._refresh_jobs: Optional[List[RefreshJob]] = None
+        self._refresh_interval = 3600.0
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_pid: Optional[int] = None
+        self._refresh_stop = threading.Event()
+        self._refresh_lock_file: Optional[IO] = None
+        self._refresh_lock_pid: Optional[int] = None
+        self._saved_mtime: Optional[int] = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._reviews)
+
+    def add(self, reviews: Iterable[Optional[ClaimReview]]) -> int:
+        """
+        Index reviews, skipping None and unrated ones.
+
+        Returns:
+            Number of reviews indexed
+        """
+        new = [r for r in reviews if r is not None and r.claim_text and r.rating and r.rating != 'Unknown']
+        if not new:
+            return 0
+        vectors = self._encode([(r.id, r.claim_text) for r in new]) if self.encoder is not None else None
+        with self._lock:
+            for i, review in enumerate(new):
+                tokens = _tokenize(review.claim_text)
+                self._reviews[review.id] = review
+                self._tokens[review.id] = frozenset(tokens)
+                self._bm25.add(review.id, tokens)
+                if vectors is not None:
+                    self._set_row(review.id, vectors[i])
+        return len(new)
+
+    def _encode(self, items: Sequence[Tuple[str, str]]) -> np.ndarray:
+        keys = [(key, content_hash(text)) for key, text in items]
+        vectors = self.embedding_cache.encode(self.encoder, keys, [text for _, text in items])
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _set_row(self, review_id: str, vector: np.ndarray):
+        row = self._rows.get(review_id)
+        if row is None:
+            row = self._rows[review_id] = len(self._row_ids)
+            self._row_ids.append(review_id)
+            if row >= len(self._matrix):
+                grown = np.zeros((max(64, 2 * len(self._matrix)), len(vector)), dtype=np.float32)
+                if len(self._matrix):
+                    grown[:len(self._matrix)] = self._matrix
+                self._matrix = grown
+        self._matrix[row] = vector
+
+    def search(self, claim: str, top_k: int = 5) -> List[Tuple[ClaimReview, float]]:
+        """
+        Best matching reviews for a claim.
+
+        Returns:
+            (review, match score in [0, 1]) pairs by descending score
+        """
+        tokens = _tokenize(claim)
+        query_vector = None
+        if self.encoder is not None and len(self):
+            # Queries bypass the embedding cache, which only holds indexed reviews
+            query_vector = np.asarray(self.encoder.encode([claim]), dtype=np.float32)[0]
+            query_vector /= max(float(np.linalg.norm(query_vector)), 1e-12)
+        with self._lock:
+            candidates = {doc_id for doc_id, _ in self._bm25.search(tokens, self.candidates)}
+            cosines: Dict[str, float] = {}
+            if query_vector is not None and self._row_ids:
+                sims = self._matrix[:len(self._row_ids)] @ query_vector
+                nearest = np.argsort(-sims)[:self.candidates]
+                candidates.update(self._row_ids[i] for i in nearest)
+                cosines = {review_id: float(sims[self._rows[review_id]]) for review_id in candidates}
+
+            query_tokens = frozenset(tokens)
+            scored = []
+            for review_id in candidates:
+                review_tokens = self._tokens[review_id]
+                overlap = (2 * len(query_tokens & review_tokens) / (len(query_tokens) + len(review_tokens))
+                           if query_tokens or review_tokens else 0.0)
+                score = self.lexical_weight * overlap
+                if query_vector is not None:
+                    score += (1 - self.lexical_weight) * max(0.0, cosines.get(review_id, 0.0))
+                scored.append((self._reviews[review_id], score))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:top_k]
+
+    def lookup(self, claim: str) -> Optional[Tuple[ClaimReview, float]]:
+        """
+        The best review if it is a confident match, else None.
+
+        Token overlap and embeddings barely notice a negation, so candidates
+        whose claim differs from ``claim`` in negation or reversal words are
+        rejected however high they score. Every lookup counts toward the
+        claim's popularity for refresh jobs.
+        """
+        self._ensure_refresh()
+        with span("factcheck.local_index", reviews=len(self)):
+            best = self.search(claim, top_k=5)
+        polarity = _polarity(claim)
+        hit = next(((review, score) for review, score in best
+                    if score >= self.min_score and _polarity(review.claim_text) == polarity), None)
+        with self._lock:
+            self._queries[claim] += 1
+            if len(self._queries) > MAX_TRACKED_QUERIES:
+                self._queries = Counter(dict(self._queries.most_common(MAX_TRACKED_QUERIES // 2)))
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return hit
+
+    def popular_claims(self, n: int = 50) -> List[str]:
+        """The most looked-up claims."""
+        with self._lock:
+            return [claim for claim, _ in self._queries.most_common(n)]
+
+    def refresh(self, jobs: Sequence[RefreshJob]) -> int:
+        """
+        Run refresh jobs once and ingest their reviews; a failing job is logged and skipped.
+
+        Returns:
+            Number of reviews indexed
+        """
+        added = 0
+        for job in jobs:
+            try:
+                added += self.add(job())
+            except Exception as e:
+                logger.warning(f"Claim review refresh job {getattr(job, '__name__', job)} failed: {e}")
+        if self.path:
+            self.save()
+        logger.info(f"Claim review index refreshed: {added} reviews indexed, {len(self)} total")
+        return added
+
+    def start_refresh(self, jobs: Sequence[RefreshJob], interval: float = 3600.0):
+        """
+        Run ``refresh(jobs)`` every ``interval`` seconds on a daemon thread.
+
+        The thread is started by the first lookup in each process. A pre-fork
+        master that only builds the index starts none. Of the forked workers,
+        the one holding the refresh lock file runs the jobs on the claims its
+        own traffic looks up; the others reload ``path`` when it changes.
+        """
+        with self._refresh_lock:
+            self._refresh_jobs = list(jobs)
+            self._refresh_interval = interval
+
+    def _ensure_refresh(self):
+        # Threads do not survive fork(), so a thread started by another process does not count
+        if self._refresh_jobs is None:
+            return
+        thread = self._refresh_thread
+        if thread is not None and self._refresh_pid == os.getpid() and thread.is_alive():
+            return
+        with self._refresh_lock:
+            thread = self._refresh_thread
+            if self._refresh_jobs is None or (
+                    thread is not None and self._refresh_pid == os.getpid() and thread.is_alive()):
+                return
+            jobs, interval = self._refresh_jobs, self._refresh_interval
+            stop = self._refresh_stop = threading.Event()
+
+            def run():
+                while not stop.wait(interval):
+                    if self._holds_refresh_lock():
+                        self.refresh(jobs)
+                    else:
+                        self._reload_if_saved()
+
+            self._refresh_pid = os.getpid()
+            self._refresh_thread = threading.Thread(target=run, name="truthlens-claim-index-refresh", daemon=True)
+            self._refresh_thread.start()
+
+    def stop_refresh(self):
+        with self._refresh_lock:
+            self._refresh_jobs = None
+            self._refresh_stop.set()
+            thread, self._refresh_thread = self._refresh_thread, None
+        if thread is not None and self._refresh_pid == os.getpid():
+            thread.join(timeout=5)
+        if self._refresh_lock_file is not None and self._refresh_lock_pid == os.getpid():
+            self._refresh_lock_file.close()
+            self._refresh_lock_file = None
+
+    def _refresh_lock_path(self) -> Path:
+        configured = os.environ.get("TRUTHLENS_CLAIM_INDEX_REFRESH_LOCK")
+        if configured:
+            return Path(configured)
+        if self.path:
+            return self.path.with_name(self.path.name + ".refresh.lock")
+        # Workers of one pre-fork server share their parent
+        return Path(tempfile.gettempdir()) / f"truthlens-claim-index-{os.getppid()}.refresh.lock"
+
+    def _holds_refresh_lock(self) -> bool:
+        """Whether this process runs the refresh jobs, taking the lock if no other process holds it."""
+        if fcntl is None:
+            return True
+        if self._refresh_lock_file is not None and self._refresh_lock_pid == os.getpid():
+            return True
+        # A descriptor inherited over fork() shares the parent's lock, so open one of our own
+        path = self._refresh_lock_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            lock_file = open(path, 'a')
+        except OSError as e:
+            logger.warning(f"Cannot open claim index refresh lock {path}, refreshing in this process: {e}")
+            return True
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._refresh_lock_file, self._refresh_lock_pid = lock_file, os.getpid()
+        logger.info(f"Process {os.getpid()} refreshes the claim review index")
+        return True
+
+    def _reload_if_saved(self):
+        """Load the reviews another process saved since this one last loaded or saved them."""
+        try:
+            mtime = self.path.stat().st_mtime_ns if self.path else None
+        except OSError:
+            return
+        if mtime is None or mtime == self._saved_mtime:
+            return
+        try:
+            self.load()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not reload the claim review index: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "reviews": len(self._reviews),
+                "embedded": len(self._row_ids),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def save(self, path: Optional[Union[str, Path]] = None):
+        """Write the reviews, and any embeddings, atomically."""
+        path = Path(path or self.path)
+        with self._lock:
+            data = {"version": FORMAT_VERSION, "reviews": [asdict(r) for r in self._reviews.values()]}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        if self.embedding_cache is not None:
+            self.embedding_cache.save(path.with_suffix('.npz'))
+        # Replaced last, so a process reloading on its mtime finds the embeddings already saved
+        os.replace(tmp_path, path)
+        if path == self.path:
+            self._saved_mtime = path.stat().st_mtime_ns
+
+    def load(self, path: Optional[Union[str, Path]] = None) -> int:
+        """
+        Add the reviews saved at ``path``; stored embeddings are reused rather than re-encoded.
+
+        Returns:
+            Number of reviews indexed
+        """
+        path = Path(path or self.path)
+        with open(path, 'r', encoding='utf-8') as f:
+            mtime = os.fstat(f.fileno()).st_mtime_ns
+            data = json.load(f)
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported claim review index version: {data.get('version')}")
+        embeddings_path = path.with_suffix('.npz')
+        if self.embedding_cache is not None and embeddings_path.exists():
+            try:
+                self.embedding_cache = EmbeddingCache.load(embeddings_path, self.model_name, max_entries=None)
+            except ValueError as e:
+                logger.warning(f"Ignoring saved claim embeddings: {e}")
+        if path == self.path:
+            self._saved_mtime = mtime
+        return self.add(ClaimReview(**review) for review in data["reviews"])
+
+
+def factcheck_refresh_job(api: Any, index: ClaimReviewIndex, top_n: int = 50) -> RefreshJob:
+    """Re-search the most looked-up claims through an EnhancedFactCheckAPI."""
+    def refresh_popular_claims() -> List[ClaimReview]:
+        claims = index.popular_claims(top_n)
+        # refresh() indexes what the job returns, so the search must not index it too
+        results = api.search_claims_batch(claims, max_results=5, index_results=False) if claims else []
+        return [ClaimReview.from_fact_check_result(r) for per_claim in results for r in per_claim]
+    return refresh_popular_claims
+
+
+def google_refresh_job(api: Any, index: ClaimReviewIndex, top_n: int = 50) -> RefreshJob:
+    """Re-search the most looked-up claims through a GoogleFactCheckAPI."""
+    def refresh_popular_claims() -> List[Optional[ClaimReview]]:
+        return [ClaimReview.from_google_claim(claim)
+                for query in index.popular_claims(top_n)
+                for claim in api.search_claims(query, max_results=5)]
+    return refresh_popular_claims
+
+
+def trusted_sources_job(database: Any) -> RefreshJob:
+    """Ingest rated content of a TrustedSourcesDatabase."""
+    def ingest_trusted_content() -> List[Optional[ClaimReview]]:
+        return [ClaimReview.from_trusted_content(content, database.sources.get(content.source_id))
+                for content in list(database.content.values())]
+    return ingest_trusted_content
+
+
+_shared_index: Optional[ClaimReviewIndex] = None
+_shared_lock = threading.Lock()
+
+
+def get_claim_review_index() -> ClaimReviewIndex:
+    """
+    Process-wide index shared by the fact-check clients, created on first request.
+
+    Configured from the ``TRUTHLENS_CLAIM_INDEX_*`` environment variables.
+    """
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            encoder = None
+            model_name = os.environ.get("TRUTHLENS_CLAIM_INDEX_MODEL")
+            if model_name:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                    encoder = SentenceTransformer(model_name)
+                except Exception as e:
+                    logger.warning(f"Claim index encoder {model_name} unavailable, matching lexically: {e}")
+            index = ClaimReviewIndex(encoder=encoder, model_name=model_name,
+                                     path=os.environ.get("TRUTHLENS_CLAIM_INDEX_PATH") or None)
+            if index.path and index.path.exists():
+                try:
+                    index.load()
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Could not load claim review index from {index.path}: {e}")
+            _shared_index = index
+        return _shared_index
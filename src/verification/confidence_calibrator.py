@@ -4,8 +4,12 @@ from typing import Dict, List, Tuple, Any
 import numpy as np
 
 import math
-import yaml
-from datetime import datetime, timezone
+from .domain_trust import trust_index
+from .fusion_engine import (
+    EvidenceArrays, calibrate_batch, net_evidence, stance_aware_fusion, temperature_softmax, weighted_fusion,
+)
+from .calibration_config import CALIBRATION_PATH, DOMAIN_PRIORS_PATH, get_calibration, get_domain_priors
+from ..utils.tracing import traced
 
 
 logger = logging.getLogger(__name__)
@@ -56,73 +60,22 @@ def _apply_temperature(avg_probs: Dict[str, float], temperature: float) -> Dict[
     return {k: sm[i] for i, k in enumerate(LABELS)}
 
 
-def _load_yaml(path: str) -> Dict[str, Any]:
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
-    except FileNotFoundError:
-        return {}
-
-
 def _domain_trust(domain: str, priors: Dict[str, float]) -> float:
-    domain = (domain or "").lower()
-    # simple exact/substring match fallback
-    for key, val in priors.items():
-        if key == "default":
-            continue
-        if "*" in key:
-            # very simple glob-like contains
-            pattern = key.replace("*", "")
-            if pattern and pattern in domain:
-                return float(val)
-        elif key in domain:
-            return float(val)
-    return float(priors.get("default", 0.6))
+    return trust_index(priors).trust(domain)
 
 
 def compute_weights(evidence_item: Dict[str, Any], recency_tau_days: int, domain_priors: Dict[str, float]) -> float:
-    scores = evidence_item.get("scores", {}) or {}
-    sim = float(scores.get("cross", scores.get("cosine", 0.0)))
-    # min-max normalize similarity assuming [0,1] already for cosine/cross; clamp
-    sim = max(0.0, min(1.0, sim))
-
-    domain = str(evidence_item.get("domain") or "")
-    trust = _domain_trust(domain, domain_priors)
-
-    # recency factor
-    recency = 1.0
-    try:
-        pub = evidence_item.get("published_at")
-        if isinstance(pub, str) and pub:
-            # try parse ISO format
-            published_at = datetime.fromisoformat(pub.replace("Z", "+00:00"))
-        elif isinstance(pub, datetime):
-            published_at = pub
-        else:
-            published_at = None
-        if published_at is not None:
-            if published_at.tzinfo is None:
-                published_at = published_at.replace(tzinfo=timezone.utc)
-            age_days = (datetime.now(timezone.utc) - published_at).total_seconds() / (24 * 3600)
-            tau = max(1e-6, float(recency_tau_days))
-            recency = math.exp(-age_days / tau)
-    except Exception:
-        recency = 1.0
-
-    return float(sim * trust * recency)
+    # similarity x domain trust x recency from published_at
+    arrays = EvidenceArrays.from_results([evidence_item], domain_priors, use_published_at=True)
+    return float(arrays.weights(recency_tau_days)[0])
 
 
 def weighted_logit_fusion(results: List[Dict[str, Any]], recency_tau_days: int, domain_priors: Dict[str, float]) -> Tuple[List[float], List[float]]:
     # results: each has keys: 'logits' (list length 3), and evidence metadata including 'scores','domain','published_at'
-    Z = [0.0, 0.0, 0.0]
-    weights: List[float] = []
-    for r in results:
-        w = compute_weights(r, recency_tau_days, domain_priors)
-        weights.append(w)
-        logits = r.get("logits") or r.get("raw_logits") or [0.0, 0.0, 0.0]
-        for i in range(3):
-            Z[i] += w * float(logits[i])
-    return Z, weights
+    arrays = EvidenceArrays.from_results(results, domain_priors, logits_keys=("logits", "raw_logits"),
+                                         use_published_at=True)
+    weights = arrays.weights(recency_tau_days)
+    return weighted_fusion(weights, arrays.logits).tolist(), weights.tolist()
 
 
 def temperature_scaling(Z: List[float], T: float) -> List[float]:
@@ -131,57 +84,39 @@ def temperature_scaling(Z: List[float], T: float) -> List[float]:
 
 
 def compute_selection_weight(item: Dict[str, Any], domain_priors: Dict[str, float], tau: float) -> float:
-    scores = item.get("scores", {}) or {}
-    sim = float(scores.get("cross", scores.get("cosine", 0.0)))
-    sim = max(0.0, min(1.0, sim))
-    trust = _domain_trust(str(item.get("domain") or ""), domain_priors)
-    rec = 1.0
-    if item.get("age_days") is not None:
-        try:
-            rec = math.exp(- float(item["age_days"]) / float(max(1e-6, tau)))
-        except Exception:
-            rec = 1.0
-    return float(sim * trust * rec)
+    # similarity x domain trust x recency from age_days
+    return float(EvidenceArrays.from_results([item], domain_priors).weights(tau)[0])
 
 
 def stance_aware_logit_fusion(results: List[Dict[str, Any]], domain_priors: Dict[str, float], tau: float) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
-    C = 3
-    Z = np.zeros(C, dtype=float)
-    contrib: List[Dict[str, Any]] = []
-    for item in results:
-        w_i = compute_selection_weight(item, domain_priors, tau)
-        p_i = np.array(item.get("probs", [0.0, 0.0, 0.0]), dtype=float)
-        z_i = np.array(item.get("logits", [0.0, 0.0, 0.0]), dtype=float)
-        for c in range(C):
-            w_ic = w_i * p_i[c]
-            Z[c] += w_ic * z_i[c]
-        contrib.append({"evidence_id": item.get("evidence_id"), "w": float(w_i), "p": p_i.tolist()})
-    return Z, contrib
-
-
-def temperature_softmax(Z: np.ndarray, T: float) -> np.ndarray:
-    Zs = Z / float(T)
-    Zs = Zs - Zs.max()
-    e = np.exp(Zs)
-    return e / e.sum()
-
-
-def aggregate_scores(results: List[Dict[str, Any]], config_path: str = "config/calibration.yaml", priors_path: str = "config/domain_priors.yaml") -> Dict[str, Any]:
-    cfg = _load_yaml(config_path)
-    priors = _load_yaml(priors_path)
-    T = float(cfg.get("temperature", 1.2))
-    tau = float(cfg.get("recency_tau_days", 365))
-    Z, contrib = stance_aware_logit_fusion(results, priors, tau)
-    p_cal = temperature_softmax(Z, T)
+    arrays = EvidenceArrays.from_results(results, domain_priors)
+    weights = arrays.weights(tau)
+    Z = stance_aware_fusion(weights, arrays.probs, arrays.logits)
+    return Z, _contributions(results, weights, arrays.probs)
+
+
+def _contributions(results: List[Dict[str, Any]], weights: np.ndarray, probs: np.ndarray) -> List[Dict[str, Any]]:
+    return [{"evidence_id": item.get("evidence_id"), "w": w, "p": p}
+            for item, w, p in zip(results, weights.tolist(), probs.tolist())]
+
+
+@traced("calibration.aggregate_scores")
+def aggregate_scores(results: List[Dict[str, Any]], config_path: str = CALIBRATION_PATH, priors_path: str = DOMAIN_PRIORS_PATH) -> Dict[str, Any]:
+    cfg = get_calibration(config_path)
+    priors = get_domain_priors(priors_path).index
+    T = cfg.temperature
+    tau = cfg.recency_tau_days
+    # One pass over the evidence: weights feed both the fusion and the net evidence
+    arrays = EvidenceArrays.from_results(results, priors)
+    weights = arrays.weights(tau)
+    contrib = _contributions(results, weights, arrays.probs)
+    p_cal = temperature_softmax(stance_aware_fusion(weights, arrays.probs, arrays.logits), T)
     c_star = int(np.argmax(p_cal))
-    p_raw = max((float(r.get("probs", [0.0, 0.0, 0.0])[c_star]) for r in results), default=0.0)
+    p_raw = float(arrays.probs[:, c_star].max()) if len(arrays) else 0.0
     # margin and net evidence
     sorted_idx = np.argsort(-p_cal)
     margin = float(p_cal[sorted_idx[0]] - p_cal[sorted_idx[1]])
-    idx_sup, idx_ref = 0, 1
-    S = 0.0
-    for r in results:
-        S += compute_selection_weight(r, priors, tau) * (float(r.get("probs", [0.0, 0.0, 0.0])[idx_sup]) - float(r.get("probs", [0.0, 0.0, 0.0])[idx_ref]))
+    S = float(net_evidence(weights, arrays.probs, support_idx=0, refute_idx=1))
     return {
         "p_calibrated": p_cal.tolist(),
         "p_raw_for_top": float(max(p_raw, 1e-6)),
@@ -192,6 +127,13 @@ def aggregate_scores(results: List[Dict[str, Any]], config_path: str = "config/c
     }
 
 
+@traced("calibration.aggregate_scores_batch")
+def aggregate_scores_batch(claims: List[List[Dict[str, Any]]], config_path: str = CALIBRATION_PATH, priors_path: str = DOMAIN_PRIORS_PATH) -> List[Dict[str, Any]]:
+    """aggregate_scores for many claims in one (claims x evidence x 3) pass; no per-evidence contributions."""
+    cfg = get_calibration(config_path)
+    return calibrate_batch(claims, cfg.temperature, cfg.recency_tau_days, get_domain_priors(priors_path).index)
+
+
 def jsd(p: List[float], q: List[float], eps: float = 1e-12) -> float:
     p = np.array(p, dtype=float)
     q = np.array(q, dtype=float)
@@ -216,6 +158,7 @@ def discrepancy_metrics(p_raw: float, p_cal_vec: List[float], c_star: int) -> Tu
  
 
 
+@traced("calibration.calibrate_confidence")
 def calibrate_confidence(
     results: List[Dict[str, float]], temperature: float = 1.5
 ) -> CalibrationResult:
@@ -15,10 +15,20 @@ import numpy as np
 from typing import List, Dict, Any, Tuple
 import logging
 
+from .fusion_engine import EvidenceArrays, log_bayesian_fusion
+
 logger = logging.getLogger(__name__)
 
 LABELS = ["SUPPORTED", "REFUTED", "NOT ENOUGH INFO"]
 
+DEFAULT_DOMAIN_PRIORS = {
+    "who.int": 1.0,
+    "cdc.gov": 1.0,
+    "nih.gov": 0.95,
+    "nature.com": 0.90,
+    "default": 0.6
+}
+
 
 def softmax(logits: np.ndarray, T: float = 1.0) -> np.ndarray:
     """Apply temperature-scaled softmax to logits."""
@@ -32,20 +42,11 @@ def softmax(logits: np.ndarray, T: float = 1.0) -> np.ndarray:
 
 
 def bayesian_fusion(probs_list: List[np.ndarray]) -> np.ndarray:
-    """Strict Bayesian fusion by multiplying probabilities."""
-    if not probs_list:
+    """Strict Bayesian fusion by multiplying probabilities (summed in log space)."""
+    if not len(probs_list):
         return np.array([1/3, 1/3, 1/3])
     
-    # Start with ones and multiply by each probability distribution
-    fused = np.ones_like(probs_list[0])
-    for p in probs_list:
-        # Clip to avoid numerical issues
-        p_clipped = np.clip(p, 1e-9, 1.0)
-        fused *= p_clipped
-    
-    # Normalize
-    fused /= np.sum(fused)
-    return fused
+    return log_bayesian_fusion(np.asarray(probs_list, dtype=float))
 
 
 def coupled_fusion(probs_list: List[np.ndarray], beta: float = 0.4) -> Tuple[np.ndarray, float]:
@@ -97,32 +98,8 @@ def compute_evidence_weights(evidence_items: List[Dict[str, Any]],
     Returns:
         List of weights for each evidence item
     """
-    weights = []
-    
-    for item in evidence_items:
-        # Similarity score (cross-encoder or cosine)
-        scores = item.get("scores", {}) or {}
-        sim = float(scores.get("cross", scores.get("cosine", 0.0)))
-        sim = max(0.0, min(1.0, sim))  # Clamp to [0, 1]
-        
-        # Domain trust
-        domain = str(item.get("domain", "")).lower()
-        trust = domain_priors.get(domain, domain_priors.get("default", 0.6))
-        
-        # Recency factor
-        recency = 1.0
-        age_days = item.get("age_days")
-        if age_days is not None:
-            try:
-                recency = np.exp(-float(age_days) / max(1e-6, float(recency_tau_days)))
-            except Exception:
-                recency = 1.0
-        
-        # Combined weight
-        weight = sim * trust * recency
-        weights.append(float(weight))
-    
-    return weights
+    arrays = EvidenceArrays.from_results(evidence_items, domain_priors)
+    return arrays.weights(recency_tau_days).tolist()
 
 
 def calibrate_confidence_coupled(results: List[Dict[str, Any]], 
@@ -153,13 +130,7 @@ def calibrate_confidence_coupled(results: List[Dict[str, Any]],
     
     # Default domain priors if not provided
     if domain_priors is None:
-        domain_priors = {
-            "who.int": 1.0,
-            "cdc.gov": 1.0,
-            "nih.gov": 0.95,
-            "nature.com": 0.90,
-            "default": 0.6
-        }
+        domain_priors = DEFAULT_DOMAIN_PRIORS
     
     # Extract logits and convert to probabilities
     probs_list = []
@@ -179,12 +150,10 @@ def calibrate_confidence_coupled(results: List[Dict[str, Any]],
     if len(results) > 1:
         weights = compute_evidence_weights(results, domain_priors, recency_tau_days)
         # Weight the fused probabilities by evidence quality
-        weighted_probs = np.zeros_like(fused_probs)
         total_weight = sum(weights)
         
         if total_weight > 0:
-            for i, (probs, weight) in enumerate(zip(probs_list, weights)):
-                weighted_probs += (weight / total_weight) * probs
+            weighted_probs = np.asarray(weights) @ np.asarray(probs_list, dtype=float) / total_weight
             
             # Blend weighted and fused
             final_probs = 0.7 * fused_probs + 0.3 * weighted_probs
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Domain Trust Index for TruthLens
+Compiles domain priors (``domain -> trust``) into a lookup structure shared
+by the confidence calibrators, so a domain gets the same trust everywhere.
+
+- Plain keys ("bbc.com", "gov.uk") go into a suffix trie over reversed
+  labels. A key matches the domain itself and any subdomain of it; the
+  longest matching suffix wins. Lookups cost O(number of labels).
+- Keys containing ``*`` are shell-style globs over the whole host name
+  ("*.blogspot.*"); ``*`` may span dots. They are compiled into a single
+  regex, tried in file order, and only consulted when no plain key matches.
+- Everything else gets the ``default`` prior.
+- Lookups are memoized in an LRU cache.
+
+Usage:
+    index = DomainTrustIndex({"who.int": 1.0, "*.blogspot.*": 0.45, "default": 0.6})
+    index.trust("www.who.int")          # 1.0
+    index.trust("foo.blogspot.co.uk")   # 0.45
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Iterator, Mapping, Optional, Tuple, Union
+
+DEFAULT_TRUST = 0.6
+
+_VALUE = ""  # trie slot for a node's trust; labels are never empty
+
+
+def normalize_domain(domain: str) -> str:
+    """Host name of a domain or URL: lower-cased, without scheme, port, path or trailing dot."""
+    host = (domain or "").strip().lower()
+    if "://" in host:
+        host = host.split("://", 1)[1]
+    host = host.split("/", 1)[0].split("?", 1)[0].split("#", 1)[0]
+    host = host.rsplit("@", 1)[-1]
+    if ":" in host:
+        host = host.split(":", 1)[0]
+    return host.strip(".")
+
+
+def _glob_regex(pattern: str) -> str:
+    return ".+".join(re.escape(part) for part in pattern.split("*"))
+
+
+class DomainTrustIndex(Mapping[str, float]):
+    """
+    Compiled, read-only view of domain priors.
+
+    Behaves as the original ``{domain: trust}`` mapping, so it can be passed
+    wherever a priors dict is expected.
+    """
+
+    def __init__(self, priors: Mapping[str, float], cache_size: int = 65_536):
+        self._priors: Dict[str, float] = {str(k): float(v) for k, v in priors.items()}
+        self.default = float(self._priors.get("default", DEFAULT_TRUST))
+        self._trie: Dict[str, dict] = {}
+        globs = []
+        for key, value in self._priors.items():
+            if key == "default":
+                continue
+            if "*" in key:
+                globs.append((key.strip().lower(), value))
+                continue
+            labels = normalize_domain(key).split(".")
+            if not all(labels):
+                continue
+            node = self._trie
+            for label in reversed(labels):
+                node = node.setdefault(label, {})
+            node[_VALUE] = value
+
+        self._glob_values = [value for _, value in globs]
+        self._globs = (re.compile("|".join(f"(?P<g{i}>{_glob_regex(pattern)})" for i, (pattern, _) in enumerate(globs)))
+                       if globs else None)
+        self.trust = lru_cache(maxsize=cache_size)(self._lookup)
+
+    def __getitem__(self, key: str) -> float:
+        return self._priors[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._priors)
+
+    def __len__(self) -> int:
+        return len(self._priors)
+
+    def _suffix_match(self, host: str) -> Optional[float]:
+        node = self._trie
+        best = None
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            best = node.get(_VALUE, best)
+        return best
+
+    def _lookup(self, domain: str) -> float:
+        """Trust for a domain or URL; see the module docstring for precedence."""
+        host = normalize_domain(domain)
+        if not host:
+            return self.default
+        value = self._suffix_match(host)
+        if value is not None:
+            return value
+        if self._globs is not None:
+            match = self._globs.fullmatch(host)
+            if match is not None:
+                return self._glob_values[int(match.lastgroup[1:])]
+        return self.default
+
+
+_compiled: "OrderedDict[int, Tuple[Mapping[str, float], int, DomainTrustIndex]]" = OrderedDict()
+_compiled_lock = threading.Lock()
+_COMPILED_MAX = 8
+
+
+def trust_index(priors: Union[Mapping[str, float], DomainTrustIndex, None]) -> DomainTrustIndex:
+    """
+    The compiled index for a priors mapping.
+
+    Indexes are returned as-is. Plain dicts are compiled once and reused while
+    the same object is passed again, so priors dicts should not be mutated
+    after first use.
+    """
+    if isinstance(priors, DomainTrustIndex):
+        return priors
+    priors = priors or {}
+    key = id(priors)
+    with _compiled_lock:
+        entry = _compiled.get(key)
+        # The stored reference keeps the id from being reused by another dict
+        if entry is not None and entry[0] is priors and entry[1] == len(priors):
+            _compiled.move_to_end(key)
+            return entry[2]
+    index = DomainTrustIndex(priors)
+    with _compiled_lock:
+        _compiled[key] = (priors, len(priors), index)
+        while len(_compiled) > _COMPILED_MAX:
+            _compiled.popitem(last=False)
+    return index
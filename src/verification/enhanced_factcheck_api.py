@@ -6,15 +6,31 @@ Integrates multiple fact-checking sources for comprehensive verification.
 
 import requests
 import json
+import os
 import time
 import logging
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import re
+from .claim_review_index import ClaimReview, ClaimReviewIndex, get_claim_review_index, normalize_rating
+from ..utils.rate_limiter import RateLimiter
+from ..utils.tracing import span, traced
 
 logger = logging.getLogger(__name__)
 
+GOOGLE_SEARCH_URL = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
+
+# Scraped providers; the query is substituted with spaces as '+'
+SEARCH_URLS = {
+    'snopes': "https://www.snopes.com/search/?q={}",
+    'politifact': "https://www.politifact.com/search/?q={}",
+    'science_feedback': "https://sciencefeedback.co/search/?q={}",
+}
+
 @dataclass
 class EnhancedFactCheckResult:
     """Enhanced fact-check result from multiple sources."""
@@ -54,22 +70,51 @@ class EnhancedFactCheckAPI:
     - AltNews (web scraping)
     """
     
-    def __init__(self, google_api_key: str = None):
+    def __init__(self, google_api_key: str = None, request_delay: float = 1.0,
+                 provider_delays: Optional[Dict[str, float]] = None, deadline_seconds: float = 8.0,
+                 max_workers: int = 8, parse_workers: int = 2,
+                 claim_index: Optional[ClaimReviewIndex] = None, use_claim_index: bool = True):
         """
         Initialize the enhanced fact-checking API.
         
         Args:
             google_api_key: Google Cloud API key with Fact Check API enabled
+            request_delay: Default minimum seconds between requests to one provider
+            provider_delays: Per-provider overrides of request_delay
+            deadline_seconds: Time budget of a single search_claims call
+            max_workers: Concurrent provider requests
+            parse_workers: Threads parsing provider responses
+            claim_index: Local review index consulted before the network and fed
+                with every parsed result; defaults to the shared index
+            use_claim_index: Set to False to always go to the network
         """
         self.google_api_key = google_api_key
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        
+        # Rate limiting: each provider has its own quota
+        self.request_delay = request_delay
+        delays = provider_delays or {}
+        self.rate_limiters = {
+            provider: RateLimiter(delays.get(provider, request_delay), name=provider)
+            for provider in ['google', *SEARCH_URLS]
+        }
+        self.deadline_seconds = deadline_seconds
         
-        # Rate limiting
-        self.request_delay = 1.0  # 1 second between requests
-        self.last_request_time = 0
+        self.max_workers = max_workers
+        self.parse_workers = parse_workers
+        self._executor_lock = threading.Lock()
+        self._fetch_pool: Optional[ThreadPoolExecutor] = None
+        self._parse_pool: Optional[ThreadPoolExecutor] = None
+        self._pool_pid: Optional[int] = None
+        
+        self.claim_index = None
+        if use_claim_index:
+            self.claim_index = claim_index if claim_index is not None else get_claim_review_index()
         
         # Initialize Google Fact Check API if key provided
         if google_api_key:
@@ -85,7 +130,7 @@ class EnhancedFactCheckAPI:
         if not self.google_api_key:
             return
         
-        test_url = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
+        test_url = GOOGLE_SEARCH_URL
         params = {
             'key': self.google_api_key,
             'query': 'test',
@@ -97,10 +142,14 @@ class EnhancedFactCheckAPI:
         if response.status_code != 200:
             raise ValueError(f"Google API test failed with status {response.status_code}")
     
+    @traced("factcheck.search")
     def search_claims(self, query: str, max_results: int = 10) -> List[EnhancedFactCheckResult]:
         """
         Search for fact-checked claims across multiple sources.
         
+        All providers are queried concurrently; whatever has arrived when
+        ``deadline_seconds`` runs out is returned.
+        
         Args:
             query: Search query
             max_results: Maximum number of results to return
@@ -108,141 +157,151 @@ class EnhancedFactCheckAPI:
         Returns:
             List of enhanced fact-check results
         """
-        all_results = []
-        
-        # Search Google Fact Check API
-        if self.google_api_key:
-            google_results = self._search_google_factcheck(query, max_results)
-            all_results.extend(google_results)
-        
-        # Search Snopes
-        snopes_results = self._search_snopes(query, max_results)
-        all_results.extend(snopes_results)
-        
-        # Search PolitiFact
-        politifact_results = self._search_politifact(query, max_results)
-        all_results.extend(politifact_results)
-        
-        # Search Science Feedback
-        science_results = self._search_science_feedback(query, max_results)
-        all_results.extend(science_results)
-        
-        # Deduplicate and rank results
-        unique_results = self._deduplicate_results(all_results)
-        ranked_results = self._rank_results(unique_results)
-        
-        return ranked_results[:max_results]
+        return self.search_claims_batch([query], max_results, deadline=self.deadline_seconds)[0]
     
-    def _search_google_factcheck(self, query: str, max_results: int) -> List[EnhancedFactCheckResult]:
-        """Search Google Fact Check API."""
-        if not self.google_api_key:
-            return []
+    @traced("factcheck.search_batch")
+    def search_claims_batch(self, queries: List[str], max_results: int = 10,
+                            deadline: Optional[float] = None,
+                            index_results: bool = True) -> List[List[EnhancedFactCheckResult]]:
+        """
+        Search many claims through all providers at once.
         
-        try:
-            self._rate_limit()
-            
-            url = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
-            params = {
-                'key': self.google_api_key,
-                'query': query,
-                'maxAgeDays': 365,
-                'pageSize': min(max_results, 20),
-                'languageCode': 'en'
-            }
-            
-            response = self.session.get(url, params=params)
-            if response.status_code != 200:
-                logger.warning(f"Google Fact Check API returned status {response.status_code}")
-                return []
-            
-            data = response.json()
-            claims = data.get('claims', [])
-            
-            results = []
-            for claim in claims:
-                try:
-                    result = self._parse_google_claim(claim)
-                    if result:
-                        results.append(result)
-                except Exception as e:
-                    logger.warning(f"Error parsing Google claim: {e}")
-                    continue
-            
-            logger.info(f"Google Fact Check: found {len(results)} results")
-            return results
+        Requests for different claims and providers overlap, each provider's
+        requests are spaced by its own rate limiter, and responses are parsed
+        on a separate worker pool while further requests are in flight.
+        
+        Args:
+            queries: Search queries
+            max_results: Maximum number of results per query
+            deadline: Seconds the whole batch may take; requests that could not
+                start in time are skipped. None waits for every provider.
+            index_results: Add parsed results to the local claim index; refresh
+                jobs turn this off and let the index ingest what they return
             
-        except Exception as e:
-            logger.error(f"Error searching Google Fact Check: {e}")
+        Returns:
+            Ranked results for each query, in query order
+        """
+        if not queries:
             return []
-    
-    def _search_snopes(self, query: str, max_results: int) -> List[EnhancedFactCheckResult]:
-        """Search Snopes for fact-checked claims."""
+        deadline_at = None if deadline is None else time.monotonic() + deadline
+        fetch_pool, parse_pool = self._executors()
+        providers = self._providers()
+        
+        fetches = {}
+        for i, query in enumerate(queries):
+            for provider in providers:
+                future = fetch_pool.submit(contextvars.copy_context().run, self._fetch,
+                                           provider, query, max_results, deadline_at)
+                fetches[future] = (i, provider)
+        
+        parses = {}
+        parsed: Dict[tuple, List[EnhancedFactCheckResult]] = {}
+        timed_out = False
         try:
-            self._rate_limit()
-            
-            # Snopes search URL
-            search_url = f"https://www.snopes.com/search/?q={query.replace(' ', '+')}"
-            
-            response = self.session.get(search_url, timeout=10)
-            if response.status_code != 200:
-                logger.warning(f"Snopes search returned status {response.status_code}")
-                return []
-            
-            # Parse search results (simplified)
-            results = self._parse_snopes_search(response.text, query)
-            
-            logger.info(f"Snopes: found {len(results)} results")
-            return results
-            
-        except Exception as e:
-            logger.error(f"Error searching Snopes: {e}")
-            return []
-    
-    def _search_politifact(self, query: str, max_results: int) -> List[EnhancedFactCheckResult]:
-        """Search PolitiFact for fact-checked claims."""
+            for future in as_completed(fetches, timeout=self._remaining(deadline_at)):
+                payload = future.result()
+                if payload is not None:
+                    i, provider = fetches[future]
+                    parses[parse_pool.submit(self._parse, provider, payload, queries[i],
+                                             index_results)] = (i, provider)
+        except FuturesTimeoutError:
+            timed_out = True
         try:
-            self._rate_limit()
-            
-            # PolitiFact search URL
-            search_url = f"https://www.politifact.com/search/?q={query.replace(' ', '+')}"
-            
-            response = self.session.get(search_url, timeout=10)
-            if response.status_code != 200:
-                logger.warning(f"PolitiFact search returned status {response.status_code}")
-                return []
-            
-            # Parse search results (simplified)
-            results = self._parse_politifact_search(response.text, query)
-            
-            logger.info(f"PolitiFact: found {len(results)} results")
-            return results
-            
-        except Exception as e:
-            logger.error(f"Error searching PolitiFact: {e}")
-            return []
+            # Past the deadline this still collects every parse that has finished
+            for future in as_completed(parses, timeout=self._remaining(deadline_at)):
+                parsed[parses[future]] = future.result()
+        except FuturesTimeoutError:
+            timed_out = True
+        if timed_out:
+            pending = [f for f in list(fetches) + list(parses) if not f.done()]
+            logger.warning(f"Fact-check deadline reached with {len(pending)} provider requests outstanding")
+            for future in pending:
+                future.cancel()
+        
+        batch_results = []
+        for i in range(len(queries)):
+            # Provider order, not arrival order, so ties rank the same way every time
+            all_results = [r for provider in providers for r in parsed.get((i, provider), [])]
+            unique_results = self._deduplicate_results(all_results)
+            batch_results.append(self._rank_results(unique_results)[:max_results])
+        return batch_results
     
-    def _search_science_feedback(self, query: str, max_results: int) -> List[EnhancedFactCheckResult]:
-        """Search Science Feedback for fact-checked claims."""
+    def _providers(self) -> List[str]:
+        """Providers to query, in ranking tie-break order."""
+        providers = ['google'] if self.google_api_key else []
+        return providers + list(SEARCH_URLS)
+    
+    @staticmethod
+    def _remaining(deadline_at: Optional[float]) -> Optional[float]:
+        return None if deadline_at is None else max(0.0, deadline_at - time.monotonic())
+    
+    def _executors(self):
+        """Fetch and parse pools, recreated in a forked worker."""
+        with self._executor_lock:
+            if self._fetch_pool is None or self._pool_pid != os.getpid():
+                self._fetch_pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                      thread_name_prefix="truthlens-factcheck")
+                self._parse_pool = ThreadPoolExecutor(max_workers=self.parse_workers,
+                                                      thread_name_prefix="truthlens-factcheck-parse")
+                self._pool_pid = os.getpid()
+            return self._fetch_pool, self._parse_pool
+    
+    def _fetch(self, provider: str, query: str, max_results: int, deadline_at: Optional[float]) -> Any:
+        """
+        Fetch one provider's raw response within its rate limit.
+        
+        Returns:
+            The Google claims list or the search page HTML, or None if the
+            request failed or could not start before the deadline
+        """
+        with span(f"factcheck.{provider}"):
+            try:
+                if not self.rate_limiters[provider].acquire(deadline_at):
+                    logger.info(f"{provider} rate limit: no request slot before the deadline")
+                    return None
+                timeout = 10.0 if deadline_at is None else min(10.0, max(0.1, deadline_at - time.monotonic()))
+                
+                if provider == 'google':
+                    params = {
+                        'key': self.google_api_key,
+                        'query': query,
+                        'maxAgeDays': 365,
+                        'pageSize': min(max_results, 20),
+                        'languageCode': 'en'
+                    }
+                    response = self.session.get(GOOGLE_SEARCH_URL, params=params, timeout=timeout)
+                else:
+                    response = self.session.get(SEARCH_URLS[provider].format(query.replace(' ', '+')),
+                                                timeout=timeout)
+                
+                if response.status_code != 200:
+                    logger.warning(f"{provider} search returned status {response.status_code}")
+                    return None
+                return response.json().get('claims', []) if provider == 'google' else response.text
+                
+            except Exception as e:
+                logger.error(f"Error searching {provider}: {e}")
+                return None
+    
+    def _parse(self, provider: str, payload: Any, query: str,
+               index_results: bool = True) -> List[EnhancedFactCheckResult]:
+        """Turn a provider response into results; runs on the parse pool."""
         try:
-            self._rate_limit()
-            
-            # Science Feedback search URL
-            search_url = f"https://sciencefeedback.co/search/?q={query.replace(' ', '+')}"
-            
-            response = self.session.get(search_url, timeout=10)
-            if response.status_code != 200:
-                logger.warning(f"Science Feedback search returned status {response.status_code}")
-                return []
-            
-            # Parse search results (simplified)
-            results = self._parse_science_feedback_search(response.text, query)
-            
-            logger.info(f"Science Feedback: found {len(results)} results")
-            return results
-            
+            if provider == 'google':
+                results = [r for r in map(self._parse_google_claim, payload) if r]
+            elif provider == 'snopes':
+                results = self._parse_snopes_search(payload, query)
+            elif provider == 'politifact':
+                results = self._parse_politifact_search(payload, query)
+            else:
+                results = self._parse_science_feedback_search(payload, query)
         except Exception as e:
-            logger.error(f"Error searching Science Feedback: {e}")
+            logger.error(f"Error parsing {provider} results: {e}")
             return []
+        logger.info(f"{provider}: found {len(results)} results")
+        if index_results and self.claim_index is not None:
+            self.claim_index.add(ClaimReview.from_fact_check_result(r) for r in results)
+        return results
     
     def _parse_google_claim(self, claim: Dict[str, Any]) -> Optional[EnhancedFactCheckResult]:
         """Parse a Google Fact Check claim into our format."""
@@ -408,16 +467,7 @@ class EnhancedFactCheckAPI:
     
     def _normalize_verdict(self, rating: str) -> str:
         """Normalize verdict ratings across different sources."""
-        rating_lower = rating.lower()
-        
-        if any(word in rating_lower for word in ['true', 'correct', 'accurate', 'supported']):
-            return "SUPPORTED"
-        elif any(word in rating_lower for word in ['false', 'incorrect', 'inaccurate', 'refuted', 'debunked']):
-            return "REFUTED"
-        elif any(word in rating_lower for word in ['mixed', 'half', 'mostly', 'partially']):
-            return "MIXED"
-        else:
-            return "NOT ENOUGH INFO"
+        return normalize_rating(rating)
     
     def _calculate_confidence(self, verdict: str, claim_review: Dict[str, Any]) -> float:
         """Calculate confidence score based on verdict and source reliability."""
@@ -470,28 +520,82 @@ class EnhancedFactCheckAPI:
         ranked_results = sorted(results, key=rank_key, reverse=True)
         return ranked_results
     
-    def _rate_limit(self):
-        """Implement rate limiting between requests."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.request_delay:
-            sleep_time = self.request_delay - time_since_last
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
-    
     def get_best_fact_check(self, query: str) -> Optional[EnhancedFactCheckResult]:
         """
         Get the best fact-check result for a query.
         
+        The local claim review index is tried first; providers are only
+        searched when it has no confident match.
+        
         Args:
             query: The claim to fact-check
             
         Returns:
             Best fact-check result or None if none found
         """
+        local = self._local_fact_check(query)
+        if local is not None:
+            return local
         results = self.search_claims(query, max_results=5)
         if results:
             return results[0]  # Already ranked by confidence and source reliability
         return None
+    
+    def _local_fact_check(self, query: str) -> Optional[EnhancedFactCheckResult]:
+        """A confident match from the local review index, if any."""
+        if self.claim_index is None:
+            return None
+        hit = self.claim_index.lookup(query)
+        if hit is None:
+            return None
+        review, score = hit
+        source = {
+            'name': review.provider,
+            'url': review.url,
+            'publisher': review.publisher,
+            'review_date': review.review_date,
+            'rating': review.rating,
+            'explanation': review.explanation or review.rating,
+            'match_score': score,
+        }
+        # The review's own confidence: a fuzzy local match must not look more certain than its source
+        return EnhancedFactCheckResult(
+            claim_text=review.claim_text,
+            verdict=review.verdict,
+            confidence=review.confidence,
+            sources=[source],
+            best_source=source,
+            review_date=review.review_date,
+            explanation=source['explanation'],
+            rating=review.rating,
+            url=review.url
+        )
+    
+    def get_best_fact_checks(self, queries: List[str],
+                             deadline: Optional[float] = None) -> List[Optional[EnhancedFactCheckResult]]:
+        """
+        Get the best fact-check result for each of many queries.
+        
+        Args:
+            queries: The claims to fact-check
+            deadline: Seconds the whole batch may take; None waits for every provider
+            
+        Returns:
+            Best result or None for each query, in query order
+        """
+        best = [self._local_fact_check(query) for query in queries]
+        misses = [i for i, result in enumerate(best) if result is None]
+        if misses:
+            batch = self.search_claims_batch([queries[i] for i in misses], max_results=5, deadline=deadline)
+            for i, results in zip(misses, batch):
+                best[i] = results[0] if results else None
+        return best
+    
+    def close(self):
+        """Stop the worker pools and close the HTTP session."""
+        with self._executor_lock:
+            for pool in (self._fetch_pool, self._parse_pool):
+                if pool is not None:
+                    pool.shutdown(wait=False, cancel_futures=True)
+            self._fetch_pool = self._parse_pool = None
+        self.session.close()
@@ -12,6 +12,10 @@ import torch
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import numpy as np
 
+from ..utils.document_analysis import analyze_text
+from ..utils.keyword_matcher import get_keyword_matcher
+from ..utils.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -86,9 +90,23 @@ class EnhancedStanceClassifier:
             'moon landing fake', 'moon landing hoax'
         ]
         
+        # Causal claim indicators
+        self.causal_words = ['causes', 'caused', 'leads to', 'led to', 'results in', 'resulted in', 'destruction', 'damage']
+        
         # Compile regex patterns
         self.destruction_regex = re.compile('|'.join(self.destruction_indicators), re.IGNORECASE)
         
+        # Compiled keyword matchers with substring semantics; article text is
+        # lowercased by classify_stance, so those matchers skip case folding
+        self.contradiction_matcher = get_keyword_matcher(
+            self.contradiction_keywords, word_boundary=False, case_sensitive=True
+        )
+        self.support_matcher = get_keyword_matcher(
+            self.support_keywords, word_boundary=False, case_sensitive=True
+        )
+        self.consensus_matcher = get_keyword_matcher(self.scientific_consensus_topics, word_boundary=False)
+        self.causal_matcher = get_keyword_matcher(self.causal_words, word_boundary=False)
+        
         # Initialize NLI model
         try:
             self.tokenizer = AutoTokenizer.from_pretrained(model_name)
@@ -102,6 +120,11 @@ class EnhancedStanceClassifier:
             self.tokenizer = None
             self.model = None
     
+    def warm_up(self):
+        """Run one dummy NLI forward pass so the first request skips lazy initialization."""
+        if self.model and self.tokenizer:
+            self._nli_probabilities_batch([("The sky is blue.", "the sky appears blue during the day.")], 1)
+    
     def classify_stance(self, claim: str, article: Dict[str, Any]) -> EnhancedStanceResult:
         """
         Classify stance with improved logic and rule-based signals.
@@ -113,12 +136,74 @@ class EnhancedStanceClassifier:
         Returns:
             EnhancedStanceResult with stance, confidence, and reasoning
         """
+        text_to_analyze = self._article_text(article)
+        
+        rule_result = self._classify_with_rules(claim, text_to_analyze)
+        if rule_result:
+            return rule_result
+        
+        # Step 5: Use NLI model if available
+        if self.model and self.tokenizer:
+            nli_result = self._classify_with_nli(claim, text_to_analyze)
+            if nli_result:
+                return nli_result
+        
+        # Step 6: Default to neutral
+        return self._default_result()
+    
+    def classify_stances(self, pairs: List[Tuple[str, Dict[str, Any]]],
+                         batch_size: int = 16) -> List[EnhancedStanceResult]:
+        """
+        Classify many (claim, article) pairs, batching the NLI model.
+        
+        Rule-based signals are applied per pair exactly as in classify_stance;
+        the pairs left for the model are de-duplicated, sorted by length and
+        run in padded batches.
+        
+        Args:
+            pairs: (claim, article) pairs
+            batch_size: Pairs per NLI forward pass
+            
+        Returns:
+            One EnhancedStanceResult per pair, in input order
+        """
+        results: List[Optional[EnhancedStanceResult]] = [None] * len(pairs)
+        pending: Dict[Tuple[str, str], List[int]] = {}
+        
+        for index, (claim, article) in enumerate(pairs):
+            text_to_analyze = self._article_text(article)
+            results[index] = self._classify_with_rules(claim, text_to_analyze)
+            if results[index] is None:
+                pending.setdefault((claim, text_to_analyze), []).append(index)
+        
+        if pending and self.model and self.tokenizer:
+            unique_pairs = list(pending)
+            probabilities = self._nli_probabilities_batch(unique_pairs, batch_size)
+            for pair, probs in zip(unique_pairs, probabilities):
+                if probs is None:
+                    continue
+                for index in pending[pair]:
+                    results[index] = self._result_from_probabilities(probs)
+        
+        return [result or self._default_result() for result in results]
+    
+    def _article_text(self, article: Dict[str, Any]) -> str:
+        """Lowercased title, description and content of an article."""
         title = article.get('title', '').lower()
         description = article.get('description', '').lower()
         content = article.get('content', '').lower()
-        
-        text_to_analyze = f"{title} {description} {content}"
-        
+        return f"{title} {description} {content}"
+    
+    def _default_result(self) -> EnhancedStanceResult:
+        return EnhancedStanceResult(
+            stance="neutral",
+            confidence=0.5,
+            evidence_sentences=[],
+            reasoning="No clear stance detected"
+        )
+    
+    def _classify_with_rules(self, claim: str, text_to_analyze: str) -> Optional[EnhancedStanceResult]:
+        """Apply the rule-based steps of classify_stance, returning None if none fires."""
         # Step 1: Check for rule-based contradictions (highest priority)
         contradiction_result = self._check_rule_based_contradiction(text_to_analyze)
         if contradiction_result:
@@ -139,57 +224,46 @@ class EnhancedStanceClassifier:
             if causal_result:
                 return causal_result
         
-        # Step 5: Use NLI model if available
-        if self.model and self.tokenizer:
-            nli_result = self._classify_with_nli(claim, text_to_analyze)
-            if nli_result:
-                return nli_result
-        
-        # Step 6: Default to neutral
-        return EnhancedStanceResult(
-            stance="neutral",
-            confidence=0.5,
-            evidence_sentences=[],
-            reasoning="No clear stance detected"
-        )
+        return None
     
     def _check_rule_based_contradiction(self, text: str) -> Optional[EnhancedStanceResult]:
         """Check for explicit contradiction keywords."""
-        for keyword in self.contradiction_keywords:
-            if keyword in text:
-                evidence_sentences = self._extract_evidence_sentences(text, keyword)
-                return EnhancedStanceResult(
-                    stance="contradict",
-                    confidence=0.9,
-                    evidence_sentences=evidence_sentences,
-                    reasoning=f"Article explicitly contains contradiction keyword: '{keyword}'",
-                    rule_based_override="contradiction_keyword"
-                )
+        hit = self.contradiction_matcher.first_by_priority(text)
+        if hit:
+            keyword = hit.keyword
+            evidence_sentences = self._extract_evidence_sentences(text, keyword)
+            return EnhancedStanceResult(
+                stance="contradict",
+                confidence=0.9,
+                evidence_sentences=evidence_sentences,
+                reasoning=f"Article explicitly contains contradiction keyword: '{keyword}'",
+                rule_based_override="contradiction_keyword"
+            )
         return None
     
     def _check_rule_based_support(self, text: str) -> Optional[EnhancedStanceResult]:
         """Check for explicit support keywords."""
-        for keyword in self.support_keywords:
-            if keyword in text:
-                evidence_sentences = self._extract_evidence_sentences(text, keyword)
-                return EnhancedStanceResult(
-                    stance="support",
-                    confidence=0.8,
-                    evidence_sentences=evidence_sentences,
-                    reasoning=f"Article explicitly contains support keyword: '{keyword}'",
-                    rule_based_override="support_keyword"
-                )
+        hit = self.support_matcher.first_by_priority(text)
+        if hit:
+            keyword = hit.keyword
+            evidence_sentences = self._extract_evidence_sentences(text, keyword)
+            return EnhancedStanceResult(
+                stance="support",
+                confidence=0.8,
+                evidence_sentences=evidence_sentences,
+                reasoning=f"Article explicitly contains support keyword: '{keyword}'",
+                rule_based_override="support_keyword"
+            )
         return None
     
     def _is_scientific_consensus_claim(self, claim: str) -> bool:
         """Check if claim is about a topic with strong scientific consensus."""
-        claim_lower = claim.lower()
-        return any(topic in claim_lower for topic in self.scientific_consensus_topics)
+        return self.consensus_matcher.search(claim)
     
     def _handle_scientific_consensus_claim(self, claim: str, text: str) -> EnhancedStanceResult:
         """Handle claims with strong scientific consensus."""
         # For consensus claims, look for refutation evidence
-        if any(keyword in text for keyword in self.contradiction_keywords):
+        if self.contradiction_matcher.search(text):
             evidence_sentences = self._extract_evidence_sentences(text, "scientific consensus")
             return EnhancedStanceResult(
                 stance="contradict",
@@ -210,8 +284,7 @@ class EnhancedStanceClassifier:
     
     def _is_causal_claim(self, claim: str) -> bool:
         """Check if claim is causal."""
-        causal_words = ['causes', 'caused', 'leads to', 'led to', 'results in', 'resulted in', 'destruction', 'damage']
-        return any(word in claim.lower() for word in causal_words)
+        return self.causal_matcher.search(claim)
     
     def _analyze_causal_stance(self, claim: str, text: str) -> Optional[EnhancedStanceResult]:
         """Analyze stance for causal claims by looking for evidence of cause-effect relationships."""
@@ -275,10 +348,9 @@ class EnhancedStanceClassifier:
             matches = self.destruction_regex.findall(text)
             if matches:
                 # Find sentences containing destruction indicators
-                sentences = re.split(r'[.!?]+', text)
-                for sentence in sentences:
-                    if any(indicator in sentence.lower() for indicator in matches):
-                        evidence.append(sentence.strip())
+                for sentence in analyze_text(text).sentences:
+                    if any(indicator in sentence.lower for indicator in matches):
+                        evidence.append(sentence.text)
         
         return evidence[:3]  # Return top 3 evidence sentences
     
@@ -291,12 +363,11 @@ class EnhancedStanceClassifier:
             r'no\s+\w+', r'not\s+\w+', r'never\s+\w+', r'does\s+not', r'did\s+not'
         ]
         
-        sentences = re.split(r'[.!?]+', text)
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
+        for sentence in analyze_text(text).sentences:
+            sentence_lower = sentence.lower
             if any(re.search(pattern, sentence_lower) for pattern in negation_patterns):
                 if cause.lower() in sentence_lower or effect.lower() in sentence_lower:
-                    evidence.append(sentence.strip())
+                    evidence.append(sentence.text)
         
         return evidence[:3]
     
@@ -317,55 +388,93 @@ class EnhancedStanceClassifier:
                 logits = outputs.logits
                 probabilities = torch.softmax(logits, dim=1)[0].cpu().numpy()
             
-            # Map probabilities to labels
-            contradict_prob = probabilities[0]  # contradiction
-            neutral_prob = probabilities[1]     # neutral
-            support_prob = probabilities[2]     # entailment
-            
-            model_probs = {
-                "contradict": float(contradict_prob),
-                "neutral": float(neutral_prob),
-                "support": float(support_prob)
-            }
-            
-            # Apply improved thresholds
-            if support_prob > self.support_threshold:
-                return EnhancedStanceResult(
-                    stance="support",
-                    confidence=float(support_prob),
-                    evidence_sentences=[],
-                    reasoning=f"NLI model: support probability {support_prob:.3f} > {self.support_threshold}",
-                    model_probabilities=model_probs
-                )
-            elif contradict_prob > self.contradict_threshold:
-                return EnhancedStanceResult(
-                    stance="contradict",
-                    confidence=float(contradict_prob),
-                    evidence_sentences=[],
-                    reasoning=f"NLI model: contradict probability {contradict_prob:.3f} > {self.contradict_threshold}",
-                    model_probabilities=model_probs
-                )
-            else:
-                return EnhancedStanceResult(
-                    stance="neutral",
-                    confidence=float(neutral_prob),
-                    evidence_sentences=[],
-                    reasoning=f"NLI model: neutral probability {neutral_prob:.3f} (no threshold exceeded)",
-                    model_probabilities=model_probs
-                )
+            return self._result_from_probabilities(probabilities)
                 
         except Exception as e:
             logger.error(f"Error in NLI classification: {e}")
             return None
     
+    @traced("nli.enhanced_batch")
+    def _nli_probabilities_batch(self, pairs: List[Tuple[str, str]],
+                                 batch_size: int) -> List[Optional[np.ndarray]]:
+        """
+        Run the NLI model over (claim, text) pairs in padded batches.
+        
+        Pairs are ordered by length so each batch pads to similar sizes.
+        A failed batch yields None for its pairs.
+        """
+        probabilities: List[Optional[np.ndarray]] = [None] * len(pairs)
+        order = sorted(range(len(pairs)), key=lambda i: len(pairs[i][0]) + len(pairs[i][1]))
+        
+        for start in range(0, len(order), max(1, batch_size)):
+            batch = order[start:start + batch_size]
+            try:
+                inputs = self.tokenizer(
+                    [pairs[i][0] for i in batch],
+                    [pairs[i][1] for i in batch],
+                    return_tensors="pt",
+                    padding=True,
+                    truncation=True,
+                    max_length=512
+                ).to(self.device)
+                
+                with torch.no_grad():
+                    logits = self.model(**inputs).logits
+                    batch_probs = torch.softmax(logits, dim=1).cpu().numpy()
+                
+                for i, probs in zip(batch, batch_probs):
+                    probabilities[i] = probs
+            except Exception as e:
+                logger.error(f"Error in batched NLI classification: {e}")
+        
+        return probabilities
+    
+    def _result_from_probabilities(self, probabilities: np.ndarray) -> EnhancedStanceResult:
+        """Map NLI probabilities (contradiction, neutral, entailment) to a stance."""
+        # Map probabilities to labels
+        contradict_prob = probabilities[0]  # contradiction
+        neutral_prob = probabilities[1]     # neutral
+        support_prob = probabilities[2]     # entailment
+        
+        model_probs = {
+            "contradict": float(contradict_prob),
+            "neutral": float(neutral_prob),
+            "support": float(support_prob)
+        }
+        
+        # Apply improved thresholds
+        if support_prob > self.support_threshold:
+            return EnhancedStanceResult(
+                stance="support",
+                confidence=float(support_prob),
+                evidence_sentences=[],
+                reasoning=f"NLI model: support probability {support_prob:.3f} > {self.support_threshold}",
+                model_probabilities=model_probs
+            )
+        elif contradict_prob > self.contradict_threshold:
+            return EnhancedStanceResult(
+                stance="contradict",
+                confidence=float(contradict_prob),
+                evidence_sentences=[],
+                reasoning=f"NLI model: contradict probability {contradict_prob:.3f} > {self.contradict_threshold}",
+                model_probabilities=model_probs
+            )
+        else:
+            return EnhancedStanceResult(
+                stance="neutral",
+                confidence=float(neutral_prob),
+                evidence_sentences=[],
+                reasoning=f"NLI model: neutral probability {neutral_prob:.3f} (no threshold exceeded)",
+                model_probabilities=model_probs
+            )
+    
     def _extract_evidence_sentences(self, text: str, keyword: str) -> List[str]:
         """Extract sentences containing evidence for a keyword."""
-        sentences = re.split(r'[.!?]+', text)
+        keyword_lower = keyword.lower()
         evidence_sentences = []
         
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if keyword.lower() in sentence.lower() and len(sentence) > 20:
-                evidence_sentences.append(sentence)
+        for sentence in analyze_text(text).sentences:
+            if keyword_lower in sentence.lower and len(sentence.text) > 20:
+                evidence_sentences.append(sentence.text)
         
         return evidence_sentences[:3]  # Return top 3 evidence sentences
@@ -8,6 +8,7 @@ import logging
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
+from ..utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +53,7 @@ class EnhancedVerdictAggregator:
             'moon landing fake', 'moon landing hoax'
         ]
     
+    @traced("verdict.aggregate")
     def aggregate_verdict(self, 
                          claim: str,
                          stance_results: List[Dict[str, Any]],
@@ -107,6 +109,21 @@ class EnhancedVerdictAggregator:
         # Apply improved weighted voting logic
         return self._apply_weighted_voting(stance_percentages, total_stances)
     
+    def rule_verdict(self,
+                     claim: str,
+                     fact_check_result: Optional[Dict[str, Any]] = None) -> Optional[VerdictResult]:
+        """
+        Verdict decided by claim-level rules alone, before any news evidence.
+
+        Scientific consensus claims are Likely False whatever the stance
+        distribution, so their verdict is known up front. Returns None for
+        claims no rule decides.
+        """
+        if not self._is_scientific_consensus_claim(claim):
+            return None
+        stance_percentages = {'support': 0.0, 'contradict': 0.0, 'neutral': 0.0}
+        return self._handle_scientific_consensus_verdict(claim, stance_percentages, fact_check_result)
+
     def _is_scientific_consensus_claim(self, claim: str) -> bool:
         """Check if claim is about a topic with strong scientific consensus."""
         claim_lower = claim.lower()
@@ -69,6 +69,11 @@ class EnhancedVerifier:
             self.nli_model = None
             self.nli_tokenizer = None
     
+    def warm_up(self):
+        """Run one dummy NLI forward pass so the first request skips lazy initialization."""
+        if self.nli_model and self.nli_tokenizer:
+            self.verify_with_nli_model("The sky is blue.", "The sky appears blue during the day.")
+    
     def verify_claim_with_google_factcheck(self, claim: str) -> Optional[FactCheckResult]:
         """Verify claim using Google Fact Check API."""
         if not self.google_factcheck:
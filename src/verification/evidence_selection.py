@@ -2,11 +2,13 @@ import logging
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Tuple
 
-import yaml
 import os
 import numpy as np
-from sentence_transformers import SentenceTransformer, CrossEncoder
+from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
+from .calibration_config import CALIBRATION_PATH, get_calibration
+from ..evidence_retrieval.rerank_service import RerankService, get_reranker, overlap_scores
+from ..utils.tracing import traced
 try:
     from rank_bm25 import BM25Okapi
 except Exception:  # Optional dependency
@@ -28,20 +30,6 @@ class EvidenceItem:
     scores: Dict[str, float] = field(default_factory=dict)
 
 
-def _load_calib(path: str = "config/calibration.yaml") -> Dict[str, Any]:
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
-    except FileNotFoundError:
-        return {
-            "cosine_floor": 0.60,
-            "topk_dense": 100,
-            "topk_rrf": 30,
-            "topk_cross_encoder": 20,
-            "final_k": 3,
-        }
-
-
 def rrf_fuse(rankings: Dict[str, List[str]], k: int = 60) -> List[str]:
     """Reciprocal Rank Fusion.
     rankings maps method->list of doc_ids by descending score.
@@ -53,26 +41,27 @@ def rrf_fuse(rankings: Dict[str, List[str]], k: int = 60) -> List[str]:
     return [doc for doc, _ in sorted(scores.items(), key=lambda x: x[1], reverse=True)]
 
 
-def cross_encoder_rerank(claim: str, docs: List[EvidenceItem], top_k: int) -> List[EvidenceItem]:
+CROSS_ENCODER_MODEL = "cross-encoder/roberta-large-ms-marco"
+
+
+@traced("rerank.cross_encoder")
+def cross_encoder_rerank(claim: str, docs: List[EvidenceItem], top_k: int,
+                         reranker: Optional[RerankService] = None) -> List[EvidenceItem]:
     if not docs:
         return []
-    text_docs = [(d, (d.snippet or d.full_text or d.title or "")) for d in docs]
+    reranker = reranker or get_reranker(CROSS_ENCODER_MODEL)
+    texts = [(d.snippet or d.full_text or d.title or "") for d in docs]
     try:
-        model = CrossEncoder("cross-encoder/roberta-large-ms-marco")
-        pairs = [(claim, txt) for _, txt in text_docs]
-        scores = model.predict(pairs).tolist()
-        for (d, _), s in zip(text_docs, scores):
-            d.scores["cross"] = float(s)
+        # The service itself falls back to lexical overlap when the cross-encoder is unavailable
+        ranked = reranker.rerank(claim, texts, top_k=top_k)
     except Exception as e:
         # Offline fallback: lexical overlap as proxy
-        logger.warning(f"Cross-encoder unavailable; using offline overlap heuristic. Error: {e}")
-        claim_set = set((claim or "").lower().split())
-        for d, txt in text_docs:
-            toks = set((txt or "").lower().split())
-            inter = len(claim_set & toks)
-            denom = max(1, len(claim_set) + len(toks) - inter)
-            d.scores["cross"] = float(inter / denom)
-    return sorted(docs, key=lambda d: d.scores.get("cross", 0.0), reverse=True)[:top_k]
+        logger.warning(f"Cross-encoder failed; using offline overlap heuristic. Error: {e}")
+        scores = overlap_scores(claim, texts)
+        ranked = sorted(enumerate(scores), key=lambda item: item[1], reverse=True)[:top_k]
+    for index, score in ranked:
+        docs[index].scores["cross"] = score
+    return [docs[index] for index, _ in ranked]
 
 
 def _median(values: List[float]) -> float:
@@ -90,6 +79,7 @@ class EvidenceSelector:
     """Selects evidence snippets by fused ranking (dense + BM25) and cross-encoder reranking."""
 
     def __init__(self, model_name: str = "sentence-transformers/all-roberta-large-v1") -> None:
+        self.reranker = get_reranker(CROSS_ENCODER_MODEL)
         self._offline = os.environ.get("TRUTHLENS_FORCE_OFFLINE", "0") == "1"
         if self._offline:
             self.model = None
@@ -104,6 +94,13 @@ class EvidenceSelector:
                 self._offline = True
                 logger.warning(f"Failed to load embedding model '{model_name}'. Falling back to offline stub. Error: {e}")
 
+    def warm_up(self) -> None:
+        """Load the cross-encoder and run dummy passes through both models."""
+        if self.model is not None:
+            self.model.encode(["The sky is blue."], convert_to_numpy=True)
+        if not self._offline:
+            self.reranker.warm_up()
+
     def _cheap_embed(self, texts: List[str], dim: int = 384) -> np.ndarray:
         vecs = np.zeros((len(texts), dim), dtype=float)
         for i, t in enumerate(texts):
@@ -119,6 +116,7 @@ class EvidenceSelector:
     def _evidence_text(self, ev: EvidenceItem) -> str:
         return (ev.snippet or ev.full_text or ev.title or "").strip()
 
+    @traced("evidence.select")
     def select_top_evidence(
         self,
         claim: str,
@@ -129,11 +127,11 @@ class EvidenceSelector:
         if not claim or not evidence_list:
             return []
 
-        cfg = _load_calib()
-        cosine_floor = float(cfg.get("cosine_floor", similarity_min))
-        topk_rrf = int(cfg.get("topk_rrf", 30))
-        topk_cross = int(cfg.get("topk_cross_encoder", 20))
-        final_k = int(cfg.get("final_k", top_k))
+        cfg = get_calibration()
+        cosine_floor = cfg.cosine_floor if cfg.cosine_floor is not None else similarity_min
+        topk_rrf = cfg.topk_rrf
+        topk_cross = cfg.topk_cross_encoder
+        final_k = cfg.final_k if cfg.final_k is not None else top_k
 
         texts = [self._evidence_text(ev) for ev in evidence_list]
         nonempty_idxs = [i for i, t in enumerate(texts) if t]
@@ -186,7 +184,7 @@ class EvidenceSelector:
             candidates.append(ev)
 
         # Cross-encoder rerank
-        reranked = cross_encoder_rerank(claim, candidates, top_k=topk_cross)
+        reranked = cross_encoder_rerank(claim, candidates, top_k=topk_cross, reranker=self.reranker)
 
         # Dynamic median filter on cross scores
         cross_scores = [ev.scores.get("cross", 0.0) for ev in reranked]
@@ -203,9 +201,8 @@ class EvidenceSelector:
         return [(ev, ev.scores.get("cosine", 0.0)) for ev in final]
 
 
-def drop_neutral_evidence(nli_probs: List[float], cfg_path: str = "config/calibration.yaml") -> bool:
-    cfg = _load_calib(cfg_path)
-    thr = float(cfg.get("nei_max_prob_keep", 0.45))
+def drop_neutral_evidence(nli_probs: List[float], cfg_path: str = CALIBRATION_PATH) -> bool:
+    thr = get_calibration(cfg_path).nei_max_prob_keep
     m = max(float(x) for x in (nli_probs or [])) if nli_probs else 0.0
     return m < thr
 
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Calibration and Fusion Engine for TruthLens
+Array versions of the evidence weighting and fusion steps used by the
+confidence calibrators.
+
+Stance results are turned into an (N x 3) logits/probs matrix plus weight
+vectors once; similarity, trust and recency weights and the fusions are then
+single numpy expressions. Every fusion also accepts a leading batch axis,
+(claims x evidence x 3) with a (claims x evidence) mask, so many claims can
+be calibrated in one pass.
+
+Usage:
+    arrays = EvidenceArrays.from_results(results, priors)
+    weights = arrays.weights(tau=365)
+    Z = stance_aware_fusion(weights, arrays.probs, arrays.logits)
+
+    batch = EvidenceBatch.from_claims([results_a, results_b], priors)
+    p = temperature_softmax(stance_aware_fusion(batch.weights(365), batch.probs, batch.logits, batch.mask), 1.2)
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from .domain_trust import DomainTrustIndex, trust_index
+
+NUM_CLASSES = 3
+PROB_FLOOR = 1e-9
+
+_ZEROS = (0.0, 0.0, 0.0)
+
+
+@lru_cache(maxsize=4096)
+def _timestamp(value: str) -> float:
+    """POSIX seconds of an ISO-8601 string (naive means UTC); NaN if unparseable."""
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return math.nan
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _published_timestamp(value: Any) -> float:
+    if isinstance(value, str) and value:
+        return _timestamp(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return math.nan
+
+
+def _present(row: Any) -> bool:
+    """Whether a logits/probs row is set; rows may be sequences or numpy arrays."""
+    return row is not None and len(row) > 0
+
+
+def _vector(values: Sequence[Any]) -> np.ndarray:
+    out = np.empty(len(values), dtype=float)
+    for i, value in enumerate(values):
+        try:
+            out[i] = float(value)
+        except (TypeError, ValueError):
+            out[i] = math.nan
+    return out
+
+
+def _matrix(rows: Sequence[Any]) -> np.ndarray:
+    if not rows:
+        return np.zeros((0, NUM_CLASSES), dtype=float)
+    return np.asarray(rows, dtype=float).reshape(len(rows), NUM_CLASSES)
+
+
+@dataclass
+class EvidenceArrays:
+    """
+    Per-evidence inputs of one claim as arrays.
+
+    ``age_days`` is NaN where an item has no usable age.
+    """
+    logits: np.ndarray      # (N, 3)
+    probs: np.ndarray       # (N, 3)
+    similarity: np.ndarray  # (N,) clamped to [0, 1]
+    trust: np.ndarray       # (N,)
+    age_days: np.ndarray    # (N,)
+
+    def __len__(self) -> int:
+        return len(self.similarity)
+
+    @classmethod
+    def from_results(cls, results: Sequence[Dict[str, Any]],
+                     priors: Union[Mapping[str, float], DomainTrustIndex, None] = None,
+                     similarity_default: float = 0.0,
+                     logits_keys: Sequence[str] = ("logits",),
+                     use_published_at: bool = False, now: Optional[float] = None) -> "EvidenceArrays":
+        """
+        Extract arrays from stance result dicts.
+
+        Args:
+            results: Dicts with 'logits'/'probs', 'scores' (cross or cosine),
+                'domain', 'age_days' and/or 'published_at'
+            priors: Domain priors or a compiled index for the trust vector
+            similarity_default: Similarity when an item has neither score
+            logits_keys: Keys tried in order for the logits; missing or empty values are skipped
+            use_published_at: Derive ages from 'published_at' instead of 'age_days'
+            now: POSIX time ages are measured from; defaults to the current time
+        """
+        index = trust_index(priors)
+        logits, probs, sims, domains, ages = [], [], [], [], []
+        for r in results:
+            row = None
+            for key in logits_keys:
+                row = r.get(key)
+                if _present(row):
+                    break
+            logits.append(row if _present(row) else _ZEROS)
+            row = r.get("probs")
+            probs.append(row if _present(row) else _ZEROS)
+            scores = r.get("scores") or {}
+            sims.append(scores.get("cross", scores.get("cosine", similarity_default)))
+            domains.append(str(r.get("domain") or ""))
+            ages.append(_published_timestamp(r.get("published_at")) if use_published_at else r.get("age_days"))
+        if use_published_at:
+            now = datetime.now(timezone.utc).timestamp() if now is None else now
+            age_days = (now - np.array(ages, dtype=float)) / 86400.0
+        else:
+            age_days = _vector(ages)
+        return cls(
+            logits=_matrix(logits),
+            probs=_matrix(probs),
+            similarity=np.clip(np.nan_to_num(_vector(sims), nan=similarity_default), 0.0, 1.0),
+            trust=np.array([index.trust(d) for d in domains], dtype=float),
+            age_days=age_days,
+        )
+
+    def weights(self, tau: float) -> np.ndarray:
+        """similarity x trust x recency."""
+        return self.similarity * self.trust * recency(self.age_days, tau)
+
+
+def recency(age_days: np.ndarray, tau: float) -> np.ndarray:
+    """exp(-age / tau); 1 where the age is unknown."""
+    with np.errstate(over="ignore", invalid="ignore"):
+        decay = np.exp(-np.asarray(age_days, dtype=float) / max(1e-6, float(tau)))
+    return np.where(np.isnan(decay), 1.0, decay)
+
+
+@dataclass
+class EvidenceBatch:
+    """Evidence of several claims padded to (claims, max evidence, ...) with a validity mask."""
+    logits: np.ndarray      # (C, N, 3)
+    probs: np.ndarray       # (C, N, 3)
+    similarity: np.ndarray  # (C, N)
+    trust: np.ndarray       # (C, N)
+    age_days: np.ndarray    # (C, N)
+    mask: np.ndarray        # (C, N) bool
+
+    @classmethod
+    def from_arrays(cls, claims: Sequence[EvidenceArrays]) -> "EvidenceBatch":
+        C = len(claims)
+        N = max((len(a) for a in claims), default=0)
+        batch = cls(
+            logits=np.zeros((C, N, NUM_CLASSES)),
+            probs=np.zeros((C, N, NUM_CLASSES)),
+            similarity=np.zeros((C, N)),
+            trust=np.zeros((C, N)),
+            age_days=np.full((C, N), np.nan),
+            mask=np.zeros((C, N), dtype=bool),
+        )
+        for c, arrays in enumerate(claims):
+            n = len(arrays)
+            batch.logits[c, :n] = arrays.logits
+            batch.probs[c, :n] = arrays.probs
+            batch.similarity[c, :n] = arrays.similarity
+            batch.trust[c, :n] = arrays.trust
+            batch.age_days[c, :n] = arrays.age_days
+            batch.mask[c, :n] = True
+        return batch
+
+    @classmethod
+    def from_claims(cls, claims: Sequence[Sequence[Dict[str, Any]]],
+                    priors: Union[Mapping[str, float], DomainTrustIndex, None] = None) -> "EvidenceBatch":
+        index = trust_index(priors)
+        return cls.from_arrays([EvidenceArrays.from_results(results, index) for results in claims])
+
+    def weights(self, tau: float) -> np.ndarray:
+        """Selection weights; zero on padding."""
+        return np.where(self.mask, self.similarity * self.trust * recency(self.age_days, tau), 0.0)
+
+
+def weighted_fusion(weights: np.ndarray, logits: np.ndarray) -> np.ndarray:
+    """Z_c = sum_i w_i z_ic over the evidence axis; (..., N) x (..., N, 3) -> (..., 3)."""
+    return np.einsum("...n,...nc->...c", weights, logits)
+
+
+def stance_aware_fusion(weights: np.ndarray, probs: np.ndarray, logits: np.ndarray,
+                        mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """Z_c = sum_i w_i p_ic z_ic over the evidence axis; padding is dropped via the mask."""
+    if mask is not None:
+        weights = np.where(mask, weights, 0.0)
+    return np.einsum("...n,...nc,...nc->...c", weights, probs, logits)
+
+
+def temperature_softmax(Z: np.ndarray, T: float) -> np.ndarray:
+    """Softmax of Z / T over the last axis."""
+    Zs = np.asarray(Z, dtype=float) / float(T)
+    Zs = Zs - Zs.max(axis=-1, keepdims=True)
+    e = np.exp(Zs)
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+def log_bayesian_fusion(probs: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Product of distributions over the evidence axis, computed as a sum of logs.
+
+    (..., N, 3) -> (..., 3). Probabilities are floored at 1e-9; claims with no
+    (unmasked) evidence get the uniform distribution.
+    """
+    log_p = np.log(np.clip(probs, PROB_FLOOR, 1.0))
+    if mask is not None:
+        log_p = np.where(mask[..., None], log_p, 0.0)
+    return temperature_softmax(log_p.sum(axis=-2), 1.0)
+
+
+def net_evidence(weights: np.ndarray, probs: np.ndarray, support_idx: int = 0, refute_idx: int = 1) -> np.ndarray:
+    """sum_i w_i (p_i[support] - p_i[refute]) over the evidence axis."""
+    return np.einsum("...n,...n->...", weights, probs[..., support_idx] - probs[..., refute_idx])
+
+
+def calibrate_batch(claims: Sequence[Sequence[Dict[str, Any]]], temperature: float, tau: float,
+                    priors: Union[Mapping[str, float], DomainTrustIndex, None] = None) -> List[Dict[str, Any]]:
+    """
+    Stance-aware fusion and temperature calibration of many claims at once.
+
+    Returns, per claim, the calibrated distribution, the top class, the margin
+    between the two best classes, the raw probability of the top class and
+    the net evidence.
+    """
+    if not claims:
+        return []
+    batch = EvidenceBatch.from_claims(claims, priors)
+    weights = batch.weights(tau)
+    p_cal = temperature_softmax(stance_aware_fusion(weights, batch.probs, batch.logits), temperature)
+    top = np.argmax(p_cal, axis=-1)
+    ordered = np.sort(p_cal, axis=-1)
+    margins = ordered[:, -1] - ordered[:, -2]
+    raw_top = np.where(batch.mask, np.take_along_axis(batch.probs, top[:, None, None], axis=-1)[..., 0], -np.inf)
+    p_raw = np.max(raw_top, axis=-1, initial=-np.inf)
+    p_raw = np.where(np.isfinite(p_raw), p_raw, 0.0)
+    S = net_evidence(weights, batch.probs)
+    return [
+        {
+            "p_calibrated": p_cal[c].tolist(),
+            "p_raw_for_top": float(max(p_raw[c], 1e-6)),
+            "top_class": int(top[c]),
+            "margin": float(margins[c]),
+            "net_evidence": float(S[c]),
+        }
+        for c in range(len(claims))
+    ]
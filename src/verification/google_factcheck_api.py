@@ -6,10 +6,13 @@ Uses Google's Fact Check API to verify claims with real fact-checking data.
 
 import requests
 import json
-import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 import logging
+from .claim_review_index import ClaimReview, ClaimReviewIndex, get_claim_review_index, normalize_rating
+from ..utils.rate_limiter import RateLimiter
+from ..utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -29,16 +32,27 @@ class FactCheckResult:
 class GoogleFactCheckAPI:
     """Google Fact Check API client."""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, request_delay: float = 0.5, max_workers: int = 4,
+                 claim_index: Optional[ClaimReviewIndex] = None, use_claim_index: bool = True):
         """
         Initialize the Google Fact Check API client.
         
         Args:
             api_key: Google Cloud API key with Fact Check API enabled
+            request_delay: Minimum seconds between the starts of two API requests
+            max_workers: Claims verified concurrently by batch_verify_claims
+            claim_index: Local review index consulted before the API and fed with
+                every search result; defaults to the shared index
+            use_claim_index: Set to False to always call the API
         """
         self.api_key = api_key
         self.base_url = "https://factchecktools.googleapis.com/v1alpha1"
         self.session = requests.Session()
+        self.rate_limiter = RateLimiter(request_delay, name="google")
+        self.max_workers = max_workers
+        self.claim_index = None
+        if use_claim_index:
+            self.claim_index = claim_index if claim_index is not None else get_claim_review_index()
         
         # Test API key
         self._test_api_key()
@@ -68,6 +82,7 @@ class GoogleFactCheckAPI:
             logger.error(f"Error testing API key: {e}")
             raise
     
+    @traced("factcheck.google_api.search")
     def search_claims(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
         """
         Search for fact-checked claims.
@@ -90,12 +105,15 @@ class GoogleFactCheckAPI:
             }
             
             logger.info(f"Searching Google Fact Check API for: {query}")
+            self.rate_limiter.acquire()
             response = self.session.get(url, params=params)
             
             if response.status_code == 200:
                 data = response.json()
                 claims = data.get('claims', [])
                 logger.info(f"Found {len(claims)} fact-checked claims")
+                if self.claim_index is not None:
+                    self.claim_index.add(ClaimReview.from_google_claim(claim) for claim in claims)
                 return claims
             else:
                 logger.error(f"API request failed with status {response.status_code}: {response.text}")
@@ -116,6 +134,11 @@ class GoogleFactCheckAPI:
             FactCheckResult if found, None otherwise
         """
         try:
+            hit = self.claim_index.lookup(claim_text) if self.claim_index is not None else None
+            if hit is not None:
+                logger.info("Using locally indexed claim review")
+                return self._result_from_review(claim_text, hit[0])
+            
             # Search for the claim
             claims = self.search_claims(claim_text, max_results=5)
             
@@ -124,70 +147,37 @@ class GoogleFactCheckAPI:
                 return None
             
             # Get the most relevant claim (first result)
-            claim = claims[0]
-            
-            # Extract claim review
-            claim_reviews = claim.get('claimReview', [])
-            if not claim_reviews:
+            review = ClaimReview.from_google_claim(claims[0])
+            if review is None:
                 logger.warning("No claim review found in the result")
                 return None
             
-            review = claim_reviews[0]
-            
-            # Extract publisher info
-            publisher = review.get('publisher', {})
-            publisher_name = publisher.get('name', 'Unknown')
-            publisher_site = publisher.get('site', '')
-            
-            # Extract review details
-            review_date = review.get('reviewDate', '')
-            review_url = review.get('url', '')
-            rating = review.get('textualRating', 'Unknown')
-            
-            # Determine verdict based on rating
-            verdict = self._map_rating_to_verdict(rating)
-            
-            # Generate explanation
-            explanation = self._generate_explanation(claim_text, rating, publisher_name)
-            
-            # Calculate confidence based on publisher reliability
-            confidence = self._calculate_confidence(publisher_name)
-            
-            return FactCheckResult(
-                claim_text=claim_text,
-                verdict=verdict,
-                confidence=confidence,
-                publisher=publisher_name,
-                review_date=review_date,
-                url=review_url,
-                explanation=explanation,
-                rating=rating,
-                claim_review_url=review_url
-            )
+            return self._result_from_review(claim_text, review)
             
         except Exception as e:
             logger.error(f"Error verifying claim: {e}")
             return None
     
+    def _result_from_review(self, claim_text: str, review: ClaimReview) -> FactCheckResult:
+        """Build the verdict, explanation and confidence for a claim review."""
+        rating = review.rating or 'Unknown'
+        publisher_name = review.publisher
+        return FactCheckResult(
+            claim_text=claim_text,
+            verdict=self._map_rating_to_verdict(rating),
+            confidence=self._calculate_confidence(publisher_name),
+            publisher=publisher_name,
+            review_date=review.review_date,
+            url=review.url,
+            explanation=self._generate_explanation(claim_text, rating, publisher_name),
+            rating=rating,
+            claim_review_url=review.url
+        )
+    
     def _map_rating_to_verdict(self, rating: str) -> str:
-        """Map Google's rating to our verdict format."""
-        rating_lower = rating.lower()
-        
-        # False ratings
-        if any(word in rating_lower for word in ['false', 'pants on fire', 'mostly false', 'false']):
-            return "REFUTED"
-        
-        # True ratings
-        elif any(word in rating_lower for word in ['true', 'mostly true', 'half true']):
-            return "SUPPORTED"
-        
-        # Mixed or unclear ratings
-        elif any(word in rating_lower for word in ['mixture', 'half true', 'unproven', 'unclear']):
-            return "NOT ENOUGH INFO"
-        
-        # Default
-        else:
-            return "NOT ENOUGH INFO"
+        """Map Google's rating to our verdict format; mixed ratings are not enough to decide."""
+        verdict = normalize_rating(rating)
+        return "NOT ENOUGH INFO" if verdict == "MIXED" else verdict
     
     def _generate_explanation(self, claim_text: str, rating: str, publisher: str) -> str:
         """Generate explanation for the verdict."""
@@ -226,25 +216,27 @@ class GoogleFactCheckAPI:
         """
         Verify multiple claims in batch.
         
+        Claims are verified on a small thread pool; the client's rate limiter
+        spaces the request starts, so requests overlap while the API quota
+        is kept.
+        
         Args:
             claims: List of claims to verify
             
         Returns:
             List of FactCheckResult objects (None for claims not found)
         """
-        results = []
+        if not claims:
+            return []
         
-        for i, claim in enumerate(claims):
+        def verify(indexed_claim):
+            i, claim = indexed_claim
             logger.info(f"Verifying claim {i+1}/{len(claims)}: {claim[:50]}...")
-            
-            result = self.verify_claim(claim)
-            results.append(result)
-            
-            # Rate limiting - wait between requests
-            if i < len(claims) - 1:
-                time.sleep(0.5)
+            return self.verify_claim(claim)
         
-        return results
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(claims)),
+                                thread_name_prefix="truthlens-google-factcheck") as pool:
+            return list(pool.map(verify, enumerate(claims)))
 
 def create_google_factcheck_client(api_key: str) -> GoogleFactCheckAPI:
     """Factory function to create a Google Fact Check API client."""
@@ -6,6 +6,8 @@ from .evidence_selection import EvidenceSelector, EvidenceItem, drop_neutral_evi
 from .stance_classifier import StanceClassifier
 from .confidence_calibrator import aggregate_scores
 from .verdict_mapper import map_to_verdict
+from ..utils.document_analysis import document_analysis_scope
+from ..utils.tracing import span, trace_request
 
 
 logger = logging.getLogger(__name__)
@@ -27,7 +29,17 @@ class VerificationPipeline:
         self.selector = EvidenceSelector(model_name=emb_model)
         self.nli = StanceClassifier(model_name=nli_model)
 
+    def warm_up(self) -> None:
+        """Run a dummy forward pass through the selector and NLI models."""
+        self.selector.warm_up()
+        self.nli.warm_up()
+
     def run(self, claim: str, evidence_list: List[Dict[str, Any]], top_k: int = 3, similarity_min: float = 0.6, temperature: float = 1.5) -> PipelineOutput:
+        # Evidence texts are segmented and tokenized once for all stages
+        with document_analysis_scope(), trace_request("verification_pipeline.run"):
+            return self._run(claim, evidence_list, top_k, similarity_min, temperature)
+
+    def _run(self, claim: str, evidence_list: List[Dict[str, Any]], top_k: int, similarity_min: float, temperature: float) -> PipelineOutput:
         # 1) Evidence selection
         items = [
             EvidenceItem(
@@ -115,7 +127,8 @@ class VerificationPipeline:
         # 3) Weighted fusion + calibration (with optional coupled calibration)
         if hasattr(self, 'use_coupled_calibration') and self.use_coupled_calibration:
             from .coupled_calibrator import calibrate_confidence_coupled
-            coupled_result = calibrate_confidence_coupled(stance_results, T=temperature, beta=0.4)
+            with span("calibration.coupled"):
+                coupled_result = calibrate_confidence_coupled(stance_results, T=temperature, beta=0.4)
             calibrated_probs = {
                 "SUPPORTED": float(coupled_result["SUPPORTED"]),
                 "REFUTED": float(coupled_result["REFUTED"]),
@@ -13,6 +13,7 @@ from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 import time
+from ..utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -244,6 +245,7 @@ class SQLiteCacheManager:
         except Exception as e:
             logger.error(f"Error cleaning up old cache: {e}")
     
+    @traced("cache.stance.get")
     def get_cached_stance(self, claim: str, evidence_text: str) -> Optional[CachedStanceResult]:
         """Get cached stance result if available."""
         claim_hash = self._generate_hash(claim)
@@ -268,6 +270,7 @@ class SQLiteCacheManager:
         
         return None
     
+    @traced("cache.stance.put")
     def cache_stance_result(self, claim: str, evidence_text: str, stance_result: Any, 
                           model_version: str = "facebook/bart-large-mnli") -> CachedStanceResult:
         """Cache stance detection result with explainability."""
@@ -322,6 +325,7 @@ class SQLiteCacheManager:
         logger.debug(f"Cached stance result for: {claim[:50]}...")
         return cached_result
     
+    @traced("cache.verdict.get")
     def get_cached_verdict(self, claim: str) -> Optional[CachedVerdictResult]:
         """Get cached verdict result if available."""
         claim_hash = self._generate_hash(claim)
@@ -344,6 +348,7 @@ class SQLiteCacheManager:
         
         return None
     
+    @traced("cache.verdict.put")
     def cache_verdict_result(self, claim: str, verdict_result: Dict[str, Any], 
                            processing_time: float) -> CachedVerdictResult:
         """Cache verdict result."""
@@ -396,6 +401,7 @@ class SQLiteCacheManager:
         logger.debug(f"Cached verdict result for: {claim[:50]}...")
         return cached_result
     
+    @traced("cache.api.get")
     def get_cached_api_result(self, api_name: str, query: str) -> Optional[Any]:
         """Get cached API result if available."""
         query_hash = self._generate_hash(query)
@@ -419,6 +425,7 @@ class SQLiteCacheManager:
         
         return None
     
+    @traced("cache.api.put")
     def cache_api_result(self, api_name: str, query: str, result: Any):
         """Cache API result."""
         query_hash = self._generate_hash(query)
@@ -3,8 +3,7 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 from collections import Counter
 
-import yaml
-
+from .calibration_config import UX_MAPPING_PATH, UXMapping, get_ux_mapping
 from .confidence_calibrator import discrepancy_metrics
 
 
@@ -55,7 +54,7 @@ class EnhancedVerdictMapper:
     - Scientific consensus and causal chain handling
     """
     
-    def __init__(self, config_path: str = "phase4_verification/config/ux_mapping.yaml"):
+    def __init__(self, config_path: str = UX_MAPPING_PATH):
         self.config = self._load_ux_config(config_path)
         
         # Enhanced thresholds for weighted voting
@@ -79,20 +78,8 @@ class EnhancedVerdictMapper:
             "confidence_calibration": True              # Apply confidence calibration
         }
     
-    def _load_ux_config(self, config_path: str) -> Dict[str, Any]:
-        try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                return yaml.safe_load(f) or {}
-        except FileNotFoundError:
-            return {
-                "thresholds": {"true_min": 0.7, "unclear_min": 0.4},
-                "labels": {
-                    "likely_true": "Likely True 🟢",
-                    "unclear": "Unclear 🟡",
-                    "likely_false": "Likely False 🔴",
-                },
-                "use_supported_probability": True,
-            }
+    def _load_ux_config(self, config_path: str) -> UXMapping:
+        return get_ux_mapping(config_path)
 
     def _calculate_weighted_voting(self, stance_results: List[Dict[str, Any]]) -> Dict[str, float]:
         """
@@ -432,22 +419,6 @@ class EnhancedVerdictMapper:
         }
 
 
-def _load_ux_config(config_path: str = "phase4_verification/config/ux_mapping.yaml") -> Dict[str, Any]:
-    try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
-    except FileNotFoundError:
-        return {
-            "thresholds": {"true_min": 0.7, "unclear_min": 0.4},
-            "labels": {
-                "likely_true": "Likely True 🟢",
-                "unclear": "Unclear 🟡",
-                "likely_false": "Likely False 🔴",
-            },
-            "use_supported_probability": True,
-        }
-
-
 def _choose_by_weight_and_label(results: List[Dict[str, Any]], stance_idx: int, k: int = 3) -> List[Dict[str, Any]]:
     # Use class-specific contribution proxy: w_i * p_i[c]
     def _class_contrib(ev: Dict[str, Any]) -> float:
@@ -474,28 +445,27 @@ def map_to_verdict(
     calibrated_probabilities: Dict[str, float],
     p_raw: float,
     results: List[Dict[str, Any]],
-    config_path: str = "phase4_verification/config/ux_mapping.yaml",
+    config_path: str = UX_MAPPING_PATH,
 ) -> Dict[str, Any]:
     """Map calibrated stance probabilities to a UX verdict and citations.
 
     Assumes probabilities are across {SUPPORTED, REFUTED, NOT ENOUGH INFO}.
     If use_supported_probability is true, uses P(SUPPORTED) as "truth" probability.
     """
-    cfg = _load_ux_config(config_path)
-    thresholds = cfg.get("thresholds", {})
-    labels = cfg.get("labels", {})
-    use_supported = cfg.get("use_supported_probability", True)
+    cfg = get_ux_mapping(config_path)
+    labels = cfg.labels
+    use_supported = cfg.use_supported_probability
     p_true = float(calibrated_probabilities.get("SUPPORTED", 0.0)) if use_supported else float(max(calibrated_probabilities.values() or [0.0]))
 
-    true_min = float(thresholds.get("true_min", 0.7))
-    unclear_min = float(thresholds.get("unclear_min", 0.4))
+    true_min = cfg.true_min
+    unclear_min = cfg.unclear_min
 
     # decide stance index first
     stance_idx = 2 if use_supported else int(max(range(3), key=lambda i: [float(calibrated_probabilities.get("REFUTED", 0.0)), float(calibrated_probabilities.get("NOT ENOUGH INFO", 0.0)), float(calibrated_probabilities.get("SUPPORTED", 0.0))][i]))
     # discrepancy gates
     delta, jsd_val = discrepancy_metrics(p_raw, [float(calibrated_probabilities.get("REFUTED", 0.0)), float(calibrated_probabilities.get("NOT ENOUGH INFO", 0.0)), float(calibrated_probabilities.get("SUPPORTED", 0.0))], stance_idx)
-    gates_delta = float(cfg.get("discrepancy_delta", 0.2))
-    gates_jsd = float(cfg.get("discrepancy_jsd", 0.2))
+    gates_delta = cfg.discrepancy_delta
+    gates_jsd = cfg.discrepancy_jsd
 
     if (delta > gates_delta) or (jsd_val > gates_jsd):
         verdict_str = labels.get("unclear", "Unclear 🟡")
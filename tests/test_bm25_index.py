@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Inverted BM25 Index Test
+Tests incremental updates, MaxScore pruning and persistence of the BM25 index.
+"""
+
+import math
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.evidence_retrieval.bm25_index import InvertedBM25Index
+
+VOCABULARY = [f"term{i}" for i in range(200)]
+
+
+def make_corpus(size, seed=3):
+    rng = random.Random(seed)
+    # Zipf-like term distribution so some terms are common and some rare
+    weights = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+    return {f"doc{i}": rng.choices(VOCABULARY, weights, k=rng.randint(5, 40)) for i in range(size)}
+
+
+def brute_force(corpus, query, top_k, k1=1.5, b=0.75):
+    n_docs = len(corpus)
+    avgdl = sum(len(tokens) for tokens in corpus.values()) / n_docs
+    df = Counter(term for tokens in corpus.values() for term in set(tokens))
+    scores = {}
+    for doc_id, tokens in corpus.items():
+        tf = Counter(tokens)
+        score = 0.0
+        for term in query:
+            if tf[term]:
+                idf = math.log(1 + (n_docs - df[term] + 0.5) / (df[term] + 0.5))
+                score += idf * tf[term] * (k1 + 1) / (tf[term] + k1 * (1 - b + b * len(tokens) / avgdl))
+        if score > 0:
+            scores[doc_id] = score
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+
+
+def assert_same_ranking(actual, expected):
+    # Documents tied on the k-th score may be cut in either order
+    assert len(actual) == len(expected)
+    for (_, a), (_, e) in zip(actual, expected):
+        assert math.isclose(a, e, rel_tol=1e-9)
+    if expected:
+        cutoff = expected[-1][1] * (1 + 1e-9)
+        assert ({doc_id for doc_id, score in actual if score > cutoff}
+                == {doc_id for doc_id, score in expected if score > cutoff})
+
+
+def test_pruned_search_matches_exhaustive_scoring():
+    """MaxScore pruning returns exactly the exhaustive top-k."""
+    corpus = make_corpus(2000)
+    index = InvertedBM25Index()
+    for doc_id, tokens in corpus.items():
+        index.add(doc_id, tokens)
+
+    rng = random.Random(11)
+    for _ in range(30):
+        query = rng.sample(VOCABULARY, rng.randint(1, 6))
+        for top_k in (1, 5, 20):
+            assert_same_ranking(index.search(query, top_k), brute_force(corpus, query, top_k))
+
+
+def test_incremental_updates_match_rebuild():
+    """Adds, replacements and deletes give the same results as a fresh index."""
+    corpus = make_corpus(600)
+    index = InvertedBM25Index(compact_ratio=0.5)
+    for doc_id, tokens in corpus.items():
+        index.add(doc_id, tokens)
+
+    for i in range(0, 600, 3):
+        index.remove(f"doc{i}")
+        del corpus[f"doc{i}"]
+    index.add("doc1", ["term199", "term199", "term5"])
+    corpus["doc1"] = ["term199", "term199", "term5"]
+    index.compact()
+
+    rebuilt = InvertedBM25Index()
+    for doc_id, tokens in corpus.items():
+        rebuilt.add(doc_id, tokens)
+
+    assert len(index) == len(corpus)
+    assert "doc0" not in index and "doc1" in index
+    for query in (["term199"], ["term0", "term5", "term40"], ["term3", "term150"]):
+        assert_same_ranking(index.search(query, 10), rebuilt.search(query, 10))
+        assert_same_ranking(index.search(query, 10), brute_force(corpus, query, 10))
+
+
+def test_retriever_re_adding_an_id_replaces_the_document():
+    """BM25Retriever.add_documents upserts by ID, like the index underneath it."""
+    pytest.importorskip("sentence_transformers")
+    pytest.importorskip("torch")
+    from src.evidence_retrieval.enhanced_retriever import BM25Retriever, EvidenceDocument
+
+    retriever = BM25Retriever([EvidenceDocument("a", "Vaccine study", "No link to autism"),
+                               EvidenceDocument("b", "Budget", "Taxes rose")])
+    retriever.add_documents([EvidenceDocument("a", "Vaccine study", "Retracted paper on measles"),
+                             EvidenceDocument("c", "Weather", "Floods in Kerala")])
+
+    assert [doc.id for doc in retriever.documents] == ["a", "b", "c"]
+    assert retriever.documents[0].content == "Retracted paper on measles"
+    assert retriever.search("autism") == []
+    assert retriever.search("measles")[0].document.content == "Retracted paper on measles"
+
+
+def test_deleted_documents_are_never_returned():
+    """Tombstoned documents are skipped before compaction."""
+    index = InvertedBM25Index(compact_ratio=1.0)
+    index.add("a", ["vaccine", "autism", "study"])
+    index.add("b", ["vaccine", "safety"])
+    assert index.remove("a")
+    assert not index.remove("a")
+    assert [doc_id for doc_id, _ in index.search(["vaccine", "autism"])] == ["b"]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    """A loaded index keeps its documents, fingerprints and scores."""
+    corpus = make_corpus(300)
+    index = InvertedBM25Index()
+    for doc_id, tokens in corpus.items():
+        index.add(doc_id, tokens, fingerprint=len(tokens))
+    index.remove("doc7")
+
+    path = tmp_path / "bm25.npz"
+    index.save(path)
+    loaded = InvertedBM25Index.load(path)
+
+    assert len(loaded) == len(index) == 299
+    assert loaded.fingerprint("doc8") == len(corpus["doc8"])
+    assert loaded.fingerprint("doc7") is None
+    query = ["term2", "term17", "term90"]
+    assert_same_ranking(loaded.search(query, 15), index.search(query, 15))
+
+    loaded.add("new", ["term90"] * 5)
+    assert loaded.search(["term90"], 1)[0][0] == "new"
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Calibration Config Test
+Tests that calibration files are parsed once, reloaded on change and versioned.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.verification.calibration_config import (
+    DEFAULT_VERSION, CalibrationConfig, ConfigFile, DomainPriors, UXMapping,
+    config_version, get_calibration, get_domain_priors,
+)
+
+
+def write(path, text, mtime):
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_file_is_parsed_once_until_it_changes(tmp_path):
+    """Unchanged files are served from memory; an edit is picked up with a new version."""
+    path = tmp_path / "calibration.yaml"
+    write(path, "temperature: 1.2\ntopk_rrf: 30\n", 1_000_000_000)
+    config = ConfigFile(str(path), CalibrationConfig.from_mapping, check_interval=0)
+
+    first = config.get()
+    assert config.get() is first
+    assert config.loads == 1
+    assert (first.temperature, first.topk_rrf, first.cosine_floor) == (1.2, 30, None)
+
+    write(path, "temperature: 2.0\ntopk_rrf: 30\n", 2_000_000_000)
+    second = config.get()
+    assert config.loads == 2
+    assert second.temperature == 2.0
+    assert second.version != first.version
+
+
+def test_invalid_edit_keeps_last_good_config(tmp_path):
+    path = tmp_path / "domain_priors.yaml"
+    write(path, "'who.int': 1.0\ndefault: 0.5\n", 1_000_000_000)
+    config = ConfigFile(str(path), DomainPriors.from_mapping, check_interval=0)
+    good = config.get()
+
+    write(path, "'who.int': [unterminated\n", 2_000_000_000)
+    assert config.get() is good
+    assert good.priors == {"who.int": 1.0, "default": 0.5}
+
+
+def test_missing_file_uses_defaults(tmp_path):
+    ux = ConfigFile(str(tmp_path / "missing.yaml"), UXMapping.from_mapping, check_interval=0).get()
+    assert ux.version == DEFAULT_VERSION
+    assert (ux.true_min, ux.unclear_min) == (0.7, 0.4)
+    assert ux.labels["unclear"] == "Unclear 🟡"
+
+
+def test_config_version_tracks_shared_configs(tmp_path):
+    """The shared accessors return one parsed object per file and a combined version stamp."""
+    calibration = tmp_path / "calibration.yaml"
+    priors = tmp_path / "priors.yaml"
+    write(calibration, "nei_max_prob_keep: 0.5\n", 1_000_000_000)
+    write(priors, "default: 0.6\n", 1_000_000_000)
+
+    assert get_calibration(str(calibration)) is get_calibration(str(calibration))
+    assert get_domain_priors(str(priors)).default == 0.6
+    before = config_version()
+    assert config_version() == before
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Citation Highlighter Test
+Tests the single-pass span engine and bulk highlighting mode.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.output_ux.citation_highlighter import CitationHighlighter, highlight_citations
+
+CLAIM = "Vaccines cause autism"
+CITATION = ("Studies have confirmed vaccines are safe. "
+            "The claim that vaccines cause autism is false and a hoax.")
+
+
+def test_spans_do_not_overlap():
+    """Emitted spans are merged so no two spans share characters."""
+    highlight = CitationHighlighter().highlight_citation(
+        CLAIM, CITATION, "REFUTED", {"REFUTED": 0.9}
+    )
+    spans = sorted(highlight.highlighted_spans, key=lambda s: s.start)
+    assert spans
+    for left, right in zip(spans, spans[1:]):
+        assert left.end <= right.start
+    for span in spans:
+        assert CITATION[span.start:span.end] == span.text
+
+
+def test_stance_breaks_ties_between_span_types():
+    """A claim term in both supporting and refuting context follows the stance."""
+    highlighter = CitationHighlighter()
+    refuted = highlighter.highlight_citation(CLAIM, CITATION, "REFUTED", {})
+    types = {s.text: s.highlight_type for s in refuted.highlighted_spans if s.start > 40}
+    assert types["autism"] == "refute"
+    assert types["false"] == "refute"
+    assert refuted.overall_refute_score > 0
+
+
+def test_bulk_mode_matches_single_calls():
+    """Bulk highlighting gives the same spans as highlighting each citation alone."""
+    highlighter = CitationHighlighter()
+    citations = [
+        {"text": CITATION, "stance": "REFUTED", "stance_probabilities": {"REFUTED": 0.8}},
+        {"snippet": "Officials confirmed the vaccines are accurate and verified.", "stance": "SUPPORTED"},
+        {"text": ""},
+    ]
+    bulk = highlight_citations(CLAIM, citations)
+    assert len(bulk) == 2
+    for citation, result in zip(citations, bulk):
+        single = highlighter.highlight_citation(
+            CLAIM, citation.get("text", citation.get("snippet", "")),
+            citation.get("stance", "NOT ENOUGH INFO"), citation.get("stance_probabilities", {})
+        )
+        assert result == single
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Claim Analysis Memo Test
+Tests that EnhancedClaimAnalyzer classifies claims and extracts search
+phrases from compiled pattern tables and reuses the analysis of recurring
+claims.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.claim_analyzer import EnhancedClaimAnalyzer, _claim_profile
+
+
+def make_analyzer():
+    # Skip API clients and model loading; claim analysis only uses the text
+    return EnhancedClaimAnalyzer.__new__(EnhancedClaimAnalyzer)
+
+
+def test_claim_types_and_phrases():
+    analyzer = make_analyzer()
+    assert analyzer.classify_claim_type("Vaccines cause autism") == "causal"
+    assert analyzer.classify_claim_type("Inflation will rise next year") == "prediction"
+    assert analyzer.classify_claim_type("I believe taxes matter") == "opinion"
+    assert analyzer.classify_claim_type("The earth is flat") == "factual"
+    assert analyzer.classify_claim_type("Rainfall totals in Kerala") == "general"
+
+    assert analyzer.extract_search_phrases("Vaccines cause autism") == ["Vaccines", "autism", "Vaccines autism",
+                                                                      "Vaccines cause autism"]
+    phrases = analyzer.extract_search_phrases("Monsoon rainfall totals across Kerala districts in 2024 hit records")
+    assert phrases[:2] == ["Monsoon rainfall", "rainfall totals"]
+    assert len(phrases) == 5
+
+    assert analyzer._is_causal_claim("Smoking leads to cancer")
+    assert not analyzer._is_causal_claim("Smoking is popular")
+    assert analyzer._is_scientific_consensus_claim("Some say the Earth is flat")
+    assert analyzer._get_related_keywords("more deaths")[0] == "death"
+
+
+def test_trigger_verbs_split_cause_and_effect():
+    """The triggers/triggered alternation no longer shifts the effect group."""
+    analyzer = make_analyzer()
+    assert analyzer.extract_search_phrases("Heavy rain triggered floods")[:2] == ["Heavy rain", "floods"]
+    assert analyzer._extract_cause_effect("heavy rain creates floods") == ("heavy rain", "floods")
+
+
+def test_recurring_claims_reuse_their_analysis():
+    analyzer = make_analyzer()
+    _claim_profile.cache_clear()
+    first = analyzer.extract_search_phrases("5G towers spread the coronavirus")
+    analyzer.classify_claim_type("  5G towers   spread the coronavirus ")
+    analyzer._is_scientific_consensus_claim("5G towers spread the coronavirus")
+    assert _claim_profile.cache_info().misses == 1
+    assert _claim_profile.cache_info().hits == 2
+
+    # Callers get their own list
+    first.append("extra")
+    assert "extra" not in analyzer.extract_search_phrases("5G towers spread the coronavirus")
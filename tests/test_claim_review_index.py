@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Claim Review Index Test
+Tests local lookups of fact-check reviews, the fact-check clients' local-first
+path, refresh jobs and persistence.
+"""
+
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.evidence_retrieval.trusted_sources import SourceType, TrustedContent, TrustedSource
+from src.verification.claim_review_index import (ClaimReview, ClaimReviewIndex, factcheck_refresh_job,
+                                                 trusted_sources_job)
+from src.verification.enhanced_factcheck_api import EnhancedFactCheckAPI
+
+
+def google_claim(text, rating, url):
+    return {"text": text, "claimReview": [{"publisher": {"name": "PolitiFact"}, "url": url,
+                                           "reviewDate": "2024-03-01", "textualRating": rating}]}
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, data):
+        self.data = data
+        self.text = ""
+
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    def __init__(self, claims):
+        self.claims = claims
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        return FakeResponse({"claims": self.claims} if "factchecktools" in url else {})
+
+    def close(self):
+        pass
+
+
+class CountingEncoder:
+    """Bag-of-words vectors over a fixed vocabulary."""
+
+    def __init__(self):
+        self.encoded = 0
+        self.vocabulary = {}
+
+    def encode(self, texts):
+        self.encoded += len(texts)
+        rows = np.zeros((len(texts), 64), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                rows[i, self.vocabulary.setdefault(word, len(self.vocabulary) % 64)] += 1
+        return rows
+
+
+def test_lookup_serves_recurring_claims_quickly():
+    index = ClaimReviewIndex()
+    index.add(ClaimReview.from_google_claim(google_claim(f"Claim number {i} about topic{i}", "False",
+                                                         f"https://example.org/{i}")) for i in range(3000))
+    index.add([ClaimReview.from_google_claim(google_claim("5G towers spread the coronavirus", "Pants on Fire",
+                                                          "https://politifact.com/5g"))])
+
+    review, score = index.lookup("5G towers spread the coronavirus!")
+    assert review.url == "https://politifact.com/5g" and review.verdict == "REFUTED"
+    assert score == 1.0
+    assert index.lookup("Inflation fell sharply last quarter") is None
+
+    timings = []
+    for _ in range(20):
+        start = time.perf_counter()
+        index.lookup("Do 5G towers spread coronavirus")
+        timings.append(time.perf_counter() - start)
+    assert statistics.median(timings) < 0.01
+    assert index.popular_claims(1) == ["Do 5G towers spread coronavirus"]
+
+
+def test_fact_check_api_goes_local_after_first_search():
+    """A network result is indexed; the same claim later never reaches the providers."""
+    index = ClaimReviewIndex()
+    api = EnhancedFactCheckAPI(None, claim_index=index, request_delay=0)
+    api.google_api_key = "key"
+    api.session = FakeSession([google_claim("Drinking bleach cures COVID-19", "False", "https://a.org/bleach")])
+
+    first = api.get_best_fact_check("Drinking bleach cures COVID-19")
+    calls = api.session.calls
+    assert first.verdict == "REFUTED"
+
+    second = api.get_best_fact_check("drinking bleach cures covid-19")
+    assert api.session.calls == calls
+    assert second.verdict == "REFUTED" and second.url == "https://a.org/bleach"
+    assert second.best_source["match_score"] == 1.0
+    assert index.stats()["hits"] == 1
+    api.close()
+
+
+def test_refresh_ingests_trusted_sources_and_persists(tmp_path):
+    class Database:
+        sources = {"snopes": TrustedSource("snopes", "Snopes", SourceType.SNOPES, "snopes.com", "https://snopes.com",
+                                           "", 0.9, datetime(2024, 1, 1))}
+        content = {
+            "c1": TrustedContent("c1", "snopes", "Bill Gates microchips in vaccines", "https://snopes.com/chips",
+                                 "No.", "", datetime(2024, 2, 1), datetime(2024, 2, 1), [], fact_check_rating="False"),
+            "c2": TrustedContent("c2", "snopes", "Unrated page", "https://snopes.com/page",
+                                 "", "", datetime(2024, 2, 1), datetime(2024, 2, 1), []),
+        }
+
+    path = tmp_path / "claim_reviews.json"
+    encoder = CountingEncoder()
+    index = ClaimReviewIndex(encoder=encoder, model_name="bow", path=path)
+    assert index.refresh([trusted_sources_job(Database())]) == 1
+    review, _ = index.lookup("Bill Gates microchips in vaccines")
+    assert review.publisher == "Snopes" and review.confidence == 0.9
+
+    encoded = encoder.encoded
+    reloaded = ClaimReviewIndex(encoder=encoder, model_name="bow", path=path)
+    assert reloaded.load() == 1
+    assert encoder.encoded == encoded
+    assert reloaded.lookup("Bill Gates microchips in vaccines")[0].url == "https://snopes.com/chips"
+
+
+def test_embedding_candidates_without_shared_tokens():
+    """Reviews found only through the embedding index are still scored."""
+    class Encoder:
+        vectors = {"Vaccines cause autism": [1, 0], "Shots lead to autism": [0.99, 0.1], "Unrelated": [0, 1]}
+
+        def encode(self, texts):
+            return np.array([self.vectors.get(text, [0, 1]) for text in texts], dtype=np.float32)
+
+    index = ClaimReviewIndex(encoder=Encoder(), model_name="toy", lexical_weight=0.2, min_score=0.5)
+    index.add([ClaimReview("Vaccines cause autism", "False", "REFUTED", "AP", "https://ap.org/v", "", "AP")])
+    review, score = index.lookup("Shots lead to autism")
+    assert review.url == "https://ap.org/v"
+    assert 0.5 < score < 1.0
+    assert index.lookup("Unrelated") is None
+
+
+def test_negated_claims_do_not_match_and_keep_review_confidence():
+    """A negated claim never gets the review of the claim it negates, nor a raised confidence."""
+    index = ClaimReviewIndex()
+    index.add([ClaimReview("5G towers spread the coronavirus", "False", "REFUTED", "PolitiFact",
+                           "https://politifact.com/5g", "2024-03-01", "Google Fact Check", confidence=0.5)])
+    assert index.lookup("5G towers do not spread the coronavirus") is None
+    assert index.lookup("5G towers don't spread the coronavirus") is None
+    assert index.lookup("The 5G towers coronavirus myth") is None
+    assert index.lookup("5G towers spread the coronavirus") is not None
+
+    api = EnhancedFactCheckAPI(None, claim_index=index, request_delay=0)
+    assert api._local_fact_check("5G towers do not spread the coronavirus") is None
+    assert api._local_fact_check("5G towers spread the coronavirus").confidence == 0.5
+    api.close()
+
+
+def test_refresh_thread_starts_per_process_on_first_lookup():
+    """Scheduling starts no thread; lookups start one per process, as after a fork."""
+    index = ClaimReviewIndex()
+    index.start_refresh([lambda: []], interval=60)
+    assert index._refresh_thread is None
+
+    index.lookup("Any claim")
+    master_thread = index._refresh_thread
+    assert master_thread.is_alive()
+    index.lookup("Any claim")
+    assert index._refresh_thread is master_thread
+
+    # A forked worker sees the master's thread object but not the thread
+    master_stop = index._refresh_stop
+    index._refresh_pid = -1
+    index.lookup("Any claim")
+    worker_thread = index._refresh_thread
+    assert worker_thread is not master_thread and worker_thread.is_alive()
+
+    index.stop_refresh()
+    assert not worker_thread.is_alive()
+    master_stop.set()
+    master_thread.join(timeout=1)
+
+
+def test_factcheck_refresh_indexes_each_review_once():
+    """The refresh job's search leaves indexing to refresh(), which adds every review once."""
+    index = ClaimReviewIndex()
+    api = EnhancedFactCheckAPI(None, claim_index=index, request_delay=0)
+    api.google_api_key = "key"
+    api.session = FakeSession([google_claim("Drinking bleach cures COVID-19", "False", "https://a.org/bleach")])
+    index.lookup("Drinking bleach cures COVID-19")
+
+    added = []
+    add = index.add
+
+    def recording_add(reviews):
+        reviews = [r for r in reviews if r is not None]
+        added.extend(reviews)
+        return add(reviews)
+
+    index.add = recording_add
+    assert index.refresh([factcheck_refresh_job(api, index)]) == 1
+    assert [r.url for r in added] == ["https://a.org/bleach"]
+    assert index.lookup("Drinking bleach cures COVID-19")[0].verdict == "REFUTED"
+    api.close()
+
+
+def test_only_the_lock_holder_runs_refresh_jobs(tmp_path):
+    """Workers sharing an index file refresh once; the others reload what the holder saved."""
+    def wait_for(condition):
+        deadline = time.monotonic() + 5
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return condition()
+
+    path = tmp_path / "claim_reviews.json"
+    runs = {"holder": 0, "follower": 0}
+
+    def job(name):
+        def refresh_job():
+            runs[name] += 1
+            return [ClaimReview.from_google_claim(google_claim(f"Claim refreshed by the {name}", "False",
+                                                               f"https://example.org/{name}"))]
+        return refresh_job
+
+    holder, follower = ClaimReviewIndex(path=path), ClaimReviewIndex(path=path)
+    holder.start_refresh([job("holder")], interval=0.02)
+    follower.start_refresh([job("follower")], interval=0.02)
+    holder.lookup("Any claim")
+    assert wait_for(lambda: runs["holder"] > 0)
+    follower.lookup("Any claim")
+    assert wait_for(lambda: follower.lookup("Claim refreshed by the holder") is not None)
+    assert runs["follower"] == 0
+
+    # The follower takes over once the holder stops
+    holder.stop_refresh()
+    assert wait_for(lambda: runs["follower"] > 0)
+    follower.stop_refresh()
+
+
+def test_index_and_api_normalize_ratings_alike():
+    """Negated and 'mostly false' ratings are refuted whichever path parses them."""
+    api = EnhancedFactCheckAPI(None, claim_index=ClaimReviewIndex(), request_delay=0)
+    expected = {"Not true": "REFUTED", "Untrue": "REFUTED", "Mostly false": "REFUTED", "Not accurate": "REFUTED",
+                "Mostly true": "SUPPORTED", "Half true": "MIXED", "Unproven": "NOT ENOUGH INFO"}
+    for rating, verdict in expected.items():
+        review = ClaimReview.from_google_claim(google_claim("Some claim", rating, "https://example.org/r"))
+        assert review.verdict == verdict, rating
+        assert api._normalize_verdict(rating) == verdict, rating
+    api.close()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Cross-Reference Cache Test
+Tests the thread-safe, batched SQLite cache used by the cross-reference scorer.
+"""
+
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.evidence_retrieval.cross_reference_cache import CrossReferenceCache, article_key
+
+
+def test_article_key_is_signed_64_bit():
+    """Hex article IDs decode directly; other IDs are hashed into range."""
+    assert article_key("0000000000000001") == 1
+    assert article_key("ffffffffffffffff") == -1
+    for article_id in ("abc", "a" * 40, "ffffffffffffffff"):
+        assert -(1 << 63) <= article_key(article_id) < (1 << 63)
+
+
+def test_writes_are_buffered_until_flush(tmp_path):
+    """Pair writes stay in memory until the batch threshold or an explicit flush."""
+    cache = CrossReferenceCache(str(tmp_path / "cache.db"), flush_batch_size=100,
+                                flush_interval_seconds=3600)
+    cache.put_similarity("0123456789abcdef", "fedcba9876543210", 0.75)
+
+    # Readable before it has been written
+    assert cache.get_similarity("0123456789abcdef", "fedcba9876543210") == 0.75
+    count = cache.conn.execute("SELECT COUNT(*) FROM pair_similarity").fetchone()[0]
+    assert count == 0
+
+    cache.flush()
+    count = cache.conn.execute("SELECT COUNT(*) FROM pair_similarity").fetchone()[0]
+    assert count == 1
+    cache.close()
+
+
+def test_quiet_period_flushes_on_a_timer(tmp_path):
+    """The last batch before a quiet period is written without another put."""
+    db_path = str(tmp_path / "cache.db")
+    cache = CrossReferenceCache(db_path, flush_batch_size=100, flush_interval_seconds=0.05)
+    cache.put_similarity("0123456789abcdef", "fedcba9876543210", 0.75)
+
+    reader = sqlite3.connect(db_path)
+    deadline = time.time() + 5
+    count = 0
+    while count == 0 and time.time() < deadline:
+        time.sleep(0.02)
+        count = reader.execute("SELECT COUNT(*) FROM pair_similarity").fetchone()[0]
+    reader.close()
+    assert count == 1
+    cache.close()
+    assert cache._flusher is None
+
+
+def test_prefetch_returns_all_pairs_in_set(tmp_path):
+    """Prefetch loads every cached pair whose both ends are in the article set."""
+    cache = CrossReferenceCache(str(tmp_path / "cache.db"), flush_batch_size=1)
+    ids = [f"{i:016x}" for i in range(5)]
+    for i in range(4):
+        cache.put_similarity(ids[i], ids[i + 1], i / 10)
+    cache.put_similarity(ids[0], "outside-the-set", 0.9)
+
+    pairs = cache.prefetch_similarities(ids)
+    assert pairs == {(ids[i], ids[i + 1]): i / 10 for i in range(4)}
+    cache.close()
+
+
+def test_shared_across_threads(tmp_path):
+    """One cache instance can be used concurrently from many threads."""
+    cache = CrossReferenceCache(str(tmp_path / "cache.db"), flush_batch_size=16)
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(50):
+                cache.put_similarity(f"{offset:08x}{i:08x}", f"{i:016x}", 0.5)
+                cache.get_similarity(f"{offset:08x}{i:08x}", f"{i:016x}")
+        except Exception as e:  # pragma: no cover - surfaced by the assert below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    cache.flush()
+    count = cache.conn.execute("SELECT COUNT(*) FROM pair_similarity").fetchone()[0]
+    assert count == 400
+    cache.close()
+
+
+def _make_articles(count, offset=0):
+    """Build simple article stand-ins alternating between two providers."""
+    from types import SimpleNamespace
+    return [
+        SimpleNamespace(
+            title=f"Vaccine study {i}",
+            content="New study finds the vaccine safe and effective " * (i % 3 + 1),
+            url=f"https://example.com/{i}",
+            source_name=["Guardian", "NewsAPI"][i % 2]
+        )
+        for i in range(offset, offset + count)
+    ]
+
+
+def test_pairs_are_symmetric_and_reused_across_sets(tmp_path):
+    """Reordered and overlapping article sets reuse cached results and pairs."""
+    from src.evidence_retrieval.semantic_cross_reference_scorer import SemanticCrossReferenceScorer
+
+    scorer = SemanticCrossReferenceScorer(str(tmp_path / "cache.db"))
+    articles = _make_articles(6)
+
+    first = scorer.calculate_cross_reference_scores(articles, "vaccine safety")
+    stats = scorer.get_cache_stats()
+    # Upper triangle only: 6 articles -> 15 unordered pairs
+    assert stats["pair_misses"] == 15
+    assert stats["pair_hits"] == 0
+
+    # Same set, different order and query spacing: served from the result cache
+    reordered = list(reversed(articles))
+    second = scorer.calculate_cross_reference_scores(reordered, "  Vaccine   safety ")
+    assert [s.article_id for s in second] == [s.article_id for s in reversed(first)]
+    assert scorer.get_cache_stats()["result_hits"] == 1
+
+    # Overlapping set from another provider mix: shared pairs are not recomputed
+    overlapping = articles[2:] + _make_articles(2, offset=6)
+    scorer.calculate_cross_reference_scores(overlapping, "vaccine safety")
+    stats = scorer.get_cache_stats()
+    # 4 shared articles -> 6 cached pairs out of 15
+    assert stats["pair_hits"] == 6
+    assert stats["pair_misses"] == 15 + 9
+    assert stats["result_hit_rate"] == 1 / 3
+    assert stats["pair_hit_rate"] == 6 / 30
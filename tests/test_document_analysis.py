@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Document Analysis Test
+Tests the per-request sentence segmentation and tokenization cache.
+"""
+
+import re
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.document_analysis import (
+    analyze_text, document_analysis_scope, group_near_duplicates, jaccard_similarity
+)
+from src.utils.text_cleaning import extract_sentences
+
+TEXT = "  Vaccines are safe.   Studies confirm it!! Is it true? yes ...  "
+
+
+def test_sentences_match_legacy_split_with_offsets():
+    """Sentences equal the old re.split output and carry source offsets."""
+    legacy = [s.strip() for s in re.split(r'[.!?]+', TEXT) if s.strip()]
+    doc = analyze_text(TEXT)
+    assert doc.sentence_texts == legacy
+    assert extract_sentences(TEXT) == legacy
+    for sentence in doc.sentences:
+        assert TEXT[sentence.start:sentence.end] == sentence.text
+
+
+def test_documents_shared_within_scope_only():
+    """The same text is analyzed once inside a scope and nested scopes share it."""
+    assert analyze_text(TEXT) is not analyze_text(TEXT)
+    with document_analysis_scope() as analyzer:
+        doc = analyze_text(TEXT)
+        with document_analysis_scope() as inner:
+            assert inner is analyzer
+            assert analyze_text(TEXT) is doc
+        assert len(analyzer) == 1
+    assert analyze_text(TEXT) is not doc
+
+
+def test_jaccard_matches_set_formula():
+    """Token-ID Jaccard equals the word-set formula it replaced."""
+    a, b = "The vaccine is safe and effective", "the Vaccine is not safe"
+    words_a, words_b = set(a.lower().split()), set(b.lower().split())
+    expected = len(words_a & words_b) / len(words_a | words_b)
+    assert jaccard_similarity(a, b) == expected
+    with document_analysis_scope():
+        assert jaccard_similarity(a, b) == expected
+    assert jaccard_similarity("", b) == 0.0
+
+
+def test_group_near_duplicates_maps_to_first_occurrence():
+    """Identical and near-identical claims share the first claim as representative."""
+    claims = [
+        "Vaccines cause autism.",
+        "vaccines  cause AUTISM",
+        "The earth is flat",
+        "A new study says vaccines cause autism in young children today",
+        "a new study says vaccines cause autism in young children, today!",
+        "A new study says vaccines do not cause autism in children",
+    ]
+    assert group_near_duplicates(claims) == [0, 0, 2, 3, 3, 5]
+    assert group_near_duplicates(claims, threshold=1.0) == [0, 0, 2, 3, 3, 5]
+    assert group_near_duplicates([]) == []
+
+
+def test_group_near_duplicates_keeps_negations_apart():
+    """A claim and its negation are never merged, however similar their words."""
+    claim = ("The MMR vaccine has been shown to cause autism in children according to a large "
+             "study of health records published by researchers in Denmark last year")
+    negated = claim.replace("has been", "has not been")
+    assert group_near_duplicates([claim, negated]) == [0, 1]
+    assert group_near_duplicates([negated, negated.replace("last year", "this year"), claim]) == [0, 0, 2]
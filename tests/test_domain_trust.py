@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Domain Trust Index Test
+Tests suffix, glob and default matching of compiled domain priors and that
+both calibrators agree on trust.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.verification.domain_trust import DomainTrustIndex, trust_index
+from src.verification.confidence_calibrator import _domain_trust
+from src.verification.coupled_calibrator import compute_evidence_weights
+
+PRIORS = {
+    "who.int": 1.00,
+    "nih.gov": 0.95,
+    "ncbi.nlm.nih.gov": 0.99,
+    "bbc.co.uk": 0.85,
+    "*.blogspot.*": 0.45,
+    "default": 0.60,
+}
+
+
+def test_suffix_matching_prefers_longest_suffix():
+    index = DomainTrustIndex(PRIORS)
+    assert index.trust("who.int") == 1.00
+    assert index.trust("www.who.int") == 1.00
+    assert index.trust("https://WWW.WHO.INT:443/news/item") == 1.00
+    assert index.trust("pubmed.ncbi.nlm.nih.gov") == 0.99
+    assert index.trust("www.nih.gov") == 0.95
+    assert index.trust("news.bbc.co.uk.") == 0.85
+
+
+def test_lookalike_domains_get_default():
+    """Substrings of a trusted domain are not that domain."""
+    index = DomainTrustIndex(PRIORS)
+    assert index.trust("notwho.int") == 0.60
+    assert index.trust("who.int.example.com") == 0.60
+    assert index.trust("") == 0.60
+
+
+def test_globs_match_whole_host():
+    index = DomainTrustIndex(PRIORS)
+    assert index.trust("someone.blogspot.com") == 0.45
+    assert index.trust("someone.blogspot.co.uk") == 0.45
+    assert index.trust("blogspot.com") == 0.60
+
+
+def test_calibrators_share_trust_values():
+    """Both calibrators give the same trust for the same domain."""
+    compiled = trust_index(PRIORS)
+    assert trust_index(PRIORS) is compiled
+    for domain in ("www.who.int", "pubmed.ncbi.nlm.nih.gov", "x.blogspot.com", "example.org"):
+        item = {"domain": domain, "scores": {"cross": 1.0}}
+        assert compute_evidence_weights([item], PRIORS)[0] == _domain_trust(domain, PRIORS)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Embedding Cache Test
+Tests that cached document embeddings are reused and only misses are encoded.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.evidence_retrieval.embedding_cache import EmbeddingCache, content_hash
+
+
+class CountingEncoder:
+    """Deterministic encoder that records how many texts it embedded."""
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, texts, **kwargs):
+        self.encoded += len(texts)
+        return np.array([[len(text), text.count("a"), 1.0] for text in texts], dtype=np.float32)
+
+
+def keys_for(docs):
+    return [(doc_id, content_hash(text)) for doc_id, text in docs]
+
+
+def test_only_missing_documents_are_encoded():
+    """A second pass over the corpus plus one new document encodes one text."""
+    encoder = CountingEncoder()
+    cache = EmbeddingCache("test-model")
+    docs = [("1", "alpha"), ("2", "beta"), ("3", "gamma")]
+
+    first = cache.encode(encoder, keys_for(docs), [text for _, text in docs])
+    assert encoder.encoded == 3
+
+    docs.append(("4", "delta"))
+    second = cache.encode(encoder, keys_for(docs), [text for _, text in docs])
+    assert encoder.encoded == 4
+    assert np.array_equal(second[:3], first)
+    assert cache.stats()["hits"] == 3
+
+
+def test_edited_content_is_re_encoded():
+    """The same document ID with different text is a cache miss."""
+    encoder = CountingEncoder()
+    cache = EmbeddingCache("test-model")
+    cache.encode(encoder, keys_for([("1", "alpha")]), ["alpha"])
+    vectors = cache.encode(encoder, keys_for([("1", "alpha alpha")]), ["alpha alpha"])
+    assert encoder.encoded == 2
+    assert vectors[0][0] == len("alpha alpha")
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = EmbeddingCache("test-model", max_entries=2)
+    cache.put(("1", "h"), np.ones(3))
+    cache.put(("2", "h"), np.ones(3))
+    assert cache.get(("1", "h")) is not None
+    cache.put(("3", "h"), np.ones(3))
+    assert cache.get(("2", "h")) is None
+    assert len(cache) == 2
+
+
+def test_save_and_load_checks_model(tmp_path):
+    """A saved cache reloads for the same model and is rejected for another."""
+    encoder = CountingEncoder()
+    cache = EmbeddingCache("test-model")
+    docs = [("1", "alpha"), ("2", "beta")]
+    original = cache.encode(encoder, keys_for(docs), [text for _, text in docs])
+
+    path = tmp_path / "embeddings.npz"
+    cache.save(path)
+    loaded = EmbeddingCache.load(path, "test-model")
+    assert np.array_equal(loaded.encode(encoder, keys_for(docs), [text for _, text in docs]), original)
+    assert encoder.encoded == 2
+
+    with pytest.raises(ValueError):
+        EmbeddingCache.load(path, "other-model")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Fact-Check Concurrency Test
+Tests that providers are queried concurrently within their rate limits and
+that a slow provider cannot hold a search past its deadline.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.rate_limiter import RateLimiter
+from src.verification.enhanced_factcheck_api import EnhancedFactCheckAPI
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.status_code = 200
+        self.text = text
+
+
+class FakeSession:
+    """Serves a search page after ``latency`` seconds, recording request start times."""
+
+    def __init__(self, latency=0.2, slow_hosts=(), slow_latency=2.0):
+        self.latency = latency
+        self.slow_hosts = slow_hosts
+        self.slow_latency = slow_latency
+        self.starts = []
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        with self._lock:
+            self.starts.append((url, time.monotonic()))
+        slow = any(host in url for host in self.slow_hosts)
+        time.sleep(self.slow_latency if slow else self.latency)
+        query = url.split("?q=")[1]
+        return FakeResponse(f'<a href="/fact-check/{query}">x</a><a href="/factcheck/{query}">y</a>')
+
+    def close(self):
+        pass
+
+
+def make_api(session, **kwargs):
+    api = EnhancedFactCheckAPI(None, **kwargs)
+    api.session = session
+    return api
+
+
+def test_rate_limiter_spaces_slots_and_respects_deadline():
+    limiter = RateLimiter(0.5)
+    assert limiter.reserve() == 0
+    assert 0.45 < limiter.reserve() <= 0.5
+    assert limiter.reserve(deadline=time.monotonic() + 0.2) is None
+    assert limiter.stats()["granted"] == 2 and limiter.stats()["refused"] == 1
+
+
+def test_providers_are_queried_concurrently():
+    api = make_api(FakeSession(latency=0.3))
+    start = time.monotonic()
+    results = api.search_claims("moon cheese")
+    assert time.monotonic() - start < 0.8
+    assert len(api.session.starts) == 3
+    assert results[0].best_source["name"] == "Snopes"
+    api.close()
+
+
+def test_slow_provider_is_dropped_at_deadline():
+    api = make_api(FakeSession(latency=0.05, slow_hosts=("snopes",)), deadline_seconds=0.5)
+    start = time.monotonic()
+    results = api.search_claims("moon cheese")
+    assert time.monotonic() - start < 1.0
+    assert results[0].best_source["name"] == "PolitiFact"
+    api.close()
+
+
+def test_batch_keeps_each_provider_within_its_quota():
+    session = FakeSession(latency=0.01)
+    api = make_api(session, request_delay=0.1)
+    results = api.search_claims_batch(["q1", "q2", "q3", "q4"])
+    assert [r[0].claim_text for r in results] == ["q1", "q2", "q3", "q4"]
+    for host in ("snopes", "politifact", "sciencefeedback"):
+        starts = sorted(t for url, t in session.starts if host in url)
+        assert len(starts) == 4
+        assert all(b - a >= 0.095 for a, b in zip(starts, starts[1:]))
+    api.close()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Fusion Engine Test
+Tests that the array-based calibration matches per-item fusion, including
+for batches of claims with different evidence counts.
+"""
+
+import math
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.verification.coupled_calibrator import bayesian_fusion
+from src.verification.fusion_engine import (
+    EvidenceArrays, calibrate_batch, log_bayesian_fusion, stance_aware_fusion, temperature_softmax,
+)
+
+PRIORS = {"who.int": 1.0, "*.blogspot.*": 0.45, "default": 0.6}
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def make_item(rng):
+    logits = [rng.uniform(-3, 3) for _ in range(3)]
+    exps = [math.exp(z) for z in logits]
+    return {
+        "logits": logits,
+        "probs": [e / sum(exps) for e in exps],
+        "scores": {"cross": rng.random()},
+        "domain": rng.choice(["www.who.int", "a.blogspot.com", "example.org"]),
+        "age_days": rng.choice([None, rng.uniform(0, 900)]),
+        "published_at": (NOW - timedelta(days=rng.uniform(0, 900))).isoformat(),
+    }
+
+
+def loop_fusion(results, tau):
+    """Reference per-item stance-aware fusion."""
+    Z = np.zeros(3)
+    trust = {"www.who.int": 1.0, "a.blogspot.com": 0.45, "example.org": 0.6}
+    for item in results:
+        rec = 1.0 if item["age_days"] is None else math.exp(-item["age_days"] / tau)
+        w = item["scores"]["cross"] * trust[item["domain"]] * rec
+        Z += w * np.array(item["probs"]) * np.array(item["logits"])
+    return Z
+
+
+def test_stance_aware_fusion_matches_loop():
+    rng = random.Random(3)
+    results = [make_item(rng) for _ in range(25)]
+    arrays = EvidenceArrays.from_results(results, PRIORS)
+    assert np.allclose(stance_aware_fusion(arrays.weights(365), arrays.probs, arrays.logits),
+                       loop_fusion(results, 365))
+
+
+def test_numpy_rows_are_accepted():
+    """Logits and probs may arrive as numpy arrays from the NLI model."""
+    rng = random.Random(5)
+    results = [make_item(rng) for _ in range(6)]
+    as_arrays = [dict(item, logits=np.array(item["logits"]), probs=np.array(item["probs"])) for item in results]
+    as_arrays.append({"logits": np.array([]), "probs": None, "scores": {"cross": 0.5}, "domain": "who.int"})
+    arrays = EvidenceArrays.from_results(as_arrays, PRIORS)
+    assert np.allclose(stance_aware_fusion(arrays.weights(365), arrays.probs, arrays.logits),
+                       loop_fusion(results, 365))
+    assert np.allclose(arrays.logits[-1], 0.0)
+
+
+def test_published_at_recency():
+    item = {"scores": {"cross": 1.0}, "domain": "who.int", "published_at": "2024-01-02T00:00:00Z"}
+    arrays = EvidenceArrays.from_results([item, {"scores": {"cross": 1.0}}], PRIORS,
+                                         use_published_at=True, now=NOW.timestamp())
+    assert np.allclose(arrays.weights(365), [math.exp(-365 / 365), 0.6])
+
+
+def test_batched_calibration_matches_single_claims():
+    """Padding in the (claims x evidence x 3) batch does not change any claim's result."""
+    rng = random.Random(8)
+    claims = [[make_item(rng) for _ in range(n)] for n in (0, 1, 7, 3)]
+    batch = calibrate_batch(claims, temperature=1.2, tau=365, priors=PRIORS)
+    for results, result in zip(claims, batch):
+        expected = temperature_softmax(loop_fusion(results, 365), 1.2)
+        assert np.allclose(result["p_calibrated"], expected)
+        assert result["top_class"] == int(np.argmax(expected))
+    assert batch[0]["p_raw_for_top"] == 1e-6
+
+
+def test_log_space_bayesian_fusion_does_not_underflow():
+    """Hundreds of confident distributions still fuse to a valid distribution."""
+    probs = np.tile([0.01, 0.01, 0.98], (400, 1))
+    fused = bayesian_fusion(list(probs))
+    assert np.isfinite(fused).all()
+    assert math.isclose(fused.sum(), 1.0)
+    assert fused[2] > 0.999
+
+    few = [np.array([0.2, 0.3, 0.5]), np.array([0.6, 0.3, 0.1])]
+    product = np.prod(few, axis=0)
+    assert np.allclose(log_bayesian_fusion(np.stack(few)), product / product.sum())
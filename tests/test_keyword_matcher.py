@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher Test
+Tests the compiled multi-keyword matcher against per-keyword regex scans.
+"""
+
+import re
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.keyword_matcher import KeywordMatcher, get_keyword_matcher
+
+KEYWORDS = ["confirm", "confirmed", "confirmed by", "true", "untrue", "not true",
+            "fact", "fact check", "n't"]
+
+TEXTS = [
+    "",
+    "The report was CONFIRMED BY officials; it isn't untrue.",
+    "A fact check found the claim not true, but confirmedly odd.",
+    "Nothing to see here.",
+]
+
+
+def _reference_hits(text, word_boundary):
+    """All (keyword, start, end) hits found by one regex scan per keyword."""
+    hits = []
+    for keyword in KEYWORDS:
+        pattern = rf'(?=(\b{re.escape(keyword)}\b))' if word_boundary else rf'(?=({re.escape(keyword)}))'
+        for match in re.finditer(pattern, text, re.IGNORECASE):
+            hits.append((keyword, match.start(1), match.end(1)))
+    return sorted(hits)
+
+
+def test_matches_per_keyword_scans():
+    """One pass returns the same hits, including overlaps, as a scan per keyword."""
+    for word_boundary in (True, False):
+        matcher = KeywordMatcher(KEYWORDS, word_boundary=word_boundary)
+        for text in TEXTS:
+            hits = sorted((h.keyword, h.start, h.end) for h in matcher.finditer(text))
+            assert hits == _reference_hits(text, word_boundary)
+
+
+def test_hit_text_keeps_original_case():
+    """Hit text is sliced from the input, not the case-folded copy."""
+    hits = KeywordMatcher(["confirmed by"]).find_all("It was CONFIRMED BY them")
+    assert [h.text for h in hits] == ["CONFIRMED BY"]
+
+
+def test_first_by_priority_follows_keyword_order():
+    """The first keyword in list order wins, like a ``keyword in text`` loop."""
+    matcher = KeywordMatcher(["hoax", "false"], word_boundary=False)
+    hit = matcher.first_by_priority("false rumours about a hoax")
+    assert hit.keyword == "hoax"
+    assert hit.start == 22
+    assert matcher.first_by_priority("all clear") is None
+    assert matcher.search("a FALSE claim")
+    assert not matcher.search("")
+
+
+def test_matchers_are_shared_per_keyword_set():
+    """Matchers are compiled once per keyword set and options."""
+    assert get_keyword_matcher(["a", "b"]) is get_keyword_matcher(("a", "b"))
+    assert get_keyword_matcher(["a", "b"]) is not get_keyword_matcher(["a", "b"], word_boundary=False)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Pre-fork Test
+Tests the memory report, heap freezing and connection release used for
+pre-fork model sharing.
+"""
+
+import gc
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.evidence_retrieval.cross_reference_cache import CrossReferenceCache
+from src.evidence_retrieval.trusted_content_store import TrustedContentStore
+from src.utils.prefork import memory_report, prefork_enabled, prepare_for_fork, worker_memory_reports
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/smaps_rollup"), reason="requires Linux /proc")
+def test_forked_child_shares_parent_pages():
+    """A child forked after prepare_for_fork reports mostly shared memory."""
+    payload = bytearray(32 * 1024 * 1024)
+    ready_r, ready_w = os.pipe()
+    done_r, done_w = os.pipe()
+    try:
+        prepare_for_fork()
+        pid = os.fork()
+        if pid == 0:
+            # Child: signal readiness, then wait until the parent has measured
+            os.write(ready_w, b"x")
+            os.read(done_r, 1)
+            os._exit(0 if payload else 1)
+        os.read(ready_r, 1)
+        child = memory_report(pid)
+        children = [r["pid"] for r in worker_memory_reports(os.getpid())]
+        os.write(done_w, b"x")
+        os.waitpid(pid, 0)
+    finally:
+        gc.unfreeze()
+        for fd in (ready_r, ready_w, done_r, done_w):
+            os.close(fd)
+
+    assert pid in children
+    assert child["available"]
+    assert child["shared_mb"] >= 32
+    assert child["shared_mb"] > child["private_mb"]
+
+
+def test_memory_report_fields_and_toggle(monkeypatch):
+    """Reports carry shared/private totals and prefork follows the env var."""
+    report = memory_report()
+    if report["available"]:
+        assert report["rss_mb"] > 0
+        assert report["shared_mb"] + report["private_mb"] == pytest.approx(report["rss_mb"], abs=1.0)
+    assert memory_report(2 ** 22 + 7)["available"] is False
+
+    monkeypatch.setenv("TRUTHLENS_PREFORK", "1")
+    assert prefork_enabled()
+    monkeypatch.delenv("TRUTHLENS_PREFORK")
+    assert not prefork_enabled()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork()")
+def test_sqlite_connections_are_reopened_after_fork(tmp_path):
+    """Connections are closed in the master and each worker opens its own."""
+    cache = CrossReferenceCache(str(tmp_path / "cross_reference.db"))
+    store = TrustedContentStore(tmp_path / "content.db")
+    cache.put_similarity("a", "b", 0.5)
+    store.set_meta("owner", "master")
+    try:
+        summary = prepare_for_fork()
+        assert cache._conn is None and store._conn is None
+        pid = os.fork()
+        if pid == 0:
+            try:
+                cache.put_similarity("c", "d", 0.25)
+                cache.flush()
+                store.set_meta("owner", "worker")
+                os._exit(0)
+            except BaseException:
+                os._exit(1)
+        _, status = os.waitpid(pid, 0)
+    finally:
+        gc.unfreeze()
+
+    assert summary["released_connections"] >= 2
+    assert os.WEXITSTATUS(status) == 0
+    assert cache.get_similarity("a", "b") == 0.5
+    assert cache.get_similarity("c", "d") == 0.25
+    assert store.get_meta("owner") == "worker"
+    cache.close()
+    store.close()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Rerank Service Test
+Tests micro-batching, score caching, the two-stage cascade and the offline
+fallback of the resident reranking service.
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.evidence_retrieval.rerank_service import RerankService, RerankerUnavailable, overlap_scores
+
+
+class RecordingModel:
+    """Scores a pair by shared words and records every predict call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, pairs, **kwargs):
+        self.calls.append(list(pairs))
+        return [float(len(set(claim.split()) & set(text.split()))) for claim, text in pairs]
+
+
+def test_concurrent_callers_share_batches():
+    """Pairs submitted at the same time are scored in fewer model calls than callers."""
+    model = RecordingModel()
+    service = RerankService(max_batch_size=64, max_wait_ms=200, cache_size=0, loader=lambda *args: model)
+    service.load()
+    barrier = threading.Barrier(4)
+    results = {}
+
+    def call(n):
+        barrier.wait()
+        results[n] = service.score(f"claim {n}", [f"claim {n} a", "b"])
+
+    threads = [threading.Thread(target=call, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    service.close()
+
+    assert len(model.calls) < 4
+    assert sum(len(call) for call in model.calls) == 8
+    assert all(results[n] == [2.0, 0.0] for n in range(4))
+
+
+def test_scores_are_cached_by_claim_and_passage():
+    model = RecordingModel()
+    service = RerankService(max_wait_ms=0, loader=lambda *args: model)
+
+    first = service.score("vaccines cause autism", ["vaccines are safe", "autism rates"])
+    assert service.score("vaccines cause autism", ["autism rates", "vaccines are safe"]) == first[::-1]
+    assert len(model.calls) == 1
+
+    service.score("vaccines are safe", ["autism rates"])
+    assert len(model.calls) == 2
+    assert service.stats()["cache_hits"] == 2
+    service.close()
+
+
+def test_first_pass_limits_heavyweight_scoring():
+    """Only the first pass's best candidates reach the heavyweight model."""
+    models = {"heavy": RecordingModel(), "cheap": RecordingModel()}
+    service = RerankService(model_name="heavy", first_pass_model="cheap", first_pass_top_n=2,
+                            max_wait_ms=0, loader=lambda name, device: models[name])
+    passages = ["x", "moon landing faked", "moon", "moon landing", "y"]
+
+    ranked = service.rerank("moon landing faked", passages, top_k=5)
+    service.close()
+
+    assert len(models["cheap"].calls[0]) == 5
+    assert sorted(text for _, text in models["heavy"].calls[0]) == ["moon landing", "moon landing faked"]
+    assert [index for index, _ in ranked] == [1, 3]
+
+
+def test_unavailable_model_falls_back_to_overlap():
+    """A failed load is not retried per call and scores fall back to token overlap."""
+    attempts = []
+
+    def failing_loader(name, device):
+        attempts.append(name)
+        raise OSError("no weights")
+
+    service = RerankService(loader=failing_loader)
+    passages = ["earth is flat", "earth is round and large"]
+    assert service.score("earth is flat", passages) == overlap_scores("earth is flat", passages)
+    assert [index for index, _ in service.rerank("earth is flat", passages)] == [0, 1]
+    with pytest.raises(RerankerUnavailable):
+        service.score("earth is flat", passages, fallback=False)
+    assert len(attempts) == 1
+
+
+def test_evidence_rerank_survives_prediction_errors():
+    """A model that loads but fails to predict falls back to overlap instead of failing the request."""
+    pytest.importorskip("sentence_transformers")
+    from src.verification.evidence_selection import EvidenceItem, cross_encoder_rerank
+
+    class BrokenModel:
+        def predict(self, pairs, **kwargs):
+            raise RuntimeError("CUDA out of memory")
+
+    service = RerankService(loader=lambda name, device: BrokenModel())
+    docs = [EvidenceItem(id="a", title="", snippet="the earth is round", url=""),
+            EvidenceItem(id="b", title="", snippet="the earth is flat", url="")]
+    ranked = cross_encoder_rerank("the earth is flat", docs, top_k=1, reranker=service)
+    assert [d.id for d in ranked] == ["b"]
+    assert ranked[0].scores["cross"] == 1.0
+    service.close()
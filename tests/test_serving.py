@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Serving Test
+Tests the bounded executor and admission control used by the FastAPI apps.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.serving import AdmissionController, AdmissionRejected, BoundedExecutor
+
+
+def test_blocking_work_runs_off_the_event_loop():
+    """Blocking calls run on pool threads while the loop keeps serving."""
+    executor = BoundedExecutor(max_workers=2, max_queue=4)
+
+    async def scenario():
+        loop_thread = threading.get_ident()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticking = asyncio.create_task(ticker())
+        threads = await asyncio.gather(*(executor.run(lambda: (time.sleep(0.1), threading.get_ident())[1])
+                                         for _ in range(2)))
+        ticking.cancel()
+        return loop_thread, threads, ticks
+
+    loop_thread, threads, ticks = asyncio.run(scenario())
+    assert loop_thread not in threads
+    assert ticks >= 5
+    assert executor.stats()["completed"] == 2
+    executor.shutdown()
+
+
+def test_queue_full_is_rejected_with_429():
+    """Requests beyond running + queued slots are shed immediately."""
+    executor = BoundedExecutor(max_workers=1, max_queue=1, queue_timeout=None)
+
+    async def scenario():
+        results = await asyncio.gather(*(executor.run(time.sleep, 0.1) for _ in range(4)),
+                                       return_exceptions=True)
+        return [r.status_code for r in results if isinstance(r, AdmissionRejected)]
+
+    assert asyncio.run(scenario()) == [429, 429]
+    assert executor.stats()["rejected_queue_full"] == 2
+    executor.shutdown()
+
+
+def test_queue_timeout_and_shutdown_are_rejected_with_503():
+    """Waiting too long for a slot, or arriving after close, yields 503."""
+    admission = AdmissionController(max_concurrency=1, max_queue=4, queue_timeout=0.05)
+
+    async def scenario():
+        async with admission:
+            with pytest.raises(AdmissionRejected) as excinfo:
+                await admission.acquire()
+        return excinfo.value.status_code
+
+    assert asyncio.run(scenario()) == 503
+    admission.close()
+    with pytest.raises(AdmissionRejected) as excinfo:
+        asyncio.run(admission.acquire())
+    assert excinfo.value.status_code == 503
+
+
+def test_stream_yields_items_and_stops_producer_on_early_exit():
+    """Streamed items arrive as produced and closing the stream stops the generator."""
+    executor = BoundedExecutor(max_workers=1, max_queue=1)
+    produced = []
+    closed = threading.Event()
+
+    def events():
+        try:
+            for i in range(100):
+                produced.append(i)
+                time.sleep(0.01)
+                yield {"event": "stance", "index": i}
+        finally:
+            closed.set()
+
+    async def scenario():
+        stream = await executor.stream(events)
+        received = []
+        async for event in stream:
+            received.append(event["index"])
+            if len(received) == 3:
+                break
+        await stream.aclose()
+        return received
+
+    assert asyncio.run(scenario()) == [0, 1, 2]
+    assert closed.wait(1.0)
+    assert len(produced) < 100
+    executor.shutdown()
+
+
+def test_stream_reports_an_error_raised_before_the_first_item():
+    """A callable that fails when called ends the stream with its error instead of hanging."""
+    executor = BoundedExecutor(max_workers=1, max_queue=1)
+
+    def broken():
+        raise ValueError("pipeline unavailable")
+
+    async def scenario():
+        stream = await executor.stream(broken)
+        with pytest.raises(ValueError, match="pipeline unavailable"):
+            await asyncio.wait_for(stream.__anext__(), timeout=2.0)
+
+    asyncio.run(scenario())
+    executor.shutdown()
+
+
+def test_stream_dropped_before_iteration_releases_its_slot():
+    """A stream that is never iterated stops its producer and frees the executor slot."""
+    executor = BoundedExecutor(max_workers=1, max_queue=1)
+    closed = threading.Event()
+
+    def events():
+        try:
+            for i in range(1000):
+                time.sleep(0.01)
+                yield {"event": "stance", "index": i}
+        finally:
+            closed.set()
+
+    async def scenario():
+        stream = await executor.stream(events)
+        assert executor.admission.stats()["active"] == 1
+        del stream
+        for _ in range(200):
+            if executor.admission.stats()["active"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        return executor.admission.stats()["active"]
+
+    assert asyncio.run(scenario()) == 0
+    assert closed.wait(1.0)
+    executor.shutdown()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tracing Test
+Tests span trees, latency percentiles and the sampling profiler.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils import tracing
+from src.utils.tracing import metrics_snapshot, span, trace_request, traced
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    tracing.metrics.reset()
+    yield
+    tracing.metrics.reset()
+
+
+@traced("test.encode")
+def encode(texts):
+    time.sleep(0.001)
+    return len(texts)
+
+
+def test_span_tree_and_stage_timings():
+    """Nested spans and decorated calls form one tree per request."""
+    with trace_request("analyze_claim", claim_id="c1") as trace:
+        with span("news.search", provider="guardian"):
+            encode(["a"])
+        encode(["b", "c"])
+
+    tree = trace.to_dict()["spans"]
+    assert tree["attributes"] == {"claim_id": "c1"}
+    assert [child["name"] for child in tree["children"]] == ["news.search", "test.encode"]
+    assert tree["children"][0]["children"][0]["name"] == "test.encode"
+    timings = trace.stage_timings()
+    assert set(timings) == {"news.search", "test.encode"}
+    assert timings["test.encode"] >= 2.0
+    assert metrics_snapshot()["recent_traces"][-1]["name"] == "analyze_claim"
+
+
+def test_nested_trace_request_joins_outer_trace():
+    """A trace opened inside another becomes a span of the outer tree."""
+    with trace_request("verify_batch") as outer:
+        with trace_request("analyze_claim") as inner:
+            encode(["a"])
+    assert [c.name for c in outer.root.children] == ["analyze_claim"]
+    assert inner.stage_timings().keys() == {"test.encode"}
+
+
+def test_percentiles_and_errors_recorded_outside_requests():
+    """Spans feed the rolling window even without a request trace."""
+    for ms in range(1, 101):
+        tracing.metrics.record("cache.get", float(ms))
+    with pytest.raises(ValueError):
+        with span("cache.get"):
+            raise ValueError("boom")
+
+    stats = metrics_snapshot()["spans"]["cache.get"]
+    assert stats["count"] == 101 and stats["errors"] == 1
+    assert stats["p50_ms"] == 50.0 and stats["p95_ms"] == 95.0 and stats["p99_ms"] == 99.0
+
+
+def test_async_functions_are_traced():
+    """The decorator awaits coroutine functions inside their span."""
+    @traced("test.fetch")
+    async def fetch():
+        await asyncio.sleep(0.001)
+        return "ok"
+
+    assert asyncio.run(fetch()) == "ok"
+    assert metrics_snapshot()["spans"]["test.fetch"]["count"] == 1
+
+
+def test_sampling_profiler_reports_slow_request(monkeypatch):
+    """Profiling samples the request thread and keeps only slow requests."""
+    monkeypatch.setenv("TRUTHLENS_PROFILE_INTERVAL_MS", "1")
+
+    def busy_stage():
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+
+    with trace_request("slow", profile=True) as trace:
+        busy_stage()
+    assert trace.profile["samples"] > 0
+    assert any("busy_stage" in f["function"] for f in trace.profile["top_functions"])
+
+    monkeypatch.setenv("TRUTHLENS_PROFILE_SLOW_MS", "10000")
+    with trace_request("fast", profile=True) as trace:
+        pass
+    assert trace.profile is None
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Trusted Sources Index Test
+Tests indexed search of TrustedSourcesDatabase content: term matching,
+source-type filters, top-k ordering, incremental updates, the SQLite store,
+migration of legacy JSON content and concurrent use.
+"""
+
+import json
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.evidence_retrieval.trusted_sources import _NOT_LOADED, SourceType, TrustedContent, TrustedSourcesDatabase
+
+
+def make_content(content_id, source_id, title, snippet="", full_text="", day=1):
+    published = datetime(2024, 1, day)
+    return TrustedContent(id=content_id, source_id=source_id, title=title, url=f"https://example.org/{content_id}",
+                          snippet=snippet, full_text=full_text, published_date=published,
+                          last_updated=published, tags=[])
+
+
+def make_database(tmp_path):
+    db = TrustedSourcesDatabase(data_dir=str(tmp_path))
+    db.add_content(make_content("who-1", "who", "Measles vaccine safety update",
+                                "The measles vaccine is safe", "Full report on measles vaccine safety"))
+    db.add_content(make_content("snopes-1", "snopes", "Does the measles vaccine cause autism?",
+                                "No, the vaccine does not cause autism", "", day=2))
+    db.add_content(make_content("pib-1", "pib", "Budget allocates funds for rural roads", "", "roads and bridges"))
+    return db
+
+
+def test_terms_match_in_any_order(tmp_path):
+    db = make_database(tmp_path)
+    results = db.search_content("vaccine measles")
+    assert [c.id for c in results] == ["who-1", "snopes-1"]
+    assert results[0].relevance_score == 1.0
+    assert results[1].relevance_score == 0.5 + 0.3 / 2 + 0.2
+    assert db.search_content("the of and") == []
+
+
+def test_source_type_filter_and_min_relevance(tmp_path):
+    db = make_database(tmp_path)
+    assert [c.id for c in db.search_content("measles vaccine", [SourceType.WHO])] == ["who-1"]
+    assert [c.id for c in db.search_content("rural roads budget", [SourceType.PIB, SourceType.GOVERNMENT])] == ["pib-1"]
+    assert db.search_content("measles vaccine", [SourceType.RBI]) == []
+    assert [c.id for c in db.search_content("measles autism", min_relevance=0.8)] == ["snopes-1"]
+
+
+def test_top_k_prefers_recent_content_on_ties(tmp_path):
+    db = TrustedSourcesDatabase(data_dir=str(tmp_path))
+    for day in range(1, 11):
+        db.add_content(make_content(f"n{day}", "reuters", f"Flood warning issued {day}", day=day))
+    assert [c.id for c in db.search_content("flood warning", max_results=3)] == ["n10", "n9", "n8"]
+
+
+def test_index_follows_updates_and_reload(tmp_path):
+    db = make_database(tmp_path)
+    db.add_content(make_content("pib-1", "pib", "Monsoon forecast released"))
+    assert db.search_content("rural roads") == []
+    assert [c.id for c in db.search_content("monsoon forecast")] == ["pib-1"]
+
+    reloaded = TrustedSourcesDatabase(data_dir=str(tmp_path))
+    assert len(reloaded.content_index) == 3
+    assert [c.id for c in reloaded.search_content("monsoon")] == ["pib-1"]
+
+
+def test_full_text_matches_come_from_the_store(tmp_path):
+    """Full texts are searched through FTS5 and only read when accessed."""
+    make_database(tmp_path)
+    reloaded = TrustedSourcesDatabase(data_dir=str(tmp_path))
+    content = reloaded.content["pib-1"]
+    assert content._full_text is _NOT_LOADED
+    assert [c.id for c in reloaded.search_content("bridges")] == ["pib-1"]
+    assert reloaded.search_content("bridges")[0].relevance_score == 0.2
+    assert content._full_text is _NOT_LOADED
+    assert content.full_text == "roads and bridges"
+
+
+def test_legacy_json_content_is_migrated(tmp_path):
+    legacy = {
+        "old-1": {"id": "old-1", "source_id": "who", "title": "Dengue cases rise", "url": "https://who.int/d",
+                  "snippet": "", "full_text": "Mosquito season", "published_date": "2023-07-01T00:00:00",
+                  "last_updated": "2023-07-01T00:00:00", "tags": ["health"]},
+    }
+    (tmp_path / "content.json").write_text(json.dumps(legacy))
+    db = TrustedSourcesDatabase(data_dir=str(tmp_path))
+    assert [c.id for c in db.search_content("mosquito dengue")] == ["old-1"]
+    assert db.content["old-1"].tags == ["health"]
+
+    # Unchanged JSON is not imported again, so newer store rows survive a restart
+    db.add_content(make_content("old-1", "who", "Dengue cases fall"))
+    assert TrustedSourcesDatabase(data_dir=str(tmp_path)).content["old-1"].title == "Dengue cases fall"
+
+
+def test_plurals_match_and_stopword_queries_match_nothing(tmp_path):
+    """Stemming keeps the recall of the old substring match for plural forms."""
+    db = make_database(tmp_path)
+    db.add_content(make_content("ap-1", "reuters", "New studies on rural policy", "", "Several cities reported"))
+    assert {c.id for c in db.search_content("vaccines")} == {"who-1", "snopes-1"}
+    assert [c.id for c in db.search_content("study policies")] == ["ap-1"]
+    assert [c.id for c in db.search_content("city")] == ["ap-1"]
+    # Stopwords are not indexed, so a query made only of them has nothing to match
+    assert db.search_content("the of and") == []
+
+
+def test_stems_match_full_text_words_not_longer_ones(tmp_path):
+    """A folded stem finds its own word forms in full texts, not longer words it is a prefix of."""
+    db = make_database(tmp_path)
+    db.add_content(make_content("sci-1", "reuters", "Physics history", "", "Newton and a student wrote this"))
+    db.add_content(make_content("ap-2", "reuters", "Morning briefing", "", "Local news and two studies"))
+    assert [c.id for c in db.search_content("news")] == ["ap-2"]
+    assert [c.id for c in db.search_content("study")] == ["ap-2"]
+    assert [c.id for c in db.search_content("newton")] == ["sci-1"]
+
+
+def test_concurrent_updates_and_searches(tmp_path):
+    db = make_database(tmp_path)
+    errors = []
+
+    def writer(worker):
+        try:
+            for i in range(50):
+                db.add_content(make_content(f"w{worker}-{i % 5}", "reuters", f"Flood warning {i}"))
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        try:
+            for _ in range(50):
+                db.search_content("flood warning measles")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(w,)) for w in range(3)]
+    threads += [threading.Thread(target=reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(db.search_content("flood warning", max_results=100)) == 15
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Verification Cascade Test
+Tests that cached verdicts, confident fact checks and rule overrides end
+analyze_claim before news retrieval and stance detection.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import enhanced_truthlens_pipeline
+from src.enhanced_truthlens_pipeline import CascadeConfig, EnhancedTruthLensPipeline, VerdictCache
+from src.verification.enhanced_factcheck_api import EnhancedFactCheckResult
+from src.verification.enhanced_stance_classifier import EnhancedStanceResult
+from src.verification.enhanced_verdict_aggregator import EnhancedVerdictAggregator
+
+
+class FakeFactCheckAPI:
+    deadline_seconds = 8.0
+
+    def __init__(self, verdicts):
+        self.verdicts = verdicts
+        self.calls = 0
+        self.batches = []
+
+    def get_best_fact_check(self, claim):
+        self.calls += 1
+        return self._result(claim)
+
+    def get_best_fact_checks(self, claims, deadline=None):
+        self.batches.append(list(claims))
+        return [self._result(claim) for claim in claims]
+
+    def _result(self, claim):
+        if claim not in self.verdicts:
+            return None
+        verdict, confidence = self.verdicts[claim]
+        source = {"name": "Snopes"}
+        return EnhancedFactCheckResult(claim_text=claim, verdict=verdict, confidence=confidence, sources=[source],
+                                       best_source=source, review_date="2024-01-01", explanation="", rating=verdict,
+                                       url="https://example.org/check")
+
+
+class FakeNewsHandler:
+    def __init__(self, titles=None, delay=0.0, error=None):
+        self.titles = titles or {}
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def get_news_sources(self, claim, max_articles, days_back=30):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if self.error:
+            raise self.error
+        return [SimpleNamespace(title=title, description="", content="", source="wire", published_at="2024-01-01",
+                                url="https://example.org/" + title.lower().replace(" ", "-"))
+                for title in self.titles.get(claim, [])]
+
+
+class FakeStanceClassifier:
+    def classify_stance(self, claim, article):
+        return EnhancedStanceResult(stance="support", confidence=0.9, evidence_sentences=[], reasoning="")
+
+
+@pytest.fixture
+def make_pipeline(monkeypatch):
+    """Build pipelines through __init__ with fake components instead of models and API clients."""
+    def build(fact_checks, cascade=None):
+        def install_fakes(pipeline):
+            pipeline.news_handler = FakeNewsHandler()
+            pipeline.stance_classifier = FakeStanceClassifier()
+            pipeline.verdict_aggregator = EnhancedVerdictAggregator()
+            pipeline.fact_check_api = FakeFactCheckAPI(fact_checks)
+
+        monkeypatch.setattr(enhanced_truthlens_pipeline, "COMPONENTS_AVAILABLE", True)
+        monkeypatch.setattr(EnhancedTruthLensPipeline, "_initialize_components", install_fakes)
+        return EnhancedTruthLensPipeline("news-key", "guardian-key", None, cascade=cascade)
+    return build
+
+
+def test_confident_fact_check_skips_news_search(make_pipeline):
+    pipeline = make_pipeline({"The moon is cheese": ("REFUTED", 0.95)})
+    result = pipeline.analyze_claim("The moon is cheese")
+    assert result.verdict == "Likely False"
+    assert result.cascade["exit"] == "fact_check"
+    assert result.cascade["path"] == ["verdict_cache:miss", "fact_check:hit"]
+    assert pipeline.news_handler.calls == 0
+
+
+def test_weak_fact_check_runs_full_path_once(make_pipeline):
+    """A fact check below the gate falls through; the lookup is not repeated."""
+    pipeline = make_pipeline({"Taxes rose in 2020": ("REFUTED", 0.5)})
+    result = pipeline.analyze_claim("Taxes rose in 2020")
+    assert result.cascade["exit"] is None
+    assert result.cascade["path"][-1] == "full"
+    assert "fact_check:pass" in result.cascade["path"]
+    assert pipeline.news_handler.calls == 1
+    assert pipeline.fact_check_api.calls == 1
+
+
+def test_rule_override_and_verdict_cache(make_pipeline):
+    """A consensus claim exits at the rules gate; asking again is a cache hit."""
+    pipeline = make_pipeline({})
+    pipeline.analyze_claim("Unrelated claim about budgets")
+    first = pipeline.analyze_claim("Vaccines cause autism in children")
+    assert first.cascade["exit"] == "rules"
+    assert first.verdict == "Likely False"
+    assert first.cascade["time_saved"] is not None
+
+    second = pipeline.analyze_claim("vaccines  cause autism in children")
+    assert second.cascade["exit"] == "verdict_cache"
+    assert second.verdict == first.verdict
+    assert pipeline.fact_check_api.calls == 2
+    assert pipeline.news_handler.calls == 1
+
+
+def test_disabled_gates_run_full_path(make_pipeline):
+    cascade = CascadeConfig(verdict_cache_size=None, fact_check_min_confidence=None, rule_min_confidence=None)
+    pipeline = make_pipeline({"The moon is cheese": ("REFUTED", 0.95)}, cascade)
+    result = pipeline.analyze_claim("The moon is cheese")
+    assert result.cascade == {"path": ["fact_check:pass", "full"], "exit": None, "time_saved": None}
+    assert result.verdict == "Likely False"
+    assert pipeline.news_handler.calls == 1
+
+
+def test_cached_verdicts_are_isolated_from_callers(make_pipeline):
+    """Changing a returned result does not change the cached verdict."""
+    pipeline = make_pipeline({})
+    first = pipeline.analyze_claim("Vaccines cause autism in children")
+    overrides = list(first.rule_based_overrides)
+    first.rule_based_overrides.append("tampered")
+    first.search_summary["tampered"] = True
+
+    second = pipeline.analyze_claim("Vaccines cause autism in children")
+    assert second.cascade["exit"] == "verdict_cache"
+    assert second.rule_based_overrides == overrides
+    assert "tampered" not in second.search_summary
+    second.rule_based_overrides.append("tampered again")
+    assert pipeline.analyze_claim("Vaccines cause autism in children").rule_based_overrides == overrides
+
+
+def test_batch_looks_up_evidence_together_and_ranks_pooled_articles(make_pipeline):
+    """Fact checks go out as one batch, news lookups overlap, and articles are ranked before truncation."""
+    pipeline = make_pipeline({"The moon is made of cheese": ("REFUTED", 0.95)})
+    pipeline.news_handler = FakeNewsHandler({
+        "Income taxes rose sharply in 2020": ["Football scores", "Weather today",
+                                              "Income taxes rose sharply in 2020 filings show"],
+        "Income taxes rose in 2021": ["Local elections"],
+    }, delay=0.05)
+    claims = ["Income taxes rose sharply in 2020", "The moon is made of cheese", "Income taxes rose in 2021"]
+
+    results = pipeline.analyze_claims(claims, max_articles=2)
+    assert pipeline.fact_check_api.batches == [claims]
+    assert pipeline.fact_check_api.calls == 0
+    assert pipeline.news_handler.max_active > 1
+    titles = [article["title"] for article in results[0].news_articles]
+    assert titles[0] == "Income taxes rose sharply in 2020 filings show"
+    assert results[0].search_summary["ranking"] == "word_overlap"
+
+
+def test_failed_or_empty_lookups_are_not_cached_for_the_full_ttl(make_pipeline):
+    """A verdict built while news search failed is not cached; one without evidence gets the short TTL."""
+    pipeline = make_pipeline({})
+    pipeline.news_handler = FakeNewsHandler(error=TimeoutError("news API timed out"))
+    first = pipeline.analyze_claim("Income taxes rose sharply in 2020")
+    assert first.cascade["exit"] is None
+
+    pipeline.news_handler.error = None
+    second = pipeline.analyze_claim("Income taxes rose sharply in 2020")
+    assert second.cascade["path"][0] == "verdict_cache:miss"
+    assert pipeline.news_handler.calls == 2
+
+    pipeline = make_pipeline({}, CascadeConfig(fallback_cache_ttl=None))
+    pipeline.analyze_claim("Income taxes rose sharply in 2020")
+    assert pipeline.verdict_cache.get("Income taxes rose sharply in 2020", 20) is None
+
+
+def test_batch_and_stream_share_the_cascade(make_pipeline):
+    """Batches and streams skip news for settled claims and read and fill the verdict cache."""
+    pipeline = make_pipeline({"The moon is made of cheese": ("REFUTED", 0.95)})
+    pipeline.news_handler = FakeNewsHandler({"Income taxes rose sharply in 2020": ["Income taxes rose in 2020"]})
+    claims = ["Income taxes rose sharply in 2020", "The moon is made of cheese"]
+
+    first = pipeline.analyze_claims(claims)
+    assert [result.cascade["exit"] for result in first] == [None, "fact_check"]
+    assert pipeline.news_handler.calls == 1
+
+    second = pipeline.analyze_claims(claims)
+    assert [result.cascade["exit"] for result in second] == ["verdict_cache", "verdict_cache"]
+    assert [result.verdict for result in second] == [result.verdict for result in first]
+    assert len(pipeline.fact_check_api.batches) == 1
+    assert pipeline.news_handler.calls == 1
+
+    events = list(pipeline.stream_analysis("Vaccines cause autism in children"))
+    assert events[-1]["event"] == "verdict" and events[-1]["early_exit"] == "rules"
+    assert pipeline.analyze_claim("Vaccines cause autism in children").cascade["exit"] == "verdict_cache"
+    events = list(pipeline.stream_analysis("The moon is made of cheese"))
+    assert [event["event"] for event in events] == ["started", "verdict"]
+    assert events[-1]["early_exit"] == "verdict_cache"
+    assert pipeline.news_handler.calls == 1
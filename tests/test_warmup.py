@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Warm-up Test
+Tests model preloading, warm-up passes and the readiness report.
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.warmup import FAILED, READY, WarmupManager
+
+
+def test_ready_after_load_and_warm_with_timings():
+    """Components load, warm and publish in order; readiness reports timings."""
+    published = {}
+    warmed = []
+    warmup = WarmupManager(run_forward_passes=True)
+    warmup.add("encoder", lambda: "model", warm=warmed.append,
+               on_loaded=lambda c: published.setdefault("encoder", c))
+
+    assert not warmup.is_ready()
+    assert warmup.readiness()["status"] == "warming"
+    warmup.run()
+
+    readiness = warmup.readiness()
+    assert warmup.is_ready() and readiness["status"] == "ready"
+    assert warmed == ["model"] and published == {"encoder": "model"}
+    component = readiness["components"]["encoder"]
+    assert component["state"] == READY
+    assert component["load_seconds"] >= 0 and component["warmup_seconds"] >= 0
+
+
+def test_failed_optional_component_does_not_block_readiness():
+    """A failed optional component is reported but readiness still passes."""
+    def broken():
+        raise RuntimeError("weights missing")
+
+    warmup = WarmupManager(run_forward_passes=True)
+    warmup.add("encoder", lambda: "model")
+    warmup.add("reranker", broken, required=False)
+    warmup.run()
+    assert warmup.is_ready()
+    assert warmup.readiness()["components"]["reranker"]["error"] == "weights missing"
+
+    warmup = WarmupManager(run_forward_passes=True)
+    warmup.add("encoder", broken)
+    warmup.run()
+    readiness = warmup.readiness()
+    assert not readiness["ready"] and readiness["status"] == "degraded"
+    assert readiness["components"]["encoder"]["state"] == FAILED
+
+
+def test_forward_passes_can_be_disabled(monkeypatch):
+    """TRUTHLENS_WARMUP=0 still loads components but skips dummy passes."""
+    monkeypatch.setenv("TRUTHLENS_WARMUP", "0")
+    warmed = []
+    warmup = WarmupManager()
+    warmup.add("encoder", lambda: "model", warm=warmed.append)
+    warmup.run()
+    assert warmup.is_ready() and warmed == []
+    assert warmup.readiness()["components"]["encoder"]["warmup_seconds"] is None
+
+
+def test_liveness_answers_while_warming_in_background():
+    """Liveness is available while a slow component is still loading."""
+    release = threading.Event()
+    warmup = WarmupManager(run_forward_passes=False)
+    warmup.add("slow", lambda: release.wait(5))
+    thread = warmup.start()
+
+    assert warmup.liveness()["status"] == "alive"
+    assert not warmup.is_ready()
+    release.set()
+    thread.join(5)
+    assert warmup.is_ready()
+
+
+def test_original_route_answers_503_during_warmup(monkeypatch):
+    """Requests that arrive while components are still loading get 503 with Retry-After."""
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setenv("TRUTHLENS_DISABLE_ML", "1")
+    monkeypatch.syspath_prepend(str(project_root / "webapp"))
+    import truthlens_fastapi
+
+    release = threading.Event()
+    warmup = WarmupManager(run_forward_passes=False)
+    warmup.add("claim_processor", lambda: release.wait(5) and "processor",
+               on_loaded=truthlens_fastapi._set_component("claim_processor"))
+    monkeypatch.setattr(truthlens_fastapi, "TRUTHLENS_AVAILABLE", True)
+    monkeypatch.setattr(truthlens_fastapi, "warmup", warmup)
+    monkeypatch.setattr(truthlens_fastapi, "claim_processor", None)
+    thread = warmup.start()
+
+    client = TestClient(truthlens_fastapi.app)
+    response = client.post("/predict/original", json={"text": "The moon is made of cheese"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(truthlens_fastapi.WARMUP_RETRY_AFTER)
+    assert "claim_processor" in response.json()["detail"]
+
+    release.set()
+    thread.join(5)
@@ -13,8 +13,9 @@ from datetime import datetime
 import time
 import uuid
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 import uvicorn
 
@@ -26,6 +27,11 @@ sys.path.insert(0, str(parent_dir))
 # Disable ML to avoid GPU memory issues and use heuristic detection
 os.environ["TRUTHLENS_DISABLE_ML"] = "1"
 
+from src.utils.serving import AdmissionRejected, BoundedExecutor
+from src.utils.prefork import memory_report, prefork_enabled, prepare_for_fork
+from src.utils.tracing import metrics_snapshot, span, traced_request
+from src.utils.warmup import WarmupManager
+
 # Import TruthLens modules
 try:
     # Enhanced Pipeline (Primary)
@@ -35,6 +41,7 @@ try:
     from src.ingestion import process_input, detect_input_type
     from src.translation import normalize_text
     from src.claim_processing import ClaimProcessor
+    from extractor import claim_detector
     from src.evidence_retrieval.hybrid_retriever import HybridEvidenceRetriever
     from src.evidence_retrieval.trusted_sources import TrustedSourcesDatabase, TrustedSourcesAPI
     from src.verification.pipeline import VerificationPipeline
@@ -74,6 +81,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# The pipeline is synchronous (blocking HTTP, torch, SQLite), so it runs on a
+# bounded pool; excess requests are shed with 429/503 instead of queueing
+inference_executor = BoundedExecutor.from_env(prefix="TRUTHLENS_INFERENCE", name="inference")
+# Models load and warm in the background; /health/ready reports when they are done
+warmup = WarmupManager()
+# Seconds clients are told to wait when a request arrives before warm-up has finished
+WARMUP_RETRY_AFTER = int(os.environ.get("TRUTHLENS_WARMUP_RETRY_AFTER", 10))
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    """Turn shed requests into 429/503 responses with a Retry-After hint."""
+    logger.warning(f"Request to {request.url.path} rejected: {exc}")
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 # Pydantic models for request/response
 class PredictRequest(BaseModel):
     text: str = Field(..., description="Input text to analyze", min_length=1, max_length=10000)
@@ -137,41 +162,59 @@ verification_pipeline = None
 explanation_layer = None
 citation_highlighter = None
 
+def _set_component(name: str):
+    """Build an on_loaded callback that publishes a component as a module global."""
+    def publish(component):
+        globals()[name] = component
+        print(f"✅ {name.replace('_', ' ').capitalize()} initialized")
+    return publish
+
 def initialize_truthlens_pipeline():
-    """Initialize all TruthLens pipeline components."""
-    global claim_processor, evidence_retriever, verification_pipeline, explanation_layer, citation_highlighter
-    
+    """Register all TruthLens pipeline components with the warm-up manager."""
     if not TRUTHLENS_AVAILABLE:
         return
     
-    try:
-        # Initialize Phase 2: Claim Processing
-        print("🔍 Initializing claim processor...")
-        claim_processor = ClaimProcessor()
-        print("✅ Claim processor initialized")
-        
-        # Initialize Phase 3: Evidence Retrieval
-        print("🔍 Initializing evidence retriever...")
-        evidence_retriever = HybridEvidenceRetriever()
-        print("✅ Evidence retriever initialized")
-        
-        # Initialize Phase 4: Verification Pipeline
-        print("🔍 Initializing verification pipeline...")
-        verification_pipeline = VerificationPipeline()
-        citation_highlighter = CitationHighlighter()
-        print("✅ Verification pipeline initialized")
-        
-        # Initialize Phase 5: User Explanation Layer
-        print("🔍 Initializing explanation layer...")
-        explanation_layer = UserExplanationLayer()
-        print("✅ Explanation layer initialized")
-        
-        print("🎉 Complete TruthLens pipeline initialized successfully!")
-        
-    except Exception as e:
-        print(f"❌ Error initializing TruthLens pipeline: {e}")
-        logger.error(f"TruthLens pipeline initialization error: {e}")
+    # Phase 2: Claim Processing
+    warmup.add("claim_processor", ClaimProcessor,
+               warm=lambda _: claim_detector.warm_up(),
+               on_loaded=_set_component("claim_processor"))
+    # Phase 3: Evidence Retrieval
+    warmup.add("evidence_retriever", HybridEvidenceRetriever,
+               on_loaded=_set_component("evidence_retriever"))
+    # Phase 4: Verification Pipeline
+    warmup.add("verification_pipeline", VerificationPipeline,
+               warm=lambda loaded: loaded.warm_up(),
+               on_loaded=_set_component("verification_pipeline"))
+    warmup.add("citation_highlighter", CitationHighlighter,
+               on_loaded=_set_component("citation_highlighter"))
+    # Phase 5: User Explanation Layer
+    warmup.add("explanation_layer", UserExplanationLayer,
+               on_loaded=_set_component("explanation_layer"))
+
+def require_components(*names: str):
+    """
+    Refuse a request whose components are not loaded yet.
+    
+    Raises:
+        HTTPException: 503, with Retry-After while warm-up is still in progress
+    """
+    if not TRUTHLENS_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Original pipeline not available - components not installed")
+    missing = [name for name in names if globals()[name] is None]
+    if missing or not warmup.is_ready():
+        raise HTTPException(
+            status_code=503,
+            detail=f"Pipeline warming up - {', '.join(missing) or 'components'} not ready",
+            headers={"Retry-After": str(WARMUP_RETRY_AFTER)}
+        )
 
+if prefork_enabled():
+    # Load in the master (gunicorn --preload) so forked workers share the weights
+    initialize_truthlens_pipeline()
+    warmup.run()
+    prepare_for_fork(claim_processor, evidence_retriever, verification_pipeline)
+
+@traced_request("predict")
 def process_truthlens_pipeline(
     input_data: str, 
     input_type: str = "text",
@@ -212,6 +255,7 @@ def process_truthlens_pipeline(
             "timestamp": datetime.now().isoformat()
         }
 
+@traced_request("predict_original")
 def process_original_pipeline(
     input_data: str, 
     input_type: str = "text",
@@ -223,96 +267,96 @@ def process_original_pipeline(
         start_time = time.time()
         
         # Phase 1: Input Processing
-        phase1_start = time.time()
-        processed_input = process_input(input_data)
-        normalized_text = normalize_text(processed_input["text"] if processed_input["success"] else input_data)
-        phase1_time = time.time() - phase1_start
+        with span("phase1.input_processing") as phase1:
+            processed_input = process_input(input_data)
+            normalized_text = normalize_text(processed_input["text"] if processed_input["success"] else input_data)
+        phase1_time = phase1.duration
         
         logger.info(f"Phase 1 completed in {phase1_time:.3f}s")
         
         # Phase 2: Claim Extraction & Ranking
-        phase2_start = time.time()
-        claim_result = claim_processor.process_claims(normalized_text)
-        top_claims = claim_result.atomic_claims[:max_claims]
-        phase2_time = time.time() - phase2_start
+        with span("phase2.claim_extraction") as phase2:
+            claim_result = claim_processor.process_claims(normalized_text)
+            top_claims = claim_result.atomic_claims[:max_claims]
+        phase2_time = phase2.duration
         
         logger.info(f"Phase 2 completed in {phase2_time:.3f}s - Found {len(top_claims)} claims")
         
         # Phase 3: Evidence Retrieval
-        phase3_start = time.time()
-        all_evidence = []
-        for claim in top_claims:
-            evidence_result = evidence_retriever.retrieve_evidence(claim["text"], claim["id"])
-            # Store evidence in a temporary list since claim is a dict
-            claim_evidence = evidence_result.evidence[:max_evidence_per_claim]
-            all_evidence.extend(claim_evidence)
-        phase3_time = time.time() - phase3_start
+        with span("phase3.evidence_retrieval") as phase3:
+            all_evidence = []
+            for claim in top_claims:
+                evidence_result = evidence_retriever.retrieve_evidence(claim["text"], claim["id"])
+                # Store evidence in a temporary list since claim is a dict
+                claim_evidence = evidence_result.evidence[:max_evidence_per_claim]
+                all_evidence.extend(claim_evidence)
+        phase3_time = phase3.duration
         
         logger.info(f"Phase 3 completed in {phase3_time:.3f}s - Retrieved {len(all_evidence)} evidence")
         
         # Phase 4: Verification & Scoring
-        phase4_start = time.time()
-        verification_results = []
-        for i, claim in enumerate(top_claims):
-            # Get evidence for this claim (using index since we stored evidence separately)
-            claim_evidence = all_evidence[i * max_evidence_per_claim:(i + 1) * max_evidence_per_claim] if all_evidence else []
+        with span("phase4.verification") as phase4:
+            verification_results = []
+            for i, claim in enumerate(top_claims):
+                # Get evidence for this claim (using index since we stored evidence separately)
+                claim_evidence = all_evidence[i * max_evidence_per_claim:(i + 1) * max_evidence_per_claim] if all_evidence else []
             
-            if claim_evidence:
-                # Verify claim against evidence
-                verification_result = verification_pipeline.verify_claim(
-                    claim["text"], 
-                    [ev.content for ev in claim_evidence]
-                )
+                if claim_evidence:
+                    # Verify claim against evidence
+                    verification_result = verification_pipeline.verify_claim(
+                        claim["text"], 
+                        [ev.content for ev in claim_evidence]
+                    )
                 
-                # Highlight citations
-                highlights = citation_highlighter.highlight_citation(
-                    claim_evidence[0].content, 
-                    claim["text"]
-                )
+                    # Highlight citations
+                    highlights = citation_highlighter.highlight_citation(
+                        claim_evidence[0].content, 
+                        claim["text"]
+                    )
                 
-                # Map verdict
-                verdict = map_verdict(verification_result.confidence_score)
+                    # Map verdict
+                    verdict = map_verdict(verification_result.confidence_score)
                 
-                verification_results.append({
-                    "claim": claim,
-                    "verification": verification_result,
-                    "highlights": highlights,
-                    "verdict": verdict
-                })
-        phase4_time = time.time() - phase4_start
+                    verification_results.append({
+                        "claim": claim,
+                        "verification": verification_result,
+                        "highlights": highlights,
+                        "verdict": verdict
+                    })
+        phase4_time = phase4.duration
         
         logger.info(f"Phase 4 completed in {phase4_time:.3f}s")
         
         # Phase 5: User Explanation Layer
-        phase5_start = time.time()
-        explanations = []
-        cue_badges = []
-        prebunk_cards = []
+        with span("phase5.explanation") as phase5:
+            explanations = []
+            cue_badges = []
+            prebunk_cards = []
         
-        for result in verification_results:
-            # Generate explanations
-            explanation = generate_user_explanation(
-                result["claim"]["text"],
-                result["verification"].confidence_score,
-                result["verdict"]
-            )
-            explanations.append(explanation)
+            for result in verification_results:
+                # Generate explanations
+                explanation = generate_user_explanation(
+                    result["claim"]["text"],
+                    result["verification"].confidence_score,
+                    result["verdict"]
+                )
+                explanations.append(explanation)
             
-            # Generate cue badges
-            cues = generate_cue_badges(result["claim"]["text"])
-            cue_badges.extend(cues)
+                # Generate cue badges
+                cues = generate_cue_badges(result["claim"]["text"])
+                cue_badges.extend(cues)
             
-            # Generate prebunk card
-            prebunk = build_prebunk_card(
-                result["claim"]["text"],
-                explanation.why_misleading,
-                explanation.prebunk_tip
-            )
-            prebunk_cards.append(prebunk)
+                # Generate prebunk card
+                prebunk = build_prebunk_card(
+                    result["claim"]["text"],
+                    explanation.why_misleading,
+                    explanation.prebunk_tip
+                )
+                prebunk_cards.append(prebunk)
         
-        # Format evidence cards
-        evidence_cards = build_evidence_cards(all_evidence)
-        phase5_time = time.time() - phase5_start
+            # Format evidence cards
+            evidence_cards = build_evidence_cards(all_evidence)
+        phase5_time = phase5.duration
         
         logger.info(f"Phase 5 completed in {phase5_time:.3f}s")
         
@@ -547,7 +591,10 @@ async def root():
             "POST /predict": "Enhanced pipeline with dynamic evidence retrieval and NLI verification",
             "POST /predict/original": "Original pipeline with claim extraction and verification",
             "GET /health": "Health check",
-            "GET /status": "Pipeline component status"
+            "GET /health/live": "Liveness probe",
+            "GET /health/ready": "Readiness probe; 503 until models are loaded and warm",
+            "GET /status": "Pipeline component status",
+            "GET /metrics": "Per-stage latency percentiles and recent request traces"
         },
         "features": {
             "enhanced_pipeline": "Dynamic evidence retrieval from Wikipedia, news, and fact-check sources",
@@ -561,6 +608,7 @@ async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
+        "ready": warmup.is_ready(),
         "timestamp": datetime.now().isoformat(),
         "truthlens_available": TRUTHLENS_AVAILABLE,
         "pipeline_components": {
@@ -572,6 +620,17 @@ async def health_check():
         }
     }
 
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness probe; answers as soon as the server accepts connections."""
+    return warmup.liveness()
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness probe; 503 until every required component is loaded and warmed."""
+    readiness = warmup.readiness()
+    return JSONResponse(status_code=200 if readiness["ready"] else 503, content=readiness)
+
 @app.get("/status")
 async def pipeline_status():
     """Get pipeline component status."""
@@ -584,6 +643,9 @@ async def pipeline_status():
             "phase4_verification": verification_pipeline is not None,
             "phase5_explanation": explanation_layer is not None
         },
+        "serving": inference_executor.stats(),
+        "warmup": warmup.readiness(),
+        "memory": {"prefork": prefork_enabled(), **memory_report()},
         "capabilities": {
             "complete_pipeline": TRUTHLENS_AVAILABLE,
             "individual_phases": True,
@@ -591,6 +653,11 @@ async def pipeline_status():
         }
     }
 
+@app.get("/metrics")
+async def metrics():
+    """Rolling p50/p95/p99 per pipeline span, recent span trees and serving counters."""
+    return {**metrics_snapshot(), "serving": inference_executor.stats()}
+
 @app.post("/predict", response_model=EnhancedPredictResponse)
 async def predict(request: PredictRequest):
     """
@@ -605,8 +672,9 @@ async def predict(request: PredictRequest):
     try:
         logger.info(f"Processing prediction request: {request.text[:100]}...")
         
-        # Process through enhanced pipeline
-        result = process_truthlens_pipeline(
+        # Process through enhanced pipeline off the event loop
+        result = await inference_executor.run(
+            process_truthlens_pipeline,
             input_data=request.text,
             input_type=request.input_type,
             max_claims=request.max_claims,
@@ -618,6 +686,8 @@ async def predict(request: PredictRequest):
         
         return result
         
+    except AdmissionRejected:
+        raise
     except Exception as e:
         logger.error(f"Error in predict endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -633,11 +703,14 @@ async def predict_original(request: PredictRequest):
     Returns:
         Original pipeline results with claim extraction and verification
     """
+    # Components are published by the background warm-up; until then answer 503, not 500
+    require_components("claim_processor", "evidence_retriever", "verification_pipeline", "citation_highlighter")
     try:
         logger.info(f"Processing original pipeline request: {request.text[:100]}...")
         
-        # Process through original pipeline
-        result = process_original_pipeline(
+        # Process through original pipeline off the event loop
+        result = await inference_executor.run(
+            process_original_pipeline,
             input_data=request.text,
             input_type=request.input_type,
             max_claims=request.max_claims,
@@ -649,6 +722,8 @@ async def predict_original(request: PredictRequest):
         
         return result
         
+    except AdmissionRejected:
+        raise
     except Exception as e:
         logger.error(f"Error in original predict endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -659,7 +734,14 @@ async def startup_event():
     """Initialize TruthLens pipeline on startup."""
     print("🚀 Starting TruthLens FastAPI Backend")
     print("=" * 60)
-    initialize_truthlens_pipeline()
+    if not warmup.started:
+        initialize_truthlens_pipeline()
+        warmup.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop admitting requests and release the inference pool."""
+    inference_executor.shutdown(wait=False)
 
 if __name__ == "__main__":
     # Run the FastAPI app